@@ -0,0 +1,45 @@
+"""sync adaptive sizing state per domain
+
+Revision ID: 0033_sync_tuning_state
+Revises: 0032_sync_records_gestor
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0033_sync_tuning_state"
+down_revision = "0032_sync_records_gestor"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if not inspector.has_table("sync_tuning_state"):
+        op.create_table(
+            "sync_tuning_state",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("domain", sa.String(length=32), nullable=False),
+            sa.Column("fetch_batch_size", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("chunk_size", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("extract_latency_ms", sa.Float(), nullable=False, server_default="0"),
+            sa.Column("upsert_latency_ms", sa.Float(), nullable=False, server_default="0"),
+            sa.Column("lock_waits", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("rss_mb", sa.Float(), nullable=False, server_default="0"),
+            sa.Column("samples", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("last_job_id", sa.String(length=64), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        )
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_sync_tuning_state_domain "
+        "ON sync_tuning_state (domain)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ux_sync_tuning_state_domain", table_name="sync_tuning_state")
+    op.drop_table("sync_tuning_state")
@@ -0,0 +1,38 @@
+"""append-only sync run log lines
+
+Revision ID: 0034_sync_run_logs
+Revises: 0033_sync_tuning_state
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0034_sync_run_logs"
+down_revision = "0033_sync_tuning_state"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if not inspector.has_table("sync_run_logs"):
+        op.create_table(
+            "sync_run_logs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("job_id", sa.String(length=64), nullable=False),
+            sa.Column("domain", sa.String(length=32), nullable=False),
+            sa.Column("line", sa.Text(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_sync_run_logs_created_at ON sync_run_logs (created_at)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_sync_run_logs_job_id_id ON sync_run_logs (job_id, id)")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sync_run_logs_job_id_id", table_name="sync_run_logs")
+    op.drop_index("ix_sync_run_logs_created_at", table_name="sync_run_logs")
+    op.drop_table("sync_run_logs")
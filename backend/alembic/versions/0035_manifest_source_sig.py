@@ -0,0 +1,29 @@
+"""source-side month fingerprint on sync_chunk_manifest
+
+Revision ID: 0035_manifest_source_sig
+Revises: 0034_sync_run_logs
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0035_manifest_source_sig"
+down_revision = "0034_sync_run_logs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    columns = {c["name"] for c in sa.inspect(bind).get_columns("sync_chunk_manifest")}
+    if "source_signature" not in columns:
+        op.add_column(
+            "sync_chunk_manifest",
+            sa.Column("source_signature", sa.String(length=96), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    op.drop_column("sync_chunk_manifest", "source_signature")
@@ -0,0 +1,77 @@
+"""precomputed orphan cobranzas per cutoff month
+
+Revision ID: 0036_cobranzas_orphan_precompute
+Revises: 0035_manifest_source_sig
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0036_cobranzas_orphan_precompute"
+down_revision = "0035_manifest_source_sig"
+branch_labels = None
+depends_on = None
+
+
+def _is_postgres() -> bool:
+    bind = op.get_bind()
+    return bind is not None and bind.dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if not inspector.has_table("cobranzas_orphan_contract"):
+        op.create_table(
+            "cobranzas_orphan_contract",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("cutoff_month", sa.String(length=7), nullable=False),
+            sa.Column("effective_cartera_month", sa.String(length=7), nullable=False),
+            sa.Column("contract_id", sa.String(length=64), nullable=False),
+            sa.Column("un", sa.String(length=128), nullable=False, server_default=""),
+            sa.Column("supervisor", sa.String(length=128), nullable=False, server_default=""),
+            sa.Column("gestor", sa.String(length=128), nullable=False, server_default=""),
+            sa.Column("via", sa.String(length=32), nullable=False, server_default=""),
+            sa.Column("tramo", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("categoria", sa.String(length=16), nullable=False, server_default="VIGENTE"),
+            sa.Column("transacciones", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("pagos_positivos", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("cobrado", sa.Float(), nullable=False, server_default="0"),
+            sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        )
+    if not inspector.has_table("cobranzas_orphan_cutoff"):
+        op.create_table(
+            "cobranzas_orphan_cutoff",
+            sa.Column("cutoff_month", sa.String(length=7), primary_key=True),
+            sa.Column("effective_cartera_month", sa.String(length=7), nullable=False),
+            sa.Column("contratos", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("pagaron", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("transacciones", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("cobrado", sa.Float(), nullable=False, server_default="0"),
+            sa.Column("refreshed_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_cobranzas_orphan_contract_cutoff_contract "
+        "ON cobranzas_orphan_contract (cutoff_month, contract_id)"
+    )
+    # Covering index: los filtros del summary (un/supervisor/via/categoria) se resuelven
+    # con index-only scan sobre el corte.
+    include = (
+        " INCLUDE (gestor, contract_id, transacciones, pagos_positivos, cobrado)"
+        if _is_postgres()
+        else ""
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_cobranzas_orphan_contract_cutoff_dims "
+        f"ON cobranzas_orphan_contract (cutoff_month, un, supervisor, via, categoria){include}"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cobranzas_orphan_contract_cutoff_dims", table_name="cobranzas_orphan_contract")
+    op.drop_index("ix_cobranzas_orphan_contract_cutoff_contract", table_name="cobranzas_orphan_contract")
+    op.drop_table("cobranzas_orphan_cutoff")
+    op.drop_table("cobranzas_orphan_contract")
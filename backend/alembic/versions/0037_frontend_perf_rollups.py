@@ -0,0 +1,54 @@
+"""per-route per-minute frontend perf rollups
+
+Revision ID: 0037_frontend_perf_rollups
+Revises: 0036_cobranzas_orphan_precompute
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0037_frontend_perf_rollups"
+down_revision = "0036_cobranzas_orphan_precompute"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if not inspector.has_table("frontend_perf_rollups"):
+        op.create_table(
+            "frontend_perf_rollups",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("route", sa.String(length=32), nullable=False),
+            sa.Column("bucket_start", sa.DateTime(), nullable=False),
+            sa.Column("samples", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("warm", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("cold", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("ttfb_hist", sa.Text(), nullable=False, server_default="{}"),
+            sa.Column("fcp_hist", sa.Text(), nullable=False, server_default="{}"),
+            sa.Column("ready_hist", sa.Text(), nullable=False, server_default="{}"),
+            sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_frontend_perf_rollups_id "
+        "ON frontend_perf_rollups (id)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_frontend_perf_rollups_bucket_start "
+        "ON frontend_perf_rollups (bucket_start)"
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_frontend_perf_rollups_route_bucket "
+        "ON frontend_perf_rollups (route, bucket_start)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ux_frontend_perf_rollups_route_bucket", table_name="frontend_perf_rollups")
+    op.drop_index("ix_frontend_perf_rollups_bucket_start", table_name="frontend_perf_rollups")
+    op.drop_index("ix_frontend_perf_rollups_id", table_name="frontend_perf_rollups")
+    op.drop_table("frontend_perf_rollups")
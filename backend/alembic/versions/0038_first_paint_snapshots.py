@@ -0,0 +1,48 @@
+"""first-paint payload snapshots persisted at the end of each sync
+
+Revision ID: 0038_first_paint_snapshots
+Revises: 0037_frontend_perf_rollups
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0038_first_paint_snapshots"
+down_revision = "0037_frontend_perf_rollups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if not inspector.has_table("first_paint_snapshots"):
+        op.create_table(
+            "first_paint_snapshots",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("endpoint", sa.String(length=64), nullable=False),
+            sa.Column("filters_hash", sa.String(length=64), nullable=False),
+            sa.Column("filters_json", sa.Text(), nullable=False, server_default="{}"),
+            sa.Column("etag", sa.String(length=64), nullable=False),
+            sa.Column("payload_gz", sa.LargeBinary(), nullable=False),
+            sa.Column("payload_bytes", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("compute_ms", sa.Float(), nullable=False, server_default="0"),
+            sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_first_paint_snapshots_id "
+        "ON first_paint_snapshots (id)"
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_first_paint_snapshots_endpoint_filters "
+        "ON first_paint_snapshots (endpoint, filters_hash)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ux_first_paint_snapshots_endpoint_filters", table_name="first_paint_snapshots")
+    op.drop_index("ix_first_paint_snapshots_id", table_name="first_paint_snapshots")
+    op.drop_table("first_paint_snapshots")
@@ -0,0 +1,60 @@
+import hmac
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+from app.core.concurrency import gates_snapshot
+from app.core.config import settings
+from app.core.logging_config import logging_stats
+from app.core.request_metrics import prometheus_text
+from app.services.telemetry_buffer import frontend_perf_buffer
+
+router = APIRouter()
+
+_PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@router.get('/metrics', include_in_schema=False)
+def metrics(request: Request):
+    """Scrape de Prometheus (sin prefijo /api/v1). Si METRICS_BEARER_TOKEN está seteado, se exige."""
+    if not settings.metrics_endpoint_enabled:
+        raise HTTPException(status_code=404, detail='Not Found')
+    expected = str(settings.metrics_bearer_token or '').strip()
+    if expected:
+        provided = request.headers.get('authorization', '')
+        if not hmac.compare_digest(provided.encode(), f'Bearer {expected}'.encode()):
+            raise HTTPException(status_code=401, detail='Unauthorized')
+    body = prometheus_text()
+    snap = frontend_perf_buffer.snapshot()
+    log_stats = logging_stats()
+    body += (
+        '# HELP frontend_perf_queue_depth Eventos de telemetria frontend pendientes de flush (este worker).\n'
+        '# TYPE frontend_perf_queue_depth gauge\n'
+        f'frontend_perf_queue_depth {snap["queue_depth"]}\n'
+        '# HELP frontend_perf_dropped_total Eventos descartados por cola llena (este worker).\n'
+        '# TYPE frontend_perf_dropped_total counter\n'
+        f'frontend_perf_dropped_total {snap["dropped"]}\n'
+        '# HELP structured_log_dropped_total Logs descartados por cola llena (este worker).\n'
+        '# TYPE structured_log_dropped_total counter\n'
+        f'structured_log_dropped_total {log_stats["dropped"]}\n'
+        '# HELP structured_log_sampled_out_total Eventos request omitidos por muestreo (este worker).\n'
+        '# TYPE structured_log_sampled_out_total counter\n'
+        f'structured_log_sampled_out_total {log_stats["sampled_out"]}\n'
+    )
+    gates = gates_snapshot()
+    if gates:
+        body += (
+            '# HELP analytics_concurrency_in_flight Requests analytics ejecutandose por clase (este worker).\n'
+            '# TYPE analytics_concurrency_in_flight gauge\n'
+            + ''.join(f'analytics_concurrency_in_flight{{class="{name}"}} {g["in_flight"]}\n' for name, g in gates.items())
+            + '# HELP analytics_concurrency_waiting Requests analytics esperando slot por clase (este worker).\n'
+            '# TYPE analytics_concurrency_waiting gauge\n'
+            + ''.join(f'analytics_concurrency_waiting{{class="{name}"}} {g["waiting"]}\n' for name, g in gates.items())
+            + '# HELP analytics_concurrency_rejected_total Requests rechazados con 503 por clase (este worker).\n'
+            '# TYPE analytics_concurrency_rejected_total counter\n'
+            + ''.join(
+                f'analytics_concurrency_rejected_total{{class="{name}"}} {g["rejected_queue_full"] + g["rejected_timeout"]}\n'
+                for name, g in gates.items()
+            )
+        )
+    return PlainTextResponse(body, media_type=_PROMETHEUS_CONTENT_TYPE)
@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from app.core.analytics_cache import RENDIMIENTO_V2_SUMMARY_CACHE_SCOPE, get as cache_get, set as cache_set
 from app.core.config import settings
-from app.core.deps import require_permission, write_rate_limiter
+from app.core.deps import (
+    export_gate,
+    first_paint_gate,
+    options_gate,
+    require_permission,
+    summary_gate,
+    write_rate_limiter,
+)
 from app.db.session import get_db
 from app.schemas.analytics import (
     AnalyticsFilters,
@@ -22,6 +29,7 @@ from app.schemas.analytics import (
     PortfolioSummaryIn,
 )
 from app.services.analytics_service import AnalyticsService
+from app.services.first_paint_snapshots import first_paint_snapshot_response
 
 router = APIRouter()
 BROKERS_SUMMARY_CACHE_TTL = 60
@@ -99,7 +107,7 @@ def _decorate_meta(db: Session, payload: dict, *, cache_hit: bool, source_table:
     return AnalyticsService.attach_meta(db, payload, cache_hit=cache_hit, source_table=source_table)
 
 
-@router.post('/portfolio/options', response_model=PortfolioOptionsOut)
+@router.post('/portfolio/options', response_model=PortfolioOptionsOut, dependencies=[Depends(options_gate)])
 def portfolio_options(
     filters: AnalyticsFilters,
     db: Session = Depends(get_db),
@@ -113,7 +121,7 @@ def portfolio_options(
     return _decorate_meta(db, result, cache_hit=False)
 
 
-@router.post('/portfolio/summary')
+@router.post('/portfolio/summary', dependencies=[Depends(summary_gate)])
 def portfolio_summary(
     filters: PortfolioSummaryIn,
     db: Session = Depends(get_db),
@@ -130,7 +138,7 @@ def portfolio_summary(
     return _decorate_meta(db, AnalyticsService.fetch_portfolio_summary_v1(db, filters), cache_hit=False)
 
 
-@router.post('/portfolio/corte/options', response_model=PortfolioCorteOptionsOut)
+@router.post('/portfolio/corte/options', response_model=PortfolioCorteOptionsOut, dependencies=[Depends(options_gate)])
 def portfolio_corte_options(
     filters: AnalyticsFilters,
     db: Session = Depends(get_db),
@@ -144,7 +152,7 @@ def portfolio_corte_options(
     return _decorate_meta(db, result, cache_hit=False)
 
 
-@router.post('/portfolio-corte-v2/options', response_model=PortfolioCorteOptionsOut)
+@router.post('/portfolio-corte-v2/options', response_model=PortfolioCorteOptionsOut, dependencies=[Depends(options_gate)])
 def portfolio_corte_options_v2(
     filters: AnalyticsFilters,
     db: Session = Depends(get_db),
@@ -158,7 +166,7 @@ def portfolio_corte_options_v2(
     return _decorate_meta(db, result, cache_hit=False, source_table='mv_options_cartera')
 
 
-@router.post('/portfolio/corte/summary', response_model=PortfolioCorteSummaryOut)
+@router.post('/portfolio/corte/summary', response_model=PortfolioCorteSummaryOut, dependencies=[Depends(summary_gate)])
 def portfolio_corte_summary(
     filters: PortfolioSummaryIn,
     db: Session = Depends(get_db),
@@ -174,7 +182,7 @@ def portfolio_corte_summary(
     return _decorate_meta(db, AnalyticsService.fetch_portfolio_corte_summary_v2(db, filters), cache_hit=False)
 
 
-@router.post('/portfolio-corte-v2/summary', response_model=PortfolioCorteSummaryOut)
+@router.post('/portfolio-corte-v2/summary', response_model=PortfolioCorteSummaryOut, dependencies=[Depends(summary_gate)])
 def portfolio_corte_summary_v2(
     filters: PortfolioSummaryIn,
     db: Session = Depends(get_db),
@@ -195,12 +203,16 @@ def portfolio_corte_summary_v2(
     )
 
 
-@router.post('/portfolio-corte-v2/first-paint')
+@router.post('/portfolio-corte-v2/first-paint', dependencies=[Depends(first_paint_gate)])
 def portfolio_corte_first_paint_v2(
     filters: PortfolioSummaryIn,
+    request: Request,
     db: Session = Depends(get_db),
     user=Depends(require_permission('analytics:read')),
 ):
+    snapshot = first_paint_snapshot_response(db, 'portfolio-corte-v2/first-paint', filters, request.headers.get('if-none-match'))
+    if snapshot is not None:
+        return snapshot
     cached = cache_get('portfolio-corte-v2/first-paint', filters)
     if cached is not None:
         return _decorate_meta(db, cached, cache_hit=True, source_table='cartera_corte_agg')
@@ -209,7 +221,7 @@ def portfolio_corte_first_paint_v2(
     return _decorate_meta(db, result, cache_hit=False, source_table='cartera_corte_agg')
 
 
-@router.post('/portfolio-rolo-v2/summary', response_model=PortfolioRoloSummaryOut)
+@router.post('/portfolio-rolo-v2/summary', response_model=PortfolioRoloSummaryOut, dependencies=[Depends(summary_gate)])
 def portfolio_rolo_summary_v2(
     filters: AnalyticsFilters,
     db: Session = Depends(get_db),
@@ -223,7 +235,7 @@ def portfolio_rolo_summary_v2(
     return _decorate_meta(db, result, cache_hit=False, source_table='cartera_fact')
 
 
-@router.post('/portfolio-rolo-v2/otros-ajustes', response_model=PortfolioRoloOtrosAjustesOut)
+@router.post('/portfolio-rolo-v2/otros-ajustes', response_model=PortfolioRoloOtrosAjustesOut, dependencies=[Depends(summary_gate)])
 def portfolio_rolo_otros_ajustes_v2(
     filters: AnalyticsFilters,
     db: Session = Depends(get_db),
@@ -242,7 +254,7 @@ def portfolio_rolo_otros_ajustes_v2(
     return _decorate_meta(db, result, cache_hit=False, source_table='cartera_fact')
 
 
-@router.post('/rendimiento/summary')
+@router.post('/rendimiento/summary', dependencies=[Depends(summary_gate)])
 def rendimiento_summary(
     filters: AnalyticsFilters,
     db: Session = Depends(get_db),
@@ -256,7 +268,7 @@ def rendimiento_summary(
     return _decorate_meta(db, result, cache_hit=False)
 
 
-@router.post('/rendimiento/options')
+@router.post('/rendimiento/options', dependencies=[Depends(options_gate)])
 def rendimiento_options(
     filters: AnalyticsFilters,
     db: Session = Depends(get_db),
@@ -327,7 +339,7 @@ def _has_complete_rendimiento_v2_kpis(payload: dict | None) -> bool:
     return isinstance(kpis, dict) and _RENDIMIENTO_V2_REQUIRED_KPI_KEYS.issubset(kpis.keys())
 
 
-@router.post('/rendimiento-v2/summary')
+@router.post('/rendimiento-v2/summary', dependencies=[Depends(summary_gate)])
 def rendimiento_summary_v2(
     filters: AnalyticsFilters,
     db: Session = Depends(get_db),
@@ -344,12 +356,16 @@ def rendimiento_summary_v2(
     return _decorate_meta(db, normalized, cache_hit=False, source_table='analytics_rendimiento_agg')
 
 
-@router.post('/rendimiento-v2/first-paint')
+@router.post('/rendimiento-v2/first-paint', dependencies=[Depends(first_paint_gate)])
 def rendimiento_first_paint_v2(
     filters: AnalyticsFilters,
+    request: Request,
     db: Session = Depends(get_db),
     user=Depends(require_permission('analytics:read')),
 ):
+    snapshot = first_paint_snapshot_response(db, 'rendimiento-v2/first-paint', filters, request.headers.get('if-none-match'))
+    if snapshot is not None:
+        return snapshot
     cached = cache_get('rendimiento-v2/first-paint', filters)
     if cached is not None:
         return _decorate_meta(db, cached, cache_hit=True, source_table='analytics_rendimiento_agg')
@@ -358,7 +374,7 @@ def rendimiento_first_paint_v2(
     return _decorate_meta(db, result, cache_hit=False, source_table='analytics_rendimiento_agg')
 
 
-@router.post('/rendimiento-v2/options')
+@router.post('/rendimiento-v2/options', dependencies=[Depends(options_gate)])
 def rendimiento_options_v2(
     filters: AnalyticsFilters,
     db: Session = Depends(get_db),
@@ -372,7 +388,7 @@ def rendimiento_options_v2(
     return _decorate_meta(db, result, cache_hit=False, source_table='analytics_rendimiento_agg')
 
 
-@router.post('/eerr-v2/options')
+@router.post('/eerr-v2/options', dependencies=[Depends(options_gate)])
 def eerr_options_v2(
     db: Session = Depends(get_db),
     user=Depends(require_permission('analytics:read')),
@@ -386,7 +402,7 @@ def eerr_options_v2(
     return _decorate_meta(db, result, cache_hit=False, source_table='eerr_fact,eerr_monthly_agg')
 
 
-@router.post('/eerr-v2/summary')
+@router.post('/eerr-v2/summary', dependencies=[Depends(summary_gate)])
 def eerr_summary_v2(
     filters: EerrV2In,
     db: Session = Depends(get_db),
@@ -400,7 +416,7 @@ def eerr_summary_v2(
     return _decorate_meta(db, result, cache_hit=False, source_table='eerr_fact,eerr_monthly_agg')
 
 
-@router.post('/anuales/options')
+@router.post('/anuales/options', dependencies=[Depends(options_gate)])
 def anuales_options(
     filters: AnalyticsFilters,
     db: Session = Depends(get_db),
@@ -414,7 +430,7 @@ def anuales_options(
     return _decorate_meta(db, result, cache_hit=False)
 
 
-@router.post('/anuales/summary')
+@router.post('/anuales/summary', dependencies=[Depends(summary_gate)])
 def anuales_summary(
     filters: AnalyticsFilters,
     db: Session = Depends(get_db),
@@ -428,7 +444,7 @@ def anuales_summary(
     return _decorate_meta(db, result, cache_hit=False)
 
 
-@router.post('/anuales-v2/options')
+@router.post('/anuales-v2/options', dependencies=[Depends(options_gate)])
 def anuales_options_v2(
     filters: AnalyticsFilters,
     db: Session = Depends(get_db),
@@ -442,7 +458,7 @@ def anuales_options_v2(
     return _decorate_meta(db, result, cache_hit=False, source_table='analytics_anuales_agg + dim_negocio_contrato')
 
 
-@router.post('/anuales-v2/summary')
+@router.post('/anuales-v2/summary', dependencies=[Depends(summary_gate)])
 def anuales_summary_v2(
     filters: AnalyticsFilters,
     db: Session = Depends(get_db),
@@ -456,12 +472,16 @@ def anuales_summary_v2(
     return _decorate_meta(db, result, cache_hit=False, source_table='analytics_anuales_agg')
 
 
-@router.post('/anuales-v2/first-paint')
+@router.post('/anuales-v2/first-paint', dependencies=[Depends(first_paint_gate)])
 def anuales_first_paint_v2(
     filters: AnalyticsFilters,
+    request: Request,
     db: Session = Depends(get_db),
     user=Depends(require_permission('analytics:read')),
 ):
+    snapshot = first_paint_snapshot_response(db, 'anuales-v2/first-paint', filters, request.headers.get('if-none-match'))
+    if snapshot is not None:
+        return snapshot
     cached = cache_get('anuales-v2/first-paint', filters)
     if cached is not None:
         return _decorate_meta(db, cached, cache_hit=True, source_table='analytics_anuales_agg')
@@ -470,7 +490,7 @@ def anuales_first_paint_v2(
     return _decorate_meta(db, result, cache_hit=False, source_table='analytics_anuales_agg')
 
 
-@router.post('/mora/summary')
+@router.post('/mora/summary', dependencies=[Depends(summary_gate)])
 def mora_summary(
     filters: AnalyticsFilters,
     db: Session = Depends(get_db),
@@ -487,7 +507,7 @@ def mora_summary(
     return _decorate_meta(db, result, cache_hit=False)
 
 
-@router.post('/brokers/summary')
+@router.post('/brokers/summary', dependencies=[Depends(summary_gate)])
 def brokers_summary(
     filters: AnalyticsFilters,
     db: Session = Depends(get_db),
@@ -501,7 +521,7 @@ def brokers_summary(
     return _decorate_meta(db, result, cache_hit=False, source_table='analytics_contract_snapshot')
 
 
-@router.post('/cobranzas-cohorte/options', response_model=CobranzasCohorteOptionsOut)
+@router.post('/cobranzas-cohorte/options', response_model=CobranzasCohorteOptionsOut, dependencies=[Depends(options_gate)])
 def cobranzas_cohorte_options(
     filters: CobranzasCohorteIn,
     db: Session = Depends(get_db),
@@ -515,7 +535,7 @@ def cobranzas_cohorte_options(
     return _decorate_meta(db, result, cache_hit=False)
 
 
-@router.post('/cobranzas-cohorte-v2/options', response_model=CobranzasCohorteOptionsOut)
+@router.post('/cobranzas-cohorte-v2/options', response_model=CobranzasCohorteOptionsOut, dependencies=[Depends(options_gate)])
 def cobranzas_cohorte_options_v2(
     filters: CobranzasCohorteIn,
     db: Session = Depends(get_db),
@@ -529,7 +549,7 @@ def cobranzas_cohorte_options_v2(
     return _decorate_meta(db, result, cache_hit=False, source_table='mv_options_cohorte')
 
 
-@router.post('/cobranzas-cohorte/summary')
+@router.post('/cobranzas-cohorte/summary', dependencies=[Depends(summary_gate)])
 def cobranzas_cohorte_summary(
     filters: CobranzasCohorteIn,
     db: Session = Depends(get_db),
@@ -543,12 +563,16 @@ def cobranzas_cohorte_summary(
     return _decorate_meta(db, result, cache_hit=False)
 
 
-@router.post('/cobranzas-cohorte-v2/first-paint')
+@router.post('/cobranzas-cohorte-v2/first-paint', dependencies=[Depends(first_paint_gate)])
 def cobranzas_cohorte_first_paint_v2(
     filters: CobranzasCohorteFirstPaintIn,
+    request: Request,
     db: Session = Depends(get_db),
     user=Depends(require_permission('analytics:read')),
 ):
+    snapshot = first_paint_snapshot_response(db, 'cobranzas-cohorte-v2/first-paint', filters, request.headers.get('if-none-match'))
+    if snapshot is not None:
+        return snapshot
     cached = cache_get('cobranzas-cohorte-v2/first-paint', filters)
     if cached is not None:
         return _decorate_meta(db, cached, cache_hit=True, source_table='cobranzas_cohorte_agg')
@@ -557,7 +581,7 @@ def cobranzas_cohorte_first_paint_v2(
     return _decorate_meta(db, result, cache_hit=False, source_table='cobranzas_cohorte_agg')
 
 
-@router.post('/cobranzas-cohorte-v2/detail')
+@router.post('/cobranzas-cohorte-v2/detail', dependencies=[Depends(summary_gate)])
 def cobranzas_cohorte_detail_v2(
     filters: CobranzasCohorteDetailIn,
     db: Session = Depends(get_db),
@@ -571,7 +595,7 @@ def cobranzas_cohorte_detail_v2(
     return _decorate_meta(db, result, cache_hit=False, source_table='cobranzas_cohorte_agg')
 
 
-@router.post('/cobranzas-cohorte-v2/orphan-detail')
+@router.post('/cobranzas-cohorte-v2/orphan-detail', dependencies=[Depends(summary_gate)])
 def cobranzas_cohorte_orphan_detail_v2(
     filters: CobranzasCohorteOrphanDetailIn,
     db: Session = Depends(get_db),
@@ -590,7 +614,7 @@ def cobranzas_cohorte_orphan_detail_v2(
     return _decorate_meta(db, result, cache_hit=False, source_table='cobranzas_fact')
 
 
-@router.post('/export/csv')
+@router.post('/export/csv', dependencies=[Depends(export_gate)])
 def analytics_export_csv(
     payload: ExportRequest,
     _rl=Depends(write_rate_limiter),
@@ -602,7 +626,7 @@ def analytics_export_csv(
     return Response(content=csv_text, media_type='text/csv')
 
 
-@router.post('/export/pdf')
+@router.post('/export/pdf', dependencies=[Depends(export_gate)])
 def analytics_export_pdf(
     payload: ExportRequest,
     _rl=Depends(write_rate_limiter),
@@ -614,7 +638,7 @@ def analytics_export_pdf(
     return Response(content=content, media_type='application/pdf')
 
 
-@router.post('/export')
+@router.post('/export', dependencies=[Depends(export_gate)])
 def analytics_export_legacy(
     payload: ExportRequest,
     _rl=Depends(write_rate_limiter),
@@ -3,49 +3,60 @@ from fastapi.responses import JSONResponse
 from sqlalchemy import text
 
 from app.core.analytics_cache import metrics as analytics_cache_metrics
+from app.core.concurrency import gates_snapshot
 from app.core.config import settings
 from app.core.deps import require_permission
+from app.core.logging_config import logging_stats
+from app.core.mysql_pool import CachedProbe, mysql_pool
 from app.core.request_metrics import summary as request_metrics_summary
 from app.db.session import SessionLocal
 from app.services.sync_service import SyncService
+from app.services.telemetry_buffer import frontend_perf_buffer
 
 router = APIRouter()
 
 
-def _check_mysql_ok() -> bool | None:
-    """
-    Verifica conexión a MySQL (fuente de sync/import).
-    Retorna True si OK, False si falla, None si no está configurado.
-    """
+def _mysql_health_config() -> dict | None:
     host = str(settings.mysql_host or '').strip()
     user = str(settings.mysql_user or '').strip()
     database = str(settings.mysql_database or '').strip()
     if not host or not user or not database:
         return None  # no configurado
+    return {
+        'host': host,
+        'port': int(settings.mysql_port or 3306),
+        'user': user,
+        'password': settings.mysql_password or '',
+        'database': database,
+        'ssl_disabled': bool(getattr(settings, 'mysql_ssl_disabled', True)),
+        'connection_timeout': 5,
+    }
+
+
+def _check_mysql_ok() -> bool | None:
+    """
+    Verifica conexión a MySQL (fuente de sync/import) con una conexión del pool.
+    Retorna True si OK, False si falla, None si no está configurado.
+    """
+    cfg = _mysql_health_config()
+    if cfg is None:
+        return None
     try:
-        import mysql.connector
-        cfg = {
-            'host': host,
-            'port': int(settings.mysql_port or 3306),
-            'user': user,
-            'password': settings.mysql_password or '',
-            'database': database,
-            'ssl_disabled': bool(getattr(settings, 'mysql_ssl_disabled', True)),
-            'connection_timeout': 5,
-        }
-        conn = mysql.connector.connect(**cfg)
-        try:
-            cur = conn.cursor()
+        with mysql_pool.connection(cfg, purpose='health', timeout=5) as conn:
+            cur = conn.prepared_cursor('SELECT 1')
             cur.execute('SELECT 1')
             cur.fetchone()
-            cur.close()
-        finally:
-            conn.close()
         return True
     except Exception:
         return False
 
 
+# /health devuelve el último resultado; el chequeo corre en segundo plano cada TTL.
+_mysql_probe = CachedProbe(
+    _check_mysql_ok, ttl_sec=float(getattr(settings, 'mysql_health_probe_ttl_sec', 15) or 15)
+)
+
+
 @router.get('/health')
 def health():
     """
@@ -73,12 +84,14 @@ def health():
                 'message': 'Database unreachable',
             },
         )
-    mysql_ok = _check_mysql_ok()
+    mysql_ok = _mysql_probe.get() if _mysql_health_config() is not None else None
     return {
         'ok': True,
         'service': 'cobranzas-api-v1',
         'db_ok': True,
-        'mysql_ok': mysql_ok,  # True=OK, False=fallo, None=no configurado
+        'mysql_ok': mysql_ok,  # True=OK, False=fallo, None=no configurado o primer chequeo pendiente
+        'mysql_checked_age_sec': _mysql_probe.age_sec(),
+        'telemetry_queue_depth': frontend_perf_buffer.depth(),
     }
 
 
@@ -146,4 +159,8 @@ def health_perf(_user=Depends(require_permission('system:read'))):
         'sync_perf_summary': sync_perf,
         'analytics_freshness': freshness_rows[:12],
         'pg_stat_statements_top': pg_stat_top,
+        'mysql_pool': mysql_pool.snapshot(),
+        'telemetry_buffer': frontend_perf_buffer.snapshot(),
+        'structured_logging': logging_stats(),
+        'analytics_concurrency': gates_snapshot(),
     }
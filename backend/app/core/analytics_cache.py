@@ -52,6 +52,11 @@ def _signature(filters: Any) -> str:
     return hashlib.sha256(raw.encode()).hexdigest()
 
 
+def signature(filters: Any) -> str:
+    """Firma canonica de filtros (la misma que usa la clave del cache)."""
+    return _signature(filters)
+
+
 def get(endpoint: str, filters: Any) -> Any | None:
     key = f"{endpoint}:{_signature(filters)}"
     now = time.time()
@@ -0,0 +1,174 @@
+"""
+Presupuestos de concurrencia por clase de endpoint (options, first_paint, summary, export).
+
+Cada clase tiene un semaforo propio con `limit` slots. El request espera un slot en el
+event loop (sin ocupar un hilo del threadpool ni una sesion de DB) hasta `queue_timeout_sec`;
+si no lo consigue, o si la cola de espera ya esta llena, responde 503 con Retry-After.
+Asi un pico de reportes pesados (rolo, anuales v1, exports) no deja sin hilos/conexiones
+a options y first-paint. Los limites son por proceso (cada worker de uvicorn tiene los suyos).
+
+Formato de ANALYTICS_CONCURRENCY_BUDGETS: `clase:limite:timeout_seg`, separado por comas.
+Con timeout_seg 0 la clase no encola: sin slot libre responde 503 en el acto.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import weakref
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+DEFAULT_BUDGETS: dict[str, tuple[int, float]] = {
+    'options': (16, 2.0),
+    'first_paint': (12, 5.0),
+    'summary': (6, 15.0),
+    'export': (2, 30.0),
+}
+# Cola maxima por clase, en multiplos del limite: mas alla se rechaza sin esperar.
+_MAX_WAITING_FACTOR = 4
+
+
+def parse_budgets(raw: str | None) -> dict[str, tuple[int, float]]:
+    budgets = dict(DEFAULT_BUDGETS)
+    for item in str(raw or '').split(','):
+        parts = [p.strip() for p in item.split(':')]
+        name = parts[0].lower() if parts else ''
+        if not name or len(parts) < 2:
+            continue
+        try:
+            limit = max(1, int(parts[1]))
+            timeout = max(0.0, float(parts[2])) if len(parts) > 2 and parts[2] else budgets.get(name, (0, 5.0))[1]
+        except ValueError:
+            continue
+        budgets[name] = (limit, timeout)
+    return budgets
+
+
+class EndpointGate:
+    def __init__(self, name: str, limit: int, queue_timeout_sec: float) -> None:
+        self.name = name
+        self.limit = max(1, int(limit))
+        self.queue_timeout_sec = max(0.0, float(queue_timeout_sec))
+        self.max_waiting = self.limit * _MAX_WAITING_FACTOR
+        # Un semaforo por event loop: asyncio.Semaphore queda ligado al loop donde se usa.
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.waiting = 0
+        self.stats = {'admitted': 0, 'rejected_queue_full': 0, 'rejected_timeout': 0}
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            sem = self._semaphores.get(loop)
+            if sem is None:
+                sem = self._semaphores[loop] = asyncio.Semaphore(self.limit)
+            return sem
+
+    def retry_after_sec(self) -> int:
+        return max(1, int(math.ceil(self.queue_timeout_sec)))
+
+    def _reject(self, reason: str) -> HTTPException:
+        with self._lock:
+            self.stats[f'rejected_{reason}'] += 1
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                'error_code': 'SERVER_BUSY',
+                'message': 'Servidor ocupado, reintentar en unos segundos',
+                'details': {
+                    'endpoint_class': self.name,
+                    'limit': self.limit,
+                    'queue_timeout_sec': self.queue_timeout_sec,
+                    'reason': reason,
+                },
+            },
+            headers={'Retry-After': str(self.retry_after_sec())},
+        )
+
+    async def acquire(self) -> None:
+        sem = self._semaphore()
+        if self.queue_timeout_sec <= 0 and sem.locked():
+            # Timeout 0: sin cola, si no hay slot libre se rechaza en el acto.
+            raise self._reject('timeout')
+        with self._lock:
+            if sem.locked() and self.waiting >= self.max_waiting:
+                full = True
+            else:
+                full = False
+                self.waiting += 1
+        if full:
+            raise self._reject('queue_full')
+        try:
+            if self.queue_timeout_sec > 0:
+                await asyncio.wait_for(sem.acquire(), timeout=self.queue_timeout_sec)
+            else:
+                await sem.acquire()  # slot libre (chequeado arriba, sin await de por medio): no espera
+        except asyncio.TimeoutError:
+            raise self._reject('timeout') from None
+        finally:
+            with self._lock:
+                self.waiting -= 1
+        with self._lock:
+            self.in_flight += 1
+            self.stats['admitted'] += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._semaphore().release()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'limit': self.limit,
+                'queue_timeout_sec': self.queue_timeout_sec,
+                'in_flight': self.in_flight,
+                'waiting': self.waiting,
+                **self.stats,
+            }
+
+
+_gates: dict[str, EndpointGate] = {}
+_gates_lock = threading.Lock()
+
+
+def get_gate(name: str) -> EndpointGate:
+    with _gates_lock:
+        gate = _gates.get(name)
+        if gate is None:
+            limit, timeout = parse_budgets(settings.analytics_concurrency_budgets).get(name, DEFAULT_BUDGETS['summary'])
+            gate = _gates[name] = EndpointGate(name, limit, timeout)
+        return gate
+
+
+def reset() -> None:
+    """Descarta los gates (se recrean con la config vigente); usado en tests."""
+    with _gates_lock:
+        _gates.clear()
+
+
+def gates_snapshot() -> dict[str, dict]:
+    with _gates_lock:
+        gates = dict(_gates)
+    return {name: gate.snapshot() for name, gate in sorted(gates.items())}
+
+
+def build_concurrency_dependency(name: str):
+    """Dependencia async con yield: toma el slot antes de auth/DB y lo libera al terminar el request."""
+
+    async def _dependency():
+        if not settings.analytics_concurrency_enabled:
+            yield
+            return
+        gate = get_gate(name)
+        await gate.acquire()
+        try:
+            yield
+        finally:
+            gate.release()
+
+    return _dependency
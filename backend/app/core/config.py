@@ -51,6 +51,12 @@ class Settings(BaseSettings):
     mysql_connection_timeout_seconds: int = Field(default=20, alias='MYSQL_CONNECTION_TIMEOUT_SECONDS')
     mysql_read_timeout_seconds: int = Field(default=600, alias='MYSQL_READ_TIMEOUT_SECONDS')
     mysql_write_timeout_seconds: int = Field(default=120, alias='MYSQL_WRITE_TIMEOUT_SECONDS')
+    mysql_pool_purpose_limits: str = Field(default='extract:4,precheck:2,health:1,admin:2', alias='MYSQL_POOL_PURPOSE_LIMITS')
+    mysql_pool_max_lifetime_sec: int = Field(default=1800, alias='MYSQL_POOL_MAX_LIFETIME_SEC')
+    mysql_pool_idle_check_sec: int = Field(default=30, alias='MYSQL_POOL_IDLE_CHECK_SEC')
+    mysql_pool_max_idle: int = Field(default=4, alias='MYSQL_POOL_MAX_IDLE')
+    mysql_pool_acquire_timeout_sec: int = Field(default=30, alias='MYSQL_POOL_ACQUIRE_TIMEOUT_SEC')
+    mysql_health_probe_ttl_sec: int = Field(default=15, alias='MYSQL_HEALTH_PROBE_TTL_SEC')
     sync_window_months: int = Field(default=3, alias='SYNC_WINDOW_MONTHS')
     sync_max_rows: int = Field(default=250000, alias='SYNC_MAX_ROWS')
     sync_max_rows_analytics: int = Field(default=0, alias='SYNC_MAX_ROWS_ANALYTICS')
@@ -82,20 +88,69 @@ class Settings(BaseSettings):
     sync_low_impact_fetch_batch_size: int = Field(default=1000, alias='SYNC_LOW_IMPACT_FETCH_BATCH_SIZE')
     sync_low_impact_chunk_size: int = Field(default=500, alias='SYNC_LOW_IMPACT_CHUNK_SIZE')
     sync_low_impact_chunk_pause_ms: int = Field(default=40, alias='SYNC_LOW_IMPACT_CHUNK_PAUSE_MS')
+    sync_low_impact_latency_budget_ms: int = Field(default=250, alias='SYNC_LOW_IMPACT_LATENCY_BUDGET_MS')
+    sync_adaptive_sizing_enabled: bool = Field(default=True, alias='SYNC_ADAPTIVE_SIZING_ENABLED')
+    sync_adaptive_fetch_target_ms: int = Field(default=1500, alias='SYNC_ADAPTIVE_FETCH_TARGET_MS')
+    sync_adaptive_chunk_target_ms: int = Field(default=2000, alias='SYNC_ADAPTIVE_CHUNK_TARGET_MS')
+    sync_adaptive_rss_limit_mb: int = Field(default=1536, alias='SYNC_ADAPTIVE_RSS_LIMIT_MB')
+    sync_compiled_normalizers_enabled: bool = Field(default=True, alias='SYNC_COMPILED_NORMALIZERS_ENABLED')
+    sync_normalize_workers: int = Field(default=0, alias='SYNC_NORMALIZE_WORKERS')
+    sync_normalize_pool_domains: str = Field(default='cartera,cobranzas', alias='SYNC_NORMALIZE_POOL_DOMAINS')
+    sync_fingerprint_algorithm: str = Field(default='blake2b', alias='SYNC_FINGERPRINT_ALGORITHM')
+    sync_fingerprint_rehash_stored: bool = Field(default=True, alias='SYNC_FINGERPRINT_REHASH_STORED')
+    sync_progress_flush_ms: int = Field(default=1000, alias='SYNC_PROGRESS_FLUSH_MS')
+    sync_run_log_retention_days: int = Field(default=30, alias='SYNC_RUN_LOG_RETENTION_DAYS')
     sync_semantic_refresh_batch_months: int = Field(default=3, alias='SYNC_SEMANTIC_REFRESH_BATCH_MONTHS')
+    sync_partition_swap_enabled: bool = Field(default=True, alias='SYNC_PARTITION_SWAP_ENABLED')
+    sync_mv_options_delta_enabled: bool = Field(default=True, alias='SYNC_MV_OPTIONS_DELTA_ENABLED')
     sync_mysql_incremental_pushdown: bool = Field(default=True, alias='SYNC_MYSQL_INCREMENTAL_PUSHDOWN')
+    sync_extract_cursor_mode: str = Field(default='stream', alias='SYNC_EXTRACT_CURSOR_MODE')
+    sync_extract_cursor_mode_overrides: str = Field(default='', alias='SYNC_EXTRACT_CURSOR_MODE_OVERRIDES')
+    sync_extract_use_c_ext: bool = Field(default=True, alias='SYNC_EXTRACT_USE_C_EXT')
+    sync_cdc_mode: str = Field(default='off', alias='SYNC_CDC_MODE')
+    sync_cdc_domains: str = Field(default='cartera,cobranzas', alias='SYNC_CDC_DOMAINS')
+    sync_cdc_max_contracts: int = Field(default=20000, alias='SYNC_CDC_MAX_CONTRACTS')
+    sync_cdc_in_chunk: int = Field(default=1000, alias='SYNC_CDC_IN_CHUNK')
+    sync_cdc_server_id: int = Field(default=4242, alias='SYNC_CDC_SERVER_ID')
     sync_query_variant_cartera: str = Field(default='v1', alias='SYNC_QUERY_VARIANT_CARTERA')
     sync_query_variant_cobranzas: str = Field(default='v1', alias='SYNC_QUERY_VARIANT_COBRANZAS')
     sync_query_variant_contratos: str = Field(default='v1', alias='SYNC_QUERY_VARIANT_CONTRATOS')
     sync_query_variant_gestores: str = Field(default='v1', alias='SYNC_QUERY_VARIANT_GESTORES')
     sync_precheck_enabled: bool = Field(default=True, alias='SYNC_PRECHECK_ENABLED')
+    sync_source_summary_enabled: bool = Field(default=False, alias='SYNC_SOURCE_SUMMARY_ENABLED')
+    sync_source_summary_domains: str = Field(default='cobranzas', alias='SYNC_SOURCE_SUMMARY_DOMAINS')
+    sync_source_summary_max_age_hours: float = Field(default=24.0, alias='SYNC_SOURCE_SUMMARY_MAX_AGE_HOURS')
     sync_postgres_prefilter_enabled: bool = Field(default=True, alias='SYNC_POSTGRES_PREFILTER_ENABLED')
+    sync_manifest_reconcile_batch_size: int = Field(default=500, alias='SYNC_MANIFEST_RECONCILE_BATCH_SIZE')
     sync_staging_retention_days: int = Field(default=14, alias='SYNC_STAGING_RETENTION_DAYS')
     sync_persist_staging_rows: bool = Field(default=False, alias='SYNC_PERSIST_STAGING_ROWS')
+    sync_persist_sync_records: bool = Field(default=False, alias='SYNC_PERSIST_SYNC_RECORDS')
+    sync_records_write_batch_size: int = Field(default=2000, alias='SYNC_RECORDS_WRITE_BATCH_SIZE')
     analytics_sync_mode: str = Field(default='incremental', alias='ANALYTICS_SYNC_MODE')
     analytics_sync_window_months: int = Field(default=3, alias='ANALYTICS_SYNC_WINDOW_MONTHS')
     read_from_fact_tables: bool = Field(default=True, alias='READ_FROM_FACT_TABLES')
     analytics_prewarm_defer_startup: bool = Field(default=True, alias='ANALYTICS_PREWARM_DEFER_STARTUP')
+    frontend_perf_raw_retention_days: int = Field(default=14, alias='FRONTEND_PERF_RAW_RETENTION_DAYS')
+    frontend_perf_rollup_retention_days: int = Field(default=180, alias='FRONTEND_PERF_ROLLUP_RETENTION_DAYS')
+    frontend_perf_summary_default_hours: int = Field(default=24, alias='FRONTEND_PERF_SUMMARY_DEFAULT_HOURS')
+    frontend_perf_buffer_capacity: int = Field(default=10000, alias='FRONTEND_PERF_BUFFER_CAPACITY')
+    frontend_perf_flush_interval_ms: int = Field(default=1000, alias='FRONTEND_PERF_FLUSH_INTERVAL_MS')
+    frontend_perf_flush_batch_size: int = Field(default=500, alias='FRONTEND_PERF_FLUSH_BATCH_SIZE')
+    request_metrics_window_minutes: int = Field(default=5, alias='REQUEST_METRICS_WINDOW_MINUTES')
+    request_metrics_multiproc_dir: str = Field(default='', alias='REQUEST_METRICS_MULTIPROC_DIR')
+    request_metrics_export_interval_sec: int = Field(default=15, alias='REQUEST_METRICS_EXPORT_INTERVAL_SEC')
+    metrics_endpoint_enabled: bool = Field(default=False, alias='METRICS_ENDPOINT_ENABLED')
+    metrics_bearer_token: str = Field(default='', alias='METRICS_BEARER_TOKEN')
+    log_async_enabled: bool = Field(default=True, alias='LOG_ASYNC_ENABLED')
+    log_queue_size: int = Field(default=10000, alias='LOG_QUEUE_SIZE')
+    log_request_sample_rate: float = Field(default=1.0, alias='LOG_REQUEST_SAMPLE_RATE')
+    log_request_slow_ms: float = Field(default=1000.0, alias='LOG_REQUEST_SLOW_MS')
+    analytics_concurrency_enabled: bool = Field(default=True, alias='ANALYTICS_CONCURRENCY_ENABLED')
+    analytics_concurrency_budgets: str = Field(
+        default='options:16:2,first_paint:12:5,summary:6:15,export:2:30',
+        alias='ANALYTICS_CONCURRENCY_BUDGETS',
+    )
+    first_paint_snapshots_enabled: bool = Field(default=True, alias='FIRST_PAINT_SNAPSHOTS_ENABLED')
 
 
 settings = Settings()
@@ -1,6 +1,7 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from app.core.concurrency import build_concurrency_dependency
 from app.core.config import settings
 from app.core.rate_limit import build_rate_limit_dependency
 from app.core.security import assert_permission, decode_token
@@ -16,6 +17,11 @@ write_rate_limiter = build_rate_limit_dependency(
     lambda: settings.write_rate_limit,
     lambda: settings.write_rate_window_seconds,
 )
+# Presupuestos de concurrencia por clase de endpoint analytics (ver app.core.concurrency).
+options_gate = build_concurrency_dependency('options')
+first_paint_gate = build_concurrency_dependency('first_paint')
+summary_gate = build_concurrency_dependency('summary')
+export_gate = build_concurrency_dependency('export')
 
 
 def get_token_payload(credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme)):
@@ -0,0 +1,121 @@
+"""
+Mergeable log-linear latency histogram (HDR-style, fixed relative precision).
+
+Each power-of-two range [2^e, 2^(e+1)) is split into SUB_BUCKETS linear
+sub-buckets, so any recorded value is reported within ~1/(2*SUB_BUCKETS) of
+its true value. Values below 1 ms share bucket 0. Histograms are sparse
+(bucket index -> count), merge by adding counts, and serialize to compact JSON,
+so per-minute sketches can be stored and combined over any window in O(buckets).
+"""
+from __future__ import annotations
+
+import json
+import math
+from typing import Iterable
+
+SUB_BUCKETS = 16
+_MAX_EXPONENT = 40  # ~3e12 ms; anything larger is clamped into the last bucket
+
+
+def bucket_index(value: float) -> int:
+    v = float(value)
+    if not math.isfinite(v) or v < 1.0:
+        return 0
+    exponent = min(int(math.floor(math.log2(v))), _MAX_EXPONENT)
+    base = 2.0**exponent
+    sub = min(int((v / base - 1.0) * SUB_BUCKETS), SUB_BUCKETS - 1)
+    return 1 + exponent * SUB_BUCKETS + sub
+
+
+def bucket_bounds(index: int) -> tuple[float, float]:
+    if index <= 0:
+        return 0.0, 1.0
+    exponent, sub = divmod(int(index) - 1, SUB_BUCKETS)
+    base = 2.0**exponent
+    return base * (1.0 + sub / SUB_BUCKETS), base * (1.0 + (sub + 1) / SUB_BUCKETS)
+
+
+class LogLinearHistogram:
+    __slots__ = ("counts", "total", "sum", "max")
+
+    def __init__(self) -> None:
+        self.counts: dict[int, int] = {}
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, value: float | None, count: int = 1) -> None:
+        if value is None:
+            return
+        v = max(0.0, float(value))
+        if not math.isfinite(v):
+            return
+        idx = bucket_index(v)
+        self.counts[idx] = self.counts.get(idx, 0) + int(count)
+        self.total += int(count)
+        self.sum += v * int(count)
+        if v > self.max:
+            self.max = v
+
+    def merge(self, other: "LogLinearHistogram") -> "LogLinearHistogram":
+        for idx, count in other.counts.items():
+            self.counts[idx] = self.counts.get(idx, 0) + count
+        self.total += other.total
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q: float) -> float:
+        if self.total <= 0:
+            return 0.0
+        rank = max(1, int(math.ceil(min(max(float(q), 0.0), 1.0) * self.total)))
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            if seen >= rank:
+                lo, hi = bucket_bounds(idx)
+                return min((lo + hi) / 2.0, self.max)
+        return self.max
+
+    def cumulative_buckets(self, bounds: Iterable[float]) -> list[tuple[float, int]]:
+        """Counts of recorded values <= each bound, for Prometheus-style `le` buckets."""
+        ordered = sorted(self.counts.items())
+        out: list[tuple[float, int]] = []
+        for bound in bounds:
+            out.append(
+                (float(bound), sum(c for idx, c in ordered if bucket_bounds(idx)[1] <= bound))
+            )
+        return out
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "c": {str(k): v for k, v in sorted(self.counts.items())},
+                "n": self.total,
+                "s": round(self.sum, 3),
+                "m": round(self.max, 3),
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, raw: str | None) -> "LogLinearHistogram":
+        hist = cls()
+        if not raw:
+            return hist
+        try:
+            data = json.loads(raw)
+        except (TypeError, ValueError):
+            return hist
+        hist.counts = {int(k): int(v) for k, v in (data.get("c") or {}).items()}
+        hist.total = int(data.get("n") or sum(hist.counts.values()))
+        hist.sum = float(data.get("s") or 0.0)
+        hist.max = float(data.get("m") or 0.0)
+        return hist
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "p50": round(self.quantile(0.50), 2),
+            "p95": round(self.quantile(0.95), 2),
+            "p99": round(self.quantile(0.99), 2),
+        }
@@ -1,16 +1,140 @@
 """
 Structured JSON logging for API v1.
 Emit one JSON object per line with trace_id, level, message, duration_ms, endpoint when available.
+
+El request path solo arma el dict y lo encola (QueueHandler, cola acotada con put_nowait);
+la serializacion (orjson si esta instalado) y la escritura a stdout las hace un QueueListener
+en su propio hilo. Si la cola esta llena el evento se descarta y se cuenta en `dropped`.
+Los eventos `request` exitosos y rapidos se muestrean con LOG_REQUEST_SAMPLE_RATE.
 """
 from __future__ import annotations
 
+import atexit
 import json
 import logging
-import time
+import queue
+import random
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any
 
 from app.core.config import settings
 
+try:  # orjson es opcional: ~5-10x mas rapido que json.dumps para estos payloads
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+_LOGGER_NAME = "app.structured"
+_lock = threading.Lock()
+_listener: QueueListener | None = None
+_queue: queue.Queue | None = None
+_installed: list[logging.Handler] = []
+_stats = {"enqueued": 0, "dropped": 0, "sampled_out": 0}
+
+
+def _encode(payload: dict[str, Any]) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, default=str).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _PayloadFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        return _encode(getattr(record, "payload", None) or {"level": record.levelname.lower(), "message": record.getMessage()})
+
+
+class _DevReadableHandler(logging.Handler):
+    """En dev, reenvia cada evento al logger `app` en formato legible (desde el hilo del listener)."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        payload = getattr(record, "payload", None) or {}
+        logging.getLogger("app").log(
+            record.levelno,
+            "%s %s", payload.get("level"), payload.get("message"), extra={"payload": payload},
+        )
+
+
+class _BoundedQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Sin formatear en el request path: el listener serializa `record.payload`.
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with _lock:
+                _stats["dropped"] += 1
+            return
+        with _lock:
+            _stats["enqueued"] += 1
+
+
+def _stdout_handler() -> logging.Handler:
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(_PayloadFormatter())
+    return handler
+
+
+def _output_handlers() -> list[logging.Handler]:
+    handlers = [_stdout_handler()]
+    if settings.app_env == "dev":
+        handlers.append(_DevReadableHandler())
+    return handlers
+
+
+def _structured_logger() -> logging.Logger:
+    global _listener, _queue
+    logger = logging.getLogger(_LOGGER_NAME)
+    if _installed:
+        return logger
+    with _lock:
+        if _installed:
+            return logger
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        if settings.log_async_enabled:
+            _queue = queue.Queue(maxsize=max(100, int(settings.log_queue_size or 10000)))
+            _listener = QueueListener(_queue, *_output_handlers(), respect_handler_level=False)
+            _listener.start()
+            handlers: list[logging.Handler] = [_BoundedQueueHandler(_queue)]
+        else:
+            handlers = _output_handlers()
+        for handler in handlers:
+            logger.addHandler(handler)
+        _installed.extend(handlers)
+    return logger
+
+
+def shutdown_logging() -> None:
+    """Drena la cola (flush final); se registra en atexit y en el shutdown de la app."""
+    global _listener
+    with _lock:
+        listener, _listener = _listener, None
+        handlers = list(_installed)
+        _installed.clear()
+    if listener is not None:
+        listener.stop()
+    logger = logging.getLogger(_LOGGER_NAME)
+    for handler in handlers:
+        logger.removeHandler(handler)
+
+
+atexit.register(shutdown_logging)
+
+
+def logging_stats() -> dict[str, int]:
+    with _lock:
+        out = dict(_stats)
+    out["queue_depth"] = _queue.qsize() if _queue is not None and _listener is not None else 0
+    out["queue_capacity"] = _queue.maxsize if _queue is not None else 0
+    return out
+
 
 def _extra(trace_id: str | None = None, duration_ms: float | None = None, endpoint: str | None = None, **kwargs: Any) -> dict[str, Any]:
     out: dict[str, Any] = {k: v for k, v in kwargs.items() if v is not None}
@@ -33,17 +157,26 @@ def structured_log(
     **kwargs: Any,
 ) -> None:
     payload = {"level": level, "message": message, **_extra(trace_id=trace_id, duration_ms=duration_ms, endpoint=endpoint, **kwargs)}
-    line = json.dumps(payload, ensure_ascii=False)
-    if settings.app_env == "dev":
-        # En dev también imprimir legible
-        logging.getLogger("app").log(
-            getattr(logging, level.upper(), logging.INFO),
-            "%s %s", level, message, extra={"payload": payload},
-        )
-    print(line, flush=True)
+    _structured_logger().log(getattr(logging, level.upper(), logging.INFO), message, extra={"payload": payload})
+
+
+def _keep_request_event(duration_ms: float, status_code: int) -> bool:
+    # Errores y requests lentos siempre se loguean; el resto se muestrea.
+    if int(status_code) >= 400 or float(duration_ms) >= float(settings.log_request_slow_ms or 0):
+        return True
+    rate = float(settings.log_request_sample_rate)
+    if rate >= 1.0:
+        return True
+    if rate > 0.0 and random.random() < rate:
+        return True
+    with _lock:
+        _stats["sampled_out"] += 1
+    return False
 
 
 def log_request(request_path: str, method: str, trace_id: str, duration_ms: float, status_code: int) -> None:
+    if not _keep_request_event(duration_ms, status_code):
+        return
     structured_log(
         "info",
         "request",
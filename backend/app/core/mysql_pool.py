@@ -0,0 +1,353 @@
+"""
+Shared pool of MySQL source connections (sync extraction, pre-checks, health, admin tests).
+
+Connections are keyed by connection config and checked out per purpose, each
+purpose with its own concurrency limit so a long extraction can never starve
+the health probe. Idle connections are pinged before reuse and recycled after
+a maximum lifetime. Pre-check statements run as server-side prepared
+statements cached on the pooled connection.
+
+Per-connection state changed by a borrower is undone on check-in: the socket
+timeout goes back to the config's `connection_timeout`, and a connection whose
+session variables were changed (`mark_session_modified()`) is reset with
+COM_RESET_CONNECTION, or discarded if that fails.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PURPOSE_LIMITS = {"extract": 4, "precheck": 2, "health": 1, "admin": 2}
+
+
+class MySQLPoolTimeout(TimeoutError):
+    """No connection slot freed up for the purpose within the acquire timeout."""
+
+
+def _config_key(cfg: dict[str, Any]) -> str:
+    parts = [f"{k}={cfg[k]!r}" for k in sorted(cfg)]
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def parse_purpose_limits(raw: str | None) -> dict[str, int]:
+    limits = dict(DEFAULT_PURPOSE_LIMITS)
+    for item in str(raw or "").split(","):
+        name, _, value = item.partition(":")
+        name = name.strip().lower()
+        if not name:
+            continue
+        try:
+            limits[name] = max(1, int(value))
+        except ValueError:
+            continue
+    return limits
+
+
+class PooledConnection:
+    """Checked-out connection; delegates to the driver connection and caches prepared cursors."""
+
+    def __init__(self, raw: Any, created_at: float, socket_timeout: float | None = None) -> None:
+        self.raw = raw
+        self.created_at = created_at
+        self.last_used_at = created_at
+        self._prepared: dict[str, Any] = {}
+        self.statements_prepared = 0
+        self.socket_timeout = socket_timeout
+        self._socket_timeout_changed = False
+        self.session_modified = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.raw, name)
+
+    def prepared_cursor(self, sql: str) -> Any:
+        """Cursor with `sql` prepared server-side once per connection; execute it with `.execute(sql)`."""
+        cursor = self._prepared.get(sql)
+        if cursor is None:
+            cursor = self.raw.cursor(prepared=True)
+            self._prepared[sql] = cursor
+            self.statements_prepared += 1
+        return cursor
+
+    def set_socket_timeout(self, seconds: float) -> None:
+        """Socket timeout for this checkout only (pure-Python driver; no-op on the C extension)."""
+        sock = getattr(self.raw, "_socket", None)
+        if sock is None:
+            return
+        sock.settimeout(seconds)
+        self._socket_timeout_changed = True
+
+    def mark_session_modified(self) -> None:
+        """Call after SET SESSION/user variables: the session is reset before reuse."""
+        self.session_modified = True
+
+    def reset_state(self) -> bool:
+        """Undo per-checkout state; False means the connection must not be reused."""
+        if self._socket_timeout_changed:
+            sock = getattr(self.raw, "_socket", None)
+            if sock is not None:
+                if self.socket_timeout is None:
+                    return False
+                try:
+                    sock.settimeout(self.socket_timeout)
+                except Exception:
+                    return False
+            self._socket_timeout_changed = False
+        if self.session_modified:
+            reset_session = getattr(self.raw, "reset_session", None)
+            if reset_session is None:
+                return False
+            try:
+                reset_session()
+            except Exception:
+                return False
+            # COM_RESET_CONNECTION also drops server-side prepared statements.
+            for cursor in self._prepared.values():
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+            self._prepared.clear()
+            self.session_modified = False
+        return True
+
+    def close(self) -> None:
+        for cursor in self._prepared.values():
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        self._prepared.clear()
+        try:
+            self.raw.close()
+        except Exception:
+            pass
+
+
+class _ConfigPool:
+    def __init__(self, limits: dict[str, int]) -> None:
+        self.idle: deque[PooledConnection] = deque()
+        self.slots = {name: threading.BoundedSemaphore(limit) for name, limit in limits.items()}
+        self.in_use: dict[str, int] = {name: 0 for name in limits}
+
+
+class MySQLSourcePool:
+    def __init__(
+        self,
+        *,
+        connect: Callable[..., Any] | None = None,
+        purpose_limits: dict[str, int] | None = None,
+        max_lifetime_sec: float | None = None,
+        idle_check_sec: float | None = None,
+        max_idle: int | None = None,
+        acquire_timeout_sec: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._connect = connect
+        self.purpose_limits = purpose_limits or parse_purpose_limits(
+            getattr(settings, "mysql_pool_purpose_limits", "")
+        )
+        self.max_lifetime_sec = float(
+            max_lifetime_sec
+            if max_lifetime_sec is not None
+            else getattr(settings, "mysql_pool_max_lifetime_sec", 1800)
+        )
+        self.idle_check_sec = float(
+            idle_check_sec
+            if idle_check_sec is not None
+            else getattr(settings, "mysql_pool_idle_check_sec", 30)
+        )
+        self.max_idle = int(
+            max_idle if max_idle is not None else getattr(settings, "mysql_pool_max_idle", 4)
+        )
+        self.acquire_timeout_sec = float(
+            acquire_timeout_sec
+            if acquire_timeout_sec is not None
+            else getattr(settings, "mysql_pool_acquire_timeout_sec", 30)
+        )
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pools: dict[str, _ConfigPool] = {}
+        self.stats = {
+            "connects": 0,
+            "reuses": 0,
+            "recycled_lifetime": 0,
+            "recycled_failed_ping": 0,
+            "discarded_on_error": 0,
+            "discarded_dirty": 0,
+            "acquire_timeouts": 0,
+        }
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def _driver_connect(self, cfg: dict[str, Any]) -> Any:
+        if self._connect is not None:
+            return self._connect(**cfg)
+        import mysql.connector
+
+        return mysql.connector.connect(**cfg)
+
+    def _pool_for(self, cfg: dict[str, Any]) -> _ConfigPool:
+        key = _config_key(cfg)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = _ConfigPool(self.purpose_limits)
+                self._pools[key] = pool
+            return pool
+
+    def _healthy(self, conn: PooledConnection, now: float) -> bool:
+        if self.max_lifetime_sec > 0 and now - conn.created_at >= self.max_lifetime_sec:
+            self._count("recycled_lifetime")
+            return False
+        if now - conn.last_used_at < self.idle_check_sec:
+            return True
+        try:
+            conn.raw.ping(reconnect=False)
+            return True
+        except Exception:
+            self._count("recycled_failed_ping")
+            return False
+
+    def _checkout(self, pool: _ConfigPool, cfg: dict[str, Any]) -> PooledConnection:
+        while True:
+            with self._lock:
+                conn = pool.idle.pop() if pool.idle else None
+            if conn is None:
+                break
+            if self._healthy(conn, self._clock()):
+                self._count("reuses")
+                return conn
+            conn.close()
+        raw = self._driver_connect(cfg)
+        self._count("connects")
+        timeout = cfg.get("connection_timeout")
+        return PooledConnection(raw, self._clock(), float(timeout) if timeout is not None else None)
+
+    def _checkin(self, pool: _ConfigPool, conn: PooledConnection) -> None:
+        try:
+            conn.raw.consume_results()
+        except Exception:
+            pass
+        if not conn.reset_state():
+            self._count("discarded_dirty")
+            conn.close()
+            return
+        conn.last_used_at = self._clock()
+        with self._lock:
+            if len(pool.idle) < self.max_idle:
+                pool.idle.append(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def connection(
+        self, cfg: dict[str, Any], *, purpose: str = "extract", timeout: float | None = None
+    ) -> Iterator[PooledConnection]:
+        """Check out a connection for `purpose`; it returns to the pool unless the block raised."""
+        purpose = purpose if purpose in self.purpose_limits else "extract"
+        pool = self._pool_for(dict(cfg))
+        slot = pool.slots[purpose]
+        wait = self.acquire_timeout_sec if timeout is None else float(timeout)
+        if not slot.acquire(timeout=max(0.0, wait)):
+            self._count("acquire_timeouts")
+            raise MySQLPoolTimeout(f"sin conexiones MySQL libres para '{purpose}'")
+        with self._lock:
+            pool.in_use[purpose] += 1
+        conn: PooledConnection | None = None
+        try:
+            conn = self._checkout(pool, dict(cfg))
+            yield conn
+        except BaseException:
+            if conn is not None:
+                self._count("discarded_on_error")
+                conn.close()
+                conn = None
+            raise
+        finally:
+            if conn is not None:
+                self._checkin(pool, conn)
+            with self._lock:
+                pool.in_use[purpose] -= 1
+            slot.release()
+
+    def clear(self) -> None:
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            while pool.idle:
+                pool.idle.pop().close()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            idle = sum(len(p.idle) for p in self._pools.values())
+            in_use: dict[str, int] = {}
+            for p in self._pools.values():
+                for name, count in p.in_use.items():
+                    in_use[name] = in_use.get(name, 0) + count
+            stats = dict(self.stats)
+        return {
+            "configs": len(self._pools),
+            "idle": idle,
+            "in_use": in_use,
+            "limits": dict(self.purpose_limits),
+            **stats,
+        }
+
+
+class CachedProbe:
+    """Last result of a background check; `get()` never runs the check inline.
+
+    When the result is older than `ttl_sec` a single refresh thread is started
+    and the previous value is returned meanwhile (None until the first probe).
+    """
+
+    def __init__(self, check: Callable[[], bool | None], *, ttl_sec: float) -> None:
+        self._check = check
+        self.ttl_sec = max(1.0, float(ttl_sec))
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self.value: bool | None = None
+        self.checked_at: float | None = None
+        self.latency_ms: int | None = None
+
+    def _refresh(self) -> None:
+        started = time.perf_counter()
+        try:
+            value = self._check()
+        except Exception:
+            value = False
+        with self._lock:
+            self.value = value
+            self.checked_at = time.monotonic()
+            self.latency_ms = int((time.perf_counter() - started) * 1000)
+            self._refreshing = False
+
+    def get(self) -> bool | None:
+        with self._lock:
+            stale = self.checked_at is None or time.monotonic() - self.checked_at >= self.ttl_sec
+            start = stale and not self._refreshing
+            if start:
+                self._refreshing = True
+            value = self.value
+        if start:
+            threading.Thread(target=self._refresh, name="mysql-health-probe", daemon=True).start()
+        return value
+
+    def age_sec(self) -> float | None:
+        checked_at = self.checked_at
+        return None if checked_at is None else round(time.monotonic() - checked_at, 1)
+
+
+mysql_pool = MySQLSourcePool()
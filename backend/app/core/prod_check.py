@@ -11,7 +11,7 @@ INSECURE_DEFAULTS = {
 }
 
 def validate_production_config() -> None:
-    """Comprueba que en producción no se usen CORS *, ni secretos JWT/DB por defecto."""
+    """Comprueba que en producción no se usen CORS *, secretos JWT/DB por defecto ni /metrics sin token."""
     if (getattr(settings, "app_env", "dev") or "dev").strip().lower() != "prod":
         return
 
@@ -53,6 +53,14 @@ def validate_production_config() -> None:
                 "DATABASE_URL no debe contener contraseña por defecto (change_me) en producción."
             )
 
+    # /metrics expone rutas, latencias y estado interno: en prod solo con bearer token.
+    if bool(getattr(settings, "metrics_endpoint_enabled", False)) and not str(
+        getattr(settings, "metrics_bearer_token", "") or ""
+    ).strip():
+        errors.append(
+            "METRICS_BEARER_TOKEN debe estar definido si METRICS_ENDPOINT_ENABLED=true en producción."
+        )
+
     if errors:
         raise RuntimeError(
             "Configuración de producción inválida:\n  - " + "\n  - ".join(errors)
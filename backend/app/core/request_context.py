@@ -0,0 +1,109 @@
+"""
+Middleware ASGI puro (sin BaseHTTPMiddleware) que concentra lo transversal de cada request:
+trace id, headers x-trace-id / x-latency-ms / Access-Control-Allow-Private-Network,
+observacion en request_metrics, log `request` y envelope JSON para errores no manejados.
+
+Al no envolver el body en streams/tareas extra, las respuestas streaming pasan chunk a chunk.
+x-latency-ms es el tiempo hasta los headers (http.response.start); metricas y log usan la
+duracion total, medida al terminar de enviar el body.
+"""
+from __future__ import annotations
+
+import time
+import uuid
+from typing import Iterable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logging_config import log_request, structured_log
+from app.core.request_metrics import begin_request, end_request, observe, route_template
+
+
+def cors_error_headers(origin: str, allowed_origins: Iterable[str]) -> dict[str, str]:
+    origin = str(origin or '').strip()
+    if not origin:
+        return {}
+    allowed = list(allowed_origins)
+    if origin not in allowed and '*' not in allowed:
+        return {}
+    return {
+        'access-control-allow-origin': origin,
+        'access-control-allow-credentials': 'true',
+        'vary': 'Origin',
+    }
+
+
+class RequestContextMiddleware:
+    def __init__(self, app: ASGIApp, allowed_origins: Iterable[str] = ()) -> None:
+        self.app = app
+        self.allowed_origins = list(allowed_origins)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        trace_id = request_headers.get('x-trace-id') or str(uuid.uuid4())
+        scope.setdefault('state', {})['trace_id'] = trace_id
+        method = scope.get('method', '')
+        path = scope.get('path', '')
+        start = time.perf_counter()
+        status_code = 500
+        response_started = False
+        metrics_token = begin_request()
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code, response_started
+            if message['type'] == 'http.response.start':
+                response_started = True
+                status_code = int(message['status'])
+                headers = MutableHeaders(scope=message)
+                headers['x-trace-id'] = trace_id
+                headers['x-latency-ms'] = str(round((time.perf_counter() - start) * 1000, 2))
+                # Chrome Private Network Access: https://developer.chrome.com/blog/private-network-access-update
+                # Sin este header Chrome bloquea requests de orígenes públicos (http://tablero...)
+                # a IPs privadas (Docker 172.x / 192.168.x).
+                headers['Access-Control-Allow-Private-Network'] = 'true'
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        except Exception as exc:
+            latency = round((time.perf_counter() - start) * 1000, 2)
+            observe(
+                route_template(scope),
+                latency,
+                method=method,
+                status_code=500,
+                cache_hit=end_request(metrics_token),
+            )
+            structured_log(
+                'error', 'request_failed',
+                trace_id=trace_id, duration_ms=latency,
+                endpoint=f'{method} {path}',
+                error=str(exc),
+            )
+            if response_started:
+                # Headers ya enviados (streaming): no hay envelope posible, que lo cierre el server.
+                raise
+            # No exponer detalles de la excepción en la respuesta (AGENTS.md: logs/errores sin secretos)
+            details = None if settings.app_env == 'prod' else str(exc)
+            body = {'error_code': 'INTERNAL_ERROR', 'message': 'Error interno', 'details': details, 'trace_id': trace_id}
+            headers = {'x-trace-id': trace_id, 'x-latency-ms': str(latency), 'Access-Control-Allow-Private-Network': 'true'}
+            headers.update(cors_error_headers(request_headers.get('origin', ''), self.allowed_origins))
+            await JSONResponse(status_code=500, content=body, headers=headers)(scope, receive, send)
+            return
+
+        latency = round((time.perf_counter() - start) * 1000, 2)
+        observe(
+            route_template(scope),
+            latency,
+            method=method,
+            status_code=status_code,
+            cache_hit=end_request(metrics_token),
+        )
+        log_request(path, method, trace_id, latency, status_code)
@@ -1,46 +1,466 @@
+"""
+Latencia de requests por route template con histogramas log-lineales (app.core.histogram).
+
+- Claves acotadas: (metodo, route template, clase de status, cache) -> nunca el path crudo,
+  asi `/users/{username}` es una sola serie; lo que no matchea ruta va a `unmatched`.
+- Lock striping: las series se reparten en _STRIPES dicts con su propio lock, de modo que
+  requests concurrentes a rutas distintas no compiten por un lock global.
+- Ventanas: cada serie lleva un histograma acumulado (desde el arranque) y uno por minuto;
+  la ventana deslizante mergea los ultimos REQUEST_METRICS_WINDOW_MINUTES.
+- Multiproceso: cada worker de uvicorn vuelca su snapshot a
+  REQUEST_METRICS_MULTIPROC_DIR/<pid>.json cada REQUEST_METRICS_EXPORT_INTERVAL_SEC.
+  Cada scrape re-exporta el snapshot propio y suma solo archivos (el propio incluido), asi
+  cualquier worker que atienda /metrics ve los mismos contadores y nunca bajan entre scrapes.
+  Los acumulados de workers muertos se pliegan en retired.json en vez de descartarse, dentro
+  de la misma generacion (mismo proceso padre, p.ej. el master de uvicorn): un reinicio
+  completo del server empieza de cero y descarta los archivos de la generacion anterior.
+"""
 from __future__ import annotations
 
-from collections import defaultdict, deque
-from threading import Lock
-from typing import Deque
+import contextvars
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+try:  # flock: solo POSIX (los workers corren en Linux/Docker); sin el, el lock es no-op.
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+from app.core.config import settings
+from app.core.histogram import LogLinearHistogram
+
+_STRIPES = 16
+_PROM_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+_cache_hit_holder: contextvars.ContextVar[dict | None] = contextvars.ContextVar(
+    "request_metrics_cache_hit", default=None
+)
+
+
+def _window_minutes() -> int:
+    return max(1, int(getattr(settings, "request_metrics_window_minutes", 5) or 5))
+
+
+def _minute_now() -> int:
+    return int(time.time() // 60)
+
+
+class _Series:
+    __slots__ = ("total", "minutes")
+
+    def __init__(self) -> None:
+        self.total = LogLinearHistogram()
+        self.minutes: dict[int, LogLinearHistogram] = {}
+
+    def record(self, latency_ms: float, minute: int) -> None:
+        self.total.record(latency_ms)
+        hist = self.minutes.get(minute)
+        if hist is None:
+            hist = self.minutes[minute] = LogLinearHistogram()
+            oldest = minute - _window_minutes()
+            for stale in [m for m in self.minutes if m <= oldest]:
+                del self.minutes[stale]
+        hist.record(latency_ms)
+
+
+class _Stripe:
+    __slots__ = ("lock", "series")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.series: dict[tuple[str, str, str, str], _Series] = {}
+
+
+_STRIPE_TABLE = [_Stripe() for _ in range(_STRIPES)]
+_export_lock = threading.Lock()
+_export_thread: threading.Thread | None = None
+
+
+def route_template(scope: dict) -> str:
+    """Template de la ruta resuelta por el router (`/api/v1/x/{id}`); `unmatched` si no hubo match."""
+    route = scope.get("route")
+    return str(getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched")
+
+
+def status_class(status_code: int | None) -> str:
+    code = int(status_code or 0)
+    return f"{code // 100}xx" if 100 <= code < 600 else "unknown"
+
+
+def begin_request() -> contextvars.Token:
+    """Abre el holder de cache_hit del request; el holder es mutable para que lo vea el middleware
+    aunque el endpoint corra en el threadpool (contexto copiado)."""
+    return _cache_hit_holder.set({"cache_hit": None})
+
+
+def end_request(token: contextvars.Token) -> bool | None:
+    holder = _cache_hit_holder.get()
+    _cache_hit_holder.reset(token)
+    return None if holder is None else holder.get("cache_hit")
+
+
+def note_cache_hit(cache_hit: bool) -> None:
+    holder = _cache_hit_holder.get()
+    if holder is not None:
+        holder["cache_hit"] = bool(cache_hit)
+
+
+def _cache_label(cache_hit: bool | None) -> str:
+    if cache_hit is None:
+        return "none"
+    return "hit" if cache_hit else "miss"
+
+
+def observe(
+    endpoint: str,
+    latency_ms: float,
+    *,
+    method: str = "",
+    status_code: int | None = 200,
+    cache_hit: bool | None = None,
+) -> None:
+    key = (
+        str(method or "").upper(),
+        str(endpoint or "unknown").strip() or "unknown",
+        status_class(status_code),
+        _cache_label(cache_hit),
+    )
+    stripe = _STRIPE_TABLE[hash(key) % _STRIPES]
+    minute = _minute_now()
+    with stripe.lock:
+        series = stripe.series.get(key)
+        if series is None:
+            series = stripe.series[key] = _Series()
+        series.record(float(max(0.0, latency_ms)), minute)
+    _ensure_export_thread()
+
+
+def _local_snapshot() -> dict[tuple[str, str, str, str], tuple[LogLinearHistogram, LogLinearHistogram]]:
+    """Copia (acumulado, ventana) por serie, tomando cada lock de stripe por separado."""
+    oldest = _minute_now() - _window_minutes()
+    out: dict[tuple[str, str, str, str], tuple[LogLinearHistogram, LogLinearHistogram]] = {}
+    for stripe in _STRIPE_TABLE:
+        with stripe.lock:
+            for key, series in stripe.series.items():
+                window = LogLinearHistogram()
+                for minute, hist in series.minutes.items():
+                    if minute > oldest:
+                        window.merge(hist)
+                out[key] = (LogLinearHistogram().merge(series.total), window)
+    return out
+
+
+def reset() -> None:
+    for stripe in _STRIPE_TABLE:
+        with stripe.lock:
+            stripe.series.clear()
+
+
+# --- agregacion multiproceso ---------------------------------------------------------
+
 
+def _multiproc_dir() -> Path:
+    raw = str(getattr(settings, "request_metrics_multiproc_dir", "") or "").strip()
+    return Path(raw) if raw else Path(tempfile.gettempdir()) / "bi-request-metrics"
 
-_MAX_SAMPLES = 500
-_LATENCIES: dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=_MAX_SAMPLES))
-_LOCK = Lock()
 
+def _export_interval_sec() -> float:
+    return max(1.0, float(getattr(settings, "request_metrics_export_interval_sec", 15) or 15))
 
-def _percentile(sorted_values: list[float], p: float) -> float:
-    if not sorted_values:
-        return 0.0
-    if len(sorted_values) == 1:
-        return float(sorted_values[0])
-    rank = (len(sorted_values) - 1) * p
-    low = int(rank)
-    high = min(low + 1, len(sorted_values) - 1)
-    weight = rank - low
-    return float(sorted_values[low] * (1.0 - weight) + sorted_values[high] * weight)
 
+_RETIRED_FILE = "retired.json"
+_LOCK_FILE = ".lock"
+_process_token: tuple[int, str] | None = None
 
-def observe(endpoint: str, latency_ms: float) -> None:
-    key = str(endpoint or "unknown").strip() or "unknown"
-    with _LOCK:
-        _LATENCIES[key].append(float(max(0.0, latency_ms)))
+_Merged = dict[tuple[str, str, str, str], tuple[LogLinearHistogram, LogLinearHistogram]]
+
+
+def _token() -> str:
+    """Identidad de este proceso: distingue un worker nuevo de uno muerto con el mismo pid."""
+    global _process_token
+    pid = os.getpid()
+    if _process_token is None or _process_token[0] != pid:
+        _process_token = (pid, f"{pid}-{time.time_ns()}")
+    return _process_token[1]
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+@contextmanager
+def _dir_lock(directory: Path, exclusive: bool) -> Iterator[None]:
+    """Lock del directorio: exclusivo para escribir/plegar snapshots, compartido para leerlos."""
+    with open(directory / _LOCK_FILE, "a+b") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _read_json(path: Path) -> dict | None:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _write_json(directory: Path, name: str, payload: dict) -> Path:
+    target = directory / name
+    tmp = directory / f".{name}.tmp"
+    tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, target)
+    return target
+
+
+def _snapshot_token(data: dict) -> str:
+    return str(data.get("token") or f"{data.get('pid')}-{data.get('written_at')}")
+
+
+def _same_generation(data: dict) -> bool:
+    """Snapshot escrito por un worker del mismo proceso padre que este (sin dato: se asume que si)."""
+    ppid = data.get("ppid")
+    return ppid is None or int(ppid) == os.getppid()
+
+
+def _current_retired(directory: Path) -> dict:
+    retired = _read_json(directory / _RETIRED_FILE) or {}
+    return retired if retired.get("ppid") == os.getppid() else {}
+
+
+def _retire_locked(directory: Path, paths: list[Path]) -> None:
+    """Pliega el acumulado de snapshots de workers muertos en retired.json y borra sus archivos.
+
+    Requiere el lock exclusivo. `absorbed` evita contar dos veces un archivo si el borrado falla.
+    """
+    if not paths:
+        return
+    retired = _current_retired(directory)
+    absorbed = set(retired.get("absorbed") or [])
+    totals: dict[tuple[str, ...], LogLinearHistogram] = {
+        tuple(item["k"]): LogLinearHistogram.from_json(item.get("t"))
+        for item in retired.get("series") or []
+        if len(item.get("k") or []) == 4
+    }
+    for path in paths:
+        data = _read_json(path)
+        if data is None or _snapshot_token(data) in absorbed or not _same_generation(data):
+            continue
+        absorbed.add(_snapshot_token(data))
+        for item in data.get("series") or []:
+            key = tuple(str(v) for v in item.get("k") or [])
+            if len(key) == 4:
+                totals.setdefault(key, LogLinearHistogram()).merge(LogLinearHistogram.from_json(item.get("t")))
+    # Solo hace falta recordar tokens de archivos que aun existen (incluidos los que se borran ahora).
+    present_tokens = set()
+    for path in directory.glob("*.json"):
+        if path.name != _RETIRED_FILE:
+            data = _read_json(path)
+            if data is not None:
+                present_tokens.add(_snapshot_token(data))
+    _write_json(
+        directory,
+        _RETIRED_FILE,
+        {
+            "ppid": os.getppid(),
+            "series": [{"k": list(k), "t": h.to_json()} for k, h in sorted(totals.items())],
+            "absorbed": sorted(absorbed & present_tokens),
+        },
+    )
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+def export_snapshot() -> Path | None:
+    """Escribe el snapshot de este proceso (escritura atomica via rename)."""
+    directory = _multiproc_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "pid": os.getpid(),
+            "token": _token(),
+            "ppid": os.getppid(),
+            "written_at": time.time(),
+            "series": [
+                {"k": list(key), "t": total.to_json(), "w": window.to_json()}
+                for key, (total, window) in _local_snapshot().items()
+            ],
+        }
+        with _dir_lock(directory, exclusive=True):
+            target = directory / f"{os.getpid()}.json"
+            previous = _read_json(target) if target.exists() else None
+            if previous is not None and _snapshot_token(previous) != payload["token"]:
+                # pid reusado: el archivo es de un worker muerto, se conserva su acumulado.
+                _retire_locked(directory, [target])
+            return _write_json(directory, target.name, payload)
+    except OSError:
+        return None
+
+
+def _export_loop() -> None:
+    while True:
+        time.sleep(_export_interval_sec())
+        export_snapshot()
+
+
+def _ensure_export_thread() -> None:
+    global _export_thread
+    if _export_thread is not None:
+        return
+    with _export_lock:
+        if _export_thread is None:
+            _export_thread = threading.Thread(target=_export_loop, name="request-metrics-export", daemon=True)
+            _export_thread.start()
+
+
+def _merge_series(merged: _Merged, series: list, *, window: bool) -> None:
+    for item in series or []:
+        key = tuple(str(v) for v in item.get("k") or [])
+        if len(key) != 4:
+            continue
+        total, win = merged.setdefault(key, (LogLinearHistogram(), LogLinearHistogram()))
+        total.merge(LogLinearHistogram.from_json(item.get("t")))
+        if window:
+            win.merge(LogLinearHistogram.from_json(item.get("w")))
+
+
+def collect(include_peers: bool = True) -> _Merged:
+    """
+    Series agregadas entre workers. Con peers, todo sale de archivos (el propio se re-exporta
+    antes de leer) bajo lock compartido: dos scrapes atendidos por workers distintos ven los
+    mismos acumulados, que solo crecen; los workers muertos aportan via retired.json.
+    """
+    if not include_peers:
+        return _local_snapshot()
+    own = export_snapshot()
+    directory = _multiproc_dir()
+    merged: _Merged = {} if own is not None else _local_snapshot()
+    if not directory.is_dir():
+        return merged
+    max_age = _export_interval_sec() * 4
+    now = time.time()
+    dead: list[Path] = []
+    with _dir_lock(directory, exclusive=False):
+        retired = _current_retired(directory)
+        absorbed = set(retired.get("absorbed") or [])
+        _merge_series(merged, retired.get("series") or [], window=False)
+        for path in directory.glob("*.json"):
+            try:
+                pid = int(path.stem)
+            except ValueError:
+                continue
+            if own is None and pid == os.getpid():
+                continue
+            data = _read_json(path)
+            if data is None or _snapshot_token(data) in absorbed:
+                continue
+            alive = _pid_alive(pid)
+            if not alive:
+                dead.append(path)
+            if not _same_generation(data):
+                # Worker de un arranque anterior del server (o de otro master): no suma.
+                continue
+            # La ventana de un snapshot viejo (o de un worker muerto) ya no es "reciente".
+            fresh = alive and now - float(data.get("written_at") or 0.0) <= max_age
+            _merge_series(merged, data.get("series") or [], window=fresh)
+    if dead:
+        try:
+            with _dir_lock(directory, exclusive=True):
+                # Re-chequeo bajo lock: otro worker pudo plegarlo, o un worker nuevo reusar el pid.
+                _retire_locked(directory, [p for p in dead if p.exists() and not _pid_alive(int(p.stem))])
+        except OSError:
+            pass
+    return merged
+
+
+# --- salidas -------------------------------------------------------------------------
 
 
 def summary() -> dict:
-    with _LOCK:
-        items = {k: list(v) for k, v in _LATENCIES.items()}
-    out: dict[str, dict[str, float | int]] = {}
-    for endpoint, values in items.items():
-        if not values:
+    """Resumen por route template (todas las clases de status/cache mergeadas) para /health/perf."""
+    by_route: dict[str, dict] = {}
+    for (method, route, status, cache), (total, window) in collect().items():
+        entry = by_route.get(route)
+        if entry is None:
+            entry = by_route[route] = {
+                "total": LogLinearHistogram(),
+                "window": LogLinearHistogram(),
+                "by_status": {},
+                "by_cache": {},
+            }
+        entry["total"].merge(total)
+        entry["window"].merge(window)
+        entry["by_status"][status] = entry["by_status"].get(status, 0) + total.total
+        entry["by_cache"][cache] = entry["by_cache"].get(cache, 0) + total.total
+    out: dict[str, dict] = {}
+    for route, entry in sorted(by_route.items()):
+        total, window = entry["total"], entry["window"]
+        if total.total <= 0:
             continue
-        arr = sorted(values)
-        out[endpoint] = {
-            "count": len(arr),
-            "p50_ms": round(_percentile(arr, 0.50), 2),
-            "p95_ms": round(_percentile(arr, 0.95), 2),
-            "p99_ms": round(_percentile(arr, 0.99), 2),
-            "max_ms": round(float(arr[-1]), 2),
+        out[route] = {
+            "count": total.total,
+            "p50_ms": round(total.quantile(0.50), 2),
+            "p95_ms": round(total.quantile(0.95), 2),
+            "p99_ms": round(total.quantile(0.99), 2),
+            "max_ms": round(total.max, 2),
+            "window_minutes": _window_minutes(),
+            "window": {"count": window.total, **{f"{k}_ms": v for k, v in window.summary().items()}},
+            "by_status": entry["by_status"],
+            "by_cache": entry["by_cache"],
         }
     return out
+
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text() -> str:
+    """Exposicion en formato texto de Prometheus (0.0.4), agregada entre workers."""
+    series = sorted(collect().items())
+    lines = [
+        "# HELP http_request_duration_seconds Latencia de requests HTTP por route template.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route, status, cache), (total, _window) in series:
+        labels = (
+            f'method="{_label_value(method)}",route="{_label_value(route)}",'
+            f'status="{status}",cache="{cache}"'
+        )
+        for bound_ms, count in total.cumulative_buckets(_PROM_BUCKETS_MS):
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound_ms / 1000:g}"}} {count}')
+        lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {total.total}')
+        lines.append(f"http_request_duration_seconds_sum{{{labels}}} {total.sum / 1000:.6f}")
+        lines.append(f"http_request_duration_seconds_count{{{labels}}} {total.total}")
+    lines.append(
+        f"# HELP http_request_duration_window_seconds Cuantiles de latencia en los ultimos {_window_minutes()} minutos."
+    )
+    lines.append("# TYPE http_request_duration_window_seconds gauge")
+    for (method, route, status, cache), (_total, window) in series:
+        if window.total <= 0:
+            continue
+        labels = (
+            f'method="{_label_value(method)}",route="{_label_value(route)}",'
+            f'status="{status}",cache="{cache}"'
+        )
+        for q in (0.5, 0.95, 0.99):
+            lines.append(
+                f'http_request_duration_window_seconds{{{labels},quantile="{q:g}"}} {window.quantile(q) / 1000:.6f}'
+            )
+    return "\n".join(lines) + "\n"
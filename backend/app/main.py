@@ -1,5 +1,4 @@
 import threading
-import time
 import uuid
 
 from fastapi import FastAPI, Request
@@ -8,14 +7,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from app.api.metrics import router as metrics_router
 from app.api.v1.router import router as v1_router
 from app.core.config import settings
+from app.core.logging_config import shutdown_logging, structured_log
 from app.core.prod_check import validate_production_config
+from app.core.request_context import RequestContextMiddleware
 from app.core.analytics_cache import RENDIMIENTO_V2_SUMMARY_CACHE_SCOPE, set as cache_set
 from app.db.bootstrap import bootstrap_database_with_demo_probe, ensure_runtime_schema, ensure_sync_schema_compatibility
 from app.db.session import SessionLocal
 from app.schemas.analytics import AnalyticsFilters, CobranzasCohorteFirstPaintIn, CobranzasCohorteIn, PortfolioSummaryIn
 from app.services.analytics_service import AnalyticsService
+from app.services.telemetry_buffer import frontend_perf_buffer
 
 if settings.app_env != 'prod' and not settings.db_bootstrap_on_start:
     ensure_runtime_schema()
@@ -40,78 +43,19 @@ else:
     origins = _dev_origins.copy()
 
 
-def _cors_error_headers(request: Request) -> dict[str, str]:
-    origin = request.headers.get('origin', '').strip()
-    if not origin:
-        return {}
-    allowed = origin in origins
-    if not allowed and '*' in origins:
-        allowed = True
-    if not allowed:
-        return {}
-    return {
-        'access-control-allow-origin': origin,
-        'access-control-allow-credentials': 'true',
-        'vary': 'Origin',
-    }
-
-
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=['*'],
     allow_headers=['*'],
+    expose_headers=['ETag'],
 )
 
-# Chrome Private Network Access: https://developer.chrome.com/blog/private-network-access-update
-@app.middleware("http")
-async def _private_network_header(request: Request, call_next):
-    response = await call_next(request)
-    response.headers["Access-Control-Allow-Private-Network"] = "true"
-    return response
-
-# Private Network Access: Chrome bloquea peticiones de orígenes públicos (http://tablero...)
-# a IPs privadas (Docker 172.x / 192.168.x) sin este header.
-# Ver: https://developer.chrome.com/blog/private-network-access-update
-@app.middleware("http")
-async def add_private_network_header(request: Request, call_next):
-    response = await call_next(request)
-    response.headers["Access-Control-Allow-Private-Network"] = "true"
-    return response
-
-
-from app.core.logging_config import log_request, structured_log
-from app.core.request_metrics import observe
-
-
-@app.middleware('http')
-async def trace_and_logging(request: Request, call_next):
-    trace_id = request.headers.get('x-trace-id') or str(uuid.uuid4())
-    request.state.trace_id = trace_id
-    start = time.time()
-    try:
-        response = await call_next(request)
-        latency = round((time.time() - start) * 1000, 2)
-        observe(request.url.path, latency)
-        log_request(request.url.path, request.method, trace_id, latency, response.status_code)
-        response.headers['x-trace-id'] = trace_id
-        response.headers['x-latency-ms'] = str(latency)
-        return response
-    except Exception as exc:
-        latency = round((time.time() - start) * 1000, 2)
-        structured_log(
-            'error', 'request_failed',
-            trace_id=trace_id, duration_ms=latency,
-            endpoint=f'{request.method} {request.url.path}',
-            error=str(exc),
-        )
-        # No exponer detalles de la excepción en la respuesta (AGENTS.md: logs/errores sin secretos)
-        details = None if settings.app_env == 'prod' else str(exc)
-        body = {'error_code': 'INTERNAL_ERROR', 'message': 'Error interno', 'details': details, 'trace_id': trace_id}
-        headers = {'x-trace-id': trace_id, 'x-latency-ms': str(latency)}
-        headers.update(_cors_error_headers(request))
-        return JSONResponse(status_code=500, content=body, headers=headers)
+# Trace id, headers de latencia / Private Network Access, métricas, log `request` y
+# envelope de errores no manejados: un solo middleware ASGI puro (ver app.core.request_context).
+# Se agrega después de CORS para quedar por fuera y cubrir también los preflight.
+app.add_middleware(RequestContextMiddleware, allowed_origins=origins)
 
 
 @app.exception_handler(StarletteHTTPException)
@@ -126,7 +70,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
         }
     else:
         body = {'error_code': 'HTTP_ERROR', 'message': str(exc.detail), 'details': None, 'trace_id': trace_id}
-    return JSONResponse(status_code=exc.status_code, content=body)
+    return JSONResponse(status_code=exc.status_code, content=body, headers=getattr(exc, 'headers', None))
 
 
 @app.exception_handler(RequestValidationError)
@@ -141,6 +85,7 @@ async def request_validation_exception_handler(request: Request, exc: RequestVal
     return JSONResponse(status_code=422, content=body)
 
 
+app.include_router(metrics_router)
 app.include_router(v1_router)
 
 
@@ -206,3 +151,10 @@ def _bootstrap_db_on_startup() -> None:
     if settings.db_bootstrap_on_start:
         bootstrap_database_with_demo_probe()
     _schedule_prewarm_analytics_cache_on_startup()
+
+
+@app.on_event('shutdown')
+def _flush_telemetry_buffer_on_shutdown() -> None:
+    # Flush final de la ingesta batch de telemetria; un kill -9 pierde lo encolado.
+    frontend_perf_buffer.stop()
+    shutdown_logging()
@@ -9,6 +9,8 @@ from app.models.brokers import (
     CarteraFact,
     CarteraCorteAgg,
     CobranzasCohorteAgg,
+    CobranzasOrphanContract,
+    CobranzasOrphanCutoff,
     DimNegocioUnMap,
     DimNegocioContrato,
     AnalyticsRendimientoAgg,
@@ -25,6 +27,8 @@ from app.models.brokers import (
     MvOptionsAnuales,
     AnalyticsSourceFreshness,
     FrontendPerfMetric,
+    FirstPaintSnapshot,
+    FrontendPerfRollup,
     CommissionRules,
     CobranzasFact,
     ContratosFact,
@@ -37,6 +41,8 @@ from app.models.brokers import (
     SyncWatermark,
     SyncChunkManifest,
     SyncExtractLog,
+    SyncRunLog,
+    SyncTuningState,
     SyncStagingRow,
     SyncRecord,
     SyncJobStep,
@@ -57,6 +63,8 @@ __all__ = [
     'CarteraFact',
     'CarteraCorteAgg',
     'CobranzasCohorteAgg',
+    'CobranzasOrphanContract',
+    'CobranzasOrphanCutoff',
     'DimNegocioUnMap',
     'DimNegocioContrato',
     'AnalyticsRendimientoAgg',
@@ -73,6 +81,8 @@ __all__ = [
     'MvOptionsAnuales',
     'AnalyticsSourceFreshness',
     'FrontendPerfMetric',
+    'FirstPaintSnapshot',
+    'FrontendPerfRollup',
     'CobranzasFact',
     'ContratosFact',
     'EerrFact',
@@ -84,6 +94,8 @@ __all__ = [
     'SyncWatermark',
     'SyncChunkManifest',
     'SyncExtractLog',
+    'SyncRunLog',
+    'SyncTuningState',
     'SyncStagingRow',
     'SyncJobStep',
     'SyncRecord',
@@ -9,6 +9,7 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     Integer,
+    LargeBinary,
     String,
     Text,
 )
@@ -160,6 +161,16 @@ class SyncRun(Base):
     actor = Column(String(128), nullable=False, default="system")
 
 
+class SyncRunLog(Base):
+    __tablename__ = "sync_run_logs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(String(64), nullable=False)
+    domain = Column(String(32), nullable=False)
+    line = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+
 class SyncJobStep(Base):
     __tablename__ = "sync_job_steps"
 
@@ -256,6 +267,7 @@ class SyncChunkManifest(Base):
     status = Column(String(16), nullable=False, default="changed", index=True)
     last_job_id = Column(String(64), nullable=True, index=True)
     skipped_count = Column(Integer, nullable=False, default=0)
+    source_signature = Column(String(96), nullable=True)
     updated_at = Column(
         DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
     )
@@ -277,6 +289,24 @@ class SyncExtractLog(Base):
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
 
 
+class SyncTuningState(Base):
+    __tablename__ = "sync_tuning_state"
+
+    id = Column(Integer, primary_key=True, index=True)
+    domain = Column(String(32), nullable=False)
+    fetch_batch_size = Column(Integer, nullable=False, default=0)
+    chunk_size = Column(Integer, nullable=False, default=0)
+    extract_latency_ms = Column(Float, nullable=False, default=0.0)
+    upsert_latency_ms = Column(Float, nullable=False, default=0.0)
+    lock_waits = Column(Integer, nullable=False, default=0)
+    rss_mb = Column(Float, nullable=False, default=0.0)
+    samples = Column(Integer, nullable=False, default=0)
+    last_job_id = Column(String(64), nullable=True)
+    updated_at = Column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
 class SyncStagingRow(Base):
     __tablename__ = "sync_staging_rows"
 
@@ -522,6 +552,45 @@ class CobranzasCohorteAgg(Base):
     )
 
 
+class CobranzasOrphanContract(Base):
+    """Pagos del mes de corte sin fila en cartera_fact para el mes de gestión efectivo, por contrato.
+
+    Grano: (cutoff_month, contract_id, un, supervisor, gestor, via, tramo); se recalcula por
+    corte en cada refresh de cohorte para que summary/first-paint no hagan el anti-join en vivo.
+    """
+
+    __tablename__ = "cobranzas_orphan_contract"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cutoff_month = Column(String(7), nullable=False)
+    effective_cartera_month = Column(String(7), nullable=False)
+    contract_id = Column(String(64), nullable=False)
+    un = Column(String(128), nullable=False, default="")
+    supervisor = Column(String(128), nullable=False, default="")
+    gestor = Column(String(128), nullable=False, default="")
+    via = Column(String(32), nullable=False, default="")
+    tramo = Column(Integer, nullable=False, default=0)
+    categoria = Column(String(16), nullable=False, default="VIGENTE")
+    transacciones = Column(Integer, nullable=False, default=0)
+    pagos_positivos = Column(Integer, nullable=False, default=0)
+    cobrado = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class CobranzasOrphanCutoff(Base):
+    """Rollup sin filtros de cobranzas_orphan_contract por corte; su presencia marca el corte como precalculado."""
+
+    __tablename__ = "cobranzas_orphan_cutoff"
+
+    cutoff_month = Column(String(7), primary_key=True)
+    effective_cartera_month = Column(String(7), nullable=False)
+    contratos = Column(Integer, nullable=False, default=0)
+    pagaron = Column(Integer, nullable=False, default=0)
+    transacciones = Column(Integer, nullable=False, default=0)
+    cobrado = Column(Float, nullable=False, default=0.0)
+    refreshed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
 class DimNegocioUnMap(Base):
     __tablename__ = "dim_negocio_un_map"
 
@@ -793,6 +862,39 @@ class FrontendPerfMetric(Base):
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
 
 
+class FrontendPerfRollup(Base):
+    """Rollup por ruta y minuto de frontend_perf_metrics con histogramas log-lineales (app.core.histogram)."""
+
+    __tablename__ = "frontend_perf_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    route = Column(String(32), nullable=False)
+    bucket_start = Column(DateTime, nullable=False, index=True)
+    samples = Column(Integer, nullable=False, default=0)
+    warm = Column(Integer, nullable=False, default=0)
+    cold = Column(Integer, nullable=False, default=0)
+    ttfb_hist = Column(Text, nullable=False, default="{}")
+    fcp_hist = Column(Text, nullable=False, default="{}")
+    ready_hist = Column(Text, nullable=False, default="{}")
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class FirstPaintSnapshot(Base):
+    """Payload first-paint precalculado al final del sync (JSON gzip) por endpoint y firma de filtros."""
+
+    __tablename__ = "first_paint_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    endpoint = Column(String(64), nullable=False)
+    filters_hash = Column(String(64), nullable=False)
+    filters_json = Column(Text, nullable=False, default="{}")
+    etag = Column(String(64), nullable=False)
+    payload_gz = Column(LargeBinary, nullable=False)
+    payload_bytes = Column(Integer, nullable=False, default=0)
+    compute_ms = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
 Index("ix_acs_contract_id", AnalyticsContractSnapshot.contract_id)
 Index("ix_acs_sale_month", AnalyticsContractSnapshot.sale_month)
 Index("ix_acs_close_month", AnalyticsContractSnapshot.close_month)
@@ -832,6 +934,8 @@ Index(
 Index(
     "ix_sync_extract_log_job_created", SyncExtractLog.job_id, SyncExtractLog.created_at
 )
+Index("ux_sync_tuning_state_domain", SyncTuningState.domain, unique=True)
+Index("ix_sync_run_logs_job_id_id", SyncRunLog.job_id, SyncRunLog.id)
 Index("ix_sync_staging_rows_job_chunk", SyncStagingRow.job_id, SyncStagingRow.chunk_key)
 Index(
     "ix_sync_staging_rows_domain_month",
@@ -1031,6 +1135,20 @@ Index(
     CobranzasCohorteAgg.cutoff_month,
     CobranzasCohorteAgg.via_cobro,
 )
+Index(
+    "ix_cobranzas_orphan_contract_cutoff_contract",
+    CobranzasOrphanContract.cutoff_month,
+    CobranzasOrphanContract.contract_id,
+)
+Index(
+    "ix_cobranzas_orphan_contract_cutoff_dims",
+    CobranzasOrphanContract.cutoff_month,
+    CobranzasOrphanContract.un,
+    CobranzasOrphanContract.supervisor,
+    CobranzasOrphanContract.via,
+    CobranzasOrphanContract.categoria,
+    postgresql_include=["gestor", "contract_id", "transacciones", "pagos_positivos", "cobrado"],
+)
 Index(
     "ux_dim_negocio_un_map_key",
     DimNegocioUnMap.source_un,
@@ -1159,6 +1277,18 @@ Index(
     FrontendPerfMetric.route,
     FrontendPerfMetric.event_at,
 )
+Index(
+    "ux_frontend_perf_rollups_route_bucket",
+    FrontendPerfRollup.route,
+    FrontendPerfRollup.bucket_start,
+    unique=True,
+)
+Index(
+    "ux_first_paint_snapshots_endpoint_filters",
+    FirstPaintSnapshot.endpoint,
+    FirstPaintSnapshot.filters_hash,
+    unique=True,
+)
 Index(
     "ix_analytics_anuales_agg_cutoff_year",
     AnalyticsAnualesAgg.cutoff_month,
@@ -172,7 +172,9 @@ def get_cartera_tramo_rules_from_payload(value: dict) -> dict:
 
 
 def get_cartera_uns(db: Session) -> list[str]:
-    if settings.read_from_fact_tables:
+    # sync_records solo se consulta si sigue siendo escrito; si no, cartera_fact
+    # (cubierto por ix_cartera_fact_un_close_month) es la fuente de UNs.
+    if settings.read_from_fact_tables or not settings.sync_persist_sync_records:
         rows = db.query(CarteraFact.un).distinct().all()
     else:
         rows = db.query(SyncRecord.un).filter(SyncRecord.domain == 'cartera').distinct().all()
@@ -126,6 +126,10 @@ class CobranzasCohorteDetailIn(CobranzasCohorteIn):
         default="sale_month", pattern="^(sale_month|cobrado|deberia|pagaron)$"
     )
     sort_dir: str = Field(default="asc", pattern="^(asc|desc)$")
+    after: str | None = Field(
+        default=None,
+        description="Cursor keyset: sale_month del último ítem de la página anterior (next_cursor). Tiene prioridad sobre page.",
+    )
 
 
 class CobranzasCohorteOrphanDetailIn(CobranzasCohorteIn):
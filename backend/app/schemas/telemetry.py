@@ -22,6 +22,10 @@ class FrontendPerfIn(BaseModel):
     app_version: str = Field(default='dev', min_length=1, max_length=64)
 
 
+class FrontendPerfBatchIn(BaseModel):
+    events: list[FrontendPerfIn] = Field(min_length=1, max_length=200)
+
+
 class FrontendPerfSummaryQuery(BaseModel):
     route: str | None = Field(default=None, pattern='^(cartera|cohorte|rendimiento|anuales|brokers|eerr)$')
     from_utc: datetime | None = None
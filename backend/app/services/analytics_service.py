@@ -10,11 +10,12 @@ from datetime import datetime
 from threading import Lock
 from urllib.parse import urlencode
 
-from sqlalchemy import Integer, Numeric, String, and_, case, cast, func, literal
+from sqlalchemy import Integer, Numeric, String, and_, case, cast, func, literal, tuple_
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Query, Session
 
 from app.core.config import settings
+from app.core.request_metrics import note_cache_hit
 from app.domain import (
     categoria_from_tramo,
     category_expr_for_tramo,
@@ -34,6 +35,8 @@ from app.models.brokers import (
     CarteraFact,
     CobranzasCohorteAgg,
     CobranzasFact,
+    CobranzasOrphanContract,
+    CobranzasOrphanCutoff,
     CommissionRules,
     DimNegocioContrato,
     DimNegocioUnMap,
@@ -58,6 +61,9 @@ from app.schemas.analytics import (
 _COHORTE_BASE_CACHE_TTL_SEC = 900
 _COHORTE_BASE_CACHE: dict[str, tuple[float, list[dict]]] = {}
 _COHORTE_BASE_CACHE_LOCK = Lock()
+# Detalle cohorte ya ordenado por (corte, filtros, orden): las páginas siguientes solo cortan.
+_COHORTE_DETAIL_CACHE: dict[str, tuple[float, dict]] = {}
+_COHORTE_DETAIL_CACHE_MAX_ENTRIES = 64
 ANALYTICS_PIPELINE_VERSION = "2026.03.v4"
 STANDARD_GESTION_CALENDAR_START = "01/2021"
 STANDARD_CONTRACT_CALENDAR_START = "01/2014"
@@ -81,10 +87,35 @@ def _cohorte_base_cache_set(cache_key: str, data: list[dict]) -> None:
         _COHORTE_BASE_CACHE[cache_key] = (time.time(), list(data))
 
 
+def _cohorte_detail_cache_get(cache_key: str) -> dict | None:
+    now = time.time()
+    with _COHORTE_BASE_CACHE_LOCK:
+        entry = _COHORTE_DETAIL_CACHE.get(cache_key)
+        if not entry:
+            return None
+        ts, data = entry
+        if now - ts > _COHORTE_BASE_CACHE_TTL_SEC:
+            _COHORTE_DETAIL_CACHE.pop(cache_key, None)
+            return None
+        return data
+
+
+def _cohorte_detail_cache_set(cache_key: str, data: dict) -> None:
+    with _COHORTE_BASE_CACHE_LOCK:
+        if (
+            cache_key not in _COHORTE_DETAIL_CACHE
+            and len(_COHORTE_DETAIL_CACHE) >= _COHORTE_DETAIL_CACHE_MAX_ENTRIES
+        ):
+            oldest = min(_COHORTE_DETAIL_CACHE, key=lambda k: _COHORTE_DETAIL_CACHE[k][0])
+            _COHORTE_DETAIL_CACHE.pop(oldest, None)
+        _COHORTE_DETAIL_CACHE[cache_key] = (time.time(), data)
+
+
 def cohorte_base_cache_clear() -> None:
     """Vaciar caché de base cohorte para que el siguiente request use cobranzas actualizadas."""
     with _COHORTE_BASE_CACHE_LOCK:
         _COHORTE_BASE_CACHE.clear()
+        _COHORTE_DETAIL_CACHE.clear()
 
 
 def _filters_to_query(filters: AnalyticsFilters) -> str:
@@ -263,6 +294,75 @@ def _normalize_contract_id_for_lookup(cid: str | int | None) -> str:
     return s
 
 
+_CORTE_ROLLUP_DIMS = ("gestion_month", "close_month", "un", "tramo", "via_cobro", "contract_year")
+_CORTE_ROLLUP_METRICS = (
+    "contracts_total",
+    "vigentes_total",
+    "morosos_total",
+    "contracts_cobrador",
+    "contracts_debito",
+    "monto_total",
+    "monto_vencido_total",
+    "paid_total",
+)
+# Grouping sets served by one pass over cartera_corte_agg (portfolio-corte-v2 summary).
+_CORTE_ROLLUP_SETS = (
+    (),
+    ("un",),
+    ("gestion_month", "un"),
+    ("close_month", "un"),
+    ("tramo",),
+    ("via_cobro",),
+    ("gestion_month", "via_cobro"),
+    ("close_month", "via_cobro"),
+    ("contract_year",),
+    ("gestion_month",),
+)
+
+
+def _corte_rollup_in_memory(rows: list[tuple]) -> dict[tuple, dict[tuple, list]]:
+    """Roll up rows grouped by every dim in _CORTE_ROLLUP_DIMS into each grouping set."""
+    dim_pos = {name: i for i, name in enumerate(_CORTE_ROLLUP_DIMS)}
+    n_dims = len(_CORTE_ROLLUP_DIMS)
+    out: dict[tuple, dict[tuple, list]] = {gs: {} for gs in _CORTE_ROLLUP_SETS}
+    for row in rows:
+        metrics = row[n_dims:]
+        for gs in _CORTE_ROLLUP_SETS:
+            key = tuple(row[dim_pos[d]] for d in gs)
+            acc = out[gs].get(key)
+            if acc is None:
+                out[gs][key] = [m or 0 for m in metrics]
+            else:
+                for i, m in enumerate(metrics):
+                    acc[i] += m or 0
+    return out
+
+
+def _corte_grouping_mask(grouping_set: tuple) -> int:
+    """Valor de GROUPING(d1..dn) para un grouping set: bit en 1 = dimensión agregada, d1 es el más significativo."""
+    n_dims = len(_CORTE_ROLLUP_DIMS)
+    mask = 0
+    for i, name in enumerate(_CORTE_ROLLUP_DIMS):
+        if name not in grouping_set:
+            mask |= 1 << (n_dims - 1 - i)
+    return mask
+
+
+def _corte_rollup_from_grouping_rows(rows: list[tuple]) -> dict[tuple, dict[tuple, list]]:
+    """Split GROUPING SETS rows (grouping mask, dims..., metrics...) back into each grouping set."""
+    dim_pos = {name: i for i, name in enumerate(_CORTE_ROLLUP_DIMS)}
+    n_dims = len(_CORTE_ROLLUP_DIMS)
+    sets_by_mask = {_corte_grouping_mask(gs): gs for gs in _CORTE_ROLLUP_SETS}
+    out: dict[tuple, dict[tuple, list]] = {gs: {} for gs in _CORTE_ROLLUP_SETS}
+    for row in rows:
+        gs = sets_by_mask.get(int(row[0]))
+        if gs is None:
+            continue
+        key = tuple(row[1 + dim_pos[d]] for d in gs)
+        out[gs][key] = [m or 0 for m in row[1 + n_dims :]]
+    return out
+
+
 def _nest_un_by_period(rows: list[tuple]) -> dict[str, dict[str, int]]:
     """periodo (gestion_month o close_month) -> { clave_dim -> contracts_total } (UN, vía, etc.)."""
     out: dict[str, dict[str, int]] = {}
@@ -592,6 +692,7 @@ class AnalyticsService:
         else:
             meta.setdefault("data_freshness_at", None)
         meta["cache_hit"] = bool(cache_hit)
+        note_cache_hit(cache_hit)
         meta["pipeline_version"] = ANALYTICS_PIPELINE_VERSION
         meta.setdefault("generated_at", datetime.utcnow().isoformat())
         out["meta"] = meta
@@ -1212,119 +1313,77 @@ class AnalyticsService:
             },
         }
 
+    @staticmethod
+    def _portfolio_corte_rollup(
+        db: Session, base: Query
+    ) -> dict[tuple, dict[tuple, list]]:
+        """
+        Todos los cortes del summary en un solo round-trip sobre cartera_corte_agg.
+        PostgreSQL: GROUP BY GROUPING SETS; SQLite: un scan agrupado por todas las
+        dimensiones y rollup en memoria. Devuelve grouping_set -> {claves -> métricas}.
+        """
+        dim_cols = [getattr(CarteraCorteAgg, d) for d in _CORTE_ROLLUP_DIMS]
+        metric_cols = [
+            func.sum(getattr(CarteraCorteAgg, m)) for m in _CORTE_ROLLUP_METRICS
+        ]
+        if db.bind is None or db.bind.dialect.name != "postgresql":
+            rows = base.with_entities(*dim_cols, *metric_cols).group_by(*dim_cols).all()
+            return _corte_rollup_in_memory(rows)
+
+        grouping_sets = func.grouping_sets(
+            *[
+                tuple_(*[getattr(CarteraCorteAgg, d) for d in gs])
+                for gs in _CORTE_ROLLUP_SETS
+            ]
+        )
+        rows = (
+            base.with_entities(func.grouping(*dim_cols), *dim_cols, *metric_cols)
+            .group_by(grouping_sets)
+            .all()
+        )
+        return _corte_rollup_from_grouping_rows(rows)
+
     @staticmethod
     def fetch_portfolio_corte_summary_v2(
         db: Session, filters: PortfolioSummaryIn
     ) -> dict:
         base = AnalyticsService._portfolio_corte_base(db, filters)
-        totals = base.with_entities(
-            func.coalesce(func.sum(CarteraCorteAgg.contracts_total), 0),
-            func.coalesce(func.sum(CarteraCorteAgg.vigentes_total), 0),
-            func.coalesce(func.sum(CarteraCorteAgg.morosos_total), 0),
-            func.coalesce(func.sum(CarteraCorteAgg.contracts_cobrador), 0),
-            func.coalesce(func.sum(CarteraCorteAgg.contracts_debito), 0),
-            func.coalesce(func.sum(CarteraCorteAgg.monto_total), 0.0),
-            func.coalesce(func.sum(CarteraCorteAgg.monto_vencido_total), 0.0),
-            func.coalesce(func.sum(CarteraCorteAgg.paid_total), 0.0),
-        ).first()
-
-        total_contracts = int(totals[0] or 0)
-        vigentes_total = int(totals[1] or 0)
-        morosos_total = int(totals[2] or 0)
-        contracts_cobrador = int(totals[3] or 0)
-        contracts_debito = int(totals[4] or 0)
-        monto_total = float(totals[5] or 0.0)
-        monto_vencido_total = float(totals[6] or 0.0)
-        paid_total = float(totals[7] or 0.0)
+        rollup = AnalyticsService._portfolio_corte_rollup(db, base)
+        metric_idx = {name: i for i, name in enumerate(_CORTE_ROLLUP_METRICS)}
+        contracts_idx = metric_idx["contracts_total"]
+
+        def _rows(grouping_set: tuple, *metrics: str) -> list[tuple]:
+            idx = [metric_idx[m] for m in metrics or ("contracts_total",)]
+            return [
+                (*key, *[values[i] for i in idx])
+                for key, values in rollup[grouping_set].items()
+            ]
 
-        by_un_rows = (
-            base.with_entities(
-                CarteraCorteAgg.un,
-                func.coalesce(func.sum(CarteraCorteAgg.contracts_total), 0),
-            )
-            .group_by(CarteraCorteAgg.un)
-            .all()
+        totals = rollup[()].get(()) or [0] * len(_CORTE_ROLLUP_METRICS)
+        total_contracts = int(totals[contracts_idx] or 0)
+        vigentes_total = int(totals[metric_idx["vigentes_total"]] or 0)
+        morosos_total = int(totals[metric_idx["morosos_total"]] or 0)
+        contracts_cobrador = int(totals[metric_idx["contracts_cobrador"]] or 0)
+        contracts_debito = int(totals[metric_idx["contracts_debito"]] or 0)
+        monto_total = float(totals[metric_idx["monto_total"]] or 0.0)
+        monto_vencido_total = float(totals[metric_idx["monto_vencido_total"]] or 0.0)
+        paid_total = float(totals[metric_idx["paid_total"]] or 0.0)
+
+        by_un_rows = _rows(("un",))
+        by_un_gestion_rows = _rows(("gestion_month", "un"))
+        by_un_close_rows = _rows(("close_month", "un"))
+        by_tramo_rows = _rows(("tramo",))
+        by_via_rows = _rows(("via_cobro",))
+        by_via_gestion_rows = _rows(("gestion_month", "via_cobro"))
+        by_via_close_rows = _rows(("close_month", "via_cobro"))
+        by_contract_year_rows = sorted(
+            (k, v) for k, v in _rows(("contract_year",)) if k is not None and int(k) > 0
         )
-        by_un_gestion_rows = (
-            base.with_entities(
-                CarteraCorteAgg.gestion_month,
-                CarteraCorteAgg.un,
-                func.coalesce(func.sum(CarteraCorteAgg.contracts_total), 0),
-            )
-            .group_by(CarteraCorteAgg.gestion_month, CarteraCorteAgg.un)
-            .all()
-        )
-        by_un_close_rows = (
-            base.with_entities(
-                CarteraCorteAgg.close_month,
-                CarteraCorteAgg.un,
-                func.coalesce(func.sum(CarteraCorteAgg.contracts_total), 0),
-            )
-            .group_by(CarteraCorteAgg.close_month, CarteraCorteAgg.un)
-            .all()
-        )
-        by_tramo_rows = (
-            base.with_entities(
-                CarteraCorteAgg.tramo,
-                func.coalesce(func.sum(CarteraCorteAgg.contracts_total), 0),
-            )
-            .group_by(CarteraCorteAgg.tramo)
-            .all()
+        series_vigente_moroso_rows = _rows(
+            ("gestion_month",), "vigentes_total", "morosos_total"
         )
-        by_via_rows = (
-            base.with_entities(
-                CarteraCorteAgg.via_cobro,
-                func.coalesce(func.sum(CarteraCorteAgg.contracts_total), 0),
-            )
-            .group_by(CarteraCorteAgg.via_cobro)
-            .all()
-        )
-        by_via_gestion_rows = (
-            base.with_entities(
-                CarteraCorteAgg.gestion_month,
-                CarteraCorteAgg.via_cobro,
-                func.coalesce(func.sum(CarteraCorteAgg.contracts_total), 0),
-            )
-            .group_by(CarteraCorteAgg.gestion_month, CarteraCorteAgg.via_cobro)
-            .all()
-        )
-        by_via_close_rows = (
-            base.with_entities(
-                CarteraCorteAgg.close_month,
-                CarteraCorteAgg.via_cobro,
-                func.coalesce(func.sum(CarteraCorteAgg.contracts_total), 0),
-            )
-            .group_by(CarteraCorteAgg.close_month, CarteraCorteAgg.via_cobro)
-            .all()
-        )
-        by_contract_year_rows = (
-            base.with_entities(
-                CarteraCorteAgg.contract_year,
-                func.coalesce(func.sum(CarteraCorteAgg.contracts_total), 0),
-            )
-            .filter(CarteraCorteAgg.contract_year > 0)
-            .group_by(CarteraCorteAgg.contract_year)
-            .order_by(CarteraCorteAgg.contract_year)
-            .all()
-        )
-
-        series_vigente_moroso_rows = (
-            base.with_entities(
-                CarteraCorteAgg.gestion_month,
-                func.coalesce(func.sum(CarteraCorteAgg.vigentes_total), 0),
-                func.coalesce(func.sum(CarteraCorteAgg.morosos_total), 0),
-            )
-            .group_by(CarteraCorteAgg.gestion_month)
-            .all()
-        )
-        series_via_rows = (
-            base.with_entities(
-                CarteraCorteAgg.gestion_month,
-                func.coalesce(func.sum(CarteraCorteAgg.contracts_cobrador), 0),
-                func.coalesce(func.sum(CarteraCorteAgg.contracts_debito), 0),
-            )
-            .group_by(CarteraCorteAgg.gestion_month)
-            .all()
+        series_via_rows = _rows(
+            ("gestion_month",), "contracts_cobrador", "contracts_debito"
         )
 
         return {
@@ -1425,6 +1484,44 @@ class AnalyticsService:
             )
         return q
 
+    @staticmethod
+    def _cohorte_orphan_precomputed(
+        db: Session, resolved_cutoff: str, effective_cartera_month: str
+    ) -> CobranzasOrphanCutoff | None:
+        """Rollup precalculado en el sync para el corte, solo si corresponde al mismo mes de cartera."""
+        row = db.get(CobranzasOrphanCutoff, str(resolved_cutoff or "").strip())
+        if row is None:
+            return None
+        if str(row.effective_cartera_month or "").strip() != str(effective_cartera_month or "").strip():
+            return None
+        return row
+
+    @staticmethod
+    def _cohorte_orphan_precomputed_query(
+        db: Session,
+        resolved_cutoff: str,
+        un_filter: set[str],
+        supervisor_filter: set[str],
+        gestor_filter: set[str],
+        via_filter: set[str],
+        category_filter: set[str],
+    ):
+        # Columnas ya guardadas como upper(coalesce(x, '')): mismo criterio que _cohorte_orphan_fact_query.
+        q = db.query(CobranzasOrphanContract).filter(
+            CobranzasOrphanContract.cutoff_month == str(resolved_cutoff or "").strip()
+        )
+        if un_filter:
+            q = q.filter(CobranzasOrphanContract.un.in_(list(un_filter)))
+        if supervisor_filter:
+            q = q.filter(CobranzasOrphanContract.supervisor.in_(list(supervisor_filter)))
+        if gestor_filter:
+            q = q.filter(CobranzasOrphanContract.gestor.in_(list(gestor_filter)))
+        if via_filter:
+            q = q.filter(CobranzasOrphanContract.via.in_(list(via_filter)))
+        if category_filter:
+            q = q.filter(CobranzasOrphanContract.categoria.in_(list(category_filter)))
+        return q
+
     @staticmethod
     def _cohorte_orphan_cobranzas(
         db: Session,
@@ -1440,6 +1537,43 @@ class AnalyticsService:
         Cobranzas del mes de corte (payment_month) que no tienen cartera con esa fecha de gestión.
         Devuelve (cobrado_total, transacciones, contratos_que_pagaron).
         """
+        marker = AnalyticsService._cohorte_orphan_precomputed(
+            db, resolved_cutoff, effective_cartera_month
+        )
+        if marker is not None:
+            if not (
+                un_filter or supervisor_filter or gestor_filter or via_filter or category_filter
+            ):
+                return float(marker.cobrado or 0.0), int(marker.transacciones or 0), int(marker.pagaron or 0)
+            cobrado, tx, pagaron = (
+                AnalyticsService._cohorte_orphan_precomputed_query(
+                    db,
+                    resolved_cutoff,
+                    un_filter,
+                    supervisor_filter,
+                    gestor_filter,
+                    via_filter,
+                    category_filter,
+                )
+                .with_entities(
+                    func.coalesce(func.sum(CobranzasOrphanContract.cobrado), 0.0),
+                    func.coalesce(func.sum(CobranzasOrphanContract.transacciones), 0),
+                    func.count(
+                        func.distinct(
+                            case(
+                                (
+                                    CobranzasOrphanContract.pagos_positivos > 0,
+                                    CobranzasOrphanContract.contract_id,
+                                ),
+                                else_=None,
+                            )
+                        )
+                    ),
+                )
+                .first()
+            )
+            return float(cobrado or 0.0), int(tx or 0), int(pagaron or 0)
+
         cids = AnalyticsService._contract_ids_in_cartera_for_month(
             db, effective_cartera_month
         )
@@ -2538,24 +2672,30 @@ class AnalyticsService:
         return totals, by_sale_month_rows, by_year_out, by_cutoff_month_out, {"rows_count": len(preagg_rows)}
 
     @staticmethod
-    def fetch_cobranzas_cohorte_first_paint_v2(
-        db: Session, filters: CobranzasCohorteFirstPaintIn
-    ) -> dict:
+    def _resolve_cohorte_cutoff_months(
+        db: Session, filters: CobranzasCohorteIn
+    ) -> tuple[list[str], str]:
         # Acepta rango de meses acumulado
         explicit_months = [str(m).strip() for m in (filters.cutoff_months or []) if _month_serial(str(m).strip()) > 0]
         if explicit_months:
-            resolved_months = explicit_months
-            resolved_cutoff = _latest_month(explicit_months)
-        else:
-            resolved_cutoff = str(filters.cutoff_month or "").strip()
-            if not resolved_cutoff:
-                available_months = [
-                    str(v[0]).strip()
-                    for v in db.query(CobranzasCohorteAgg.cutoff_month).distinct().all()
-                    if _month_serial(str(v[0] or "").strip()) > 0
-                ]
-                resolved_cutoff = _latest_month(available_months)
-            resolved_months = [resolved_cutoff] if resolved_cutoff else []
+            return explicit_months, _latest_month(explicit_months)
+        resolved_cutoff = str(filters.cutoff_month or "").strip()
+        if not resolved_cutoff:
+            available_months = [
+                str(v[0]).strip()
+                for v in db.query(CobranzasCohorteAgg.cutoff_month).distinct().all()
+                if _month_serial(str(v[0] or "").strip()) > 0
+            ]
+            resolved_cutoff = _latest_month(available_months)
+        return ([resolved_cutoff] if resolved_cutoff else []), resolved_cutoff
+
+    @staticmethod
+    def fetch_cobranzas_cohorte_first_paint_v2(
+        db: Session, filters: CobranzasCohorteFirstPaintIn
+    ) -> dict:
+        resolved_months, resolved_cutoff = AnalyticsService._resolve_cohorte_cutoff_months(
+            db, filters
+        )
         if not resolved_months:
             return {
                 "cutoff_month": "",
@@ -2712,38 +2852,58 @@ class AnalyticsService:
         }
 
     @staticmethod
-    def fetch_cobranzas_cohorte_detail_v2(
-        db: Session, filters: CobranzasCohorteDetailIn
-    ) -> dict:
-        base = AnalyticsService.fetch_cobranzas_cohorte_first_paint_v2(
-            db,
-            CobranzasCohorteFirstPaintIn(
-                **filters.model_dump(
-                    exclude={"page", "page_size", "sort_by", "sort_dir"}
-                )
-            ),
+    def _cohorte_detail_sorted(db: Session, filters: CobranzasCohorteDetailIn) -> dict:
+        """
+        Filas by_sale_month del corte ya ordenadas, materializadas una vez por
+        (corte, filtros, orden) en _COHORTE_DETAIL_CACHE. position: sale_month -> índice
+        para resolver el cursor keyset en O(1).
+        """
+        resolved_months, resolved_cutoff = AnalyticsService._resolve_cohorte_cutoff_months(
+            db, filters
         )
-        un_filter = _normalize_str_set(filters.un)
-        supervisor_filter = _normalize_str_set(filters.supervisor)
-        via_filter = _normalize_str_set(filters.via_cobro)
-        category_filter = _normalize_str_set(filters.categoria)
-        _, by_sale_month_rows, _, stats = AnalyticsService._cohorte_preagg_rollup(
-            db,
-            str(base.get("cutoff_month") or ""),
-            un_filter,
-            supervisor_filter,
-            via_filter,
-            category_filter,
+        cache_key = json.dumps(
+            {
+                **filters.model_dump(exclude={"page", "page_size", "after"}),
+                "resolved_months": resolved_months,
+            },
+            sort_keys=True,
+            default=str,
         )
-        rows = by_sale_month_rows
-        if int(stats.get("rows_count") or 0) <= 0:
-            fallback = AnalyticsService.fetch_cobranzas_cohorte_summary_v1(
-                db, CobranzasCohorteIn(**filters.model_dump())
+        cached = _cohorte_detail_cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        rows: list[dict] = []
+        cutoff_month = resolved_cutoff
+        effective_cartera_month = ""
+        if resolved_months:
+            _, rows, _, _, stats = AnalyticsService._cohorte_preagg_rollup(
+                db,
+                resolved_months,
+                None,
+                _normalize_str_set(filters.un),
+                _normalize_str_set(filters.supervisor),
+                _normalize_str_set(filters.gestor),
+                _normalize_str_set(filters.via_cobro),
+                _normalize_str_set(filters.categoria),
             )
-            rows = list(fallback.get("by_sale_month") or [])
+            if int(stats.get("rows_count") or 0) <= 0:
+                fallback = AnalyticsService.fetch_cobranzas_cohorte_summary_v1(
+                    db, CobranzasCohorteIn(**filters.model_dump())
+                )
+                rows = list(fallback.get("by_sale_month") or [])
+                cutoff_month = fallback.get("cutoff_month") or resolved_cutoff
+                effective_cartera_month = (
+                    fallback.get("effective_cartera_month") or resolved_cutoff
+                )
+            else:
+                effective_cartera_month = (
+                    _effective_cartera_month_for_cutoff(db, resolved_cutoff)
+                    or resolved_cutoff
+                )
+
         sort_by = str(filters.sort_by or "sale_month")
-        sort_dir = str(filters.sort_dir or "asc").lower()
-        reverse = sort_dir == "desc"
+        reverse = str(filters.sort_dir or "asc").lower() == "desc"
         if sort_by == "sale_month":
             rows = sorted(
                 rows,
@@ -2751,23 +2911,54 @@ class AnalyticsService:
                 reverse=reverse,
             )
         else:
+            # sale_month desempata para que el orden (y el cursor) sea determinístico.
             rows = sorted(
-                rows, key=lambda r: float(r.get(sort_by) or 0.0), reverse=reverse
+                rows,
+                key=lambda r: (
+                    float(r.get(sort_by) or 0.0),
+                    _month_serial(str(r.get("sale_month") or "")),
+                ),
+                reverse=reverse,
             )
-        page = int(filters.page or 1)
+        entry = {
+            "cutoff_month": cutoff_month or "",
+            "effective_cartera_month": effective_cartera_month or "",
+            "rows": tuple(rows),
+            "position": {
+                str(r.get("sale_month") or ""): idx for idx, r in enumerate(rows)
+            },
+        }
+        _cohorte_detail_cache_set(cache_key, entry)
+        return entry
+
+    @staticmethod
+    def fetch_cobranzas_cohorte_detail_v2(
+        db: Session, filters: CobranzasCohorteDetailIn
+    ) -> dict:
+        detail = AnalyticsService._cohorte_detail_sorted(db, filters)
+        rows = detail["rows"]
         page_size = int(filters.page_size or 24)
         total_items = len(rows)
-        start = (page - 1) * page_size
+        after = str(filters.after or "").strip()
+        if after and after in detail["position"]:
+            start = detail["position"][after] + 1
+            page = start // page_size + 1
+        else:
+            # Cursor desconocido (p. ej. tras un sync): se pagina por offset.
+            page = int(filters.page or 1)
+            start = (page - 1) * page_size
         end = start + page_size
-        items = rows[start:end]
+        items = [dict(r) for r in rows[start:end]]
+        has_next = end < total_items
         return {
-            "cutoff_month": base.get("cutoff_month") or "",
-            "effective_cartera_month": base.get("effective_cartera_month") or "",
+            "cutoff_month": detail["cutoff_month"],
+            "effective_cartera_month": detail["effective_cartera_month"],
             "items": items,
             "total_items": total_items,
             "page": page,
             "page_size": page_size,
-            "has_next": end < total_items,
+            "has_next": has_next,
+            "next_cursor": str(items[-1].get("sale_month") or "") if has_next and items else None,
             "meta": {
                 "source": "api-v1",
                 "source_table": "cobranzas_cohorte_agg",
@@ -2828,36 +3019,68 @@ class AnalyticsService:
         gestor_filter = _normalize_str_set(filters.gestor)
         via_filter = _normalize_str_set(filters.via_cobro)
         category_filter = _normalize_str_set(filters.categoria)
-        cids = AnalyticsService._contract_ids_in_cartera_for_month(
-            db, effective_cartera_month
-        )
-        q = AnalyticsService._cohorte_orphan_fact_query(
-            db,
-            resolved_cutoff,
-            cids,
-            un_filter,
-            supervisor_filter,
-            gestor_filter,
-            via_filter,
-            category_filter,
-        )
-        agg_rows = (
-            q.with_entities(
-                CobranzasFact.contract_id,
-                func.max(func.coalesce(CobranzasFact.un, "")).label("un"),
-                func.max(func.coalesce(CobranzasFact.supervisor, "")).label(
-                    "supervisor"
-                ),
-                func.max(func.coalesce(CobranzasFact.via, "")).label("via"),
-                func.max(CobranzasFact.tramo).label("tramo"),
-                func.count().label("transacciones"),
-                func.coalesce(func.sum(CobranzasFact.payment_amount), 0.0).label(
-                    "cobrado"
-                ),
+        source_table = "cobranzas_fact"
+        if AnalyticsService._cohorte_orphan_precomputed(
+            db, resolved_cutoff, effective_cartera_month
+        ) is not None:
+            source_table = "cobranzas_orphan_contract"
+            q = AnalyticsService._cohorte_orphan_precomputed_query(
+                db,
+                resolved_cutoff,
+                un_filter,
+                supervisor_filter,
+                gestor_filter,
+                via_filter,
+                category_filter,
+            )
+            agg_rows = (
+                q.with_entities(
+                    CobranzasOrphanContract.contract_id,
+                    func.max(CobranzasOrphanContract.un).label("un"),
+                    func.max(CobranzasOrphanContract.supervisor).label("supervisor"),
+                    func.max(CobranzasOrphanContract.via).label("via"),
+                    func.max(CobranzasOrphanContract.tramo).label("tramo"),
+                    func.sum(CobranzasOrphanContract.transacciones).label(
+                        "transacciones"
+                    ),
+                    func.coalesce(func.sum(CobranzasOrphanContract.cobrado), 0.0).label(
+                        "cobrado"
+                    ),
+                )
+                .group_by(CobranzasOrphanContract.contract_id)
+                .all()
+            )
+        else:
+            cids = AnalyticsService._contract_ids_in_cartera_for_month(
+                db, effective_cartera_month
+            )
+            q = AnalyticsService._cohorte_orphan_fact_query(
+                db,
+                resolved_cutoff,
+                cids,
+                un_filter,
+                supervisor_filter,
+                gestor_filter,
+                via_filter,
+                category_filter,
+            )
+            agg_rows = (
+                q.with_entities(
+                    CobranzasFact.contract_id,
+                    func.max(func.coalesce(CobranzasFact.un, "")).label("un"),
+                    func.max(func.coalesce(CobranzasFact.supervisor, "")).label(
+                        "supervisor"
+                    ),
+                    func.max(func.coalesce(CobranzasFact.via, "")).label("via"),
+                    func.max(CobranzasFact.tramo).label("tramo"),
+                    func.count().label("transacciones"),
+                    func.coalesce(func.sum(CobranzasFact.payment_amount), 0.0).label(
+                        "cobrado"
+                    ),
+                )
+                .group_by(CobranzasFact.contract_id)
+                .all()
             )
-            .group_by(CobranzasFact.contract_id)
-            .all()
-        )
         items_raw: list[dict] = []
         for contract_id, un, supervisor, via, tramo, transacciones, cobrado in agg_rows:
             cid = str(contract_id or "").strip()
@@ -2915,7 +3138,7 @@ class AnalyticsService:
             },
             "meta": {
                 "source": "api-v1",
-                "source_table": "cobranzas_fact",
+                "source_table": source_table,
                 "payload_mode": "orphan_detail",
                 "generated_at": datetime.utcnow().isoformat(),
             },
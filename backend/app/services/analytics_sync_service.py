@@ -2,10 +2,10 @@
 from datetime import datetime
 from pathlib import Path
 
-import mysql.connector
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.mysql_pool import mysql_pool
 from app.models.brokers import AnalyticsContractSnapshot
 from app.services.brokers_config_service import BrokersConfigService
 
@@ -78,20 +78,18 @@ def sync_from_mysql(db: Session, progress_cb=None) -> dict:
         'connection_timeout': 10,
     }
     try:
-        conn = mysql.connector.connect(**mysql_config)
-        try:
-            if hasattr(conn, '_socket') and conn._socket is not None:
-                conn._socket.settimeout(120)
-        except Exception:
-            pass
-        cursor = conn.cursor(dictionary=True)
-        query_sql = query_path.read_text(encoding='utf-8')
-        if callable(progress_cb):
-            progress_cb(stage='querying_mysql', progress_pct=15, message='Ejecutando query_analytics.sql...')
-        cursor.execute(query_sql)
-        rows_raw = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        with mysql_pool.connection(mysql_config, purpose='extract') as conn:
+            try:
+                conn.set_socket_timeout(120)
+            except Exception:
+                pass
+            cursor = conn.cursor(dictionary=True)
+            query_sql = query_path.read_text(encoding='utf-8')
+            if callable(progress_cb):
+                progress_cb(stage='querying_mysql', progress_pct=15, message='Ejecutando query_analytics.sql...')
+            cursor.execute(query_sql)
+            rows_raw = cursor.fetchall()
+            cursor.close()
     except Exception as e:
         return {'rows_inserted': 0, 'error': f'Error MySQL: {e}'}
 
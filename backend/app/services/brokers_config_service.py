@@ -1,12 +1,12 @@
 from app.core.auth_refresh import clear_user_lockout
 from app.core.security import ROLE_PERMISSIONS, hash_password
 from app.core.config import settings
+from app.core.mysql_pool import mysql_pool
 from app.repositories import brokers_config
 from app.services.dashboard_filter_layouts import (
     PREF_KEY as DASHBOARD_FILTER_LAYOUTS_PREF_KEY,
     normalize_dashboard_filter_layouts_payload,
 )
-import mysql.connector
 import time
 
 
@@ -33,16 +33,11 @@ class BrokersConfigService:
             'consume_results': True,
         }
         started = time.perf_counter()
-        conn = mysql.connector.connect(**cfg)
-        try:
-            cursor = conn.cursor()
-            try:
-                cursor.execute('SELECT 1')
-                cursor.fetchone()
-            finally:
-                cursor.close()
-        finally:
-            conn.close()
+        # Same config as a pooled connection means it already authenticated; a new one does a handshake.
+        with mysql_pool.connection(cfg, purpose='admin', timeout=10) as conn:
+            cursor = conn.prepared_cursor('SELECT 1')
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
         latency_ms = int((time.perf_counter() - started) * 1000)
         return {
             'ok': True,
@@ -0,0 +1,251 @@
+"""
+Snapshots persistentes de los payloads first-paint (tabla first_paint_snapshots).
+
+Al final de cada sync, despues de refrescar la capa semantica y del prewarm, se serializa el
+payload first-paint de los filtros por defecto de cada vista (JSON ya decorado con meta),
+se comprime con gzip y se guarda con su ETag. La API lo sirve directo desde la tabla: un
+proceso recien levantado responde first-paint con una consulta indexada, sin tocar las
+tablas de hechos/agregados, y un If-None-Match vigente responde 304 sin cuerpo.
+
+Los payloads first-paint no dependen del rol del usuario (solo de los filtros), por eso la
+clave es (endpoint, firma de filtros) con la misma firma que app.core.analytics_cache.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.analytics_cache import get as cache_get, signature as filters_signature
+from app.core.config import settings
+from app.core.request_metrics import note_cache_hit
+from app.models.brokers import FirstPaintSnapshot
+from app.schemas.analytics import AnalyticsFilters, CobranzasCohorteFirstPaintIn, PortfolioSummaryIn
+from app.services.analytics_service import AnalyticsService
+
+_GZIP_LEVEL = 6
+# Payloads ya descomprimidos por (endpoint, etag): evita gunzip en cada request del mismo worker.
+_DECODED_MAX_ENTRIES = 32
+_decoded: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+_decoded_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class SnapshotSpec:
+    endpoint: str
+    default_filters: Callable[[], Any]
+    fetch: Callable[[Session, Any], dict]
+    source_table: str
+    domains: frozenset[str]
+
+
+SNAPSHOT_SPECS: tuple[SnapshotSpec, ...] = (
+    SnapshotSpec(
+        'portfolio-corte-v2/first-paint',
+        lambda: PortfolioSummaryIn(include_rows=False),
+        AnalyticsService.fetch_portfolio_corte_first_paint_v2,
+        'cartera_corte_agg',
+        frozenset({'cartera', 'cobranzas', 'analytics'}),
+    ),
+    SnapshotSpec(
+        'rendimiento-v2/first-paint',
+        AnalyticsFilters,
+        AnalyticsService.fetch_rendimiento_first_paint_v2,
+        'analytics_rendimiento_agg',
+        frozenset({'cartera', 'cobranzas', 'analytics'}),
+    ),
+    SnapshotSpec(
+        'anuales-v2/first-paint',
+        AnalyticsFilters,
+        AnalyticsService.fetch_anuales_first_paint_v2,
+        'analytics_anuales_agg',
+        frozenset({'cartera', 'cobranzas', 'analytics'}),
+    ),
+    SnapshotSpec(
+        'cobranzas-cohorte-v2/first-paint',
+        CobranzasCohorteFirstPaintIn,
+        AnalyticsService.fetch_cobranzas_cohorte_first_paint_v2,
+        'cobranzas_cohorte_agg',
+        frozenset({'cartera', 'cobranzas'}),
+    ),
+)
+_SPECS_BY_ENDPOINT = {spec.endpoint: spec for spec in SNAPSHOT_SPECS}
+_default_signatures: dict[str, str] = {}
+
+
+@dataclass(frozen=True)
+class FirstPaintHit:
+    etag: str
+    body: bytes
+
+
+def _default_signature(endpoint: str) -> str | None:
+    spec = _SPECS_BY_ENDPOINT.get(endpoint)
+    if spec is None:
+        return None
+    sig = _default_signatures.get(endpoint)
+    if sig is None:
+        sig = _default_signatures[endpoint] = filters_signature(spec.default_filters())
+    return sig
+
+
+def encode_payload(payload: dict) -> tuple[bytes, str]:
+    """JSON canonico (mismo encoder que FastAPI) y su ETag (sha256 truncado)."""
+    raw = json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, sort_keys=True, separators=(',', ':')
+    ).encode('utf-8')
+    return raw, hashlib.sha256(raw).hexdigest()[:32]
+
+
+def _insert_for(db: Session):
+    return pg_insert if db.bind.dialect.name == 'postgresql' else sqlite_insert
+
+
+def store_first_paint_snapshot(
+    db: Session, endpoint: str, filters: Any, payload: dict, *, compute_ms: float = 0.0
+) -> str:
+    """Upsert del snapshot (endpoint, firma de filtros). Devuelve el ETag. No hace commit."""
+    spec = _SPECS_BY_ENDPOINT[endpoint]
+    decorated = AnalyticsService.attach_meta(db, payload, cache_hit=True, source_table=spec.source_table)
+    raw, etag = encode_payload(decorated)
+    filters_data = filters.model_dump() if hasattr(filters, 'model_dump') else dict(filters or {})
+    values = {
+        'endpoint': endpoint,
+        'filters_hash': filters_signature(filters),
+        'filters_json': json.dumps(filters_data, sort_keys=True, default=str),
+        'etag': etag,
+        'payload_gz': gzip.compress(raw, compresslevel=_GZIP_LEVEL),
+        'payload_bytes': len(raw),
+        'compute_ms': round(float(compute_ms), 2),
+        'updated_at': datetime.utcnow(),
+    }
+    table = FirstPaintSnapshot.__table__
+    stmt = _insert_for(db)(table).values(values)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[table.c.endpoint, table.c.filters_hash],
+            set_={k: stmt.excluded[k] for k in values if k not in ('endpoint', 'filters_hash')},
+        )
+    )
+    return etag
+
+
+def refresh_first_paint_snapshots(db: Session, domain: str, append_log=None) -> dict[str, str]:
+    """
+    Recalcula y persiste los snapshots del dominio sincronizado (fin de la capa semantica).
+    Reusa el payload del prewarm en memoria si esta; si un endpoint falla se borra su snapshot
+    para no seguir sirviendo datos previos al sync. Commit por endpoint (best-effort).
+    """
+    if not settings.first_paint_snapshots_enabled:
+        return {}
+    out: dict[str, str] = {}
+    for spec in SNAPSHOT_SPECS:
+        if domain not in spec.domains:
+            continue
+        filters = spec.default_filters()
+        started = time.perf_counter()
+        try:
+            payload = cache_get(spec.endpoint, filters)
+            if payload is None:
+                payload = spec.fetch(db, filters)
+            compute_ms = (time.perf_counter() - started) * 1000
+            out[spec.endpoint] = store_first_paint_snapshot(db, spec.endpoint, filters, payload, compute_ms=compute_ms)
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            delete_first_paint_snapshots(db, spec.endpoint)
+            out[spec.endpoint] = 'error'
+            if append_log is not None:
+                append_log(domain, f"Snapshot first-paint omitido ({spec.endpoint}): {exc}")
+    if out and append_log is not None:
+        append_log(domain, "Snapshots first-paint: " + ", ".join(f"{k}={v}" for k, v in out.items()))
+    return out
+
+
+def delete_first_paint_snapshots(db: Session, endpoint: str | None = None) -> int:
+    try:
+        query = db.query(FirstPaintSnapshot)
+        if endpoint is not None:
+            query = query.filter(FirstPaintSnapshot.endpoint == endpoint)
+        deleted = query.delete(synchronize_session=False)
+        db.commit()
+        return int(deleted or 0)
+    except Exception:
+        db.rollback()
+        return 0
+
+
+def load_first_paint_snapshot(db: Session, endpoint: str, filters: Any) -> FirstPaintHit | None:
+    """
+    Snapshot vigente para (endpoint, filtros) o None. Solo consulta la tabla si los filtros
+    coinciden con los que se persisten; primero lee el ETag y solo descomprime si no esta en memoria.
+    """
+    if not settings.first_paint_snapshots_enabled:
+        return None
+    sig = filters_signature(filters)
+    if sig != _default_signature(endpoint):
+        return None
+    try:
+        row = (
+            db.query(FirstPaintSnapshot.id, FirstPaintSnapshot.etag)
+            .filter(FirstPaintSnapshot.endpoint == endpoint, FirstPaintSnapshot.filters_hash == sig)
+            .first()
+        )
+    except Exception:
+        # Tabla aun no migrada u otro error: rollback para que el calculo en vivo use la sesion limpia.
+        db.rollback()
+        return None
+    if row is None:
+        return None
+    key = (endpoint, str(row.etag))
+    with _decoded_lock:
+        body = _decoded.get(key)
+        if body is not None:
+            _decoded.move_to_end(key)
+            return FirstPaintHit(etag=key[1], body=body)
+    payload_gz = db.query(FirstPaintSnapshot.payload_gz).filter(FirstPaintSnapshot.id == row.id).scalar()
+    if payload_gz is None:
+        return None
+    body = gzip.decompress(payload_gz)
+    with _decoded_lock:
+        _decoded[key] = body
+        _decoded.move_to_end(key)
+        while len(_decoded) > _DECODED_MAX_ENTRIES:
+            _decoded.popitem(last=False)
+    return FirstPaintHit(etag=key[1], body=body)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {c.strip().removeprefix('W/').strip('"') for c in if_none_match.split(',')}
+    return '*' in candidates or etag in candidates
+
+
+def first_paint_snapshot_response(db: Session, endpoint: str, filters: Any, if_none_match: str | None):
+    """Response (200 con el JSON persistido o 304) si hay snapshot; None para caer al calculo en vivo."""
+    hit = load_first_paint_snapshot(db, endpoint, filters)
+    if hit is None:
+        return None
+    note_cache_hit(True)
+    headers = {'ETag': f'"{hit.etag}"', 'Cache-Control': 'private, no-cache'}
+    if etag_matches(if_none_match, hit.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=hit.body, media_type='application/json', headers=headers)
+
+
+def reset_decoded_cache() -> None:
+    with _decoded_lock:
+        _decoded.clear()
@@ -0,0 +1,401 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Sequence
+
+from app.services.sync_extractors import append_where_predicate
+
+try:  # Optional: binlog tailing needs the `mysql-replication` package.
+    from pymysqlreplication import BinLogStreamReader as _BinLogStreamReader
+    from pymysqlreplication.row_event import (
+        DeleteRowsEvent as _DeleteRowsEvent,
+        UpdateRowsEvent as _UpdateRowsEvent,
+        WriteRowsEvent as _WriteRowsEvent,
+    )
+except Exception:  # pragma: no cover - depends on the environment
+    _BinLogStreamReader = None
+    _DeleteRowsEvent = _UpdateRowsEvent = _WriteRowsEvent = None
+
+CDC_BACKENDS = ("change_table", "binlog")
+CDC_CHANGE_TABLE = "bi_cdc_changes"
+_IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_QUALIFIED_IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?$")
+
+
+@dataclass(frozen=True)
+class CdcSourceTable:
+    """Source table whose row changes affect a domain.
+
+    `key_column` holds the contract id, or (with `lookup`) a key that resolves to
+    it: `lookup=(table, id_column, contract_column)`.
+    """
+
+    name: str
+    key_column: str
+    lookup: tuple[str, str, str] | None = None
+
+    def trigger_expr(self, row_alias: str) -> str:
+        ref = f"{row_alias}.`{self.key_column}`"
+        if self.lookup is None:
+            return ref
+        table, id_col, contract_col = self.lookup
+        return f"(SELECT `{contract_col}` FROM `{table}` WHERE `{id_col}` = {ref} LIMIT 1)"
+
+
+@dataclass(frozen=True)
+class CdcDomainSpec:
+    # Source expression of the contract id in the domain query's FROM (same in v1 and v2).
+    source_key_expr: str
+    tables: tuple[CdcSourceTable, ...]
+
+
+CDC_DOMAIN_SPECS: dict[str, CdcDomainSpec] = {
+    "cobranzas": CdcDomainSpec(
+        source_key_expr="p.contract_id",
+        tables=(
+            CdcSourceTable("payments", "contract_id"),
+            CdcSourceTable("account_payment_ways", "payment_id", lookup=("payments", "id", "contract_id")),
+            CdcSourceTable("contracts", "id"),
+        ),
+    ),
+    "cartera": CdcDomainSpec(
+        source_key_expr="ccd.contract_id",
+        tables=(
+            CdcSourceTable("contract_closed_dates", "contract_id"),
+            CdcSourceTable("contracts", "id"),
+            CdcSourceTable("contract_situations", "contract_id"),
+            CdcSourceTable("detail_client_portfolios", "contract_id"),
+            CdcSourceTable("contracting_entities", "contract_id"),
+        ),
+    ),
+}
+
+
+class CdcUnavailable(RuntimeError):
+    """CDC backend cannot be used (missing package, privileges or change table)."""
+
+
+@dataclass
+class CdcChanges:
+    backend: str
+    start_position: str
+    end_position: str
+    contract_ids: set[int] = field(default_factory=set)
+    events: int = 0
+    truncated: bool = False
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "from": self.start_position,
+            "to": self.end_position,
+            "events": int(self.events),
+            "contracts": len(self.contract_ids),
+            "truncated": bool(self.truncated),
+        }
+
+
+def cdc_partition_key(backend: str) -> str:
+    return f"cdc:{backend}"
+
+
+def _contract_id(value: object) -> int | None:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        parsed = int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed > 0 else None
+
+
+def build_cdc_query(base_sql: str, key_expr: str, contract_ids: Iterable[int]) -> str:
+    """Restrict the domain query to the given contracts inside its own WHERE.
+
+    Not wrapped as a derived table: cobranzas selects p.id and pm.id (MySQL ERROR 1060).
+    Ids are validated integers and inlined: the base queries contain `LIKE '%..%'`
+    literals, which the connector would read as placeholders if params were passed.
+    """
+    if not _QUALIFIED_IDENT_RE.match(str(key_expr or "")):
+        raise ValueError(f"columna clave invalida: {key_expr}")
+    ids = sorted({i for i in (_contract_id(v) for v in contract_ids) if i is not None})
+    if not ids:
+        raise ValueError("build_cdc_query requiere al menos un contrato")
+    in_list = ",".join(str(i) for i in ids)
+    return append_where_predicate(base_sql, f"{key_expr} IN ({in_list})")
+
+
+def chunked_ids(contract_ids: Iterable[int], size: int) -> list[list[int]]:
+    ids = sorted(set(contract_ids))
+    size = max(1, int(size or 1))
+    return [ids[i : i + size] for i in range(0, len(ids), size)]
+
+
+# ---------------------------------------------------------------------------
+# Change table (triggers on the source)
+# ---------------------------------------------------------------------------
+
+
+def change_table_ddl(table: str = CDC_CHANGE_TABLE) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS `{table}` (\n"
+        "  id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,\n"
+        "  table_name VARCHAR(64) NOT NULL,\n"
+        "  contract_id BIGINT NULL,\n"
+        "  changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,\n"
+        "  KEY ix_bi_cdc_changes_table_id (table_name, id),\n"
+        "  KEY ix_bi_cdc_changes_changed_at (changed_at)\n"
+        ") ENGINE=InnoDB"
+    )
+
+
+def trigger_ddl(domains: Sequence[str] | None = None, table: str = CDC_CHANGE_TABLE) -> list[str]:
+    """DROP/CREATE TRIGGER statements that feed the change table (one per table and event)."""
+    seen: set[str] = set()
+    statements: list[str] = []
+    for domain in domains or sorted(CDC_DOMAIN_SPECS):
+        for source in CDC_DOMAIN_SPECS[domain].tables:
+            if source.name in seen:
+                continue
+            seen.add(source.name)
+            for event, aliases in (("INSERT", ("NEW",)), ("UPDATE", ("NEW", "OLD")), ("DELETE", ("OLD",))):
+                name = f"bi_cdc_{source.name}_{event.lower()}"[:64]
+                inserts = []
+                for alias in aliases:
+                    inserts.append(
+                        f"INSERT INTO `{table}` (table_name, contract_id) "
+                        f"VALUES ('{source.name}', {source.trigger_expr(alias)});"
+                    )
+                if event == "UPDATE":
+                    # Only log the old contract again when the row moved to another one.
+                    inserts[1] = (
+                        f"IF NOT ({source.trigger_expr('NEW')} <=> {source.trigger_expr('OLD')}) THEN "
+                        f"{inserts[1]} END IF;"
+                    )
+                statements.append(f"DROP TRIGGER IF EXISTS `{name}`")
+                statements.append(
+                    f"CREATE TRIGGER `{name}` AFTER {event} ON `{source.name}` FOR EACH ROW "
+                    f"BEGIN {' '.join(inserts)} END"
+                )
+    return statements
+
+
+def change_table_head(conn, table: str = CDC_CHANGE_TABLE) -> str:
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM `{table}`")
+        row = cursor.fetchone()
+    except Exception as exc:
+        raise CdcUnavailable(f"tabla de cambios no disponible: {exc}") from exc
+    finally:
+        cursor.close()
+    return str(int((row or (0,))[0] or 0))
+
+
+def read_change_table(
+    conn,
+    domain: str,
+    position: str,
+    *,
+    max_contracts: int,
+    batch_size: int = 5000,
+    table: str = CDC_CHANGE_TABLE,
+) -> CdcChanges:
+    """Contracts touched after `position` (a change-table id), up to the current head."""
+    spec = CDC_DOMAIN_SPECS[domain]
+    names = tuple(sorted({t.name for t in spec.tables}))
+    after_id = int(position or 0)
+    head = int(change_table_head(conn, table))
+    changes = CdcChanges("change_table", str(after_id), str(head))
+    placeholders = ",".join(["%s"] * len(names))
+    sql = (
+        f"SELECT id, contract_id FROM `{table}` "
+        f"WHERE id > %s AND id <= %s AND table_name IN ({placeholders}) "
+        "ORDER BY id LIMIT %s"
+    )
+    cursor = conn.cursor()
+    try:
+        while after_id < head:
+            cursor.execute(sql, (after_id, head, *names, int(batch_size)))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            for change_id, contract in rows:
+                changes.events += 1
+                cid = _contract_id(contract)
+                if cid is not None:
+                    changes.contract_ids.add(cid)
+            after_id = int(rows[-1][0])
+            if len(changes.contract_ids) > max_contracts:
+                changes.truncated = True
+                break
+    finally:
+        cursor.close()
+    return changes
+
+
+def purge_change_table(conn, *, keep_days: int, table: str = CDC_CHANGE_TABLE) -> int:
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            f"DELETE FROM `{table}` WHERE changed_at < NOW() - INTERVAL %s DAY",
+            (max(1, int(keep_days)),),
+        )
+        deleted = int(cursor.rowcount or 0)
+        conn.commit()
+    finally:
+        cursor.close()
+    return deleted
+
+
+# ---------------------------------------------------------------------------
+# Binlog (row-based replication stream)
+# ---------------------------------------------------------------------------
+
+
+def binlog_available() -> bool:
+    return _BinLogStreamReader is not None
+
+
+def binlog_head(conn) -> str:
+    cursor = conn.cursor()
+    try:
+        row = None
+        for sql in ("SHOW BINARY LOG STATUS", "SHOW MASTER STATUS"):
+            try:
+                cursor.execute(sql)
+                row = cursor.fetchone()
+                break
+            except Exception:
+                continue
+    finally:
+        cursor.close()
+    if not row:
+        raise CdcUnavailable("binlog deshabilitado o sin privilegio REPLICATION CLIENT")
+    return f"{row[0]}:{int(row[1])}"
+
+
+def _split_binlog_position(position: str) -> tuple[str, int]:
+    log_file, _, log_pos = str(position or "").rpartition(":")
+    if not log_file:
+        raise CdcUnavailable(f"posicion de binlog invalida: {position!r}")
+    return log_file, int(log_pos)
+
+
+def _resolve_lookups(conn, pending: dict[tuple[str, str, str], set[int]]) -> set[int]:
+    resolved: set[int] = set()
+    cursor = conn.cursor()
+    try:
+        for (table, id_col, contract_col), keys in pending.items():
+            for chunk in chunked_ids(keys, 1000):
+                placeholders = ",".join(["%s"] * len(chunk))
+                cursor.execute(
+                    f"SELECT DISTINCT `{contract_col}` FROM `{table}` WHERE `{id_col}` IN ({placeholders})",
+                    tuple(chunk),
+                )
+                for (contract,) in cursor.fetchall():
+                    cid = _contract_id(contract)
+                    if cid is not None:
+                        resolved.add(cid)
+    finally:
+        cursor.close()
+    return resolved
+
+
+def read_binlog(
+    conn,
+    mysql_config: dict[str, Any],
+    domain: str,
+    position: str,
+    *,
+    max_contracts: int,
+    server_id: int,
+) -> CdcChanges:
+    """Contracts touched between `position` ("file:pos") and the current binlog head.
+
+    Requires binlog_format=ROW and a user with REPLICATION SLAVE/CLIENT.
+    """
+    if _BinLogStreamReader is None:
+        raise CdcUnavailable("paquete mysql-replication no instalado")
+    spec = CDC_DOMAIN_SPECS[domain]
+    by_table = {t.name: t for t in spec.tables}
+    head = binlog_head(conn)
+    head_file, head_pos = _split_binlog_position(head)
+    log_file, log_pos = _split_binlog_position(position)
+    changes = CdcChanges("binlog", position, head)
+    pending: dict[tuple[str, str, str], set[int]] = {}
+    stream = _BinLogStreamReader(
+        connection_settings={
+            "host": mysql_config.get("host"),
+            "port": int(mysql_config.get("port") or 3306),
+            "user": mysql_config.get("user"),
+            "passwd": mysql_config.get("password") or "",
+        },
+        server_id=int(server_id),
+        log_file=log_file,
+        log_pos=log_pos,
+        resume_stream=True,
+        blocking=False,
+        only_events=[_WriteRowsEvent, _UpdateRowsEvent, _DeleteRowsEvent],
+        only_tables=sorted(by_table),
+        only_schemas=[mysql_config.get("database")] if mysql_config.get("database") else None,
+    )
+    try:
+        for event in stream:
+            current_file = str(getattr(stream, "log_file", "") or "")
+            current_pos = int(getattr(stream, "log_pos", 0) or 0)
+            if (current_file, current_pos) > (head_file, head_pos):
+                break
+            source = by_table.get(str(getattr(event, "table", "")))
+            if source is None:
+                continue
+            for row in event.rows:
+                changes.events += 1
+                for values in (row.get("values"), row.get("after_values"), row.get("before_values")):
+                    if not values:
+                        continue
+                    key = _contract_id(values.get(source.key_column))
+                    if key is None:
+                        continue
+                    if source.lookup is None:
+                        changes.contract_ids.add(key)
+                    else:
+                        pending.setdefault(source.lookup, set()).add(key)
+            if len(changes.contract_ids) + sum(len(v) for v in pending.values()) > max_contracts:
+                changes.truncated = True
+                break
+    finally:
+        stream.close()
+    if pending and not changes.truncated:
+        changes.contract_ids |= _resolve_lookups(conn, pending)
+    return changes
+
+
+def source_head(conn, backend: str) -> str:
+    if backend == "binlog":
+        if _BinLogStreamReader is None:
+            raise CdcUnavailable("paquete mysql-replication no instalado")
+        return binlog_head(conn)
+    return change_table_head(conn)
+
+
+def read_changes(
+    conn,
+    mysql_config: dict[str, Any],
+    domain: str,
+    backend: str,
+    position: str,
+    *,
+    max_contracts: int,
+    server_id: int = 4242,
+) -> CdcChanges:
+    if domain not in CDC_DOMAIN_SPECS:
+        raise CdcUnavailable(f"CDC no soportado para {domain}")
+    if backend == "binlog":
+        return read_binlog(
+            conn, mysql_config, domain, position, max_contracts=max_contracts, server_id=server_id
+        )
+    if backend == "change_table":
+        return read_change_table(conn, domain, position, max_contracts=max_contracts)
+    raise CdcUnavailable(f"backend CDC desconocido: {backend}")
@@ -68,6 +68,138 @@ MYSQL_PRECHECK_QUERIES = {
     """,
 }
 
+# Per-month source fingerprints (COUNT, MAX(updated), BIT_XOR(CRC32(row))) computed at the source.
+# They hash the columns the domain query reads from payments/apw and its cheap joins (UN rules,
+# branch, payment method). The v2 Gestor subquery is not hashed (it would cost as much as the
+# extraction), so a signature is only a hint: it expires after SYNC_SOURCE_SUMMARY_MAX_AGE_HOURS
+# and the month is re-extracted (periodic reconcile).
+# `period` is YYYYMM of the month that drives gestion_month; `month_offset` maps it to gestion_month
+# and `date_column` is the source column the month filter is pushed down on (append_where_predicate).
+MYSQL_MONTH_SUMMARY_QUERIES = {
+    "cobranzas": {
+        "sql": f"""
+            SELECT YEAR(p.date) * 100 + MONTH(p.date) AS period,
+                   COUNT(*) AS row_count,
+                   MAX(p.updated_at) AS max_updated,
+                   BIT_XOR(CRC32(CONCAT_WS('|', p.id, apw.id, apw.amount, apw.payment_method_id,
+                                           p.contract_id, p.branch_id, p.date, p.created_at, p.updated_at,
+                                           c.number, c.enterprise_id, c.request_financing_number,
+                                           e.name, b.name, pm.name))) AS xor_crc
+            FROM payments p
+            JOIN account_payment_ways apw ON apw.payment_id = p.id
+            JOIN contracts c ON p.contract_id = c.id
+            JOIN enterprises e ON c.enterprise_id = e.id
+            LEFT JOIN branches b ON p.branch_id = b.id
+            LEFT JOIN payment_methods pm ON apw.payment_method_id = pm.id
+            WHERE p.status = 1
+              AND p.type < 2
+              AND p.date >= '2020-01-01'
+              AND c.enterprise_id IN {ENTERPRISE_SCOPE_IDS}
+              AND p.contract_id NOT IN {COBRANZAS_EXCLUDED_CONTRACT_IDS}
+            GROUP BY period
+        """,
+        # Source column the month filter is pushed down on (index-friendly date range).
+        "date_column": "p.date",
+        "month_offset": 0,
+    },
+    "cartera": {
+        "sql": f"""
+            SELECT YEAR(ccd.closed_date) * 100 + MONTH(ccd.closed_date) AS period,
+                   COUNT(*) AS row_count,
+                   MAX(c.updated_at) AS max_updated,
+                   BIT_XOR(CRC32(CONCAT_WS('|', ccd.contract_id, ccd.closed_date, ccd.total_residue,
+                                           ccd.expired_amount, ccd.quotas_expirations, ccd.days_late,
+                                           ccd.last_payment, ccd.last_collection_manager_id,
+                                           c.status, c.updated_at))) AS xor_crc
+            FROM epem.contract_closed_dates ccd
+            JOIN epem.contracts c ON ccd.contract_id = c.id
+            WHERE ccd.closed_date > '2020-12-31' AND c.enterprise_id IN {ENTERPRISE_SCOPE_IDS}
+            GROUP BY period
+        """,
+        "date_column": "ccd.closed_date",
+        "month_offset": 1,
+    },
+}
+
+
+_SQL_TOKEN_RE = re.compile(
+    r"'(?:[^'\\]|\\.|'')*'"  # string literal
+    r"|`[^`]*`"  # quoted identifier
+    r"|--[^\n]*|#[^\n]*"  # line comment
+    r"|/\*.*?\*/"  # block comment
+    r"|[()]",
+    re.S,
+)
+_TOP_LEVEL_TAIL_RE = re.compile(
+    r"\b(GROUP\s+BY|HAVING|ORDER\s+BY|LIMIT|UNION|WINDOW|FOR\s+UPDATE)\b", re.I
+)
+_SQL_QUALIFIED_IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?$")
+
+
+def _top_level_sql(sql: str) -> str:
+    """Copy of `sql` with literals, comments and anything inside parentheses blanked out."""
+    out = list(sql)
+    depth = 0
+    pos = 0
+    for match in _SQL_TOKEN_RE.finditer(sql):
+        start, end = match.span()
+        if depth > 0:
+            out[pos:start] = " " * (start - pos)
+        token = match.group(0)
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth = max(0, depth - 1)
+        out[start:end] = " " * (end - start)
+        pos = end
+    if depth > 0:
+        out[pos:] = " " * (len(sql) - pos)
+    return "".join(out)
+
+
+def append_where_predicate(base_sql: str, predicate: str) -> str:
+    """AND a predicate onto the top-level WHERE of a domain query, without wrapping it.
+
+    Wrapping as `SELECT * FROM (...) _src` breaks on MySQL when the query selects two
+    columns with the same name (cobranzas: p.id and pm.id -> ERROR 1060). The existing
+    condition is parenthesized so a top-level OR cannot change precedence. Only queries
+    whose last top-level clause is WHERE are supported.
+    """
+    sql = str(base_sql or "").strip()
+    while sql.endswith(";"):
+        sql = sql[:-1].rstrip()
+    top = _top_level_sql(sql)
+    wheres = list(re.finditer(r"\bWHERE\b", top, re.I))
+    if not wheres:
+        raise ValueError("la query no tiene WHERE de nivel superior")
+    where_end = wheres[-1].end()
+    if _TOP_LEVEL_TAIL_RE.search(top, where_end):
+        raise ValueError("la query tiene clausulas despues del WHERE de nivel superior")
+    return f"{sql[:where_end]} (\n{sql[where_end:].strip()}\n) AND ({predicate})"
+
+
+def month_range_predicate(date_column: str, periods: list[int]) -> str:
+    """`col >= 'YYYY-MM-01' AND col < next` per run of consecutive YYYYMM periods, OR'ed."""
+    if not _SQL_QUALIFIED_IDENT_RE.match(str(date_column or "")):
+        raise ValueError(f"columna de fecha invalida: {date_column}")
+    indexes = sorted({(int(p) // 100) * 12 + (int(p) % 100 - 1) for p in periods})
+    if not indexes:
+        raise ValueError("sin meses para filtrar")
+    runs: list[tuple[int, int]] = []
+    for idx in indexes:
+        if runs and idx == runs[-1][1]:
+            runs[-1] = (runs[-1][0], idx + 1)
+        else:
+            runs.append((idx, idx + 1))
+
+    def first_day(idx: int) -> str:
+        return f"{idx // 12:04d}-{idx % 12 + 1:02d}-01"
+
+    return " OR ".join(
+        f"({date_column} >= '{first_day(lo)}' AND {date_column} < '{first_day(hi)}')"
+        for lo, hi in runs
+    )
+
 
 def repo_root() -> Path:
     return Path(__file__).resolve().parents[3]
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Per worker process: compiled (normalize, markers) keyed by (domain, columns).
+_worker_normalizers: dict[tuple[str, tuple], tuple[Callable, Callable]] = {}
+
+
+def _normalizers_for(domain: str, columns: tuple) -> tuple[Callable, Callable]:
+    key = (domain, columns)
+    cached = _worker_normalizers.get(key)
+    if cached is None:
+        from app.services.sync_service import _row_normalizer_for
+
+        cached = _row_normalizer_for(domain, columns)
+        _worker_normalizers.clear()
+        _worker_normalizers[key] = cached
+    return cached
+
+
+def normalize_batch_columnar(
+    domain: str, columns: tuple, rows: Sequence[tuple], seq_start: int
+) -> tuple[tuple[str, ...], list[list], list[tuple]]:
+    """Normalize one raw batch; returns (fields, column values, source markers) in input order.
+
+    Runs inside pool workers, so everything it returns is plain picklable data.
+    """
+    normalize, markers = _normalizers_for(domain, columns)
+    fields: tuple[str, ...] = ()
+    values: list[list] = []
+    marks: list[tuple] = []
+    for offset, row in enumerate(rows):
+        marks.append(markers(row))
+        n = normalize(row, seq_start + offset)
+        if not fields:
+            fields = tuple(n.keys())
+            values = [[] for _ in fields]
+        for pos, field in enumerate(fields):
+            values[pos].append(n[field])
+    return fields, values, marks
+
+
+def rows_from_columnar(fields: tuple[str, ...], values: list[list]) -> list[dict]:
+    if not fields:
+        return []
+    return [dict(zip(fields, item)) for item in zip(*values)]
+
+
+class NormalizationStage:
+    """Turns raw `(columns, batch)` pairs into `(batch_size, [(updated_at, source_id, row), ...])`.
+
+    With `workers > 1` batches are normalized in a process pool while the next
+    ones are fetched; results are yielded strictly in submission order so
+    watermark tracking sees rows exactly as the source returned them. Any pool
+    failure (spawn, pickling, broken worker) switches the stage to inline mode
+    and the affected batches are normalized again in-process.
+    """
+
+    def __init__(self, domain: str, *, workers: int = 0, max_in_flight: int | None = None) -> None:
+        self.domain = domain
+        self.workers = max(0, int(workers or 0))
+        self.max_in_flight = max(1, int(max_in_flight or (self.workers * 2) or 1))
+        self.mode = "process" if self.workers > 1 else "inline"
+        self.fallback_reason = ""
+        self.batches = 0
+        self._pool: ProcessPoolExecutor | None = None
+        self._inline_key: tuple | None = None
+        self._inline: tuple[Callable, Callable] | None = None
+
+    def _inline_batch(self, columns: tuple, rows: Sequence[tuple], seq_start: int) -> list[tuple]:
+        if self._inline is None or self._inline_key != columns:
+            from app.services.sync_service import _row_normalizer_for
+
+            self._inline = _row_normalizer_for(self.domain, columns)
+            self._inline_key = columns
+        normalize, markers = self._inline
+        out: list[tuple] = []
+        for offset, row in enumerate(rows):
+            updated_at, source_id = markers(row)
+            out.append((updated_at, source_id, normalize(row, seq_start + offset)))
+        return out
+
+    def _ensure_pool(self) -> ProcessPoolExecutor | None:
+        if self.mode != "process":
+            return None
+        if self._pool is None:
+            try:
+                # spawn: the sync runs inside a threaded API process, where fork is unsafe.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            except Exception as exc:
+                self._fallback(f"pool no disponible: {exc}")
+        return self._pool
+
+    def _fallback(self, reason: str) -> None:
+        if self.mode == "inline":
+            return
+        self.mode = "inline"
+        self.fallback_reason = reason
+        logger.warning("[sync:%s] normalizacion en proceso unico (%s)", self.domain, reason)
+        self.close()
+
+    def _collect(self, columns: tuple, rows: Sequence[tuple], seq_start: int, future: Future | None) -> list[tuple]:
+        if future is not None:
+            try:
+                fields, values, marks = future.result()
+                normalized = rows_from_columnar(fields, values)
+                return [(m[0], m[1], n) for m, n in zip(marks, normalized)]
+            except Exception as exc:
+                self._fallback(f"worker fallo: {type(exc).__name__}: {exc}")
+        return self._inline_batch(columns, rows, seq_start)
+
+    def run(self, batches: Iterable[tuple[tuple, Sequence[tuple]]]) -> Iterator[tuple[int, list[tuple]]]:
+        pending: deque[tuple[tuple, Sequence[tuple], int, Future | None]] = deque()
+        seq = 0
+        try:
+            for columns, rows in batches:
+                pool = self._ensure_pool()
+                future: Future | None = None
+                if pool is not None:
+                    try:
+                        future = pool.submit(normalize_batch_columnar, self.domain, columns, list(rows), seq)
+                    except Exception as exc:
+                        self._fallback(f"submit fallo: {exc}")
+                pending.append((columns, rows, seq, future))
+                seq += len(rows)
+                self.batches += 1
+                while pending and (len(pending) >= self.max_in_flight or pending[0][3] is None):
+                    columns_p, rows_p, seq_p, future_p = pending.popleft()
+                    yield len(rows_p), self._collect(columns_p, rows_p, seq_p, future_p)
+            while pending:
+                columns_p, rows_p, seq_p, future_p = pending.popleft()
+                yield len(rows_p), self._collect(columns_p, rows_p, seq_p, future_p)
+        finally:
+            for _, _, _, future_p in pending:
+                if future_p is not None:
+                    future_p.cancel()
+            self.close()
+
+    def close(self) -> None:
+        pool = self._pool
+        self._pool = None
+        if pool is not None:
+            try:
+                pool.shutdown(wait=False, cancel_futures=True)
+            except Exception:
+                pass
+
+    def snapshot(self) -> dict:
+        return {
+            "mode": self.mode,
+            "workers": self.workers if self.mode == "process" else 0,
+            "batches": int(self.batches),
+            "fallback_reason": self.fallback_reason or None,
+        }
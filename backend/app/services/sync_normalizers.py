@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-import hashlib
 import json
 from datetime import date, datetime, timezone
+from typing import Callable, Sequence
 
 from app.domain import (
     add_months,
@@ -15,6 +15,7 @@ from app.domain import (
     payload_coalesce_numeric,
     tramo_from_cuotas_vencidas,
 )
+from app.services.sync_fingerprint import active_fingerprint
 
 BUSINESS_KEY_FIELDS = [
     "domain",
@@ -87,12 +88,75 @@ def parse_iso_date(value: object) -> date | None:
         return None
 
 
-def _coerce_calendar_month_year(row: dict) -> tuple[int, int] | None:
-    """Mes/Año del extracto EERR (y similares): MySQL puede devolver int, Decimal o float ('3.0' no pasa isdigit)."""
-    month_raw = normalize_key(row, "Mes", "mes", "month", "MONTH", "Month")
-    year_raw = normalize_key(
-        row, "Año", "AÃ±o", "anio", "year", "Year", "YEAR", "ANO", "Ano"
-    )
+# Columnas candidatas de cada campo normalizado, en orden de prioridad (nombre exacto y
+# luego sin distinguir mayusculas). Las usan normalize_record (filas dict) y
+# compile_row_normalizer (filas tupla), asi ambos caminos leen exactamente las mismas columnas.
+FIELD_CANDIDATES: dict[str, tuple[str, ...]] = {
+    "contract_id": ("contract_id", "id_contrato", "id"),
+    "close_date": ("fecha_cierre", "closed_date", "close_date"),
+    "gestion_month": ("gestion_month",),
+    "calendar_month": ("Mes", "mes", "month", "MONTH", "Month"),
+    "calendar_year": ("Año", "AÃ±o", "anio", "year", "Year", "YEAR", "ANO", "Ano"),
+    "year": ("Año", "AÃ±o", "anio", "year"),
+    "month": ("Mes", "mes", "month"),
+    "day": ("Dia", "day", "dia"),
+    "gestion_fallback": ("from_date", "date", "fecha_contrato", "fecha_cierre", "Actualizado_al"),
+    "supervisor": ("supervisor", "Supervisor", "Vendedor"),
+    "gestor": ("gestor", "Gestor", "GESTOR", "manager", "collection_manager"),
+    "un": ("un", "UN"),
+    "via": ("via", "via_cobro", "via_de_cobro", "VP"),
+    "tramo": ("tramo",),
+    "eerr_block": ("eerr_block",),
+    "social_reason_id": ("social_reason_id",),
+    "accounting_plan_id": ("accounting_plan_id",),
+    "source_row_id": ("payment_way_id", "account_payment_way_id", "apw_id", "id"),
+    "payment_date": ("date", "payment_date", "Actualizado_al"),
+    "payment_amount": ("monto", "amount", "payment_amount"),
+    "mayor": ("Mayor", "mayor"),
+    "cuenta": ("Cuenta", "cuenta"),
+}
+DOMAIN_FIELD_CANDIDATES: dict[str, dict[str, tuple[str, ...]]] = {
+    "cartera": {"tramo": ("cuotas_vencidas", "quotas_expirations", "tramo")},
+}
+# Columnas leidas por nombre exacto (valor crudo); las tuplas se prueban como `a or b or c`.
+EERR_IS_TAPO_COLUMN = "is_tapo"
+EERR_DEBIT_COLUMN = "debit"
+EERR_CREDIT_COLUMN = "credit"
+ANALYTICS_CONTRACTS_COLUMNS = ("contracts_total", "contracts", "cantidad_contratos")
+ANALYTICS_DEBT_COLUMNS = ("debt_total", "debt", "total_saldo", "deberia")
+ANALYTICS_PAID_COLUMNS = ("paid_total", "paid", "cobrado")
+RAW_COLUMNS: tuple[str, ...] = (
+    EERR_IS_TAPO_COLUMN,
+    EERR_DEBIT_COLUMN,
+    EERR_CREDIT_COLUMN,
+    *ANALYTICS_CONTRACTS_COLUMNS,
+    *ANALYTICS_DEBT_COLUMNS,
+    *ANALYTICS_PAID_COLUMNS,
+)
+
+# pick(campo) -> primer valor no vacio (str, strip) de las candidatas del campo.
+Pick = Callable[[str], str]
+# get(columna) -> valor crudo de la columna exacta o None.
+Get = Callable[[str], object]
+
+
+def field_candidates(domain: str) -> dict[str, tuple[str, ...]]:
+    return {**FIELD_CANDIDATES, **DOMAIN_FIELD_CANDIDATES.get(domain, {})}
+
+
+def _first_raw(get: Get, columns: tuple[str, ...]) -> object:
+    for column in columns:
+        value = get(column)
+        if value:
+            return value
+    return None
+
+
+def _dict_pick(row: dict, candidates: dict[str, tuple[str, ...]]) -> Pick:
+    return lambda field: normalize_key(row, *candidates[field])
+
+
+def _month_year_from_parts(month_raw: str, year_raw: str) -> tuple[int, int] | None:
     if not month_raw or not year_raw:
         return None
     try:
@@ -105,57 +169,67 @@ def _coerce_calendar_month_year(row: dict) -> tuple[int, int] | None:
     return None
 
 
-def parse_payment_date(row: dict) -> date | None:
-    day = normalize_key(row, "Dia", "day", "dia")
-    month = normalize_key(row, "Mes", "mes", "month")
-    year = normalize_key(row, "Año", "AÃ±o", "anio", "year")
+def _calendar_month_year(pick: Pick) -> tuple[int, int] | None:
+    return _month_year_from_parts(pick("calendar_month"), pick("calendar_year"))
+
+
+def _payment_date(pick: Pick) -> date | None:
+    day = pick("day")
+    month = pick("month")
+    year = pick("year")
     if day.isdigit() and month.isdigit() and year.isdigit():
         try:
             return date(int(year), int(month), int(day))
         except ValueError:
             pass
-    return parse_iso_date(normalize_key(row, "date", "payment_date", "Actualizado_al"))
+    return parse_iso_date(pick("payment_date"))
 
 
-def normalize_record(domain: str, row: dict, seq: int) -> dict:
-    contract_id = (
-        normalize_key(row, "contract_id", "id_contrato", "id") or f"{domain}_{seq}"
-    )
-    close_date = parse_date_key(
-        normalize_key(row, "fecha_cierre", "closed_date", "close_date")
-    )
-    close_month = (
-        normalize_month(close_date)
-        if close_date
-        else normalize_month(
-            normalize_key(row, "fecha_cierre", "closed_date", "close_date")
-        )
-    )
-    raw_gestion_month = normalize_key(row, "gestion_month")
+def _coerce_calendar_month_year(row: dict) -> tuple[int, int] | None:
+    """Mes/Año del extracto EERR (y similares): MySQL puede devolver int, Decimal o float ('3.0' no pasa isdigit)."""
+    return _calendar_month_year(_dict_pick(row, FIELD_CANDIDATES))
+
+
+def parse_payment_date(row: dict) -> date | None:
+    return _payment_date(_dict_pick(row, FIELD_CANDIDATES))
+
+
+def _eerr_identity(pick: Pick) -> tuple[str, str, str]:
+    blk = pick("eerr_block").strip().lower()
+    if blk not in ("ventas", "costos", "gastos"):
+        blk = "ventas"
+    return blk, pick("social_reason_id"), pick("accounting_plan_id")
+
+
+def _normalize_fields(
+    domain: str,
+    seq: int,
+    pick: Pick,
+    get: Get,
+    payload_row: Callable[[], dict],
+    fingerprint,
+) -> dict:
+    """Reglas de normalizacion comunes a filas dict y tupla (solo cambia el acceso a columnas)."""
+    contract_id = pick("contract_id") or f"{domain}_{seq}"
+    close_raw = pick("close_date")
+    close_date = parse_date_key(close_raw)
+    close_month = normalize_month(close_date) if close_date else normalize_month(close_raw)
+    raw_gestion_month = pick("gestion_month")
     gestion_month = normalize_month(raw_gestion_month)
     if not gestion_month:
-        my = _coerce_calendar_month_year(row)
+        my = _calendar_month_year(pick)
         if my:
             gestion_month = f"{my[0]:02d}/{my[1]}"
     if not gestion_month:
-        year = normalize_key(row, "Año", "AÃ±o", "anio", "year")
-        month = normalize_key(row, "Mes", "mes", "month")
+        year = pick("year")
+        month = pick("month")
         if year.isdigit() and month.isdigit():
             gestion_month = f"{int(month):02d}/{int(year)}"
     if not gestion_month:
         if domain == "cartera" and close_month:
             gestion_month = add_months(close_month, 1)
         if not gestion_month:
-            gestion_month = normalize_month(
-                normalize_key(
-                    row,
-                    "from_date",
-                    "date",
-                    "fecha_contrato",
-                    "fecha_cierre",
-                    "Actualizado_al",
-                )
-            )
+            gestion_month = normalize_month(pick("gestion_fallback"))
     if domain == "cartera" and close_month:
         parsed_raw = normalize_month(raw_gestion_month) if raw_gestion_month else ""
         if not raw_gestion_month or parsed_raw == close_month:
@@ -168,31 +242,15 @@ def normalize_record(domain: str, row: dict, seq: int) -> dict:
             gestion_month = datetime.now(timezone.utc).strftime("%m/%Y")
 
     if domain == "eerr":
-        blk = normalize_key(row, "eerr_block").strip().lower()
-        if blk not in ("ventas", "costos", "gastos"):
-            blk = "ventas"
-        sr = normalize_key(row, "social_reason_id")
-        pl = normalize_key(row, "accounting_plan_id")
-        tapo_flag = "1" if _to_int(row.get("is_tapo")) else "0"
+        blk, sr, pl = _eerr_identity(pick)
+        tapo_flag = "1" if _to_int(get(EERR_IS_TAPO_COLUMN)) else "0"
         contract_id = f"eerr|{gestion_month}|{sr}|{pl}|{blk}|t{tapo_flag}"[:64]
 
-    supervisor = (
-        normalize_key(row, "supervisor", "Supervisor", "Vendedor").upper()
-        or "S/D"
-    )
-    gestor = (
-        normalize_key(row, "gestor", "Gestor", "GESTOR", "manager", "collection_manager").upper()
-        or "S/D"
-    )
-    un = normalize_key(row, "un", "UN").upper() or "S/D"
-    via = normalize_key(row, "via", "via_cobro", "via_de_cobro", "VP").upper() or "S/D"
-
-    if domain == "cartera":
-        tramo = tramo_from_cuotas_vencidas(
-            normalize_key(row, "cuotas_vencidas", "quotas_expirations", "tramo")
-        )
-    else:
-        tramo = tramo_from_cuotas_vencidas(normalize_key(row, "tramo"))
+    supervisor = pick("supervisor").upper() or "S/D"
+    gestor = pick("gestor").upper() or "S/D"
+    un = pick("un").upper() or "S/D"
+    via = pick("via").upper() or "S/D"
+    tramo = tramo_from_cuotas_vencidas(pick("tramo"))
 
     payload_json = "{}"
     source_hash = ""
@@ -207,75 +265,63 @@ def normalize_record(domain: str, row: dict, seq: int) -> dict:
     analytics_paid_total = 0.0
 
     if domain == "cobranzas":
-        source_row_id = normalize_key(
-            row, "payment_way_id", "account_payment_way_id", "apw_id", "id"
-        )
-        parsed_payment_date = parse_payment_date(row)
-        payment_date = (
-            parsed_payment_date.strftime("%Y-%m-%d") if parsed_payment_date else ""
-        )
-        payment_month = (
-            normalize_month(
-                parsed_payment_date.strftime("%Y-%m-%d") if parsed_payment_date else ""
-            )
-            or gestion_month
-        )
+        source_row_id = pick("source_row_id")
+        parsed_payment_date = _payment_date(pick)
+        payment_date = parsed_payment_date.strftime("%Y-%m-%d") if parsed_payment_date else ""
+        payment_month = normalize_month(payment_date) or gestion_month
         payment_year = (
-            int(payment_month[-4:])
-            if payment_month
-            else datetime.now(timezone.utc).year
-        )
-        payment_amount = _to_float(
-            normalize_key(row, "monto", "amount", "payment_amount")
+            int(payment_month[-4:]) if payment_month else datetime.now(timezone.utc).year
         )
+        payment_amount = _to_float(pick("payment_amount"))
         payment_via_class = normalize_payment_via_class(via)
-        signature = (
-            f"{source_row_id}|{contract_id}|{gestion_month}|{payment_date}|{payment_amount}|"
-            f"{payment_via_class}|{supervisor}|{un}|{via}|{tramo}"
+        source_hash = fingerprint.parts(
+            (
+                source_row_id,
+                contract_id,
+                gestion_month,
+                payment_date,
+                payment_amount,
+                payment_via_class,
+                supervisor,
+                un,
+                via,
+                tramo,
+            )
         )
-        source_hash = hashlib.sha256(signature.encode("utf-8")).hexdigest()
     elif domain == "eerr":
-        payload_json = json.dumps(row, ensure_ascii=False, sort_keys=True, default=str)
-        blk = normalize_key(row, "eerr_block").strip().lower()
-        if blk not in ("ventas", "costos", "gastos"):
-            blk = "ventas"
-        sr = normalize_key(row, "social_reason_id")
-        pl = normalize_key(row, "accounting_plan_id")
-        debit = _to_float(row.get("debit"))
-        credit = _to_float(row.get("credit"))
-        mayor = normalize_key(row, "Mayor", "mayor")
-        cuenta = normalize_key(row, "Cuenta", "cuenta")
-        tapo_sig = "1" if bool(_to_int(row.get("is_tapo"))) else "0"
-        signature = f"{gestion_month}|{sr}|{pl}|{blk}|{tapo_sig}|{debit}|{credit}|{mayor}|{cuenta}"
-        source_hash = hashlib.sha256(signature.encode("utf-8")).hexdigest()
+        payload_json = json.dumps(payload_row(), ensure_ascii=False, sort_keys=True, default=str)
+        blk, sr, pl = _eerr_identity(pick)
+        debit = _to_float(get(EERR_DEBIT_COLUMN))
+        credit = _to_float(get(EERR_CREDIT_COLUMN))
+        mayor = pick("mayor")
+        cuenta = pick("cuenta")
+        tapo_sig = "1" if bool(_to_int(get(EERR_IS_TAPO_COLUMN))) else "0"
+        source_hash = fingerprint.parts(
+            (gestion_month, sr, pl, blk, tapo_sig, debit, credit, mayor, cuenta)
+        )
     elif domain == "analytics":
         analytics_contracts_total = max(
-            1,
-            _to_int(
-                row.get("contracts_total")
-                or row.get("contracts")
-                or row.get("cantidad_contratos")
-                or 1,
-                1,
-            ),
-        )
-        analytics_debt_total = _to_float(
-            row.get("debt_total")
-            or row.get("debt")
-            or row.get("total_saldo")
-            or row.get("deberia")
+            1, _to_int(_first_raw(get, ANALYTICS_CONTRACTS_COLUMNS) or 1, 1)
         )
-        analytics_paid_total = _to_float(
-            row.get("paid_total") or row.get("paid") or row.get("cobrado")
-        )
-        signature = (
-            f"{contract_id}|{gestion_month}|{supervisor}|{un}|{via}|{tramo}|"
-            f"{analytics_contracts_total}|{analytics_debt_total}|{analytics_paid_total}"
+        analytics_debt_total = _to_float(_first_raw(get, ANALYTICS_DEBT_COLUMNS))
+        analytics_paid_total = _to_float(_first_raw(get, ANALYTICS_PAID_COLUMNS))
+        source_hash = fingerprint.parts(
+            (
+                contract_id,
+                gestion_month,
+                supervisor,
+                un,
+                via,
+                tramo,
+                analytics_contracts_total,
+                analytics_debt_total,
+                analytics_paid_total,
+            )
         )
-        source_hash = hashlib.sha256(signature.encode("utf-8")).hexdigest()
     else:
+        row = payload_row()
         payload_json = json.dumps(row, ensure_ascii=False, sort_keys=True, default=str)
-        source_hash = hashlib.sha256(payload_json.encode("utf-8")).hexdigest()
+        source_hash = fingerprint.mapping(row, payload_json)
 
     return {
         "domain": domain,
@@ -302,6 +348,96 @@ def normalize_record(domain: str, row: dict, seq: int) -> dict:
     }
 
 
+def normalize_record(domain: str, row: dict, seq: int) -> dict:
+    return _normalize_fields(
+        domain,
+        seq,
+        _dict_pick(row, field_candidates(domain)),
+        row.get,
+        lambda: row,
+        active_fingerprint(),
+    )
+
+
+class RowColumnPlan:
+    """Column positions for one query result, resolved once from `cursor.description`.
+
+    `resolve(*candidates)` returns the tuple indices `normalize_key` would probe for
+    the same candidates on a dict row with these columns (exact names first, then
+    case-insensitive matches), so lookups on tuple rows give identical results.
+    """
+
+    def __init__(self, column_names: Sequence[object]) -> None:
+        self.names = tuple(str(c) for c in column_names)
+        # Same semantics as dict(zip(names, row)): first position wins the key order, last value wins.
+        self.index: dict[str, int] = {}
+        for pos, name in enumerate(self.names):
+            self.index[name] = pos
+        self.keys = tuple(self.index.keys())
+        self._lower = {k.lower(): k for k in self.keys}
+
+    def resolve(self, *candidates: str) -> tuple[int, ...]:
+        out: list[int] = []
+        for key in candidates:
+            if key in self.index:
+                out.append(self.index[key])
+        for key in candidates:
+            resolved = self._lower.get(key.lower())
+            if resolved:
+                out.append(self.index[resolved])
+        seen: set[int] = set()
+        return tuple(i for i in out if not (i in seen or seen.add(i)))
+
+    def position(self, name: str) -> int | None:
+        return self.index.get(name)
+
+    def as_dict(self, row: Sequence[object]) -> dict:
+        return dict(zip(self.names, row))
+
+
+def _pick(row: Sequence[object], positions: tuple[int, ...]) -> str:
+    for pos in positions:
+        value = row[pos]
+        if value:
+            text = str(value).strip()
+            if text:
+                return text
+    return ""
+
+
+def compile_row_normalizer(
+    domain: str, column_names: Sequence[object]
+) -> Callable[[Sequence[object], int], dict]:
+    """Build a `normalize_record` equivalent specialized for one domain and column layout.
+
+    The returned callable takes a tuple row (plain cursor) and `seq`, and produces
+    exactly the same dict as `normalize_record(domain, dict(zip(columns, row)), seq)`:
+    the candidate columns are resolved once from the same tables and the rules are shared.
+    """
+    plan = RowColumnPlan(column_names)
+    positions = {
+        field: plan.resolve(*candidates) for field, candidates in field_candidates(domain).items()
+    }
+    raw_positions = {
+        name: pos for name in RAW_COLUMNS if (pos := plan.position(name)) is not None
+    }
+    as_dict = plan.as_dict
+    fingerprint = active_fingerprint()
+
+    def normalize(row: Sequence[object], seq: int) -> dict:
+        def pick(field: str) -> str:
+            return _pick(row, positions[field])
+
+        def get(name: str) -> object:
+            pos = raw_positions.get(name)
+            return None if pos is None else row[pos]
+
+        return _normalize_fields(domain, seq, pick, get, lambda: as_dict(row), fingerprint)
+
+    normalize.plan = plan  # type: ignore[attr-defined]
+    return normalize
+
+
 def fact_row_from_normalized(domain: str, normalized: dict) -> dict:
     cached_payload = normalized.get("_sync_payload_parsed")
     if isinstance(cached_payload, dict):
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressReporter:
+    """Background writer for sync progress.
+
+    The sync loop only mutates its in-memory state and calls `mark(domain)` /
+    `log(...)`, both O(1) and lock-free. A daemon thread wakes every
+    `interval_sec`, takes one snapshot per dirty domain, persists it and
+    bulk-appends the pending log lines. `flush()` does the same synchronously
+    (used for start/finish transitions, which must not be coalesced away).
+    """
+
+    def __init__(
+        self,
+        *,
+        snapshot: Callable[[str], dict | None],
+        persist: Callable[[str, dict], None],
+        write_logs: Callable[[list[dict]], None],
+        interval_sec: float = 1.0,
+    ) -> None:
+        self._snapshot = snapshot
+        self._persist = persist
+        self._write_logs = write_logs
+        self.interval_sec = max(0.05, float(interval_sec))
+        self._dirty: set[str] = set()
+        self._pending_logs: deque[dict] = deque()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.flushes = 0
+        self.snapshots_written = 0
+        self.log_lines_written = 0
+
+    def mark(self, domain: str) -> None:
+        self._dirty.add(domain)
+        self._ensure_started()
+
+    def log(self, domain: str, job_id: str, line: str) -> None:
+        self._pending_logs.append(
+            {"job_id": job_id, "domain": domain, "line": line, "created_at": datetime.utcnow()}
+        )
+        self._ensure_started()
+
+    def _ensure_started(self) -> None:
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="sync-progress-reporter", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.interval_sec)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("[sync] progress reporter flush failed")
+
+    def flush(self, domain: str | None = None) -> None:
+        """Persist pending log lines and dirty snapshots (all, or only `domain`)."""
+        with self._flush_lock:
+            lines: list[dict] = []
+            while self._pending_logs:
+                try:
+                    lines.append(self._pending_logs.popleft())
+                except IndexError:
+                    break
+            if lines:
+                try:
+                    self._write_logs(lines)
+                    self.log_lines_written += len(lines)
+                except Exception:
+                    logger.exception("[sync] no se pudieron persistir %s lineas de log", len(lines))
+            if domain is None:
+                domains = list(self._dirty)
+            else:
+                domains = [domain]
+            for name in domains:
+                self._dirty.discard(name)
+                snap = self._snapshot(name)
+                if snap:
+                    self._persist(name, snap)
+                    self.snapshots_written += 1
+            self.flushes += 1
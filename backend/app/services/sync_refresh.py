@@ -19,6 +19,8 @@ from app.models.brokers import (
     CarteraCorteAgg,
     CobranzasCohorteAgg,
     CobranzasFact,
+    CobranzasOrphanContract,
+    CobranzasOrphanCutoff,
     EerrFact,
     EerrMonthlyAgg,
     DimCategoria,
@@ -33,8 +35,9 @@ from app.models.brokers import (
     MvOptionsCohorte,
     MvOptionsRendimiento,
 )
+from app.domain import categoria_from_tramo
 from app.schemas.analytics import AnalyticsFilters
-from app.services.analytics_service import AnalyticsService
+from app.services.analytics_service import AnalyticsService, _payment_month_variants
 
 
 def _normalize_dim(value, default: str) -> str:
@@ -733,6 +736,114 @@ def refresh_cobranzas_cohorte_agg(
     return int(deleted or 0), len(mappings)
 
 
+def refresh_cobranzas_orphan_precompute(
+    db: Session,
+    month_serial,
+    *,
+    effective_by_cutoff: dict[str, str],
+) -> tuple[int, int]:
+    """Precalcular por corte las cobranzas sin fila en cartera_fact para el mes de gestión efectivo.
+
+    Escribe el detalle por contrato (cobranzas_orphan_contract) y el rollup sin filtros
+    (cobranzas_orphan_cutoff) que summary/first-paint suman en lugar del anti-join en vivo.
+    """
+    cutoffs = sorted(
+        {
+            str(c).strip()
+            for c, eff in (effective_by_cutoff or {}).items()
+            if month_serial(str(c).strip()) > 0 and month_serial(str(eff or "").strip()) > 0
+        },
+        key=month_serial,
+    )
+    if not cutoffs:
+        return 0, 0
+
+    deleted = db.query(CobranzasOrphanContract).filter(CobranzasOrphanContract.cutoff_month.in_(cutoffs)).delete(synchronize_session=False)
+    db.query(CobranzasOrphanCutoff).filter(CobranzasOrphanCutoff.cutoff_month.in_(cutoffs)).delete(synchronize_session=False)
+    db.commit()
+
+    un_expr = func.upper(func.coalesce(CobranzasFact.un, ""))
+    supervisor_expr = func.upper(func.coalesce(CobranzasFact.supervisor, ""))
+    gestor_expr = func.upper(func.coalesce(CobranzasFact.gestor, ""))
+    via_expr = func.upper(func.coalesce(CobranzasFact.via, ""))
+    now = datetime.utcnow()
+    written = 0
+    for cutoff_month in cutoffs:
+        effective_month = str(effective_by_cutoff.get(cutoff_month) or "").strip()
+        in_cartera = (
+            db.query(CarteraFact.id)
+            .filter(
+                CarteraFact.gestion_month == effective_month,
+                CarteraFact.contract_id == CobranzasFact.contract_id,
+            )
+            .exists()
+        )
+        grouped_rows = (
+            db.query(
+                CobranzasFact.contract_id,
+                un_expr.label("un"),
+                supervisor_expr.label("supervisor"),
+                gestor_expr.label("gestor"),
+                via_expr.label("via"),
+                CobranzasFact.tramo,
+                func.count().label("transacciones"),
+                func.coalesce(func.sum(case((CobranzasFact.payment_amount > 0, literal(1)), else_=literal(0))), 0).label("pagos_positivos"),
+                func.coalesce(func.sum(CobranzasFact.payment_amount), 0.0).label("cobrado"),
+            )
+            .filter(func.trim(CobranzasFact.payment_month).in_(_payment_month_variants(cutoff_month)))
+            .filter(~in_cartera)
+            .group_by(CobranzasFact.contract_id, un_expr, supervisor_expr, gestor_expr, via_expr, CobranzasFact.tramo)
+            .all()
+        )
+        mappings: list[dict] = []
+        contratos: set[str] = set()
+        pagaron: set[str] = set()
+        transacciones = 0
+        cobrado = 0.0
+        for row in grouped_rows:
+            contract_id = str(row.contract_id or "").strip()
+            tramo = int(row.tramo or 0)
+            mappings.append(
+                {
+                    "cutoff_month": cutoff_month,
+                    "effective_cartera_month": effective_month,
+                    "contract_id": contract_id,
+                    "un": str(row.un or ""),
+                    "supervisor": str(row.supervisor or ""),
+                    "gestor": str(row.gestor or ""),
+                    "via": str(row.via or ""),
+                    "tramo": tramo,
+                    "categoria": categoria_from_tramo(tramo),
+                    "transacciones": int(row.transacciones or 0),
+                    "pagos_positivos": int(row.pagos_positivos or 0),
+                    "cobrado": float(row.cobrado or 0.0),
+                    "updated_at": now,
+                }
+            )
+            if contract_id:
+                contratos.add(contract_id)
+            if int(row.pagos_positivos or 0) > 0:
+                pagaron.add(contract_id)
+            transacciones += int(row.transacciones or 0)
+            cobrado += float(row.cobrado or 0.0)
+        if mappings:
+            db.bulk_insert_mappings(CobranzasOrphanContract, mappings)
+        db.add(
+            CobranzasOrphanCutoff(
+                cutoff_month=cutoff_month,
+                effective_cartera_month=effective_month,
+                contratos=len(contratos),
+                pagaron=len(pagaron),
+                transacciones=transacciones,
+                cobrado=cobrado,
+                refreshed_at=now,
+            )
+        )
+        db.commit()
+        written += len(mappings)
+    return int(deleted or 0), written
+
+
 def refresh_analytics_snapshot(
     db: Session,
     mode: str,
@@ -1001,6 +1112,121 @@ def refresh_mv_options_tables(db: Session, affected_months: set[str], month_seri
     }
 
 
+_MV_OPTIONS_DELTA_SPECS = (
+    (
+        "cartera",
+        MvOptionsCartera,
+        CarteraCorteAgg,
+        "gestion_month",
+        ("gestion_month", "close_month", "un", "supervisor", "via_cobro", "categoria", "tramo", "contract_year"),
+        ("gestion_month", "close_month", "un", "supervisor", "via_cobro", "categoria", "tramo", "contract_year"),
+    ),
+    (
+        "cohorte",
+        MvOptionsCohorte,
+        CobranzasCohorteAgg,
+        "cutoff_month",
+        ("cutoff_month", "un", "supervisor", "gestor", "via_cobro", "categoria"),
+        ("cutoff_month", "un", "supervisor", "via_cobro", "categoria"),
+    ),
+    (
+        "rendimiento",
+        MvOptionsRendimiento,
+        AnalyticsRendimientoAgg,
+        "gestion_month",
+        ("gestion_month", "un", "supervisor", "via_cobro", "categoria", "tramo"),
+        ("gestion_month", "un", "supervisor", "via_cobro", "categoria", "tramo"),
+    ),
+    (
+        "anuales",
+        MvOptionsAnuales,
+        AnalyticsAnualesAgg,
+        "cutoff_month",
+        ("cutoff_month", "sale_month", "sale_year", "un"),
+        ("cutoff_month", "sale_month", "sale_year", "un"),
+    ),
+)
+
+_MV_OPTIONS_DIM_DEFAULTS = {
+    "un": "S/D",
+    "supervisor": "S/D",
+    "gestor": "S/D",
+    "via_cobro": "DEBITO",
+    "categoria": "VIGENTE",
+}
+_MV_OPTIONS_INT_COLUMNS = {"tramo", "contract_year", "sale_year"}
+
+
+def _mv_options_value(column: str, value):
+    if column in _MV_OPTIONS_INT_COLUMNS:
+        return int(value or 0)
+    if column in _MV_OPTIONS_DIM_DEFAULTS:
+        return _normalize_dim(value, _MV_OPTIONS_DIM_DEFAULTS[column])
+    return str(value or "").strip()
+
+
+def apply_mv_options_delta(db: Session, affected_months: set[str], month_serial) -> dict[str, int]:
+    """Mantiene mv_options_* por delta: solo inserta tuplas nuevas y borra las que ya no existen.
+
+    A diferencia de refresh_mv_options_tables no reescribe los meses afectados: compara las
+    tuplas de dimensiones de los agregados contra las ya publicadas y aplica solo la diferencia,
+    asi una sync incremental chica no genera churn de indices ni de WAL.
+    """
+    months = sorted({str(m).strip() for m in (affected_months or set()) if month_serial(str(m).strip()) > 0}, key=month_serial)
+    out = {"cartera": 0, "cohorte": 0, "rendimiento": 0, "anuales": 0, "removed": 0}
+    if not months:
+        return out
+
+    now = datetime.utcnow()
+    is_postgres = db.bind is not None and db.bind.dialect.name == "postgresql"
+    for key, options_model, agg_model, month_column, columns, unique_columns in _MV_OPTIONS_DELTA_SPECS:
+        agg_cols = [getattr(agg_model, c) for c in columns]
+        desired: dict[tuple, dict] = {}
+        for r in (
+            db.query(*agg_cols)
+            .filter(getattr(agg_model, month_column).in_(months))
+            .group_by(*agg_cols)
+            .order_by(*agg_cols)
+            .all()
+        ):
+            mapping = {c: _mv_options_value(c, getattr(r, c)) for c in columns}
+            if month_serial(mapping[month_column]) <= 0:
+                continue
+            desired.setdefault(tuple(mapping[c] for c in unique_columns), mapping)
+
+        existing: dict[tuple, int] = {}
+        option_cols = [getattr(options_model, c) for c in unique_columns]
+        for r in (
+            db.query(options_model.id, *option_cols)
+            .filter(getattr(options_model, month_column).in_(months))
+            .all()
+        ):
+            existing[tuple(_mv_options_value(c, getattr(r, c)) for c in unique_columns)] = int(r.id)
+
+        stale_ids = [row_id for tuple_key, row_id in existing.items() if tuple_key not in desired]
+        for start in range(0, len(stale_ids), 1000):
+            db.query(options_model).filter(
+                options_model.id.in_(stale_ids[start : start + 1000])
+            ).delete(synchronize_session=False)
+
+        new_rows = [
+            {**mapping, "updated_at": now}
+            for tuple_key, mapping in desired.items()
+            if tuple_key not in existing
+        ]
+        table = options_model.__table__
+        for start in range(0, len(new_rows), 1000):
+            batch = new_rows[start : start + 1000]
+            stmt = (pg_insert(table) if is_postgres else sqlite_insert(table)).values(batch)
+            db.execute(stmt.on_conflict_do_nothing(index_elements=list(unique_columns)))
+
+        out[key] = len(new_rows)
+        out["removed"] += len(stale_ids)
+
+    db.commit()
+    return out
+
+
 def bootstrap_mv_options_full(db: Session, month_serial) -> dict[str, int]:
     now = datetime.utcnow()
 
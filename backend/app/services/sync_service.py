@@ -12,8 +12,7 @@ from time import monotonic
 from time import sleep as time_sleep
 from typing import Any
 
-import mysql.connector
-from sqlalchemy import Integer, and_, case, cast, func, select
+from sqlalchemy import Integer, MetaData, and_, bindparam, case, cast, func, select, update
 from sqlalchemy import text as sa_text
 from sqlalchemy import tuple_ as sa_tuple
 from sqlalchemy.dialects.postgresql import insert as pg_insert
@@ -27,6 +26,7 @@ from app.core.analytics_cache import (
     invalidate_prefix,
 )
 from app.core.config import settings
+from app.core.mysql_pool import mysql_pool
 from app.db.session import SessionLocal, engine
 from app.domain import (
     canonical_un,
@@ -57,29 +57,51 @@ from app.models.brokers import (
     SyncJobStep,
     SyncRecord,
     SyncRun,
+    SyncRunLog,
     SyncSchedule,
     SyncStagingRow,
     SyncWatermark,
 )
 from app.services.analytics_service import AnalyticsService, cohorte_base_cache_clear
 from app.services.brokers_config_service import BrokersConfigService
+from app.services.first_paint_snapshots import refresh_first_paint_snapshots
 from app.services.sync_cache import prewarm_analytics_cache_after_sync
+from app.services.sync_cdc import (
+    CDC_BACKENDS,
+    CDC_DOMAIN_SPECS,
+    CdcChanges,
+    CdcUnavailable,
+    build_cdc_query,
+    cdc_partition_key,
+    chunked_ids,
+    read_changes,
+    source_head,
+)
 from app.services.sync_extractors import (
+    MYSQL_MONTH_SUMMARY_QUERIES,
     MYSQL_PRECHECK_QUERIES,
     SYNC_DOMAIN_QUERIES,
+    append_where_predicate,
     load_sql_with_includes,
+    month_range_predicate,
     query_file_for,
     query_filename_for,
     query_path_for,
     query_variant_for_domain,
 )
+from app.services.sync_fingerprint import active_fingerprint, fingerprint_words
+from app.services.sync_normalize_pool import NormalizationStage
+from app.services.sync_progress import ProgressReporter
 from app.services.sync_normalizers import (
+    RowColumnPlan,
+    compile_row_normalizer,
     dedupe_rows_in_chunk,
     fact_row_from_normalized,
     normalize_payment_via_class,
     normalize_record,
 )
 from app.services.sync_refresh import (
+    apply_mv_options_delta,
     bootstrap_mv_options_full,
     mv_options_consistency_report,
     refresh_analytics_anuales_agg,
@@ -87,6 +109,7 @@ from app.services.sync_refresh import (
     refresh_analytics_snapshot,
     refresh_cartera_corte_agg,
     refresh_cobranzas_cohorte_agg,
+    refresh_cobranzas_orphan_precompute,
     refresh_dim_contract_month_and_catalogs,
     refresh_dim_negocio_contrato,
     refresh_dim_time,
@@ -97,6 +120,19 @@ from app.services.sync_refresh import (
 from app.services.sync_schedules import (
     create_schedule as create_schedule_record,
 )
+from app.services.sync_spill import (
+    SPILL_SUFFIX,
+    SpillStats,
+    SpillWriter,
+    iter_spill_rows,
+)
+from app.services.sync_tuning import (
+    AimdController,
+    ExtractStats,
+    current_rss_mb,
+    load_tuning_state,
+    save_tuning_state,
+)
 from app.services.sync_schedules import (
     delete_schedule as delete_schedule_record,
 )
@@ -138,6 +174,16 @@ FACT_TABLE_BY_DOMAIN = {
     "gestores": GestoresFact,
     "eerr": EerrFact,
 }
+# Tables that may be RANGE-partitioned (Postgres) by month serial of the given
+# column: serial = (year * 12) + month, one partition per year ({table}_part_YYYY).
+# See scripts/partitioning/*.sql for the cutover of each table.
+MONTH_PARTITIONED_TABLES = {
+    "cartera_fact": "gestion_month",
+    "cobranzas_fact": "payment_month",
+    "eerr_fact": "gestion_month",
+    "cobranzas_cohorte_agg": "cutoff_month",
+    "analytics_rendimiento_agg": "gestion_month",
+}
 
 MYSQL_INCREMENTAL_HINTS = {
     # Column names are based on the aliases returned by each query_*.sql
@@ -212,6 +258,7 @@ def _query_file_for(domain: str) -> str:
 
 def _prewarm_analytics_cache_after_sync(db: Session, domain: str) -> None:
     prewarm_analytics_cache_after_sync(db, domain, _append_log)
+    refresh_first_paint_snapshots(db, domain, _append_log)
 
 
 def _job_step_from_stage(stage: str | None) -> str | None:
@@ -267,7 +314,6 @@ def _json_loads_dict(value: str | None) -> dict[str, Any]:
 _state_lock = threading.Lock()
 _state_by_domain: dict[str, dict] = {}
 _running_by_domain: set[str] = set()
-_last_persist_by_domain: dict[str, dict[str, Any]] = {}
 logger = logging.getLogger(__name__)
 RUNNING_JOB_STALE_GRACE_SECONDS = max(
     60, int(getattr(settings, "sync_running_stale_grace_seconds", 600) or 600)
@@ -503,50 +549,89 @@ def _parse_source_updated_at(value: object) -> datetime | None:
     return None
 
 
+_SOURCE_UPDATED_CANDIDATES = (
+    "updated_at",
+    "updatedAt",
+    "Actualizado_al",
+    "actualizado_al",
+    "fecha_actualizacion",
+    "modificado_en",
+)
+_SOURCE_ID_CANDIDATES = (
+    "payment_way_id",
+    "id",
+    "ID",
+    "payment_id",
+    "contract_id",
+    "id_contrato",
+)
+
+
 def _extract_source_markers(row: dict) -> tuple[datetime | None, str | None]:
     updated_at = None
     source_id = None
-    updated_candidates = [
-        "updated_at",
-        "updatedAt",
-        "Actualizado_al",
-        "actualizado_al",
-        "fecha_actualizacion",
-        "modificado_en",
-    ]
-    id_candidates = [
-        "payment_way_id",
-        "id",
-        "ID",
-        "payment_id",
-        "contract_id",
-        "id_contrato",
-    ]
-    for key in updated_candidates:
+    for key in _SOURCE_UPDATED_CANDIDATES:
         if key in row:
             updated_at = _parse_source_updated_at(row.get(key))
             if updated_at is not None:
                 break
-    for key in id_candidates:
+    for key in _SOURCE_ID_CANDIDATES:
         if key in row and str(row.get(key) or "").strip():
             source_id = str(row.get(key)).strip()
             break
     return updated_at, source_id
 
 
+def _compile_source_markers(plan: RowColumnPlan):
+    """Tuple-row version of `_extract_source_markers` with column positions fixed per query."""
+    updated_positions = tuple(
+        plan.index[k] for k in _SOURCE_UPDATED_CANDIDATES if k in plan.index
+    )
+    id_positions = tuple(plan.index[k] for k in _SOURCE_ID_CANDIDATES if k in plan.index)
+
+    def markers(row) -> tuple[datetime | None, str | None]:
+        updated_at = None
+        source_id = None
+        for pos in updated_positions:
+            updated_at = _parse_source_updated_at(row[pos])
+            if updated_at is not None:
+                break
+        for pos in id_positions:
+            value = row[pos]
+            if str(value or "").strip():
+                source_id = str(value).strip()
+                break
+        return updated_at, source_id
+
+    return markers
+
+
+def _row_normalizer_for(domain: str, column_names: tuple):
+    """(normalize(row, seq), markers(row)) for tuple rows of one query result."""
+    if bool(getattr(settings, "sync_compiled_normalizers_enabled", True)):
+        normalize = compile_row_normalizer(domain, column_names)
+        return normalize, _compile_source_markers(normalize.plan)
+    plan = RowColumnPlan(column_names)
+
+    def normalize_dict(row, seq: int) -> dict:
+        return _normalize_record(domain, plan.as_dict(row), seq)
+
+    def markers_dict(row) -> tuple[datetime | None, str | None]:
+        return _extract_source_markers(plan.as_dict(row))
+
+    return normalize_dict, markers_dict
+
+
+_MASK64 = (1 << 64) - 1
+
+
 def _chunk_signal_update(current: dict | None, source_hash: str) -> dict:
     state = current or {"count": 0, "sum_a": 0, "sum_b": 0, "xor_c": 0}
-    h = str(source_hash or "")
-    if len(h) < 48:
-        h = (h + ("0" * 48))[:48]
-    a = int(h[0:16], 16)
-    b = int(h[16:32], 16)
-    c = int(h[32:48], 16)
-    mod = 2**64
-    state["count"] = int(state["count"]) + 1
-    state["sum_a"] = (int(state["sum_a"]) + a) % mod
-    state["sum_b"] = (int(state["sum_b"]) + b) % mod
-    state["xor_c"] = int(state["xor_c"]) ^ c
+    a, b, c = fingerprint_words(source_hash)
+    state["count"] += 1
+    state["sum_a"] = (state["sum_a"] + a) & _MASK64
+    state["sum_b"] = (state["sum_b"] + b) & _MASK64
+    state["xor_c"] ^= c
     return state
 
 
@@ -596,67 +681,84 @@ def _dedupe_rows_in_chunk(rows: list[dict]) -> tuple[list[dict], int]:
     return dedupe_rows_in_chunk(rows)
 
 
+_TERMINAL_STAGES = {"completed", "failed", "cancelled"}
+_started_at_cache: dict[str, tuple[str, datetime | None]] = {}
+
+
 def _set_state(domain: str, updates: dict) -> None:
-    snapshot: dict[str, Any] | None = None
-    force_persist = False
+    """Update the in-memory sync state in place; persistence is left to the progress reporter.
+
+    Safe to call per batch: no copy of the state, no parsing, no DB work. The
+    update runs under _state_lock, like every other access from another thread
+    (status reads, reporter snapshots); the reporter is notified after releasing it.
+    Only start/finish transitions (running flag flips or a terminal stage) are
+    flushed synchronously so they are never coalesced away.
+    """
     with _state_lock:
-        current = dict(_state_by_domain.get(domain) or {})
-        previous = dict(current)
+        current = _state_by_domain.get(domain)
+        if current is None:
+            current = _state_by_domain.setdefault(domain, {})
+        was_running = current.get("running")
         current.update(updates)
-        started_at_raw = current.get("started_at")
-        started_at_dt = None
-        if isinstance(started_at_raw, str) and started_at_raw:
-            try:
-                started_at_dt = datetime.fromisoformat(
-                    started_at_raw.replace("Z", "+00:00")
-                )
-            except Exception:
-                started_at_dt = None
-        if started_at_dt is not None:
-            now = datetime.now(timezone.utc)
-            if started_at_dt.tzinfo is None:
-                started_at_dt = started_at_dt.replace(tzinfo=timezone.utc)
-            elapsed = max(1.0, (now - started_at_dt).total_seconds())
-            progress = float(current.get("progress_pct") or 0.0)
-            rows_read = float(current.get("rows_read") or 0.0)
-            rows_processed = float(current.get("rows_upserted") or 0.0) + float(
-                current.get("rows_unchanged") or 0.0
-            )
-            throughput = (
-                rows_read / elapsed if rows_read > 0 else rows_processed / elapsed
-            )
-            current["throughput_rows_per_sec"] = (
-                round(throughput, 2) if throughput > 0 else 0.0
-            )
-            if current.get("running") and progress > 0 and progress < 100:
-                current["eta_seconds"] = int((elapsed * (100.0 - progress)) / progress)
-            else:
-                current["eta_seconds"] = 0
-        current["current_query_file"] = _query_file_for(domain)
-        current["job_step"] = _job_step_from_stage(current.get("stage"))
-        _state_by_domain[domain] = current
+        if "stage" in updates or "job_step" in updates:
+            current["job_step"] = _job_step_from_stage(current.get("stage"))
+        if "job_id" in updates or "current_query_file" not in current:
+            current["current_query_file"] = _query_file_for(domain)
+        flush_now = (
+            current.get("running") != was_running
+            or str(updates.get("stage") or "") in _TERMINAL_STAGES
+        )
+    if flush_now:
+        _progress_reporter.flush(domain)
+    else:
+        _progress_reporter.mark(domain)
+
+
+def _state_started_at(domain: str, raw: object) -> datetime | None:
+    if not isinstance(raw, str) or not raw:
+        return None
+    cached = _started_at_cache.get(domain)
+    if cached is not None and cached[0] == raw:
+        return cached[1]
+    try:
+        parsed = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+    except Exception:
+        parsed = None
+    _started_at_cache[domain] = (raw, parsed)
+    return parsed
+
+
+def _progress_snapshot(domain: str) -> dict[str, Any] | None:
+    """Copy of the domain state with throughput/ETA refreshed (reporter thread)."""
+    with _state_lock:
+        current = _state_by_domain.get(domain)
+        if not current:
+            return None
         snapshot = dict(current)
-        force_keys = {
-            "stage",
-            "progress_pct",
-            "status_message",
-            "rows_read",
-            "rows_upserted",
-            "rows_unchanged",
-            "chunk_key",
-            "chunk_status",
-            "skipped_unchanged_chunks",
-            "duplicates_detected",
-        }
-        force_persist = not force_keys.isdisjoint(updates)
-        if previous.get("running") != current.get("running"):
-            force_persist = True
-    _persist_runtime_state_snapshot(domain, snapshot, force=force_persist)
+    started_at_dt = _state_started_at(domain, snapshot.get("started_at"))
+    if started_at_dt is not None:
+        elapsed = max(1.0, (datetime.now(timezone.utc) - started_at_dt).total_seconds())
+        progress = float(snapshot.get("progress_pct") or 0.0)
+        rows_read = float(snapshot.get("rows_read") or 0.0)
+        rows_processed = float(snapshot.get("rows_upserted") or 0.0) + float(
+            snapshot.get("rows_unchanged") or 0.0
+        )
+        throughput = rows_read / elapsed if rows_read > 0 else rows_processed / elapsed
+        snapshot["throughput_rows_per_sec"] = round(throughput, 2) if throughput > 0 else 0.0
+        if snapshot.get("running") and 0 < progress < 100:
+            snapshot["eta_seconds"] = int((elapsed * (100.0 - progress)) / progress)
+        else:
+            snapshot["eta_seconds"] = 0
+        with _state_lock:
+            current["throughput_rows_per_sec"] = snapshot["throughput_rows_per_sec"]
+            current["eta_seconds"] = snapshot["eta_seconds"]
+    return snapshot
 
 
 def _persist_runtime_state_snapshot(
-    domain: str, snapshot: dict[str, Any] | None, *,
-    force: bool = False, db: Session | None = None
+    domain: str, snapshot: dict[str, Any] | None, *, db: Session | None = None
 ) -> None:
     if not snapshot:
         return
@@ -664,23 +766,7 @@ def _persist_runtime_state_snapshot(
     if not job_id:
         return
     # Worker and API run in different processes; persist periodic state so /sync/status stays accurate.
-    fingerprint = (
-        str(snapshot.get("stage") or ""),
-        int(snapshot.get("progress_pct") or 0),
-        int(snapshot.get("rows_read") or 0),
-        int(snapshot.get("rows_upserted") or 0),
-        int(snapshot.get("rows_unchanged") or 0),
-        int(snapshot.get("duplicates_detected") or 0),
-        str(snapshot.get("status_message") or ""),
-    )
-    now_ts = datetime.now(timezone.utc).timestamp()
-    with _state_lock:
-        meta = dict(_last_persist_by_domain.get(domain) or {})
-    prev_ts = float(meta.get("ts") or 0.0)
-    prev_fp = tuple(meta.get("fp") or ())
-    should_persist = force or (now_ts - prev_ts >= 1.5) or (prev_fp != fingerprint)
-    if not should_persist:
-        return
+    # The log is not rewritten here: lines go to sync_run_logs as they are produced.
     _db = db or SessionLocal()
     try:
         _persist_sync_run(_db,
@@ -732,7 +818,6 @@ def _persist_runtime_state_snapshot(
                     else None
                 ),
                 "duration_sec": snapshot.get("duration_sec"),
-                "log": list(snapshot.get("log") or []),
             },
         )
     except Exception:
@@ -740,20 +825,75 @@ def _persist_runtime_state_snapshot(
     finally:
         if db is None:
             _db.close()
-    with _state_lock:
-        _last_persist_by_domain[domain] = {"ts": now_ts, "fp": fingerprint}
+
+
+def _write_run_log_lines(rows: list[dict]) -> None:
+    db = SessionLocal()
+    try:
+        db.bulk_insert_mappings(SyncRunLog, rows)
+        db.commit()
+    finally:
+        db.close()
+
+
+_progress_reporter = ProgressReporter(
+    snapshot=_progress_snapshot,
+    persist=_persist_runtime_state_snapshot,
+    write_logs=_write_run_log_lines,
+    interval_sec=max(
+        0.2, float(getattr(settings, "sync_progress_flush_ms", 1000) or 1000) / 1000.0
+    ),
+)
 
 
 def _append_log(domain: str, line: str) -> None:
     with _state_lock:
-        current = dict(_state_by_domain.get(domain) or {"log": []})
-        logs = list(current.get("log") or [])
+        current = _state_by_domain.get(domain)
+        if current is None:
+            current = _state_by_domain.setdefault(domain, {"log": []})
+        logs = current.get("log")
+        if not isinstance(logs, list):
+            logs = list(logs or [])
+            current["log"] = logs
         logs.append(line)
-        current["log"] = logs[-200:]
-        _state_by_domain[domain] = current
+        if len(logs) > 200:
+            del logs[: len(logs) - 200]
+        job_id = str(current.get("job_id") or "").strip()
+    if job_id:
+        _progress_reporter.log(domain, job_id, line)
     logger.info("[sync:%s] %s", domain, line)
 
 
+def _run_log_lines(db: Session, row: SyncRun) -> list[str]:
+    """Log of a sync_runs row: log_json plus, while running, the lines appended since it started."""
+    lines = _status_log_list(row.log_json)
+    if not bool(row.running):
+        return lines
+    try:
+        tail = (
+            db.query(SyncRunLog.line)
+            .filter(SyncRunLog.job_id == row.job_id)
+            .order_by(SyncRunLog.id.desc())
+            .limit(200)
+            .all()
+        )
+    except Exception:
+        return lines
+    return (lines + [str(r[0]) for r in reversed(tail)])[-200:]
+
+
+def _cleanup_run_logs(db: Session) -> int:
+    retention_days = max(1, int(getattr(settings, "sync_run_log_retention_days", 30) or 30))
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    deleted = (
+        db.query(SyncRunLog)
+        .filter(SyncRunLog.created_at < cutoff)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return int(deleted or 0)
+
+
 def _strip_sql_trailing_semicolon(sql_text: str) -> str:
     text = str(sql_text or "").strip()
     while text.endswith(";"):
@@ -866,14 +1006,13 @@ def _mysql_has_new_data(
     if not sql:
         return True
     try:
-        conn = mysql.connector.connect(**dict(mysql_config))
-        try:
-            cursor = conn.cursor(dictionary=True)
+        with mysql_pool.connection(mysql_config, purpose="precheck") as conn:
+            cursor = conn.prepared_cursor(sql)
             cursor.execute(sql)
-            row = cursor.fetchone()
-            cursor.close()
-        finally:
-            conn.close()
+            values = cursor.fetchone()
+            columns = [str(d[0]) for d in (cursor.description or ())]
+            cursor.fetchall()
+        row = dict(zip(columns, values)) if values else None
         if not row:
             return False
         max_updated_raw = row.get("max_updated")
@@ -902,6 +1041,207 @@ def _mysql_has_new_data(
         return True
 
 
+def _source_summary_enabled(domain: str, mode: str) -> bool:
+    if not bool(getattr(settings, "sync_source_summary_enabled", False)):
+        return False
+    # full_all must re-read the complete source snapshot.
+    if str(mode or "").strip().lower() == "full_all":
+        return False
+    raw = str(getattr(settings, "sync_source_summary_domains", "cobranzas") or "")
+    enabled = {d.strip().lower() for d in raw.split(",") if d.strip()}
+    return domain in enabled and domain in MYSQL_MONTH_SUMMARY_QUERIES
+
+
+def _source_signature_fresh_since() -> datetime | None:
+    """Signatures older than this are ignored so every month gets a periodic full re-extract."""
+    hours = float(getattr(settings, "sync_source_summary_max_age_hours", 24) or 0)
+    if hours <= 0:
+        return None
+    return datetime.utcnow() - timedelta(hours=hours)
+
+
+def _summary_period_to_month(period: object, month_offset: int) -> str | None:
+    try:
+        value = int(period)
+    except (TypeError, ValueError):
+        return None
+    year, month = divmod(value, 100)
+    if year < 1900 or not 1 <= month <= 12:
+        return None
+    month_key = f"{month:02d}/{year}"
+    return add_months(month_key, month_offset) if month_offset else month_key
+
+
+def _month_to_summary_period(month_key: str, month_offset: int) -> int | None:
+    source_month = add_months(month_key, -month_offset) if month_offset else month_key
+    normalized = normalize_month(source_month)
+    if not normalized:
+        return None
+    mm, yyyy = normalized.split("/")
+    return int(yyyy) * 100 + int(mm)
+
+
+def _source_month_summaries(
+    *, domain: str, mysql_config: dict[str, Any]
+) -> dict[str, str] | None:
+    """Source fingerprint per gestion_month ("count:max_updated:xor"); None if the query fails."""
+    spec = MYSQL_MONTH_SUMMARY_QUERIES.get(domain)
+    if not spec:
+        return None
+    offset = int(spec.get("month_offset") or 0)
+    sql = str(spec["sql"]).strip()
+    try:
+        with mysql_pool.connection(mysql_config, purpose="precheck") as conn:
+            cursor = conn.prepared_cursor(sql)
+            cursor.execute(sql)
+            rows = cursor.fetchall()
+    except Exception:
+        logger.exception("[sync:%s] resumen por mes en origen fallo, extraccion completa", domain)
+        return None
+    out: dict[str, str] = {}
+    for period, row_count, max_updated, xor_crc in rows:
+        month_key = _summary_period_to_month(period, offset)
+        if not month_key:
+            continue
+        max_updated_dt = _parse_source_updated_at(max_updated)
+        out[month_key] = (
+            f"{int(row_count or 0)}:"
+            f"{max_updated_dt.isoformat() if max_updated_dt is not None else '-'}:"
+            f"{int(xor_crc or 0)}"
+        )
+    return out
+
+
+def _stored_source_signatures(
+    db: Session, domain: str, months: set[str], *, fresh_since: datetime | None = None
+) -> dict[str, str]:
+    """Stored fingerprints by month; with `fresh_since`, only months extracted after it count."""
+    out: dict[str, str] = {}
+    ordered = sorted(months)
+    for start in range(0, len(ordered), 500):
+        batch = ordered[start : start + 500]
+        for chunk_key, signature in (
+            db.query(SyncChunkManifest.chunk_key, SyncChunkManifest.source_signature)
+            .filter(
+                SyncChunkManifest.domain == domain,
+                SyncChunkManifest.chunk_key.in_(batch),
+                *(
+                    (SyncChunkManifest.updated_at >= fresh_since,)
+                    if fresh_since is not None
+                    else ()
+                ),
+            )
+            .all()
+        ):
+            if signature:
+                out[str(chunk_key)] = str(signature)
+    return out
+
+
+def _store_source_signatures(db: Session, domain: str, signatures: dict[str, str]) -> int:
+    """Record source fingerprints of months applied by this run (rows created by the manifest reconcile)."""
+    if not signatures:
+        return 0
+    table = SyncChunkManifest.__table__
+    db.execute(
+        update(table)
+        .where(
+            table.c.domain == domain,
+            table.c.chunk_key == bindparam("b_chunk_key"),
+        )
+        .values(source_signature=bindparam("b_signature")),
+        [
+            {"b_chunk_key": month, "b_signature": signature}
+            for month, signature in signatures.items()
+        ],
+    )
+    db.commit()
+    return len(signatures)
+
+
+def _build_month_filtered_query(domain: str, base_sql: str, months: set[str]) -> str:
+    """Push a date-range predicate for the given gestion months into the domain query's WHERE."""
+    spec = MYSQL_MONTH_SUMMARY_QUERIES[domain]
+    offset = int(spec.get("month_offset") or 0)
+    periods = sorted(
+        {p for p in (_month_to_summary_period(m, offset) for m in months) if p is not None}
+    )
+    if not periods:
+        raise ValueError("sin meses para filtrar")
+    return append_where_predicate(base_sql, month_range_predicate(spec["date_column"], periods))
+
+
+def _cdc_backend_for(domain: str, mode: str) -> str | None:
+    backend = str(getattr(settings, "sync_cdc_mode", "off") or "off").strip().lower()
+    if backend not in CDC_BACKENDS or str(mode or "").strip().lower() != "incremental":
+        return None
+    raw = str(getattr(settings, "sync_cdc_domains", "cartera,cobranzas") or "")
+    enabled = {d.strip().lower() for d in raw.split(",") if d.strip()}
+    if domain not in enabled or domain not in CDC_DOMAIN_SPECS:
+        return None
+    return backend
+
+
+def _read_cdc_changes(
+    db: Session,
+    *,
+    domain: str,
+    backend: str,
+    mysql_config: dict[str, Any],
+    head_only: bool = False,
+) -> tuple[CdcChanges | None, str | None]:
+    """Changed contracts since the stored CDC position, plus the position to store on success.
+
+    Returns (None, head) when the domain must run the regular incremental path
+    (first run, too many changes) and (None, None) when CDC is not usable.
+    """
+    stored = _get_watermark(
+        db,
+        domain=domain,
+        query_file=_query_file_for(domain),
+        partition_key=cdc_partition_key(backend),
+    )
+    position = str(stored.last_source_id or "").strip() if stored is not None else ""
+    max_contracts = max(1, int(getattr(settings, "sync_cdc_max_contracts", 20000) or 20000))
+    try:
+        with mysql_pool.connection(mysql_config, purpose="precheck") as conn:
+            if head_only or not position:
+                return None, source_head(conn, backend)
+            changes = read_changes(
+                conn,
+                mysql_config,
+                domain,
+                backend,
+                position,
+                max_contracts=max_contracts,
+                server_id=int(getattr(settings, "sync_cdc_server_id", 4242) or 4242),
+            )
+    except CdcUnavailable as exc:
+        logger.warning("[sync:%s] CDC %s no disponible: %s", domain, backend, exc)
+        return None, None
+    except Exception:
+        logger.exception("[sync:%s] CDC %s fallo, se usa watermark", domain, backend)
+        return None, None
+    if changes.truncated:
+        return None, changes.end_position
+    return changes, changes.end_position
+
+
+def _store_cdc_position(
+    db: Session, *, domain: str, backend: str, position: str, job_id: str, contracts: int
+) -> None:
+    _upsert_watermark(
+        db,
+        domain=domain,
+        query_file=_query_file_for(domain),
+        partition_key=cdc_partition_key(backend),
+        last_updated_at=datetime.utcnow(),
+        last_source_id=position,
+        last_success_job_id=job_id,
+        last_row_count=contracts,
+    )
+
+
 def _iter_from_mysql(
     query_path: Path,
     *,
@@ -910,22 +1250,34 @@ def _iter_from_mysql(
     watermark_source_id: str | None = None,
     mysql_config: dict[str, Any] | None = None,
     batch_size_override: int | None = None,
+    fetch_controller: AimdController | None = None,
+    cdc_contract_ids: set[int] | None = None,
+    source_months: set[str] | None = None,
+    pool_purpose: str = "extract",
+    extract_stats: ExtractStats | None = None,
 ):
     cfg = dict(mysql_config or _resolve_mysql_connection_config(None))
-    conn = mysql.connector.connect(**cfg)
-    try:
+    domain_key = str(domain or "").strip().lower()
+    cursor_mode = _extract_cursor_mode_for_domain(domain_key)
+    # C extension decodes rows natively; mysql-connector falls back to pure Python when it is missing.
+    cfg["use_pure"] = not bool(getattr(settings, "sync_extract_use_c_ext", True))
+    with mysql_pool.connection(cfg, purpose=pool_purpose) as conn:
         # Shield long-running fetch loops from transient low socket timeouts.
         try:
-            if getattr(conn, "_socket", None) is not None:
-                conn._socket.settimeout(
-                    float(max(30, int(cfg.get("read_timeout") or 600)))
-                )
+            conn.set_socket_timeout(float(max(30, int(cfg.get("read_timeout") or 600))))
         except Exception:
             pass
-        cursor = conn.cursor(dictionary=True)
+        # Tuple cursor: column positions are resolved once per query (see _row_normalizer_for).
+        # "stream" is unbuffered (rows stay server-side until fetched); "buffered" reads the
+        # whole result set into client memory on execute.
+        cursor = conn.cursor(buffered=cursor_mode == "buffered")
+        if extract_stats is not None:
+            extract_stats.cursor_mode = cursor_mode
+            extract_stats.driver = (
+                "c_ext" if "cext" in type(getattr(conn, "raw", conn)).__module__ else "pure"
+            )
         try:
             query_text, includes = _load_sql_with_includes(query_path)
-            domain_key = str(domain or "").strip().lower()
             query_variant = (
                 _query_variant_for_domain(domain_key) if domain_key else "v1"
             )
@@ -936,10 +1288,13 @@ def _iter_from_mysql(
                 _relative_repo_path(query_path),
                 ",".join(includes) if includes else "-",
             )
+            if source_months and not cdc_contract_ids:
+                # Months whose source fingerprint is unchanged are never transferred.
+                query_text = _build_month_filtered_query(domain_key, query_text, source_months)
             effective_sql = query_text
             effective_params: tuple = tuple()
             used_pushdown = False
-            if bool(settings.sync_mysql_incremental_pushdown) and domain:
+            if bool(settings.sync_mysql_incremental_pushdown) and domain and not cdc_contract_ids:
                 try:
                     effective_sql, effective_params, used_pushdown = (
                         _build_mysql_incremental_query(
@@ -953,32 +1308,60 @@ def _iter_from_mysql(
                     effective_sql = query_text
                     effective_params = tuple()
                     used_pushdown = False
-            try:
-                cursor.execute(effective_sql, effective_params)
-            except Exception as e:
-                if used_pushdown:
-                    logger.warning(
-                        "[sync:%s] fallback to base query (incremental pushdown not applicable at source)",
-                        str(domain or "unknown"),
+            statements = [(effective_sql, effective_params, used_pushdown)]
+            if cdc_contract_ids:
+                # CDC: re-extract only the changed contracts, one IN-list per statement.
+                key_expr = CDC_DOMAIN_SPECS[domain_key].source_key_expr
+                statements = [
+                    (build_cdc_query(query_text, key_expr, ids), tuple(), False)
+                    for ids in chunked_ids(
+                        cdc_contract_ids,
+                        int(getattr(settings, "sync_cdc_in_chunk", 1000) or 1000),
                     )
-                    cursor.execute(query_text)
-                else:
-                    raise
+                ]
             batch_size = int(batch_size_override or 0) or _fetch_batch_size_for_domain(
                 domain
             )
             batch_size = max(100, min(50000, batch_size))
-            while True:
-                batch = cursor.fetchmany(batch_size)
-                if not batch:
-                    break
-                yield batch
-            # Drain any trailing result sets to avoid "Unread result found".
-            while cursor.nextset():
+            for effective_sql, effective_params, used_pushdown in statements:
+                execute_started = monotonic()
+                try:
+                    cursor.execute(effective_sql, effective_params)
+                except Exception as e:
+                    if used_pushdown:
+                        logger.warning(
+                            "[sync:%s] fallback to base query (incremental pushdown not applicable at source)",
+                            str(domain or "unknown"),
+                        )
+                        cursor.execute(query_text)
+                    else:
+                        raise
+                if extract_stats is not None:
+                    extract_stats.statements += 1
+                    extract_stats.execute_sec += monotonic() - execute_started
+                    extract_stats.observe_rss(current_rss_mb())
+                column_names = tuple(str(d[0]) for d in (cursor.description or ()))
                 while True:
-                    trailing = cursor.fetchmany(batch_size)
-                    if not trailing:
+                    if fetch_controller is not None:
+                        batch_size = fetch_controller.size
+                    fetch_started = monotonic()
+                    batch = cursor.fetchmany(batch_size)
+                    if not batch:
                         break
+                    if fetch_controller is not None or extract_stats is not None:
+                        fetch_elapsed = monotonic() - fetch_started
+                        rss_mb = current_rss_mb()
+                        if fetch_controller is not None:
+                            fetch_controller.observe(len(batch), fetch_elapsed, rss_mb=rss_mb)
+                        if extract_stats is not None:
+                            extract_stats.observe_batch(len(batch), fetch_elapsed, rss_mb)
+                    yield column_names, batch
+                # Drain any trailing result sets to avoid "Unread result found".
+                while cursor.nextset():
+                    while True:
+                        trailing = cursor.fetchmany(batch_size)
+                        if not trailing:
+                            break
         finally:
             # Best effort: ensure connection has no pending results before close.
             try:
@@ -986,8 +1369,6 @@ def _iter_from_mysql(
             except Exception:
                 pass
             cursor.close()
-    finally:
-        conn.close()
 
 
 def _delete_target_window(
@@ -1034,6 +1415,23 @@ def _adaptive_chunk_size(domain: str, configured: int) -> int:
     return resolved
 
 
+EXTRACT_CURSOR_MODES = ("stream", "buffered")
+
+
+def _extract_cursor_mode_for_domain(domain: str) -> str:
+    """Cursor mode for a domain: SYNC_EXTRACT_CURSOR_MODE_OVERRIDES ("domain:mode,...") or the default."""
+    overrides: dict[str, str] = {}
+    raw = str(getattr(settings, "sync_extract_cursor_mode_overrides", "") or "")
+    for item in raw.split(","):
+        name, _, value = item.partition(":")
+        if name.strip() and value.strip():
+            overrides[name.strip().lower()] = value.strip().lower()
+    mode = overrides.get(str(domain or "").strip().lower()) or str(
+        getattr(settings, "sync_extract_cursor_mode", "stream") or "stream"
+    ).strip().lower()
+    return mode if mode in EXTRACT_CURSOR_MODES else "stream"
+
+
 def _fetch_batch_size_for_domain(domain: str) -> int:
     base = max(500, int(getattr(settings, "sync_fetch_batch_size", 5000) or 5000))
     domain_key = str(domain or "").strip().lower()
@@ -1091,9 +1489,144 @@ def _low_impact_chunk_pause_seconds() -> float:
     return float(pause_ms) / 1000.0
 
 
+def _normalize_workers_for_domain(domain: str, low_impact_mode: bool) -> int:
+    """Process-pool size for the normalize stage (0 = inline in the sync thread)."""
+    if low_impact_mode:
+        return 0
+    workers = int(getattr(settings, "sync_normalize_workers", 0) or 0)
+    if workers <= 1:
+        return 0
+    enabled_domains = {
+        d.strip().lower()
+        for d in str(getattr(settings, "sync_normalize_pool_domains", "") or "").split(",")
+        if d.strip()
+    }
+    if str(domain or "").strip().lower() not in enabled_domains:
+        return 0
+    return max(0, min(workers, os.cpu_count() or 1))
+
+
+def _build_sizing_controllers(
+    db: Session, domain: str, low_impact_mode: bool
+) -> tuple[AimdController, AimdController]:
+    """Fetch-batch and upsert-chunk controllers for one sync run.
+
+    Static sizes are the starting point (and the ceiling for cobranzas, whose
+    caps protect the MySQL source). Normal runs start from the sizes learned
+    by the previous run; low-impact runs start from the micro-batch sizes and
+    grow only while chunks stay inside the latency budget.
+    """
+    domain_key = str(domain or "").strip().lower()
+    fetch_base = _fetch_batch_size_for_domain(domain_key)
+    chunk_base = _adaptive_chunk_size(
+        domain_key, int(settings.sync_fetch_batch_size or 5000)
+    )
+    if not bool(getattr(settings, "sync_adaptive_sizing_enabled", True)):
+        if low_impact_mode:
+            fetch_base = _low_impact_fetch_batch_size(fetch_base)
+            chunk_base = _low_impact_chunk_size(chunk_base)
+        return (
+            AimdController(fetch_base, min_size=fetch_base, max_size=fetch_base, target_ms=1),
+            AimdController(chunk_base, min_size=chunk_base, max_size=chunk_base, target_ms=1),
+        )
+    if domain_key == "cobranzas":
+        fetch_max, chunk_max = fetch_base, chunk_base
+    else:
+        fetch_max = min(50000, fetch_base * 2)
+        chunk_max = min(30000, chunk_base * 2)
+    rss_limit_mb = float(getattr(settings, "sync_adaptive_rss_limit_mb", 1536) or 0)
+    if low_impact_mode:
+        budget_ms = float(
+            getattr(settings, "sync_low_impact_latency_budget_ms", 250) or 250
+        )
+        return (
+            AimdController(
+                _low_impact_fetch_batch_size(fetch_base),
+                min_size=100,
+                max_size=fetch_base,
+                target_ms=budget_ms,
+                rss_limit_mb=rss_limit_mb,
+            ),
+            AimdController(
+                _low_impact_chunk_size(chunk_base),
+                min_size=100,
+                max_size=chunk_base,
+                target_ms=budget_ms,
+                rss_limit_mb=rss_limit_mb,
+            ),
+        )
+    fetch_initial, chunk_initial = fetch_base, chunk_base
+    try:
+        learned = load_tuning_state(db, domain_key)
+    except Exception:
+        db.rollback()
+        learned = None
+    if learned is not None:
+        fetch_initial = int(learned.fetch_batch_size or 0) or fetch_base
+        chunk_initial = int(learned.chunk_size or 0) or chunk_base
+    return (
+        AimdController(
+            fetch_initial,
+            min_size=500,
+            max_size=fetch_max,
+            target_ms=float(getattr(settings, "sync_adaptive_fetch_target_ms", 1500) or 1500),
+            increase_step=max(100, fetch_base // 10),
+            rss_limit_mb=rss_limit_mb,
+        ),
+        AimdController(
+            chunk_initial,
+            min_size=500,
+            max_size=chunk_max,
+            target_ms=float(getattr(settings, "sync_adaptive_chunk_target_ms", 2000) or 2000),
+            increase_step=max(100, chunk_base // 10),
+            rss_limit_mb=rss_limit_mb,
+        ),
+    )
+
+
+def _pg_lock_waiters(db: Session, tables: list[str]) -> int:
+    """
+    Locks no concedidos sobre las tablas que escribe el sync (y sus particiones).
+
+    Acotado a esas relaciones: un lock en espera en otra base u otra tabla del cluster
+    no es congestion de esta carga y no debe achicar el chunk.
+    """
+    if engine.dialect.name != "postgresql" or not tables:
+        return 0
+    try:
+        return int(
+            db.execute(
+                sa_text(
+                    """
+                    WITH targets AS (
+                        SELECT to_regclass(t)::oid AS oid
+                        FROM unnest(CAST(:tables AS text[])) AS t
+                    )
+                    SELECT count(*)
+                    FROM pg_locks l
+                    WHERE NOT l.granted
+                      AND l.relation IN (
+                        SELECT oid FROM targets WHERE oid IS NOT NULL
+                        UNION
+                        SELECT i.inhrelid FROM pg_inherits i
+                        WHERE i.inhparent IN (SELECT oid FROM targets)
+                      )
+                    """
+                ),
+                {"tables": list(tables)},
+            ).scalar()
+            or 0
+        )
+    except Exception:
+        db.rollback()
+        return 0
+
+
 def _should_persist_sync_records(domain: str) -> bool:
-    # sync_records is only used for cartera config lookups; skipping other domains
-    # removes an extra heavyweight upsert path.
+    # sync_records is legacy: cartera config lookups read cartera_fact. Writes stay
+    # available (cartera only) behind SYNC_PERSIST_SYNC_RECORDS.
+    if not bool(getattr(settings, "sync_persist_sync_records", False)):
+        return False
     return str(domain or "").strip().lower() == "cartera"
 
 
@@ -1260,7 +1793,32 @@ def _cleanup_staging_rows(db: Session) -> int:
     return int(deleted or 0)
 
 
+def _sync_records_has_unique_index(db: Session) -> bool:
+    if engine.dialect.name != "postgresql":
+        return True
+    # En tablas particionadas por expresión puede no existir un unique/exclusion
+    # compatible para ON CONFLICT. En ese caso, hacer fallback a delete+insert.
+    return bool(
+        db.execute(
+            sa_text(
+                """
+                SELECT 1
+                FROM pg_index i
+                JOIN pg_class t ON t.oid = i.indrelid
+                WHERE t.relname = 'sync_records'
+                  AND i.indisunique = true
+                LIMIT 1
+                """
+            )
+        ).scalar()
+    )
+
+
 def _upsert_sync_records(db: Session, rows: list[dict], *, commit: bool = True) -> int:
+    """Bulk merge into sync_records, same multi-row INSERT ... ON CONFLICT path as the facts.
+
+    Rows whose source_hash did not change are not rewritten. Returns rows written.
+    """
     if not rows:
         return 0
     now = datetime.utcnow()
@@ -1290,9 +1848,7 @@ def _upsert_sync_records(db: Session, rows: list[dict], *, commit: bool = True)
             "created_at": now,
             "updated_at": now,
         }
-    values = list(by_business_key.values())
     table = SyncRecord.__table__
-    dialect = engine.dialect.name
     index_cols = [
         table.c.domain,
         table.c.contract_id,
@@ -1302,51 +1858,30 @@ def _upsert_sync_records(db: Session, rows: list[dict], *, commit: bool = True)
         table.c.via,
         table.c.tramo,
     ]
-    if dialect == "postgresql":
-        # En tablas particionadas por expresión puede no existir un unique/exclusion
-        # compatible para ON CONFLICT. En ese caso, hacer fallback a delete+insert.
-        has_upsert_constraint = bool(
-            db.execute(
-                sa_text(
-                    """
-                    SELECT 1
-                    FROM pg_index i
-                    JOIN pg_class t ON t.oid = i.indrelid
-                    WHERE t.relname = 'sync_records'
-                      AND i.indisunique = true
-                    LIMIT 1
-                    """
-                )
-            ).scalar()
-        )
-        if has_upsert_constraint:
+    batch_size = max(100, int(getattr(settings, "sync_records_write_batch_size", 2000) or 2000))
+    use_on_conflict = _sync_records_has_unique_index(db)
+    written = 0
+    for keys in _iter_chunks(list(by_business_key.keys()), size=batch_size):
+        values = [by_business_key[k] for k in keys]
+        if not use_on_conflict:
+            db.query(SyncRecord).filter(
+                sa_tuple(
+                    SyncRecord.domain,
+                    SyncRecord.contract_id,
+                    SyncRecord.gestion_month,
+                    SyncRecord.supervisor,
+                    SyncRecord.un,
+                    SyncRecord.via,
+                    SyncRecord.tramo,
+                ).in_(keys)
+            ).delete(synchronize_session=False)
+            db.execute(table.insert(), values)
+            written += len(values)
+            continue
+        if engine.dialect.name == "postgresql":
             insert_stmt = pg_insert(table).values(values)
-            stmt = insert_stmt.on_conflict_do_update(
-                index_elements=index_cols,
-                set_={
-                    "payload_json": insert_stmt.excluded.payload_json,
-                    "source_hash": insert_stmt.excluded.source_hash,
-                    "updated_at": now,
-                },
-            )
-            db.execute(stmt)
         else:
-            keys = list(by_business_key.keys())
-            for chunk in _iter_chunks(keys, size=1200):
-                db.query(SyncRecord).filter(
-                    sa_tuple(
-                        SyncRecord.domain,
-                        SyncRecord.contract_id,
-                        SyncRecord.gestion_month,
-                        SyncRecord.supervisor,
-                        SyncRecord.un,
-                        SyncRecord.via,
-                        SyncRecord.tramo,
-                    ).in_(chunk)
-                ).delete(synchronize_session=False)
-            db.bulk_insert_mappings(SyncRecord, values)
-    else:
-        insert_stmt = sqlite_insert(table).values(values)
+            insert_stmt = sqlite_insert(table).values(values)
         stmt = insert_stmt.on_conflict_do_update(
             index_elements=index_cols,
             set_={
@@ -1354,43 +1889,55 @@ def _upsert_sync_records(db: Session, rows: list[dict], *, commit: bool = True)
                 "source_hash": insert_stmt.excluded.source_hash,
                 "updated_at": now,
             },
+            where=table.c.source_hash != insert_stmt.excluded.source_hash,
         )
-        db.execute(stmt)
+        result = db.execute(stmt)
+        written += int(result.rowcount or 0)
     if commit:
         db.commit()
-    return len(values)
+    return written
 
 
-def _ensure_cartera_partitions(db: Session, months: set[str]) -> None:
+def _is_partitioned_table(db: Session, table_name: str) -> bool:
+    if engine.dialect.name != "postgresql":
+        return False
+    return bool(
+        db.execute(
+            sa_text(
+                """
+                SELECT 1
+                FROM pg_partitioned_table p
+                JOIN pg_class c ON c.oid = p.partrelid
+                WHERE c.relname = :table_name
+                LIMIT 1
+                """
+            ),
+            {"table_name": table_name},
+        ).scalar()
+    )
+
+
+def _ensure_month_partitions(db: Session, table_name: str, months: set[str]) -> None:
     if engine.dialect.name != "postgresql" or not months:
         return
-    partitioned = db.execute(
-        sa_text(
-            """
-            SELECT 1
-            FROM pg_partitioned_table p
-            JOIN pg_class c ON c.oid = p.partrelid
-            WHERE c.relname = 'cartera_fact'
-            LIMIT 1
-            """
-        )
-    ).scalar()
-    if not partitioned:
-        # Compat mode: if cartera_fact exists as regular table, skip partition DDL.
+    if table_name not in MONTH_PARTITIONED_TABLES:
+        return
+    if not _is_partitioned_table(db, table_name):
+        # Compat mode: if the table exists as regular table, skip partition DDL.
         return
     years = {int(str(mm).split("/")[1]) for mm in months if _month_serial(str(mm)) > 0}
     for year in sorted(years):
         # Parent table is RANGE-partitioned by month serial:
         # serial = (year * 12) + month
-        # Existing convention in DB is yearly partitions (cartera_fact_part_YYYY).
-        part_name = f"cartera_fact_part_{year}"
+        # Existing convention in DB is yearly partitions ({table}_part_YYYY).
+        part_name = f"{table_name}_part_{year}"
         start_serial = (year * 12) + 1  # Jan
         end_serial = ((year + 1) * 12) + 1  # Jan next year
         db.execute(
             sa_text(
                 f"""
                 CREATE TABLE IF NOT EXISTS {part_name}
-                PARTITION OF cartera_fact
+                PARTITION OF {table_name}
                 FOR VALUES FROM ({start_serial}) TO ({end_serial})
                 """
             )
@@ -1398,6 +1945,280 @@ def _ensure_cartera_partitions(db: Session, months: set[str]) -> None:
     db.commit()
 
 
+def _ensure_cartera_partitions(db: Session, months: set[str]) -> None:
+    _ensure_month_partitions(db, "cartera_fact", months)
+
+
+def _truncate_full_month_partitions(
+    db: Session, table_name: str, months: set[str]
+) -> set[str]:
+    """TRUNCATE yearly partitions fully covered by `months`.
+
+    Returns the months whose rows were removed this way, so the caller only
+    needs a row-level DELETE for the remainder of the window.
+    """
+    if not months or table_name not in MONTH_PARTITIONED_TABLES:
+        return set()
+    if not _is_partitioned_table(db, table_name):
+        return set()
+    months_by_year: dict[int, set[str]] = {}
+    for mm in months:
+        if _month_serial(str(mm)) <= 0:
+            continue
+        month_num, year = str(mm).split("/")
+        months_by_year.setdefault(int(year), set()).add(int(month_num))
+    covered: set[str] = set()
+    for year, month_nums in sorted(months_by_year.items()):
+        if len(month_nums) < 12:
+            continue
+        part_name = f"{table_name}_part_{year}"
+        attached = db.execute(
+            sa_text(
+                """
+                SELECT 1
+                FROM pg_inherits i
+                JOIN pg_class parent ON parent.oid = i.inhparent
+                JOIN pg_class child ON child.oid = i.inhrelid
+                WHERE parent.relname = :parent AND child.relname = :child
+                LIMIT 1
+                """
+            ),
+            {"parent": table_name, "child": part_name},
+        ).scalar()
+        if not attached:
+            continue
+        db.execute(sa_text(f"TRUNCATE TABLE {part_name}"))
+        covered.update(f"{m:02d}/{year}" for m in range(1, 13))
+    return covered
+
+
+# Business key per domain used to keep only the newest row (highest id) in a
+# swap stage; mirrors the ON CONFLICT / delete+insert keys of _upsert_fact_rows.
+PARTITION_SWAP_DEDUPE_KEYS = {
+    "cartera": ("contract_id", "close_date", "gestion_month"),
+    "cobranzas": ("source_row_id",),
+    "eerr": (
+        "gestion_month",
+        "social_reason_id",
+        "accounting_plan_id",
+        "eerr_block",
+        "is_tapo",
+    ),
+}
+_INDEXDEF_RE = re.compile(
+    r"^(CREATE (?:UNIQUE )?INDEX) (\S+) ON (?:ONLY )?(\S+) (USING .+)$", re.IGNORECASE
+)
+
+
+def _partition_month_serial_sql(month_column: str) -> str:
+    return (
+        f"((split_part({month_column}, '/', 2)::integer * 12) "
+        f"+ split_part({month_column}, '/', 1)::integer)"
+    )
+
+
+def _partition_swap_plan(
+    db: Session, domain: str, mode: str, target_months: set[str]
+) -> dict[int, dict]:
+    """Yearly partitions to reload via shadow table + ATTACH/DETACH swap.
+
+    Empty dict means "use the regular delete window + upsert path".
+    """
+    if not bool(getattr(settings, "sync_partition_swap_enabled", True)):
+        return {}
+    if str(mode or "").lower() not in {"full_month", "full_year"} or not target_months:
+        return {}
+    if domain not in PARTITION_SWAP_DEDUPE_KEYS:
+        return {}
+    table_name = _target_table_name(domain)
+    if table_name not in MONTH_PARTITIONED_TABLES:
+        return {}
+    if not _is_partitioned_table(db, table_name):
+        return {}
+    plan: dict[int, dict] = {}
+    for mm in sorted(target_months, key=_month_serial):
+        if _month_serial(mm) <= 0:
+            continue
+        year = int(str(mm).split("/")[1])
+        part_name = f"{table_name}_part_{year}"
+        item = plan.setdefault(
+            year,
+            {
+                "partition": part_name,
+                "stage": f"{part_name}_swap",
+                "start": (year * 12) + 1,
+                "end": ((year + 1) * 12) + 1,
+                "months": [],
+                "table": None,
+            },
+        )
+        item["months"].append(str(mm))
+    for item in plan.values():
+        attached = db.execute(
+            sa_text(
+                """
+                SELECT 1
+                FROM pg_inherits i
+                JOIN pg_class parent ON parent.oid = i.inhparent
+                JOIN pg_class child ON child.oid = i.inhrelid
+                WHERE parent.relname = :parent AND child.relname = :child
+                LIMIT 1
+                """
+            ),
+            {"parent": table_name, "child": item["partition"]},
+        ).scalar()
+        if not attached:
+            return {}
+    return plan
+
+
+_RELOPTION_RE = re.compile(r"^[a-z_][a-z0-9_.]*=[A-Za-z0-9_.\-]+$")
+
+
+def _copy_partition_reloptions(db: Session, source: str, target: str) -> list[str]:
+    """Copy storage parameters (per-partition autovacuum from script 07) onto `target`.
+
+    CREATE TABLE ... LIKE does not carry reloptions, and the stage replaces the
+    partition on swap: without this the new partition falls back to the defaults.
+    """
+    reloptions = db.execute(
+        sa_text("SELECT reloptions FROM pg_class WHERE oid = to_regclass(:t)"),
+        {"t": source},
+    ).scalar()
+    options = [str(o) for o in (reloptions or []) if _RELOPTION_RE.match(str(o))]
+    if options:
+        db.execute(sa_text(f"ALTER TABLE {target} SET ({', '.join(options)})"))
+    return options
+
+
+def _prepare_partition_swap_stages(db: Session, domain: str, plan: dict[int, dict]) -> int:
+    """Create one stage table per partition seeded with the rows outside the window."""
+    table = FACT_TABLE_BY_DOMAIN[domain].__table__
+    month_column = MONTH_PARTITIONED_TABLES[table.name]
+    cols_sql = ", ".join(c.name for c in table.columns)
+    kept = 0
+    for _, item in sorted(plan.items()):
+        stage = item["stage"]
+        db.execute(sa_text(f"DROP TABLE IF EXISTS {stage}"))
+        db.execute(
+            sa_text(
+                f"CREATE TABLE {stage} (LIKE {table.name} INCLUDING DEFAULTS INCLUDING STORAGE)"
+            )
+        )
+        _copy_partition_reloptions(db, item["partition"], stage)
+        result = db.execute(
+            sa_text(
+                f"INSERT INTO {stage} ({cols_sql}) "
+                f"SELECT {cols_sql} FROM {item['partition']} WHERE {month_column} NOT IN :months"
+            ).bindparams(bindparam("months", expanding=True)),
+            {"months": item["months"]},
+        )
+        kept += int(result.rowcount or 0)
+        item["table"] = table.to_metadata(MetaData(), name=stage)
+    db.commit()
+    return kept
+
+
+def _insert_partition_swap_rows(
+    db: Session, domain: str, plan: dict[int, dict], rows: list[dict]
+) -> list[dict]:
+    """Insert rows into their stage table; returns rows outside the staged partitions."""
+    month_column = MONTH_PARTITIONED_TABLES[_target_table_name(domain)]
+    now = datetime.utcnow()
+    values_by_year: dict[int, list[dict]] = {}
+    remaining: list[dict] = []
+    for n in rows:
+        record = _fact_row_from_normalized(domain, n)
+        month = str(record.get(month_column) or "")
+        year = int(month[-4:]) if _month_serial(month) > 0 else 0
+        if year not in plan:
+            remaining.append(n)
+            continue
+        record["loaded_at"] = now
+        record["updated_at"] = now
+        values_by_year.setdefault(year, []).append(record)
+    for year, values in values_by_year.items():
+        db.execute(plan[year]["table"].insert(), values)
+    return remaining
+
+
+def _swap_in_partition_stages(db: Session, domain: str, plan: dict[int, dict]) -> None:
+    """Dedupe + index the stages, then swap them in with DETACH/ATTACH in one transaction."""
+    table_name = _target_table_name(domain)
+    serial_sql = _partition_month_serial_sql(MONTH_PARTITIONED_TABLES[table_name])
+    key_join = " AND ".join(
+        f"a.{col} = b.{col}" for col in PARTITION_SWAP_DEDUPE_KEYS[domain]
+    )
+    index_renames: list[tuple[str, str]] = []
+    for _, item in sorted(plan.items()):
+        stage = item["stage"]
+        db.execute(
+            sa_text(f"DELETE FROM {stage} a USING {stage} b WHERE {key_join} AND a.id < b.id")
+        )
+        index_defs = db.execute(
+            sa_text("SELECT indexname, indexdef FROM pg_indexes WHERE tablename = :t"),
+            {"t": item["partition"]},
+        ).all()
+        for pos, (index_name, index_def) in enumerate(index_defs):
+            match = _INDEXDEF_RE.match(str(index_def or ""))
+            if not match:
+                continue
+            stage_index = f"{stage}_ix{pos}"
+            db.execute(
+                sa_text(f"{match.group(1)} {stage_index} ON {stage} {match.group(4)}")
+            )
+            index_renames.append((stage_index, str(index_name)))
+        # Valid CHECK matching the bounds lets ATTACH skip the validation scan.
+        db.execute(
+            sa_text(
+                f"ALTER TABLE {stage} ADD CONSTRAINT {stage}_bounds "
+                f"CHECK ({serial_sql} >= {item['start']} AND {serial_sql} < {item['end']})"
+            )
+        )
+        db.execute(sa_text(f"ANALYZE {stage}"))
+    db.commit()
+
+    db.execute(sa_text(f"LOCK TABLE {table_name} IN ACCESS EXCLUSIVE MODE"))
+    for _, item in sorted(plan.items()):
+        partition = item["partition"]
+        stage = item["stage"]
+        db.execute(sa_text(f"ALTER TABLE {table_name} DETACH PARTITION {partition}"))
+        db.execute(sa_text(f"DROP TABLE {partition}"))
+        db.execute(sa_text(f"ALTER TABLE {stage} RENAME TO {partition}"))
+        db.execute(
+            sa_text(
+                f"ALTER TABLE {table_name} ATTACH PARTITION {partition} "
+                f"FOR VALUES FROM ({item['start']}) TO ({item['end']})"
+            )
+        )
+        db.execute(sa_text(f"ALTER TABLE {partition} DROP CONSTRAINT {stage}_bounds"))
+    for stage_index, index_name in index_renames:
+        db.execute(sa_text(f"ALTER INDEX {stage_index} RENAME TO {index_name}"))
+    db.commit()
+
+
+def _drop_partition_swap_stages(db: Session, plan: dict[int, dict]) -> None:
+    if not plan:
+        return
+    try:
+        db.rollback()
+        for _, item in sorted(plan.items()):
+            db.execute(sa_text(f"DROP TABLE IF EXISTS {item['stage']}"))
+        db.commit()
+    except Exception:
+        db.rollback()
+
+
+def _write_fact_rows(
+    db: Session, domain: str, rows: list[dict], swap_plan: dict[int, dict]
+) -> tuple[int, int]:
+    if not swap_plan:
+        return _upsert_fact_rows(db, domain, rows, commit=False)
+    remaining = _insert_partition_swap_rows(db, domain, swap_plan, rows)
+    changed, unchanged = _upsert_fact_rows(db, domain, remaining, commit=False)
+    return changed + (len(rows) - len(remaining)), unchanged
+
+
 def _delete_target_window_fact(
     db: Session,
     domain: str,
@@ -1407,6 +2228,18 @@ def _delete_target_window_fact(
     target_months: set[str],
 ) -> None:
     model = FACT_TABLE_BY_DOMAIN[domain]
+    partition_months = set(target_months or set())
+    if not partition_months and mode == "full_year" and year_from is not None:
+        if domain in {"cobranzas", "eerr"}:
+            partition_months = {f"{m:02d}/{int(year_from)}" for m in range(1, 13)}
+    truncated_months = _truncate_full_month_partitions(
+        db, model.__tablename__, partition_months
+    )
+    if truncated_months:
+        target_months = set(target_months or set()) - truncated_months
+        if not target_months:
+            db.commit()
+            return
     q = db.query(model)
     if domain == "cartera":
         if target_months:
@@ -1435,6 +2268,42 @@ def _delete_target_window_fact(
     db.commit()
 
 
+def _delete_target_contracts(
+    db: Session, domain: str, contract_ids: set[int], *, commit: bool = True
+) -> set[str]:
+    """
+    CDC: borra las filas destino de los contratos re-extraidos antes del UPSERT.
+
+    La extraccion CDC trae el estado completo de cada contrato modificado; sin este
+    borrado, una fila eliminada en origen (o que cambio de mes) quedaria en el fact.
+    Con commit=False el borrado queda en la transaccion del UPSERT: los lectores siguen
+    viendo las filas previas hasta el commit y un fallo lo revierte junto con la carga.
+    Devuelve los meses de las filas borradas, para refrescar tambien los agregados del mes viejo.
+    """
+    model = FACT_TABLE_BY_DOMAIN.get(domain)
+    if model is None or not contract_ids:
+        return set()
+    chunk_size = int(getattr(settings, "sync_cdc_in_chunk", 1000) or 1000)
+    stale_months: set[str] = set()
+    for ids in chunked_ids(contract_ids, chunk_size):
+        keys = [str(i) for i in ids]
+        stale_months.update(
+            str(m or "")
+            for (m,) in db.query(model.gestion_month)
+            .filter(model.contract_id.in_(keys))
+            .distinct()
+        )
+        db.query(model).filter(model.contract_id.in_(keys)).delete(synchronize_session=False)
+        if _should_persist_sync_records(domain):
+            db.query(SyncRecord).filter(
+                SyncRecord.domain == domain, SyncRecord.contract_id.in_(keys)
+            ).delete(synchronize_session=False)
+    if commit:
+        db.commit()
+    stale_months.discard("")
+    return stale_months
+
+
 def _fact_business_key_tuple(record: dict, domain: str) -> tuple:
     """Build a comparable tuple for fact table business key (for pre-filter lookup)."""
     if domain == "cartera":
@@ -1475,6 +2344,100 @@ def _fact_business_key_tuple(record: dict, domain: str) -> tuple:
     )
 
 
+def _stored_fact_source_hash(domain: str, fingerprint, row) -> str | None:
+    """Recompute `source_hash` for a stored fact row with the active fingerprint."""
+    payload_json = str(row.payload_json or "{}")
+    if domain == "cobranzas":
+        payment_date = row.payment_date.strftime("%Y-%m-%d") if row.payment_date else ""
+        return fingerprint.parts(
+            (
+                str(row.source_row_id or ""),
+                row.contract_id,
+                row.gestion_month,
+                payment_date,
+                _to_float(row.payment_amount),
+                row.payment_via_class,
+                row.supervisor,
+                row.un,
+                row.via,
+                int(row.tramo or 0),
+            )
+        )
+    if domain == "analytics":
+        return fingerprint.parts(
+            (
+                row.contract_id,
+                row.gestion_month,
+                row.supervisor,
+                row.un,
+                row.via,
+                int(row.tramo or 0),
+                max(1, _to_int(row.contracts_total, 1)),
+                _to_float(row.debt_total),
+                _to_float(row.paid_total),
+            )
+        )
+    try:
+        payload = json.loads(payload_json)
+    except Exception:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    if domain == "eerr":
+        return _normalize_record(domain, payload, 0)["source_hash"]
+    return fingerprint.mapping(payload, payload_json)
+
+
+def _rehash_stored_source_hashes(
+    db: Session,
+    domain: str,
+    months: set[str] | None = None,
+    *,
+    batch_size: int = 2000,
+) -> int:
+    """Rewrite fact `source_hash` values produced by another fingerprint algorithm.
+
+    Keeps incremental change detection (prefilter and unchanged counts) working
+    after SYNC_FINGERPRINT_ALGORITHM changes: without it every stored row would
+    look changed once. Limited to `months` when given; returns rows rewritten.
+    """
+    model = FACT_TABLE_BY_DOMAIN.get(domain)
+    if model is None:
+        return 0
+    fingerprint = active_fingerprint()
+    table = model.__table__
+    if fingerprint.prefix:
+        stale = ~table.c.source_hash.like(f"{fingerprint.prefix}%")
+    else:
+        stale = table.c.source_hash.like("%:%")
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .where(table.c.gestion_month == bindparam("b_month"))
+        .values(source_hash=bindparam("b_hash"))
+    )
+    rewritten = 0
+    last_id = 0
+    while True:
+        q = select(table).where(stale, table.c.id > last_id)
+        if months:
+            q = q.where(table.c.gestion_month.in_(sorted(months)))
+        rows = db.execute(q.order_by(table.c.id).limit(max(100, int(batch_size)))).all()
+        if not rows:
+            break
+        last_id = int(rows[-1].id)
+        params = []
+        for row in rows:
+            new_hash = _stored_fact_source_hash(domain, fingerprint, row)
+            if new_hash and new_hash != row.source_hash:
+                params.append({"b_id": row.id, "b_month": row.gestion_month, "b_hash": new_hash})
+        if params:
+            db.execute(stmt, params)
+            rewritten += len(params)
+        db.commit()
+    return rewritten
+
+
 def _filter_rows_changed_vs_postgres(
     db: Session, domain: str, rows: list[dict]
 ) -> list[dict]:
@@ -1917,13 +2880,24 @@ def _refresh_cobranzas_cohorte_agg(
         key=_month_serial,
     )
     effective_by_cutoff = _effective_cartera_month_by_cutoff(db, months)
-    return refresh_cobranzas_cohorte_agg(
+    result = refresh_cobranzas_cohorte_agg(
         db,
         affected_months,
         _month_serial,
         effective_by_cutoff=effective_by_cutoff,
         categoria_expr=_build_cartera_categoria_expr(db),
     )
+    # Órfanos (cobranzas sin cartera en el mes efectivo) por corte, junto al cohorte.
+    deleted_orphans, orphan_rows = refresh_cobranzas_orphan_precompute(
+        db, _month_serial, effective_by_cutoff=effective_by_cutoff
+    )
+    logger.info(
+        "[sync] cobranzas_orphan precalculado: cortes=%s borradas=%s insertadas=%s",
+        len(effective_by_cutoff),
+        deleted_orphans,
+        orphan_rows,
+    )
+    return result
 
 
 def _load_un_canonical_map(db: Session) -> dict[str, str]:
@@ -2049,6 +3023,14 @@ def _refresh_mv_options_tables(
     return refresh_mv_options_tables(db, affected_months, _month_serial)
 
 
+def _maintain_mv_options_tables(
+    db: Session, affected_months: set[str]
+) -> dict[str, int]:
+    if bool(getattr(settings, "sync_mv_options_delta_enabled", True)):
+        return apply_mv_options_delta(db, affected_months, _month_serial)
+    return refresh_mv_options_tables(db, affected_months, _month_serial)
+
+
 def _bootstrap_mv_options_full(db: Session) -> dict[str, int]:
     return bootstrap_mv_options_full(db, _month_serial)
 
@@ -2288,64 +3270,103 @@ def _reconcile_chunk_manifest(
     domain: str,
     job_id: str,
     chunk_signals: dict[str, dict],
+    batch_size: int | None = None,
 ) -> tuple[set[str], int]:
+    """Compare chunk signals against sync_chunk_manifest in bounded batches.
+
+    Each batch reads only (chunk_key, chunk_hash, row_count) for its keys,
+    writes new/changed chunks with one INSERT ... ON CONFLICT and marks the
+    unchanged ones with one UPDATE, then commits. Memory and transaction size
+    are bounded by the batch, and a crash keeps the batches already reconciled.
+    """
     changed: set[str] = set()
     skipped = 0
-    now = datetime.utcnow()
-
-    chunk_keys = list(chunk_signals.keys())
-    existing_rows = (
-        db.query(SyncChunkManifest)
-        .filter(
-            SyncChunkManifest.domain == domain,
-            SyncChunkManifest.chunk_key.in_(chunk_keys),
-        )
-        .all()
+    size = max(
+        1,
+        int(
+            batch_size
+            or getattr(settings, "sync_manifest_reconcile_batch_size", 500)
+            or 500
+        ),
     )
-    manifest_by_key: dict[str, SyncChunkManifest] = {
-        row.chunk_key: row for row in existing_rows
-    }
-
-    for chunk_key, signal in chunk_signals.items():
-        row_count = int(signal.get("count") or 0)
-        chunk_hash = _chunk_hash_finalize(signal)
-        row = manifest_by_key.get(chunk_key)
-
-        if row is None:
-            row = SyncChunkManifest(
-                domain=domain,
-                chunk_key=chunk_key,
-                chunk_hash=chunk_hash,
-                row_count=row_count,
-                first_seen_at=now,
-                last_seen_at=now,
-                status="changed",
-                last_job_id=job_id,
-                skipped_count=0,
-                updated_at=now,
+    table = SyncChunkManifest.__table__
+    chunk_keys = sorted(chunk_signals.keys())
+    for start in range(0, len(chunk_keys), size):
+        batch_keys = chunk_keys[start : start + size]
+        now = datetime.utcnow()
+        existing = {
+            str(r.chunk_key): (str(r.chunk_hash or ""), int(r.row_count or 0))
+            for r in db.query(
+                SyncChunkManifest.chunk_key,
+                SyncChunkManifest.chunk_hash,
+                SyncChunkManifest.row_count,
+            )
+            .filter(
+                SyncChunkManifest.domain == domain,
+                SyncChunkManifest.chunk_key.in_(batch_keys),
+            )
+            .all()
+        }
+        changed_values: list[dict] = []
+        unchanged_keys: list[str] = []
+        for chunk_key in batch_keys:
+            signal = chunk_signals[chunk_key]
+            row_count = int(signal.get("count") or 0)
+            chunk_hash = _chunk_hash_finalize(signal)
+            if existing.get(chunk_key) == (chunk_hash, row_count):
+                unchanged_keys.append(chunk_key)
+                continue
+            changed_values.append(
+                {
+                    "domain": domain,
+                    "chunk_key": chunk_key,
+                    "chunk_hash": chunk_hash,
+                    "row_count": row_count,
+                    "first_seen_at": now,
+                    "last_seen_at": now,
+                    "status": "changed",
+                    "last_job_id": job_id,
+                    "skipped_count": 0,
+                    "updated_at": now,
+                }
+            )
+        if changed_values:
+            if engine.dialect.name == "postgresql":
+                insert_stmt = pg_insert(table).values(changed_values)
+            else:
+                insert_stmt = sqlite_insert(table).values(changed_values)
+            excluded = insert_stmt.excluded
+            db.execute(
+                insert_stmt.on_conflict_do_update(
+                    index_elements=[table.c.domain, table.c.chunk_key],
+                    set_={
+                        "chunk_hash": excluded.chunk_hash,
+                        "row_count": excluded.row_count,
+                        "status": "changed",
+                        "last_seen_at": excluded.last_seen_at,
+                        "last_job_id": excluded.last_job_id,
+                        "updated_at": excluded.updated_at,
+                    },
+                )
             )
-            db.add(row)
-            changed.add(chunk_key)
-            continue
-        if (
-            str(row.chunk_hash or "") == chunk_hash
-            and int(row.row_count or 0) == row_count
-        ):
-            row.status = "unchanged"
-            row.last_seen_at = now
-            row.last_job_id = job_id
-            row.skipped_count = int(row.skipped_count or 0) + 1
-            row.updated_at = now
-            skipped += 1
-            continue
-        row.chunk_hash = chunk_hash
-        row.row_count = row_count
-        row.status = "changed"
-        row.last_seen_at = now
-        row.last_job_id = job_id
-        row.updated_at = now
-        changed.add(chunk_key)
-    db.commit()
+            changed.update(v["chunk_key"] for v in changed_values)
+        if unchanged_keys:
+            db.execute(
+                table.update()
+                .where(
+                    table.c.domain == domain,
+                    table.c.chunk_key.in_(unchanged_keys),
+                )
+                .values(
+                    status="unchanged",
+                    last_seen_at=now,
+                    last_job_id=job_id,
+                    skipped_count=table.c.skipped_count + 1,
+                    updated_at=now,
+                )
+            )
+            skipped += len(unchanged_keys)
+        db.commit()
     return changed, skipped
 
 
@@ -2434,6 +3455,7 @@ def _cleanup_stale_running_jobs() -> None:
                 ):
                     # Another worker may still be actively processing this job.
                     continue
+            existing_log = _run_log_lines(db, row)
             row.running = False
             row.stage = "failed"
             row.progress_pct = 100
@@ -2442,11 +3464,6 @@ def _cleanup_stale_running_jobs() -> None:
             row.finished_at = now
             if row.started_at:
                 row.duration_sec = round((now - row.started_at).total_seconds(), 2)
-            existing_log = []
-            try:
-                existing_log = json.loads(row.log_json or "[]")
-            except Exception:
-                existing_log = []
             existing_log.append(
                 f"Error: job_interrupted_on_restart ({now.isoformat()})"
             )
@@ -2828,6 +3845,7 @@ def _execute_job(
 ) -> None:
     started_at = datetime.now(timezone.utc)
     db = SessionLocal()
+    swap_plan: dict[int, dict] = {}
     try:
         logger.info(
             "[sync:%s:%s] start mode=%s year_from=%s close_month=%s close_month_from=%s close_month_to=%s actor=%s",
@@ -2990,116 +4008,179 @@ def _execute_job(
                 f"Watermark activo: updated_at>{wm_filter_updated_at.isoformat()}"
                 + (f" (id>{wm_filter_source_id})" if wm_filter_source_id else ""),
             )
-        if getattr(settings, "sync_precheck_enabled", True):
-            if not _mysql_has_new_data(
+        cdc_backend = _cdc_backend_for(domain, mode)
+        cdc_changes: CdcChanges | None = None
+        cdc_position: str | None = None
+        if cdc_backend:
+            # Without a row watermark the run is not a delta; only capture the CDC head.
+            cdc_changes, cdc_position = _read_cdc_changes(
+                db,
                 domain=domain,
-                watermark_updated_at=wm_filter_updated_at,
-                watermark_source_id=wm_filter_source_id or None,
+                backend=cdc_backend,
                 mysql_config=mysql_cfg,
-            ):
+                head_only=wm_filter_updated_at is None,
+            )
+            if cdc_changes is not None:
                 _append_log(
                     domain,
-                    "Pre-check: sin datos nuevos, omitiendo sync (skipped_no_changes).",
-                )
-                finished_at = datetime.now(timezone.utc)
-                duration_sec = round((finished_at - started_at).total_seconds(), 2)
-                _set_state(
-                    domain,
-                    {
-                        "running": False,
-                        "stage": "completed",
-                        "progress_pct": 100,
-                        "status_message": "Sin datos nuevos (skipped_no_changes)",
-                        "rows_read": 0,
-                        "rows_upserted": 0,
-                        "rows_unchanged": 0,
-                        "finished_at": finished_at.isoformat(),
-                        "duration_sec": duration_sec,
-                        "job_step": "finalize",
-                    },
-                )
-                _persist_job_step(
-                    db, job_id, domain, "extract", "completed", {"rows_read": 0}
+                    f"CDC {cdc_backend}: {len(cdc_changes.contract_ids)} contratos modificados "
+                    f"({cdc_changes.events} eventos, {cdc_changes.start_position}->{cdc_changes.end_position})",
                 )
-                _persist_job_step(
-                    db,
-                    job_id,
+            elif cdc_position:
+                _append_log(
                     domain,
-                    "normalize",
-                    "completed",
-                    {"rows_read": 0, "normalized": 0},
+                    f"CDC {cdc_backend}: sin posicion previa o demasiados cambios, extraccion incremental normal.",
                 )
-                _persist_job_step(
-                    db, job_id, domain, "replace_window", "completed", {"months": []}
-                )
-                _persist_job_step(
-                    db,
-                    job_id,
-                    domain,
-                    "upsert",
-                    "completed",
-                    {"rows_upserted": 0, "rows_unchanged": 0},
+        cdc_contract_ids = set(cdc_changes.contract_ids) if cdc_changes is not None else None
+        if cdc_changes is not None:
+            has_new_data = bool(cdc_contract_ids)
+        elif getattr(settings, "sync_precheck_enabled", True):
+            has_new_data = _mysql_has_new_data(
+                domain=domain,
+                watermark_updated_at=wm_filter_updated_at,
+                watermark_source_id=wm_filter_source_id or None,
+                mysql_config=mysql_cfg,
+            )
+        else:
+            has_new_data = True
+        source_summary: dict[str, str] | None = None
+        source_changed_months: set[str] | None = None
+        source_unchanged_months = 0
+        if has_new_data and cdc_changes is None and _source_summary_enabled(domain, mode):
+            source_summary = _source_month_summaries(domain=domain, mysql_config=mysql_cfg)
+            if source_summary is not None:
+                stored_signatures = _stored_source_signatures(
+                    db, domain, set(source_summary), fresh_since=_source_signature_fresh_since()
                 )
-                _persist_job_step(
-                    db,
-                    job_id,
+                source_changed_months = {
+                    month
+                    for month, signature in source_summary.items()
+                    if stored_signatures.get(month) != signature
+                }
+                source_unchanged_months = len(source_summary) - len(source_changed_months)
+                has_new_data = bool(source_changed_months)
+                _append_log(
                     domain,
-                    "finalize",
-                    "completed",
-                    {"duration_sec": duration_sec},
+                    f"Resumen en origen: {len(source_changed_months)} meses con cambios, "
+                    f"{source_unchanged_months} sin cambios (no se extraen)",
                 )
-                _persist_job_step(db, job_id, domain, "bootstrap", "completed")
-                state_snap = _state_by_domain.get(domain) or {}
-                _persist_sync_run(
+        if not has_new_data:
+            _append_log(
+                domain,
+                "CDC: sin contratos modificados, omitiendo sync (skipped_no_changes)."
+                if cdc_changes is not None
+                else "Resumen en origen: ningun mes cambio, omitiendo sync (skipped_no_changes)."
+                if source_summary is not None
+                else "Pre-check: sin datos nuevos, omitiendo sync (skipped_no_changes).",
+            )
+            finished_at = datetime.now(timezone.utc)
+            duration_sec = round((finished_at - started_at).total_seconds(), 2)
+            _set_state(
+                domain,
+                {
+                    "running": False,
+                    "stage": "completed",
+                    "progress_pct": 100,
+                    "status_message": "Sin datos nuevos (skipped_no_changes)",
+                    "rows_read": 0,
+                    "rows_upserted": 0,
+                    "rows_unchanged": 0,
+                    "finished_at": finished_at.isoformat(),
+                    "duration_sec": duration_sec,
+                    "job_step": "finalize",
+                },
+            )
+            _persist_job_step(
+                db, job_id, domain, "extract", "completed", {"rows_read": 0}
+            )
+            _persist_job_step(
+                db,
+                job_id,
+                domain,
+                "normalize",
+                "completed",
+                {"rows_read": 0, "normalized": 0},
+            )
+            _persist_job_step(
+                db, job_id, domain, "replace_window", "completed", {"months": []}
+            )
+            _persist_job_step(
+                db,
+                job_id,
+                domain,
+                "upsert",
+                "completed",
+                {"rows_upserted": 0, "rows_unchanged": 0},
+            )
+            _persist_job_step(
+                db,
+                job_id,
+                domain,
+                "finalize",
+                "completed",
+                {"duration_sec": duration_sec},
+            )
+            _persist_job_step(db, job_id, domain, "bootstrap", "completed")
+            state_snap = _state_by_domain.get(domain) or {}
+            _persist_sync_run(
+                db,
+                {
+                    "job_id": job_id,
+                    "domain": domain,
+                    "mode": mode,
+                    "year_from": year_from,
+                    "close_month": close_month,
+                    "close_month_from": close_month_from,
+                    "close_month_to": close_month_to,
+                    "target_table": _target_table_name(domain),
+                    "running": False,
+                    "stage": "completed",
+                    "progress_pct": 100,
+                    "status_message": "Sin datos nuevos (skipped_no_changes)",
+                    "rows_inserted": 0,
+                    "rows_updated": 0,
+                    "rows_skipped": 0,
+                    "rows_read": 0,
+                    "rows_upserted": 0,
+                    "rows_unchanged": 0,
+                    "current_query_file": _query_file_for(domain),
+                    "job_step": "finalize",
+                    "affected_months": [],
+                    "error": None,
+                    "finished_at": finished_at.replace(tzinfo=None),
+                    "duration_sec": duration_sec,
+                    "log": state_snap.get("log", [])[-200:],
+                    "actor": actor,
+                },
+            )
+            if cdc_backend and cdc_position:
+                _store_cdc_position(
                     db,
-                    {
-                        "job_id": job_id,
-                        "domain": domain,
-                        "mode": mode,
-                        "year_from": year_from,
-                        "close_month": close_month,
-                        "close_month_from": close_month_from,
-                        "close_month_to": close_month_to,
-                        "target_table": _target_table_name(domain),
-                        "running": False,
-                        "stage": "completed",
-                        "progress_pct": 100,
-                        "status_message": "Sin datos nuevos (skipped_no_changes)",
-                        "rows_inserted": 0,
-                        "rows_updated": 0,
-                        "rows_skipped": 0,
-                        "rows_read": 0,
-                        "rows_upserted": 0,
-                        "rows_unchanged": 0,
-                        "current_query_file": _query_file_for(domain),
-                        "job_step": "finalize",
-                        "affected_months": [],
-                        "error": None,
-                        "finished_at": finished_at.replace(tzinfo=None),
-                        "duration_sec": duration_sec,
-                        "log": state_snap.get("log", [])[-200:],
-                        "actor": actor,
-                    },
-                )
-                logger.info(
-                    "[sync:%s:%s] skipped_no_changes (pre-check)", domain, job_id
+                    domain=domain,
+                    backend=cdc_backend,
+                    position=cdc_position,
+                    job_id=job_id,
+                    contracts=0,
                 )
-                return
+            logger.info(
+                "[sync:%s:%s] skipped_no_changes (pre-check)", domain, job_id
+            )
+            return
         max_rows = _max_rows_for_domain(domain)
         low_impact_mode = _is_low_impact_mode(mode)
-        default_fetch_batch = _fetch_batch_size_for_domain(domain)
-        effective_fetch_batch = (
-            _low_impact_fetch_batch_size(default_fetch_batch)
-            if low_impact_mode
-            else default_fetch_batch
+        fetch_controller, chunk_controller = _build_sizing_controllers(
+            db, domain, low_impact_mode
         )
+        effective_fetch_batch = fetch_controller.size
+        lock_waits_seen = 0
         if low_impact_mode:
             _append_log(
                 domain,
                 (
-                    "Modo protegido activo (micro-lotes): "
+                    "Modo protegido activo (presupuesto de latencia): "
                     f"fetch_batch={effective_fetch_batch}, "
-                    f"chunk_pause={int(getattr(settings, 'sync_low_impact_chunk_pause_ms', 40) or 40)}ms"
+                    f"chunk={chunk_controller.size}, "
+                    f"presupuesto={int(chunk_controller.target_ms)}ms"
                 ),
             )
             _set_state(
@@ -3131,42 +4212,15 @@ def _execute_job(
         wm_last_updated_at: datetime | None = None
         wm_last_source_id: str | None = None
         temp_rows_path: str | None = None
-        temp_rows_file = None
+        temp_rows_file: SpillWriter | None = None
         temp_rows_by_month: dict[str, str] = {}
-        temp_file_by_month: dict[str, Any] = {}
-        temp_rows_buffer: list[str] = []
-        temp_rows_buffer_by_month: dict[str, list[str]] = {}
+        temp_file_by_month: dict[str, SpillWriter] = {}
         month_counts: dict[str, int] = {}
-        jsonl_flush_every = max(
+        spill_stats = SpillStats()
+        spill_frame_rows = max(
             100, int(getattr(settings, "sync_jsonl_flush_every_rows", 1000) or 1000)
         )
 
-        def _jsonl_line(record: dict) -> str:
-            json_row = (
-                record
-                if "_sync_payload_parsed" not in record
-                else {k: v for k, v in record.items() if k != "_sync_payload_parsed"}
-            )
-            return json.dumps(json_row, ensure_ascii=False) + "\n"
-
-        def _flush_temp_rows(force: bool = False) -> None:
-            if temp_rows_file is None:
-                return
-            if temp_rows_buffer and (
-                force or len(temp_rows_buffer) >= jsonl_flush_every
-            ):
-                temp_rows_file.writelines(temp_rows_buffer)
-                temp_rows_buffer.clear()
-
-        def _flush_temp_rows_month(month_key: str, force: bool = False) -> None:
-            month_file = temp_file_by_month.get(month_key)
-            month_buffer = temp_rows_buffer_by_month.get(month_key)
-            if month_file is None or not month_buffer:
-                return
-            if force or len(month_buffer) >= jsonl_flush_every:
-                month_file.writelines(month_buffer)
-                month_buffer.clear()
-
         # Stream large domains to disk to keep memory stable and show incremental progress.
         stream_to_disk_domains = {
             "cartera",
@@ -3182,22 +4236,40 @@ def _execute_job(
                 temp_rows_path = None
             else:
                 fd, temp_rows_path = tempfile.mkstemp(
-                    prefix=f"sync_{domain}_", suffix=".jsonl"
+                    prefix=f"sync_{domain}_", suffix=SPILL_SUFFIX
                 )
                 os.close(fd)
-                temp_rows_file = open(temp_rows_path, "w", encoding="utf-8")
-        seq = 0
+                temp_rows_file = SpillWriter(
+                    temp_rows_path, stats=spill_stats, frame_rows=spill_frame_rows
+                )
+        normalize_stage = NormalizationStage(
+            domain, workers=_normalize_workers_for_domain(domain, low_impact_mode)
+        )
+        extract_stats = ExtractStats()
+        # CDC rows of a changed contract are all re-applied, whatever their updated_at.
+        row_filter_updated_at = None if cdc_contract_ids else wm_filter_updated_at
+        if normalize_stage.mode == "process":
+            _append_log(
+                domain,
+                f"Normalizacion en paralelo: workers={normalize_stage.workers}",
+            )
         try:
-            for batch in _iter_from_mysql(
-                query_path,
-                domain=domain,
-                watermark_updated_at=wm_filter_updated_at,
-                watermark_source_id=wm_filter_source_id or None,
-                mysql_config=mysql_cfg,
-                batch_size_override=effective_fetch_batch,
+            for batch_len, normalized_batch in normalize_stage.run(
+                _iter_from_mysql(
+                    query_path,
+                    domain=domain,
+                    watermark_updated_at=wm_filter_updated_at,
+                    watermark_source_id=wm_filter_source_id or None,
+                    mysql_config=mysql_cfg,
+                    batch_size_override=effective_fetch_batch,
+                    fetch_controller=fetch_controller,
+                    cdc_contract_ids=cdc_contract_ids,
+                    source_months=source_changed_months,
+                    extract_stats=extract_stats,
+                )
             ):
                 _ensure_job_not_cancelled(db, job_id, domain)
-                source_rows += len(batch)
+                source_rows += batch_len
                 # Runtime resilience: never abort a running sync for size; process incrementally.
                 hard_limit = None
                 if hard_limit is not None and source_rows > hard_limit:
@@ -3216,15 +4288,12 @@ def _execute_job(
                         "duplicates_detected": duplicates_detected,
                     },
                 )
-                for row in batch:
-                    raw_updated_at, raw_source_id = _extract_source_markers(row)
-                    n = _normalize_record(domain, row, seq)
-                    seq += 1
-                    if wm_filter_updated_at is not None and raw_updated_at is not None:
-                        should_skip_by_watermark = raw_updated_at < wm_filter_updated_at
+                for raw_updated_at, raw_source_id, n in normalized_batch:
+                    if row_filter_updated_at is not None and raw_updated_at is not None:
+                        should_skip_by_watermark = raw_updated_at < row_filter_updated_at
                         if (
                             not should_skip_by_watermark
-                            and raw_updated_at == wm_filter_updated_at
+                            and raw_updated_at == row_filter_updated_at
                             and wm_filter_source_id
                             and raw_source_id
                         ):
@@ -3276,19 +4345,16 @@ def _execute_job(
                             if month_key not in temp_file_by_month:
                                 fd, path = tempfile.mkstemp(
                                     prefix=f"sync_{domain}_{month_key.replace('/', '_')}_",
-                                    suffix=".jsonl",
+                                    suffix=SPILL_SUFFIX,
                                 )
                                 os.close(fd)
                                 temp_rows_by_month[month_key] = path
-                                temp_file_by_month[month_key] = open(
-                                    path, "w", encoding="utf-8"
+                                temp_file_by_month[month_key] = SpillWriter(
+                                    path, stats=spill_stats, frame_rows=spill_frame_rows
                                 )
-                                temp_rows_buffer_by_month[month_key] = []
-                            temp_rows_buffer_by_month[month_key].append(_jsonl_line(n))
-                            _flush_temp_rows_month(month_key)
+                            temp_file_by_month[month_key].append(n)
                     elif temp_rows_file is not None:
-                        temp_rows_buffer.append(_jsonl_line(n))
-                        _flush_temp_rows()
+                        temp_rows_file.append(n)
                     else:
                         normalized_rows.append(n)
                 if source_rows % 50000 == 0:
@@ -3297,39 +4363,51 @@ def _execute_job(
                         f"Normalizando... leidas={source_rows}, unicas={normalized_count}, duplicadas={duplicates_detected}",
                     )
         finally:
+            # Los spills se leen en la fase de upsert y se borran al final de ella.
             if temp_rows_file is not None:
-                _flush_temp_rows(force=True)
                 temp_rows_file.close()
-                # os.unlink MOVED: el archivo todavia se necesita en la fase de upsert
-                # (lineas 3591, 3648). Se limpia correctamente al final del upsert.
-            for month_key, f in temp_file_by_month.items():
+            for f in temp_file_by_month.values():
                 try:
-                    _flush_temp_rows_month(month_key, force=True)
                     f.close()
-                    fp = temp_rows_by_month.get(month_key)
-                    if fp and os.path.exists(fp):
-                        try:
-                            os.unlink(fp)
-                        except Exception:
-                            pass
                 except Exception:
                     pass
 
         _append_log(domain, f"Filas fuente: {source_rows}")
+        extract_snapshot = extract_stats.snapshot()
+        _append_log(
+            domain,
+            f"Extraccion MySQL: cursor={extract_snapshot['cursor_mode']} "
+            f"driver={extract_snapshot['driver']} "
+            f"filas/s={extract_snapshot['rows_per_sec']} "
+            f"rss_pico={extract_snapshot['peak_rss_mb']}MB",
+        )
         _persist_job_step(
             db,
             job_id,
             domain,
             "normalize",
             "completed",
-            {"rows_read": source_rows, "normalized": normalized_count},
-        )
-        changed_months, skipped_unchanged_chunks = _reconcile_chunk_manifest(
-            db,
-            domain=domain,
-            job_id=job_id,
-            chunk_signals=chunk_signals,
+            {
+                "rows_read": source_rows,
+                "normalized": normalized_count,
+                "normalize_stage": normalize_stage.snapshot(),
+                "spill": spill_stats.snapshot(),
+                "source_cursor": extract_snapshot,
+            },
         )
+        if cdc_contract_ids:
+            # CDC: the signals cover only the re-extracted contracts, not whole months, so they
+            # must not overwrite the month manifest; every re-extracted month is applied anyway.
+            changed_months, skipped_unchanged_chunks = set(chunk_signals), 0
+            _append_log(domain, "CDC: manifest de chunks sin cambios (señales parciales por contrato)")
+        else:
+            changed_months, skipped_unchanged_chunks = _reconcile_chunk_manifest(
+                db,
+                domain=domain,
+                job_id=job_id,
+                chunk_signals=chunk_signals,
+            )
+        skipped_unchanged_chunks += source_unchanged_months
         _log_extract_chunk(
             db,
             job_id=job_id,
@@ -3348,11 +4426,18 @@ def _execute_job(
                 "skipped_unchanged_chunks": skipped_unchanged_chunks,
                 "watermark_partition_key": partition_key,
                 "watermark_filtered_rows": int(watermark_filtered_rows),
+                "cdc": cdc_changes.snapshot() if cdc_changes is not None else None,
+                "source_summary": {
+                    "months": len(source_summary),
+                    "changed": len(source_changed_months or ()),
+                }
+                if source_summary is not None
+                else None,
             },
         )
         detected_target_months = set(changed_months)
         target_months = set(detected_target_months)
-        # full_all + JSONL único (cobranzas/contratos/gestores/eerr/…): no limitar el upsert a
+        # full_all + spill único (cobranzas/contratos/gestores/eerr/…): no limitar el upsert a
         # changed_months del manifiesto. Si un mes queda "unchanged" pero el fact nunca se cargó
         # completo (o hubo sync parcial), esas filas se saltaban y el fact quedaba con pocos meses.
         if (
@@ -3367,6 +4452,9 @@ def _execute_job(
                     f"no solo manifest cambiado ({len(target_months)}).",
                 )
             target_months = set(source_months)
+        if cdc_contract_ids:
+            # CDC: the target rows of these contracts are replaced, so every re-extracted row is applied.
+            target_months |= set(source_months)
         _set_state(
             domain,
             {
@@ -3381,7 +4469,8 @@ def _execute_job(
             _append_log(
                 domain, f"Chunks sin cambios detectados: {skipped_unchanged_chunks}"
             )
-        _ensure_cartera_partitions(db, target_months if domain == "cartera" else set())
+        _ensure_month_partitions(db, _target_table_name(domain), target_months)
+        swap_plan = _partition_swap_plan(db, domain, mode, target_months)
         if domain == "cartera":
             _ensure_cartera_conflict_unique_index(db)
 
@@ -3408,10 +4497,22 @@ def _execute_job(
             },
         )
         if target_months and not incremental_delta_mode:
-            _delete_target_window(db, domain, mode, year_from, target_months)
-            _delete_target_window_fact(
-                db, domain, mode, year_from, close_month, target_months
-            )
+            if _should_persist_sync_records(domain):
+                _delete_target_window(db, domain, mode, year_from, target_months)
+            if swap_plan:
+                kept_rows = _prepare_partition_swap_stages(db, domain, swap_plan)
+                _append_log(
+                    domain,
+                    (
+                        "Carga por swap de particion: "
+                        f"{', '.join(item['partition'] for _, item in sorted(swap_plan.items()))} "
+                        f"(filas fuera de ventana conservadas={kept_rows})"
+                    ),
+                )
+            else:
+                _delete_target_window_fact(
+                    db, domain, mode, year_from, close_month, target_months
+                )
         elif target_months and incremental_delta_mode:
             _append_log(
                 domain,
@@ -3443,24 +4544,44 @@ def _execute_job(
         )
         persist_sync_records = _should_persist_sync_records(domain)
         persist_staging_rows = _should_persist_staging_rows()
+        lock_wait_tables = [_target_table_name(domain)]
+        if persist_sync_records:
+            lock_wait_tables.append(SyncRecord.__tablename__)
+        rehashed_rows = 0
+        if (
+            bool(getattr(settings, "sync_fingerprint_rehash_stored", True))
+            and target_months
+            and incremental_delta_mode
+        ):
+            # Only rows that survive the run (no window replace) are compared by source_hash.
+            rehashed_rows = _rehash_stored_source_hashes(db, domain, target_months)
+            if rehashed_rows:
+                _append_log(
+                    domain,
+                    f"source_hash recalculado ({active_fingerprint().name}): {rehashed_rows} filas",
+                )
         pre_fact_count = 0
         fact_model = FACT_TABLE_BY_DOMAIN.get(domain)
         if fact_model is not None:
             pre_fact_count = 1 if db.query(fact_model).first() is not None else 0
+        # CDC: delete + UPSERT de los contratos en una sola transaccion (commit al final de la carga).
+        cdc_atomic = bool(cdc_contract_ids) and incremental_delta_mode
+        if cdc_atomic:
+            stale_months = _delete_target_contracts(
+                db, domain, cdc_contract_ids, commit=False
+            )
+            detected_target_months |= stale_months | set(source_months)
+            _append_log(
+                domain,
+                f"CDC: filas destino de {len(cdc_contract_ids)} contratos a reemplazar "
+                f"(meses previos: {', '.join(sorted(stale_months, key=_month_serial)) or '-'})",
+            )
         rows_inserted = 0
         rows_upserted = 0
         rows_unchanged = 0
         applied_months: set[str] = set()
         processed_by_month: dict[str, int] = {}
         if temp_rows_path is not None or temp_rows_by_month:
-            base_chunk_size = _adaptive_chunk_size(
-                domain, int(settings.sync_fetch_batch_size or 5000)
-            )
-            chunk_size = (
-                _low_impact_chunk_size(base_chunk_size)
-                if low_impact_mode
-                else base_chunk_size
-            )
             chunk_pause_seconds = (
                 _low_impact_chunk_pause_seconds() if low_impact_mode else 0.0
             )
@@ -3474,7 +4595,8 @@ def _execute_job(
                     rows_unchanged, \
                     duplicates_detected, \
                     processed, \
-                    applied_months
+                    applied_months, \
+                    lock_waits_seen
                 _ensure_job_not_cancelled(db, job_id, domain)
                 if not chunk_rows:
                     return 0
@@ -3485,10 +4607,12 @@ def _execute_job(
                 if (
                     getattr(settings, "sync_postgres_prefilter_enabled", True)
                     and deduped_rows
+                    and not swap_plan
                 ):
                     deduped_rows = _filter_rows_changed_vs_postgres(
                         db, domain, deduped_rows
                     )
+                write_started = monotonic()
                 if persist_staging_rows:
                     _persist_staging_rows(
                         db, job_id, domain, chunk_key, deduped_rows, commit=False
@@ -3497,10 +4621,22 @@ def _execute_job(
                     rows_inserted += _upsert_sync_records(
                         db, deduped_rows, commit=False
                     )
-                changed, unchanged = _upsert_fact_rows(
-                    db, domain, deduped_rows, commit=False
+                changed, unchanged = _write_fact_rows(
+                    db, domain, deduped_rows, swap_plan
+                )
+                if cdc_atomic:
+                    # Sin commit intermedio; pg_locks se omite (su rollback ante error abortaria la carga).
+                    chunk_lock_waits = 0
+                else:
+                    db.commit()
+                    chunk_lock_waits = _pg_lock_waiters(db, lock_wait_tables)
+                lock_waits_seen += chunk_lock_waits
+                congested = chunk_controller.observe(
+                    len(deduped_rows),
+                    monotonic() - write_started,
+                    lock_waits=chunk_lock_waits,
+                    rss_mb=current_rss_mb(),
                 )
-                db.commit()
                 rows_upserted += changed
                 rows_unchanged += unchanged
                 if changed > 0:
@@ -3513,7 +4649,8 @@ def _execute_job(
                     )
                 duplicates_detected += int(chunk_duplicates) + int(unchanged)
                 processed += len(deduped_rows)
-                if chunk_pause_seconds > 0:
+                if congested and chunk_pause_seconds > 0:
+                    # Low-impact: back off only after a chunk overran the latency budget.
                     time_sleep(chunk_pause_seconds)
                 return len(deduped_rows)
 
@@ -3532,35 +4669,31 @@ def _execute_job(
                         continue
                     _append_log(domain, f"Procesando mes {month_key}...")
                     processed_by_month[month_key] = 0
-                    with open(month_path, "r", encoding="utf-8") as f:
-                        for line in f:
-                            line = line.strip()
-                            if not line:
-                                continue
-                            chunk.append(json.loads(line))
-                            if len(chunk) >= chunk_size:
-                                applied = _apply_chunk(chunk, month_key)
-                                processed_by_month[month_key] = (
-                                    processed_by_month.get(month_key, 0) + applied
-                                )
-                                chunk = []
-                                pct = 75 + int(
-                                    (processed / max(1, normalized_count)) * 20
-                                )
-                                _set_state(
-                                    domain,
-                                    {
-                                        "stage": "upserting",
-                                        "progress_pct": min(95, pct),
-                                        "status_message": f"Aplicando UPSERT {month_key} ({processed_by_month.get(month_key, 0)}/{month_counts.get(month_key, 0)})",
-                                        "rows_inserted": rows_inserted,
-                                        "rows_read": source_rows,
-                                        "rows_upserted": rows_upserted,
-                                        "rows_unchanged": rows_unchanged,
-                                        "target_table": _target_table_name(domain),
-                                        "duplicates_detected": duplicates_detected,
-                                    },
-                                )
+                    for item in iter_spill_rows(month_path, stats=spill_stats):
+                        chunk.append(item)
+                        if len(chunk) >= chunk_controller.size:
+                            applied = _apply_chunk(chunk, month_key)
+                            processed_by_month[month_key] = (
+                                processed_by_month.get(month_key, 0) + applied
+                            )
+                            chunk = []
+                            pct = 75 + int(
+                                (processed / max(1, normalized_count)) * 20
+                            )
+                            _set_state(
+                                domain,
+                                {
+                                    "stage": "upserting",
+                                    "progress_pct": min(95, pct),
+                                    "status_message": f"Aplicando UPSERT {month_key} ({processed_by_month.get(month_key, 0)}/{month_counts.get(month_key, 0)})",
+                                    "rows_inserted": rows_inserted,
+                                    "rows_read": source_rows,
+                                    "rows_upserted": rows_upserted,
+                                    "rows_unchanged": rows_unchanged,
+                                    "target_table": _target_table_name(domain),
+                                    "duplicates_detected": duplicates_detected,
+                                },
+                            )
                     if chunk:
                         applied = _apply_chunk(chunk, month_key)
                         processed_by_month[month_key] = (
@@ -3587,41 +4720,38 @@ def _execute_job(
                         },
                     )
             else:
-                with open(temp_rows_path, "r", encoding="utf-8") as f:
-                    for line in f:
-                        line = line.strip()
-                        if not line:
-                            continue
-                        if not target_months:
-                            continue
-                        item = json.loads(line)
-                        item_month = str(item.get("gestion_month") or "")
-                        if target_months and item_month not in target_months:
-                            continue
-                        chunk.append(item)
-                        if len(chunk) >= chunk_size:
-                            _apply_chunk(chunk, _derive_chunk_key(chunk))
-                            chunk = []
-                            pct = 75 + int((processed / max(1, normalized_count)) * 20)
-                            _set_state(
+                spill_rows = (
+                    iter_spill_rows(
+                        temp_rows_path, stats=spill_stats, gestion_months=target_months
+                    )
+                    if target_months
+                    else iter(())
+                )
+                for item in spill_rows:
+                    chunk.append(item)
+                    if len(chunk) >= chunk_controller.size:
+                        _apply_chunk(chunk, _derive_chunk_key(chunk))
+                        chunk = []
+                        pct = 75 + int((processed / max(1, normalized_count)) * 20)
+                        _set_state(
+                            domain,
+                            {
+                                "stage": "upserting",
+                                "progress_pct": min(95, pct),
+                                "status_message": f"Aplicando UPSERT ({processed}/{normalized_count})",
+                                "rows_inserted": rows_inserted,
+                                "rows_read": source_rows,
+                                "rows_upserted": rows_upserted,
+                                "rows_unchanged": rows_unchanged,
+                                "target_table": _target_table_name(domain),
+                                "duplicates_detected": duplicates_detected,
+                            },
+                        )
+                        if processed % 50000 == 0:
+                            _append_log(
                                 domain,
-                                {
-                                    "stage": "upserting",
-                                    "progress_pct": min(95, pct),
-                                    "status_message": f"Aplicando UPSERT ({processed}/{normalized_count})",
-                                    "rows_inserted": rows_inserted,
-                                    "rows_read": source_rows,
-                                    "rows_upserted": rows_upserted,
-                                    "rows_unchanged": rows_unchanged,
-                                    "target_table": _target_table_name(domain),
-                                    "duplicates_detected": duplicates_detected,
-                                },
+                                f"UPSERT... procesadas={processed}/{normalized_count}, upsert_destino={rows_upserted}, sin_cambios={rows_unchanged}",
                             )
-                            if processed % 50000 == 0:
-                                _append_log(
-                                    domain,
-                                    f"UPSERT... procesadas={processed}/{normalized_count}, upsert_destino={rows_upserted}, sin_cambios={rows_unchanged}",
-                                )
                 if chunk:
                     _apply_chunk(chunk, _derive_chunk_key(chunk))
                     chunk = []
@@ -3668,14 +4798,15 @@ def _execute_job(
             if (
                 getattr(settings, "sync_postgres_prefilter_enabled", True)
                 and rows_for_upsert
+                and not swap_plan
             ):
                 rows_for_upsert = _filter_rows_changed_vs_postgres(
                     db, domain, rows_for_upsert
                 )
             if persist_sync_records:
                 rows_inserted = _upsert_sync_records(db, rows_for_upsert, commit=False)
-            rows_upserted, rows_unchanged = _upsert_fact_rows(
-                db, domain, rows_for_upsert, commit=False
+            rows_upserted, rows_unchanged = _write_fact_rows(
+                db, domain, rows_for_upsert, swap_plan
             )
             if rows_upserted > 0:
                 applied_months.update(
@@ -3707,6 +4838,34 @@ def _execute_job(
                     "duplicates_detected": duplicates_detected,
                 },
             )
+        if cdc_atomic:
+            db.commit()
+            _append_log(domain, f"CDC: {len(cdc_contract_ids)} contratos reemplazados")
+        if (
+            bool(getattr(settings, "sync_adaptive_sizing_enabled", True))
+            and not low_impact_mode
+            and (fetch_controller.samples or chunk_controller.samples)
+        ):
+            try:
+                save_tuning_state(
+                    db,
+                    domain,
+                    fetch=fetch_controller,
+                    chunk=chunk_controller,
+                    lock_waits=lock_waits_seen,
+                    rss_mb=current_rss_mb(),
+                    job_id=job_id,
+                )
+            except Exception:
+                db.rollback()
+                logger.warning("[sync:%s] could not persist tuning state", domain, exc_info=True)
+        if swap_plan:
+            _swap_in_partition_stages(db, domain, swap_plan)
+            _append_log(
+                domain,
+                f"Swap de particiones aplicado: {', '.join(item['partition'] for _, item in sorted(swap_plan.items()))}",
+            )
+            swap_plan = {}
         _persist_job_step(
             db,
             job_id,
@@ -3717,6 +4876,14 @@ def _execute_job(
                 "rows_inserted": rows_inserted,
                 "rows_upserted": rows_upserted,
                 "rows_unchanged": rows_unchanged,
+                "fetch_sizing": fetch_controller.snapshot(),
+                "chunk_sizing": chunk_controller.snapshot(),
+                "lock_waits": lock_waits_seen,
+                "spill": spill_stats.snapshot(),
+                "fingerprint": {
+                    "algorithm": active_fingerprint().name,
+                    "rehashed_rows": rehashed_rows,
+                },
             },
         )
         refresh_target_months: set[str] = set(detected_target_months)
@@ -3760,6 +4927,8 @@ def _execute_job(
             agg_started_at = datetime.now(timezone.utc)
             _persist_job_step(db, job_id, domain, "refresh_agg", "running")
             _ensure_agg_perf_indexes(db)
+            for agg_table_name in ("cobranzas_cohorte_agg", "analytics_rendimiento_agg"):
+                _ensure_month_partitions(db, agg_table_name, refresh_target_months)
             _set_state(
                 domain,
                 {
@@ -3845,6 +5014,7 @@ def _execute_job(
                 "cohorte": 0,
                 "rendimiento": 0,
                 "anuales": 0,
+                "removed": 0,
             }
 
             semantic_batches = _semantic_refresh_month_batches(refresh_target_months)
@@ -3876,7 +5046,7 @@ def _execute_job(
                     _refresh_dim_contract_month_and_catalogs(db, batch_set)
                 )
                 b_deleted_dim_time, b_dim_time_rows = _refresh_dim_time(db, batch_set)
-                b_options_rows = _refresh_mv_options_tables(db, batch_set)
+                b_options_rows = _maintain_mv_options_tables(db, batch_set)
 
                 deleted_dim += int(b_deleted_dim or 0)
                 dim_rows_written += int(b_dim_rows or 0)
@@ -3892,6 +5062,7 @@ def _execute_job(
                     (b_options_rows or {}).get("rendimiento", 0)
                 )
                 options_rows["anuales"] += int((b_options_rows or {}).get("anuales", 0))
+                options_rows["removed"] += int((b_options_rows or {}).get("removed", 0))
 
             latest_month_set = (
                 {ordered_refresh_target_months[-1]}
@@ -3964,6 +5135,7 @@ def _execute_job(
                     f"options_cohorte={options_rows.get('cohorte', 0)}, "
                     f"options_rend={options_rows.get('rendimiento', 0)}, "
                     f"options_anuales={options_rows.get('anuales', 0)}, "
+                    f"options_removidas={options_rows.get('removed', 0)}, "
                     f"options_consistency_ok={options_consistency.get('ok')}"
                 ),
             )
@@ -4018,7 +5190,7 @@ def _execute_job(
                     fb_deleted_dim_time, fb_dim_time_rows = _refresh_dim_time(
                         db, fallback_months
                     )
-                    fb_options_rows = _refresh_mv_options_tables(db, fallback_months)
+                    fb_options_rows = _maintain_mv_options_tables(db, fallback_months)
                     agg_rows_written = (
                         int(fb_agg_rows)
                         + int(fb_cohorte_rows)
@@ -4250,6 +5422,12 @@ def _execute_job(
         partition_key = _watermark_partition_key(
             mode, year_from, close_month, close_month_from, close_month_to
         )
+        if cdc_changes is not None and wm_filter_updated_at is not None and (
+            wm_last_updated_at is None or wm_last_updated_at < wm_filter_updated_at
+        ):
+            # CDC re-reads whole contracts, so the max updated_at seen can be older than the stored one.
+            wm_last_updated_at = wm_filter_updated_at
+            wm_last_source_id = wm_filter_source_id or wm_last_source_id
         _upsert_watermark(
             db,
             domain=domain,
@@ -4260,12 +5438,37 @@ def _execute_job(
             last_success_job_id=job_id,
             last_row_count=rows_upserted + rows_unchanged,
         )
+        if cdc_backend and cdc_position:
+            _store_cdc_position(
+                db,
+                domain=domain,
+                backend=cdc_backend,
+                position=cdc_position,
+                job_id=job_id,
+                contracts=len(cdc_contract_ids or ()),
+            )
+        if source_summary is not None:
+            # Only months that were normalized inside the mode window reached the fact table.
+            _store_source_signatures(
+                db,
+                domain,
+                {
+                    month: signature
+                    for month, signature in source_summary.items()
+                    if month in source_months
+                },
+            )
         _refresh_source_freshness_snapshots(db, last_job_id=job_id)
         cleaned_stg = _cleanup_staging_rows(db)
         if cleaned_stg > 0:
             _append_log(
                 domain, f"Limpieza staging: {cleaned_stg} filas antiguas removidas"
             )
+        cleaned_logs = _cleanup_run_logs(db)
+        if cleaned_logs > 0:
+            _append_log(
+                domain, f"Limpieza logs: {cleaned_logs} lineas antiguas removidas"
+            )
         if domain == "cartera":
             invalidated_options = invalidate_prefix("portfolio/options")
             invalidated_summary = invalidate_prefix("portfolio/summary")
@@ -4584,6 +5787,7 @@ def _execute_job(
             db.rollback()
         except Exception:
             pass
+        _drop_partition_swap_stages(db, swap_plan)
         state_snapshot = dict(_state_by_domain.get(domain) or {})
         is_cancelled = isinstance(exc, SyncCancelledError) or str(error).lower() in {
             "cancelled",
@@ -4845,16 +6049,21 @@ class SyncService:
         scan_start = monotonic()
         sample_cutoff = effective_sample_rows if sampled else None
         seq = 0
-        for batch in _iter_from_mysql(
+        batch_columns: tuple | None = None
+        for columns, batch in _iter_from_mysql(
             query_path,
             domain=domain,
             watermark_updated_at=wm_updated_at,
             watermark_source_id=wm_source_id,
             mysql_config=mysql_cfg,
+            pool_purpose="admin",
         ):
+            if columns != batch_columns:
+                batch_columns = columns
+                normalize_row, _ = _row_normalizer_for(domain, columns)
             for row in batch:
                 try:
-                    n = _normalize_record(domain, row, seq)
+                    n = normalize_row(row, seq)
                 except Exception as norm_e:
                     raise
                 seq += 1
@@ -5164,7 +6373,7 @@ class SyncService:
                     "agg_duration_sec": None,
                     "duplicates_detected": int(row.duplicates_detected or 0),
                     "error": error_value,
-                    "log": _status_log_list(row.log_json),
+                    "log": _run_log_lines(db, row),
                     "started_at": row.started_at.isoformat()
                     if row.started_at
                     else None,
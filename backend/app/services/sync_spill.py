@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import mmap
+import os
+import pickle
+import struct
+from time import perf_counter
+from typing import Iterator
+
+SPILL_MAGIC = b"BISPILL1"
+SPILL_SUFFIX = ".spill"
+_FRAME_HEADER = struct.Struct("<I")
+# Cached parse of fact payloads; never spilled (rebuilt lazily by fact_row_from_normalized).
+_TRANSIENT_KEYS = ("_sync_payload_parsed",)
+
+
+class SpillStats:
+    """Size and codec timings shared by all spill files of one sync run."""
+
+    def __init__(self) -> None:
+        self.files = 0
+        self.frames = 0
+        self.rows_written = 0
+        self.bytes_written = 0
+        self.encode_sec = 0.0
+        self.rows_read = 0
+        self.decode_sec = 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "format": "columnar-pickle",
+            "files": int(self.files),
+            "frames": int(self.frames),
+            "rows_written": int(self.rows_written),
+            "bytes": int(self.bytes_written),
+            "encode_ms": round(self.encode_sec * 1000.0, 1),
+            "rows_read": int(self.rows_read),
+            "decode_ms": round(self.decode_sec * 1000.0, 1),
+        }
+
+
+class SpillWriter:
+    """Appends normalized rows to a binary spill file as columnar frames.
+
+    Each frame is `<u32 length><pickle((fields, columns))>`, with one list per
+    field, so the upsert phase decodes a whole batch at once instead of one
+    JSON document per row.
+    """
+
+    def __init__(self, path: str, *, stats: SpillStats, frame_rows: int = 1000) -> None:
+        self.path = path
+        self.stats = stats
+        self.frame_rows = max(100, int(frame_rows or 1000))
+        self._rows: list[dict] = []
+        self._file = open(path, "wb")
+        self._file.write(SPILL_MAGIC)
+        self.stats.files += 1
+        self.stats.bytes_written += len(SPILL_MAGIC)
+
+    def append(self, row: dict) -> None:
+        self._rows.append(row)
+        if len(self._rows) >= self.frame_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._rows or self._file is None:
+            return
+        started = perf_counter()
+        fields = tuple(k for k in self._rows[0].keys() if k not in _TRANSIENT_KEYS)
+        columns = [[row.get(field) for row in self._rows] for field in fields]
+        payload = pickle.dumps((fields, columns), protocol=pickle.HIGHEST_PROTOCOL)
+        self._file.write(_FRAME_HEADER.pack(len(payload)))
+        self._file.write(payload)
+        self.stats.encode_sec += perf_counter() - started
+        self.stats.frames += 1
+        self.stats.rows_written += len(self._rows)
+        self.stats.bytes_written += _FRAME_HEADER.size + len(payload)
+        self._rows = []
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+            self._file = None
+
+
+def iter_spill_frames(path: str, *, stats: SpillStats | None = None) -> Iterator[tuple[tuple, list[list]]]:
+    """Yield `(fields, columns)` frames from a spill file (memory-mapped, read-only)."""
+    if os.path.getsize(path) <= len(SPILL_MAGIC):
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm[: len(SPILL_MAGIC)] != SPILL_MAGIC:
+            raise ValueError(f"Archivo de spill invalido: {path}")
+        view = memoryview(mm)
+        try:
+            offset = len(SPILL_MAGIC)
+            end = len(mm)
+            while offset + _FRAME_HEADER.size <= end:
+                (length,) = _FRAME_HEADER.unpack_from(view, offset)
+                offset += _FRAME_HEADER.size
+                started = perf_counter()
+                fields, columns = pickle.loads(view[offset : offset + length])
+                if stats is not None:
+                    stats.decode_sec += perf_counter() - started
+                offset += length
+                yield fields, columns
+        finally:
+            view.release()
+
+
+def iter_spill_rows(
+    path: str,
+    *,
+    stats: SpillStats | None = None,
+    gestion_months: set[str] | None = None,
+) -> Iterator[dict]:
+    """Rows of a spill file in write order; `gestion_months` filters on the column before building dicts."""
+    for fields, columns in iter_spill_frames(path, stats=stats):
+        if not fields:
+            continue
+        started = perf_counter()
+        if gestion_months is not None and "gestion_month" in fields:
+            month_col = columns[fields.index("gestion_month")]
+            keep = [i for i, month in enumerate(month_col) if str(month or "") in gestion_months]
+            rows = [dict(zip(fields, [col[i] for col in columns])) for i in keep]
+        else:
+            rows = [dict(zip(fields, values)) for values in zip(*columns)]
+        if stats is not None:
+            stats.decode_sec += perf_counter() - started
+            stats.rows_read += len(rows)
+        yield from rows
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import os
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.models.brokers import SyncTuningState
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB (0.0 when it cannot be read)."""
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024.0 * 1024.0)
+    except Exception:
+        pass
+    try:
+        import resource
+
+        # ru_maxrss is the peak (KB on Linux); better than nothing on other platforms.
+        return float(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss) / 1024.0
+    except Exception:
+        return 0.0
+
+
+class ExtractStats:
+    """Fetch throughput and peak memory of one source extraction."""
+
+    def __init__(self, cursor_mode: str = "", driver: str = "") -> None:
+        self.cursor_mode = cursor_mode
+        self.driver = driver
+        self.statements = 0
+        self.rows = 0
+        self.batches = 0
+        self.execute_sec = 0.0
+        self.fetch_sec = 0.0
+        self.peak_rss_mb = 0.0
+
+    def observe_rss(self, rss_mb: float) -> None:
+        if rss_mb > self.peak_rss_mb:
+            self.peak_rss_mb = rss_mb
+
+    def observe_batch(self, rows: int, elapsed_sec: float, rss_mb: float) -> None:
+        self.rows += int(rows)
+        self.batches += 1
+        self.fetch_sec += max(0.0, float(elapsed_sec))
+        self.observe_rss(rss_mb)
+
+    def snapshot(self) -> dict:
+        source_sec = self.execute_sec + self.fetch_sec
+        return {
+            "cursor_mode": self.cursor_mode,
+            "driver": self.driver,
+            "statements": int(self.statements),
+            "rows": int(self.rows),
+            "batches": int(self.batches),
+            "execute_ms": round(self.execute_sec * 1000.0, 1),
+            "fetch_ms": round(self.fetch_sec * 1000.0, 1),
+            "rows_per_sec": round(self.rows / source_sec, 1) if source_sec > 0 else 0.0,
+            "peak_rss_mb": round(self.peak_rss_mb, 1),
+        }
+
+
+class AimdController:
+    """Additive-increase / multiplicative-decrease sizing for one sync knob.
+
+    Each observation reports how long a unit of work took (fetch batch or
+    upsert chunk). Under the latency target the size grows by a fixed step;
+    over it, or when lock waits / RSS signal pressure, it is cut by
+    `decrease_factor`. The size always stays inside [min_size, max_size].
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        *,
+        min_size: int,
+        max_size: int,
+        target_ms: float,
+        increase_step: int | None = None,
+        decrease_factor: float = 0.5,
+        rss_limit_mb: float = 0.0,
+    ) -> None:
+        self.min_size = max(1, int(min_size))
+        self.max_size = max(self.min_size, int(max_size))
+        self.size = self._clamp(initial)
+        self.target_ms = max(1.0, float(target_ms))
+        self.increase_step = max(1, int(increase_step or max(50, self.size // 10)))
+        self.decrease_factor = min(0.95, max(0.1, float(decrease_factor)))
+        self.rss_limit_mb = max(0.0, float(rss_limit_mb or 0.0))
+        self.latency_ms_ewma = 0.0
+        self.samples = 0
+        self.decreases = 0
+        self.last_congested = False
+
+    def _clamp(self, value: int) -> int:
+        return max(self.min_size, min(self.max_size, int(value or self.min_size)))
+
+    def observe(
+        self,
+        rows: int,
+        elapsed_sec: float,
+        *,
+        lock_waits: int = 0,
+        rss_mb: float = 0.0,
+    ) -> bool:
+        """Record one unit of work and adjust `size`. Returns True when congested."""
+        if rows <= 0:
+            return False
+        elapsed_ms = max(0.0, float(elapsed_sec) * 1000.0)
+        self.samples += 1
+        if self.samples == 1:
+            self.latency_ms_ewma = elapsed_ms
+        else:
+            self.latency_ms_ewma = (0.8 * self.latency_ms_ewma) + (0.2 * elapsed_ms)
+        over_rss = self.rss_limit_mb > 0 and float(rss_mb or 0.0) > self.rss_limit_mb
+        congested = elapsed_ms > self.target_ms or int(lock_waits or 0) > 0 or over_rss
+        if congested:
+            self.size = self._clamp(int(self.size * self.decrease_factor))
+            self.decreases += 1
+        elif rows >= self.size and elapsed_ms < self.target_ms * 0.75:
+            # Only grow when the unit was full: a short trailing batch says nothing.
+            self.size = self._clamp(self.size + self.increase_step)
+        self.last_congested = congested
+        return congested
+
+    def snapshot(self) -> dict:
+        return {
+            "size": int(self.size),
+            "min_size": int(self.min_size),
+            "max_size": int(self.max_size),
+            "target_ms": round(self.target_ms, 1),
+            "latency_ms_ewma": round(self.latency_ms_ewma, 1),
+            "samples": int(self.samples),
+            "decreases": int(self.decreases),
+        }
+
+
+def load_tuning_state(db: Session, domain: str) -> SyncTuningState | None:
+    return (
+        db.query(SyncTuningState)
+        .filter(SyncTuningState.domain == str(domain or "").strip().lower())
+        .first()
+    )
+
+
+def save_tuning_state(
+    db: Session,
+    domain: str,
+    *,
+    fetch: AimdController,
+    chunk: AimdController,
+    lock_waits: int,
+    rss_mb: float,
+    job_id: str | None,
+) -> None:
+    domain_key = str(domain or "").strip().lower()
+    row = load_tuning_state(db, domain_key)
+    if row is None:
+        row = SyncTuningState(domain=domain_key)
+        db.add(row)
+    row.fetch_batch_size = int(fetch.size)
+    row.chunk_size = int(chunk.size)
+    row.extract_latency_ms = float(round(fetch.latency_ms_ewma, 3))
+    row.upsert_latency_ms = float(round(chunk.latency_ms_ewma, 3))
+    row.lock_waits = int(lock_waits or 0)
+    row.rss_mb = float(round(rss_mb or 0.0, 1))
+    row.samples = int(row.samples or 0) + int(fetch.samples) + int(chunk.samples)
+    row.last_job_id = job_id
+    row.updated_at = datetime.utcnow()
+    db.commit()
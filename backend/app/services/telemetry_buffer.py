@@ -0,0 +1,178 @@
+"""
+Ring buffer en memoria para la ingesta batch de telemetria frontend.
+
+El endpoint encola y responde sin tocar la DB; un hilo daemon por proceso vacia la cola
+cada FRONTEND_PERF_FLUSH_INTERVAL_MS o apenas hay FRONTEND_PERF_FLUSH_BATCH_SIZE eventos,
+con un INSERT multi-fila en frontend_perf_metrics + merge de rollups en una sola transaccion.
+
+Durabilidad (best-effort, es telemetria):
+- lo encolado vive solo en memoria: un kill/crash del proceso pierde como mucho lo
+  acumulado desde el ultimo flush (~1 intervalo); el shutdown ordenado hace flush final;
+- con la cola llena se descartan los eventos mas viejos (contador `dropped`);
+- un batch cuyo flush falla se descarta (contador `failed_events`) para no reintentar
+  en bucle un evento envenenado.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Iterable
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.brokers import FrontendPerfMetric
+from app.services.telemetry_rollup import merge_frontend_perf_rollups, prune_frontend_perf, raw_columns
+
+logger = logging.getLogger(__name__)
+
+
+class FrontendPerfBuffer:
+    def __init__(
+        self,
+        *,
+        capacity: int,
+        flush_interval_ms: int,
+        batch_size: int,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ) -> None:
+        self.capacity = max(1, int(capacity))
+        self.flush_interval_sec = max(0.05, int(flush_interval_ms) / 1000.0)
+        self.batch_size = max(1, int(batch_size))
+        self._session_factory = session_factory
+        self._queue: deque[dict] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+        self.stats = {
+            "accepted": 0,
+            "dropped": 0,
+            "flushed": 0,
+            "failed_events": 0,
+            "flushes": 0,
+        }
+        self.last_flush_at: float | None = None
+        self.last_flush_ms: int | None = None
+        self.last_error: str | None = None
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="frontend-perf-flush", daemon=True)
+        self._thread.start()
+
+    def put_many(self, events: Iterable[dict]) -> tuple[int, int]:
+        """Encola sin bloquear; devuelve (aceptados, descartados por cola llena)."""
+        accepted = dropped = 0
+        with self._lock:
+            for event in events:
+                if len(self._queue) >= self.capacity:
+                    self._queue.popleft()
+                    dropped += 1
+                self._queue.append(event)
+                accepted += 1
+            self.stats["accepted"] += accepted
+            self.stats["dropped"] += dropped
+            full_batch = len(self._queue) >= self.batch_size
+            self._ensure_thread()
+        if full_batch:
+            self._wakeup.set()
+        return accepted, dropped
+
+    def depth(self) -> int:
+        with self._lock:
+            return len(self._queue)
+
+    def _take_batch(self) -> list[dict]:
+        with self._lock:
+            n = min(self.batch_size, len(self._queue))
+            return [self._queue.popleft() for _ in range(n)]
+
+    def _write(self, batch: list[dict]) -> None:
+        db = self._session_factory()
+        try:
+            db.execute(insert(FrontendPerfMetric.__table__), [raw_columns(e) for e in batch])
+            merge_frontend_perf_rollups(db, batch)
+            prune_frontend_perf(db)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def flush(self) -> int:
+        """Vacia la cola en batches de `batch_size`; devuelve eventos persistidos."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    break
+                started = time.perf_counter()
+                try:
+                    self._write(batch)
+                except Exception as exc:
+                    with self._lock:
+                        self.stats["failed_events"] += len(batch)
+                    self.last_error = f"{exc.__class__.__name__}: {exc}"[:300]
+                    logger.warning("Flush de telemetria frontend fallido (%s eventos descartados): %s", len(batch), exc)
+                    continue
+                written += len(batch)
+                with self._lock:
+                    self.stats["flushed"] += len(batch)
+                    self.stats["flushes"] += 1
+                self.last_flush_at = time.time()
+                self.last_flush_ms = int((time.perf_counter() - started) * 1000)
+        return written
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval_sec)
+            self._wakeup.clear()
+            if self._stopping:
+                break  # el flush final lo hace stop()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Error inesperado en el flush de telemetria frontend")
+
+    def stop(self, timeout: float = 5.0) -> int:
+        """Detiene el hilo y hace un flush final (shutdown ordenado)."""
+        self._stopping = True
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout=timeout)
+        self._thread = None
+        return self.flush()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            depth = len(self._queue)
+            stats = dict(self.stats)
+        return {
+            "queue_depth": depth,
+            "capacity": self.capacity,
+            "batch_size": self.batch_size,
+            "flush_interval_ms": int(self.flush_interval_sec * 1000),
+            "flusher_alive": bool(self._thread is not None and self._thread.is_alive()),
+            "last_flush_age_sec": None if self.last_flush_at is None else round(time.time() - self.last_flush_at, 1),
+            "last_flush_ms": self.last_flush_ms,
+            "last_error": self.last_error,
+            **stats,
+        }
+
+
+frontend_perf_buffer = FrontendPerfBuffer(
+    capacity=settings.frontend_perf_buffer_capacity,
+    flush_interval_ms=settings.frontend_perf_flush_interval_ms,
+    batch_size=settings.frontend_perf_flush_batch_size,
+)
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.histogram import LogLinearHistogram
+from app.models.brokers import FrontendPerfMetric, FrontendPerfRollup
+from app.schemas.telemetry import FrontendPerfIn
+
+_PRUNE_INTERVAL_SECONDS = 3600.0
+_RAW_COLUMNS = (
+    "route",
+    "session_id",
+    "trace_id",
+    "ttfb_ms",
+    "fcp_ms",
+    "ready_ms",
+    "api_calls_json",
+    "app_version",
+    "event_at",
+)
+
+_prune_lock = threading.Lock()
+_last_prune_monotonic = 0.0
+
+
+def _to_naive_utc(value: datetime | None) -> datetime | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _bucket_start(value: datetime) -> datetime:
+    # Granularidad del rollup: un bucket por ruta y minuto.
+    return value.replace(second=0, microsecond=0)
+
+
+def _calls_are_warm(calls: Iterable) -> bool:
+    return any(bool(c.get("cache_hit")) for c in calls if isinstance(c, dict))
+
+
+def frontend_perf_event(payload: FrontendPerfIn) -> dict:
+    """Mapping de columnas de frontend_perf_metrics + flag `warm` (se clasifica una sola vez, al ingerir)."""
+    calls = [item.model_dump() for item in payload.api_calls]
+    return {
+        "route": str(payload.route),
+        "session_id": str(payload.session_id),
+        "trace_id": str(payload.trace_id or ""),
+        "ttfb_ms": float(payload.ttfb_ms) if payload.ttfb_ms is not None else None,
+        "fcp_ms": float(payload.fcp_ms) if payload.fcp_ms is not None else None,
+        "ready_ms": float(payload.ready_ms),
+        "api_calls_json": json.dumps(calls, ensure_ascii=False),
+        "app_version": str(payload.app_version or "dev"),
+        "event_at": _to_naive_utc(payload.timestamp_utc) or datetime.utcnow(),
+        "warm": _calls_are_warm(calls),
+    }
+
+
+def raw_columns(event: dict) -> dict:
+    return {key: event.get(key) for key in _RAW_COLUMNS}
+
+
+class _RollupDelta:
+    __slots__ = ("samples", "warm", "cold", "ttfb", "fcp", "ready")
+
+    def __init__(self) -> None:
+        self.samples = 0
+        self.warm = 0
+        self.cold = 0
+        self.ttfb = LogLinearHistogram()
+        self.fcp = LogLinearHistogram()
+        self.ready = LogLinearHistogram()
+
+    def add(self, event: dict) -> None:
+        self.samples += 1
+        if event.get("warm"):
+            self.warm += 1
+        else:
+            self.cold += 1
+        self.ttfb.record(event.get("ttfb_ms"))
+        self.fcp.record(event.get("fcp_ms"))
+        self.ready.record(event.get("ready_ms"))
+
+
+def _insert_for(db: Session):
+    return pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+
+
+def merge_frontend_perf_rollups(db: Session, events: Iterable[dict]) -> int:
+    """
+    Suma los eventos a sus buckets (ruta, minuto). Crea los buckets faltantes con
+    ON CONFLICT DO NOTHING y luego los bloquea (FOR UPDATE) para mergear histogramas,
+    asi dos workers que ingieren el mismo minuto no se pisan. No hace commit.
+    """
+    deltas: dict[tuple[str, datetime], _RollupDelta] = {}
+    for event in events:
+        key = (str(event["route"]), _bucket_start(event["event_at"]))
+        delta = deltas.get(key)
+        if delta is None:
+            delta = deltas[key] = _RollupDelta()
+        delta.add(event)
+    if not deltas:
+        return 0
+
+    now = datetime.utcnow()
+    table = FrontendPerfRollup.__table__
+    stmt = _insert_for(db)(table).values(
+        [
+            {
+                "route": route,
+                "bucket_start": bucket,
+                "samples": 0,
+                "warm": 0,
+                "cold": 0,
+                "ttfb_hist": "{}",
+                "fcp_hist": "{}",
+                "ready_hist": "{}",
+                "updated_at": now,
+            }
+            for route, bucket in sorted(deltas)
+        ]
+    )
+    db.execute(stmt.on_conflict_do_nothing(index_elements=[table.c.route, table.c.bucket_start]))
+
+    rows = (
+        db.query(FrontendPerfRollup)
+        .filter(tuple_(FrontendPerfRollup.route, FrontendPerfRollup.bucket_start).in_(list(deltas)))
+        .order_by(FrontendPerfRollup.route, FrontendPerfRollup.bucket_start)
+        .with_for_update()
+        .all()
+    )
+    for row in rows:
+        delta = deltas.get((row.route, row.bucket_start))
+        if delta is None:
+            continue
+        row.samples = int(row.samples or 0) + delta.samples
+        row.warm = int(row.warm or 0) + delta.warm
+        row.cold = int(row.cold or 0) + delta.cold
+        row.ttfb_hist = LogLinearHistogram.from_json(row.ttfb_hist).merge(delta.ttfb).to_json()
+        row.fcp_hist = LogLinearHistogram.from_json(row.fcp_hist).merge(delta.fcp).to_json()
+        row.ready_hist = LogLinearHistogram.from_json(row.ready_hist).merge(delta.ready).to_json()
+        row.updated_at = now
+    return len(rows)
+
+
+def prune_frontend_perf(db: Session, *, force: bool = False) -> tuple[int, int]:
+    """
+    Aplica la retencion de filas crudas y rollups; a lo sumo una vez por hora por proceso.
+    Como _cleanup_run_logs, corta por hora de escritura (created_at/updated_at) y no por el
+    timestamp del cliente, que puede venir desfasado.
+    """
+    global _last_prune_monotonic
+    with _prune_lock:
+        now_mono = time.monotonic()
+        if not force and _last_prune_monotonic and now_mono - _last_prune_monotonic < _PRUNE_INTERVAL_SECONDS:
+            return 0, 0
+        _last_prune_monotonic = now_mono
+    now = datetime.utcnow()
+    raw_days = max(1, int(settings.frontend_perf_raw_retention_days or 1))
+    rollup_days = max(raw_days, int(settings.frontend_perf_rollup_retention_days or raw_days))
+    raw_deleted = (
+        db.query(FrontendPerfMetric)
+        .filter(FrontendPerfMetric.created_at < now - timedelta(days=raw_days))
+        .delete(synchronize_session=False)
+    )
+    rollup_deleted = (
+        db.query(FrontendPerfRollup)
+        .filter(FrontendPerfRollup.updated_at < now - timedelta(days=rollup_days))
+        .delete(synchronize_session=False)
+    )
+    return int(raw_deleted or 0), int(rollup_deleted or 0)
+
+
+def summarize_frontend_perf(
+    db: Session,
+    route: str | None = None,
+    from_utc: datetime | None = None,
+    to_utc: datetime | None = None,
+) -> dict:
+    """
+    Summary de percentiles mergeando los sketches por minuto de la ventana (O(buckets), sin filas crudas).
+    Sin from_utc la ventana es FRONTEND_PERF_SUMMARY_DEFAULT_HOURS hacia atras desde to_utc (o ahora):
+    el costo queda acotado aunque la retencion de rollups sea de meses.
+    """
+    to_v = _to_naive_utc(to_utc)
+    from_v = _to_naive_utc(from_utc)
+    if from_v is None:
+        hours = max(1, int(settings.frontend_perf_summary_default_hours or 24))
+        from_v = (to_v or datetime.utcnow()) - timedelta(hours=hours)
+    filters = [FrontendPerfRollup.bucket_start >= _bucket_start(from_v)]
+    if route:
+        filters.append(FrontendPerfRollup.route == str(route))
+    if to_v is not None:
+        filters.append(FrontendPerfRollup.bucket_start <= to_v)
+    q = db.query(
+        FrontendPerfRollup.samples,
+        FrontendPerfRollup.warm,
+        FrontendPerfRollup.cold,
+        FrontendPerfRollup.ttfb_hist,
+        FrontendPerfRollup.fcp_hist,
+        FrontendPerfRollup.ready_hist,
+    ).filter(*filters)
+
+    samples = warm = cold = 0
+    ttfb = LogLinearHistogram()
+    fcp = LogLinearHistogram()
+    ready = LogLinearHistogram()
+    for row in q.yield_per(2000):
+        samples += int(row.samples or 0)
+        warm += int(row.warm or 0)
+        cold += int(row.cold or 0)
+        ttfb.merge(LogLinearHistogram.from_json(row.ttfb_hist))
+        fcp.merge(LogLinearHistogram.from_json(row.fcp_hist))
+        ready.merge(LogLinearHistogram.from_json(row.ready_hist))
+
+    by_route = (
+        db.query(FrontendPerfRollup.route, func.sum(FrontendPerfRollup.samples))
+        .filter(*filters)
+        .group_by(FrontendPerfRollup.route)
+        .all()
+    )
+    return {
+        "sample_count": samples,
+        "route": route,
+        "window": {
+            "from_utc": from_v.isoformat(),
+            "to_utc": to_v.isoformat() if to_v else None,
+        },
+        "ttfb_ms": ttfb.summary(),
+        "fcp_ms": fcp.summary(),
+        "ready_ms": ready.summary(),
+        "breakdown": {"cold": cold, "warm": warm},
+        "counts_by_route": [{"route": str(r[0]), "count": int(r[1] or 0)} for r in by_route],
+    }
+
+
+def _first_complete_raw_bucket(db: Session) -> datetime | None:
+    """Primer bucket cuyo minuto completo sigue en frontend_perf_metrics (el retention pudo cortar uno a medias)."""
+    oldest = db.query(func.min(FrontendPerfMetric.event_at)).scalar()
+    if oldest is None:
+        return None
+    bucket = _bucket_start(oldest)
+    return bucket if bucket == oldest else bucket + timedelta(minutes=1)
+
+
+def rebuild_frontend_perf_rollups(db: Session, since: datetime | None = None, batch_size: int = 5000) -> int:
+    """
+    Reconstruye los rollups desde frontend_perf_metrics (backfill inicial o reparacion). No hace commit.
+
+    Solo reemplaza buckets que los eventos crudos retenidos cubren completos: los rollups
+    anteriores al evento crudo mas viejo (historia ya podada del crudo) se conservan.
+    """
+    start = _first_complete_raw_bucket(db)
+    if start is None:
+        return 0
+    if since is not None:
+        start = max(start, _bucket_start(_to_naive_utc(since)))
+    # Merges previos sin flush (autoflush off) y objetos ya cargados no deben sobrevivir al borrado.
+    db.flush()
+    db.query(FrontendPerfRollup).filter(FrontendPerfRollup.bucket_start >= start).delete(
+        synchronize_session="fetch"
+    )
+
+    q = db.query(*(getattr(FrontendPerfMetric, c) for c in _RAW_COLUMNS)).filter(
+        FrontendPerfMetric.event_at >= start
+    )
+    batch: list[dict] = []
+    total = 0
+    for row in q.order_by(FrontendPerfMetric.id).yield_per(batch_size):
+        event = dict(zip(_RAW_COLUMNS, row))
+        try:
+            calls = json.loads(event["api_calls_json"] or "[]")
+        except (TypeError, ValueError):
+            calls = []
+        event["warm"] = _calls_are_warm(calls if isinstance(calls, list) else [])
+        batch.append(event)
+        if len(batch) >= batch_size:
+            merge_frontend_perf_rollups(db, batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        merge_frontend_perf_rollups(db, batch)
+        total += len(batch)
+    return total
@@ -1,4 +1,4 @@
-import axios, { type AxiosError } from "axios";
+import axios, { type AxiosError, type AxiosResponse } from "axios";
 import type {
   AnalyticsDashboardSectionId,
   AnalyticsFilterId,
@@ -324,6 +324,7 @@ const ANALYTICS_CACHE_TTL_MS: Record<AnalyticsCachePolicy, number> = {
 type CachedEntry<T> = {
   expiresAt: number;
   value: T;
+  etag?: string;
 };
 const analyticsCacheMemory = new Map<string, CachedEntry<unknown>>();
 const ANALYTICS_CACHE_PREFIX = "analytics_api_cache:";
@@ -413,12 +414,33 @@ async function analyticsPostWithTransientRetry<T>(
   payload: unknown,
   retryDelaysMs?: number[],
 ): Promise<T> {
+  const response = await analyticsPostResponseWithTransientRetry<T>(
+    path,
+    payload,
+    retryDelaysMs,
+  );
+  return response.data;
+}
+
+async function analyticsPostResponseWithTransientRetry<T>(
+  path: string,
+  payload: unknown,
+  retryDelaysMs?: number[],
+  ifNoneMatch?: string,
+): Promise<AxiosResponse<T>> {
   const delays = retryDelaysMs ?? [];
+  // Con If-None-Match el backend puede responder 304 (snapshot first-paint sin cambios).
+  const config = ifNoneMatch
+    ? {
+        headers: { "If-None-Match": ifNoneMatch },
+        validateStatus: (status: number) =>
+          (status >= 200 && status < 300) || status === 304,
+      }
+    : undefined;
   let lastError: unknown;
   for (let attempt = 0; attempt <= delays.length; attempt += 1) {
     try {
-      const response = await api.post<T>(path, payload);
-      return response.data;
+      return await api.post<T>(path, payload, config);
     } catch (error) {
       lastError = error;
       if (attempt >= delays.length || !isRetryableAnalyticsError(error)) {
@@ -462,16 +484,30 @@ async function cachedAnalyticsPost<T>(
     });
     return markCacheHitMeta(hitSession.value);
   }
-  const data = await analyticsPostWithTransientRetry<T>(
+  // Entrada vencida con ETag: se revalida y un 304 reusa el valor sin bajar el payload.
+  const stale = hitMem?.etag ? (hitMem as CachedEntry<T>) : undefined;
+  const response = await analyticsPostResponseWithTransientRetry<T>(
     path,
     payload,
     retryDelaysMs,
+    stale?.etag,
   );
   const ttl = ANALYTICS_CACHE_TTL_MS[policy];
-  const entry: CachedEntry<T> = { value: data, expiresAt: now + ttl };
+  if (stale && response.status === 304) {
+    const revalidated: CachedEntry<T> = { ...stale, expiresAt: now + ttl };
+    analyticsCacheMemory.set(key, revalidated as CachedEntry<unknown>);
+    setSessionCache(key, revalidated);
+    return markCacheHitMeta(stale.value);
+  }
+  const etagHeader = response.headers?.etag;
+  const entry: CachedEntry<T> = {
+    value: response.data,
+    expiresAt: now + ttl,
+    etag: typeof etagHeader === "string" ? etagHeader : undefined,
+  };
   analyticsCacheMemory.set(key, entry as CachedEntry<unknown>);
   setSessionCache(key, entry);
-  return data;
+  return response.data;
 }
 
 export function clearAnalyticsApiCache(pathPrefix?: string): void {
@@ -502,10 +538,19 @@ function getApiBaseUrl(): string {
   return base;
 }
 
+// Cola de telemetria: los eventos se envian en lote (FRONTEND_PERF_FLUSH_BATCH eventos o cada
+// FRONTEND_PERF_FLUSH_MS), y al ocultar/cerrar la pagina se vacia con sendBeacon/keepalive.
+const FRONTEND_PERF_FLUSH_BATCH = 20;
+const FRONTEND_PERF_FLUSH_MS = 5_000;
+// Tope de la cola (el backend acepta hasta 200 eventos por batch); llena = se descartan los mas viejos.
+const FRONTEND_PERF_QUEUE_CAPACITY = 200;
+const frontendPerfQueue: FrontendPerfIn[] = [];
+let frontendPerfFlushTimer: ReturnType<typeof setTimeout> | null = null;
+
 async function sendFrontendPerfKeepAlive(
-  payload: FrontendPerfIn,
+  events: FrontendPerfIn[],
 ): Promise<boolean> {
-  const endpoint = `${getApiBaseUrl()}/telemetry/frontend-perf`;
+  const endpoint = `${getApiBaseUrl()}/telemetry/frontend-perf/batch`;
   const token = String(api.defaults.headers.common.Authorization || "");
   if (typeof fetch !== "function") return false;
   try {
@@ -515,7 +560,7 @@ async function sendFrontendPerfKeepAlive(
         "Content-Type": "application/json",
         ...(token ? { Authorization: token } : {}),
       },
-      body: JSON.stringify(payload),
+      body: JSON.stringify({ events }),
       keepalive: true,
       credentials: "include",
     });
@@ -525,15 +570,15 @@ async function sendFrontendPerfKeepAlive(
   }
 }
 
-function sendFrontendPerfBeacon(payload: FrontendPerfIn): boolean {
+function sendFrontendPerfBeacon(events: FrontendPerfIn[]): boolean {
   if (
     typeof navigator === "undefined" ||
     typeof navigator.sendBeacon !== "function"
   )
     return false;
-  const endpoint = `${getApiBaseUrl()}/telemetry/frontend-perf`;
+  const endpoint = `${getApiBaseUrl()}/telemetry/frontend-perf/batch`;
   try {
-    const blob = new Blob([JSON.stringify(payload)], {
+    const blob = new Blob([JSON.stringify({ events })], {
       type: "application/json",
     });
     return navigator.sendBeacon(endpoint, blob);
@@ -542,10 +587,53 @@ function sendFrontendPerfBeacon(payload: FrontendPerfIn): boolean {
   }
 }
 
+function scheduleFrontendPerfFlush(): void {
+  if (frontendPerfFlushTimer !== null) return;
+  frontendPerfFlushTimer = setTimeout(() => {
+    frontendPerfFlushTimer = null;
+    void flushFrontendPerfQueue();
+  }, FRONTEND_PERF_FLUSH_MS);
+}
+
+function takeFrontendPerfBatch(): FrontendPerfIn[] {
+  return frontendPerfQueue.splice(0, FRONTEND_PERF_FLUSH_BATCH);
+}
+
+export async function flushFrontendPerfQueue(): Promise<void> {
+  if (frontendPerfFlushTimer !== null) {
+    clearTimeout(frontendPerfFlushTimer);
+    frontendPerfFlushTimer = null;
+  }
+  while (frontendPerfQueue.length > 0) {
+    const events = takeFrontendPerfBatch();
+    try {
+      if (await sendFrontendPerfKeepAlive(events)) continue;
+      await api.post("/telemetry/frontend-perf/batch", { events });
+    } catch {
+      // best-effort: el lote se descarta, la telemetria no debe romper la UX
+    }
+  }
+}
+
+function flushFrontendPerfQueueOnHide(): void {
+  // Sincrono: la pagina puede descargarse antes de que resuelva una promesa.
+  if (frontendPerfFlushTimer !== null) {
+    clearTimeout(frontendPerfFlushTimer);
+    frontendPerfFlushTimer = null;
+  }
+  while (frontendPerfQueue.length > 0) {
+    const events = takeFrontendPerfBatch();
+    if (!sendFrontendPerfBeacon(events)) void sendFrontendPerfKeepAlive(events);
+  }
+}
+
 if (typeof window !== "undefined" && USE_FRONTEND_PERF_TELEMETRY) {
   window.addEventListener("pagehide", () => {
-    if (!perfRoute || perfReadySent) return;
-    void markPerfReady(perfRoute);
+    if (perfRoute && !perfReadySent) void markPerfReady(perfRoute);
+    flushFrontendPerfQueueOnHide();
+  });
+  document.addEventListener("visibilitychange", () => {
+    if (document.visibilityState === "hidden") flushFrontendPerfQueueOnHide();
   });
 }
 
@@ -1102,6 +1190,7 @@ export type CobranzasCohorteDetailResponse = {
   page: number;
   page_size: number;
   has_next: boolean;
+  next_cursor?: string | null;
   meta?: AnalyticsMeta;
 };
 
@@ -1882,6 +1971,7 @@ export async function getCobranzasCohorteDetail(payload: {
   page_size?: number;
   sort_by?: "sale_month" | "cobrado" | "deberia" | "pagaron";
   sort_dir?: "asc" | "desc";
+  after?: string;
 }): Promise<CobranzasCohorteDetailResponse> {
   return cachedAnalyticsPost<CobranzasCohorteDetailResponse>(
     "/analytics/cobranzas-cohorte-v2/detail",
@@ -2071,11 +2161,25 @@ export async function getPortfolioCorteFirstPaint(payload: {
 
 export async function sendFrontendPerf(payload: FrontendPerfIn): Promise<void> {
   if (!USE_FRONTEND_PERF_TELEMETRY) return;
-  const hidden =
-    typeof document !== "undefined" && document.visibilityState === "hidden";
-  if (hidden && sendFrontendPerfBeacon(payload)) return;
-  if (await sendFrontendPerfKeepAlive(payload)) return;
-  await api.post("/telemetry/frontend-perf", payload);
+  frontendPerfQueue.push(payload);
+  if (frontendPerfQueue.length > FRONTEND_PERF_QUEUE_CAPACITY) {
+    frontendPerfQueue.splice(
+      0,
+      frontendPerfQueue.length - FRONTEND_PERF_QUEUE_CAPACITY,
+    );
+  }
+  if (
+    typeof document !== "undefined" &&
+    document.visibilityState === "hidden"
+  ) {
+    flushFrontendPerfQueueOnHide();
+    return;
+  }
+  if (frontendPerfQueue.length >= FRONTEND_PERF_FLUSH_BATCH) {
+    await flushFrontendPerfQueue();
+    return;
+  }
+  scheduleFrontendPerfFlush();
 }
 
 export async function getFrontendPerfSummary(params?: {
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import argparse
+from datetime import datetime
+
+from app.db.session import SessionLocal
+from app.services.telemetry_rollup import rebuild_frontend_perf_rollups
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description='Reconstruye frontend_perf_rollups desde frontend_perf_metrics.')
+    parser.add_argument('--since', default=None, help='ISO datetime (UTC); por defecto todo lo que cubren los eventos crudos retenidos')
+    args = parser.parse_args()
+    since = datetime.fromisoformat(args.since) if args.since else None
+    db = SessionLocal()
+    try:
+        total = rebuild_frontend_perf_rollups(db, since=since)
+        db.commit()
+        print(f'[backfill] frontend_perf_rollups eventos={total}')
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    run()
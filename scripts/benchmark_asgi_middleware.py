@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Benchmark del stack de middlewares HTTP: BaseHTTPMiddleware (legacy) vs RequestContextMiddleware (ASGI puro).
+
+Invoca las apps ASGI directo (sin red ni cliente HTTP, que agregaria su propio buffering) y reporta:
+- overhead por request sobre un endpoint JSON trivial (mean/p50/p95 en microsegundos);
+- streaming: en que momento llega cada chunk de un StreamingResponse que produce un chunk
+  cada --chunk-delay-ms, para confirmar que el middleware no bufferea el body.
+
+El stack legacy reproduce el de main.py anterior: dos middlewares de Private Network Access
++ trace_and_logging, todos con @app.middleware('http').
+
+Uso:
+  python scripts/benchmark_asgi_middleware.py --requests 5000
+  python scripts/benchmark_asgi_middleware.py --chunks 5 --chunk-delay-ms 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import StreamingResponse  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.logging_config import log_request  # noqa: E402
+from app.core.request_context import RequestContextMiddleware  # noqa: E402
+from app.core.request_metrics import begin_request, end_request, observe, route_template  # noqa: E402
+
+
+def _routes(app: FastAPI, chunks: int, delay_s: float) -> FastAPI:
+    @app.get("/ping/{item_id}")
+    async def ping(item_id: int):
+        return {"ok": True, "id": item_id}
+
+    @app.get("/stream")
+    async def stream():
+        async def body():
+            for i in range(chunks):
+                yield f"chunk-{i}\n".encode()
+                await asyncio.sleep(delay_s)
+
+        return StreamingResponse(body(), media_type="text/plain")
+
+    return app
+
+
+def legacy_app(chunks: int, delay_s: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def _private_network_header(request: Request, call_next):
+        response = await call_next(request)
+        response.headers["Access-Control-Allow-Private-Network"] = "true"
+        return response
+
+    @app.middleware("http")
+    async def add_private_network_header(request: Request, call_next):
+        response = await call_next(request)
+        response.headers["Access-Control-Allow-Private-Network"] = "true"
+        return response
+
+    @app.middleware("http")
+    async def trace_and_logging(request: Request, call_next):
+        trace_id = request.headers.get("x-trace-id") or str(uuid.uuid4())
+        request.state.trace_id = trace_id
+        start = time.time()
+        token = begin_request()
+        response = await call_next(request)
+        latency = round((time.time() - start) * 1000, 2)
+        observe(route_template(request.scope), latency, method=request.method,
+                status_code=response.status_code, cache_hit=end_request(token))
+        log_request(request.url.path, request.method, trace_id, latency, response.status_code)
+        response.headers["x-trace-id"] = trace_id
+        response.headers["x-latency-ms"] = str(latency)
+        return response
+
+    return _routes(app, chunks, delay_s)
+
+
+def asgi_app(chunks: int, delay_s: float) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+    return _routes(app, chunks, delay_s)
+
+
+def bare_app(chunks: int, delay_s: float) -> FastAPI:
+    return _routes(FastAPI(), chunks, delay_s)
+
+
+async def _call(app, path: str) -> list[tuple[float, dict]]:
+    started = time.perf_counter()
+    events: list[tuple[float, dict]] = []
+    sent_request = False
+
+    async def receive():
+        nonlocal sent_request
+        if not sent_request:
+            sent_request = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        events.append((time.perf_counter() - started, message))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+    await app(scope, receive, send)
+    return events
+
+
+async def _overhead(app, requests: int) -> dict:
+    for i in range(min(200, requests)):
+        await _call(app, f"/ping/{i}")
+    samples = []
+    for i in range(requests):
+        t0 = time.perf_counter()
+        await _call(app, f"/ping/{i}")
+        samples.append((time.perf_counter() - t0) * 1_000_000)
+    samples.sort()
+    return {
+        "mean_us": round(statistics.fmean(samples), 1),
+        "p50_us": round(samples[len(samples) // 2], 1),
+        "p95_us": round(samples[int(len(samples) * 0.95) - 1], 1),
+    }
+
+
+async def _streaming(app) -> dict:
+    events = await _call(app, "/stream")
+    arrivals = [round(t * 1000, 1) for t, m in events if m["type"] == "http.response.body" and m.get("body")]
+    start = [m for _, m in events if m["type"] == "http.response.start"][0]
+    return {
+        "chunk_arrival_ms": arrivals,
+        "first_chunk_ms": arrivals[0] if arrivals else None,
+        "private_network_header": (b"access-control-allow-private-network", b"true") in start["headers"],
+    }
+
+
+async def main_async(args) -> dict:
+    delay_s = args.chunk_delay_ms / 1000.0
+    out = {}
+    for name, factory in (("bare", bare_app), ("legacy_base_http", legacy_app), ("pure_asgi", asgi_app)):
+        app = factory(args.chunks, delay_s)
+        out[name] = {"overhead": await _overhead(app, args.requests), "streaming": await _streaming(app)}
+    bare = out["bare"]["overhead"]["mean_us"]
+    for name in ("legacy_base_http", "pure_asgi"):
+        out[name]["overhead"]["added_mean_us"] = round(out[name]["overhead"]["mean_us"] - bare, 1)
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--chunks", type=int, default=4)
+    parser.add_argument("--chunk-delay-ms", type=float, default=50.0)
+    args = parser.parse_args()
+    # Sin logs de request en la medicion (mismo trato para ambos stacks).
+    settings.log_request_sample_rate = 0.0
+    settings.log_request_slow_ms = float("inf")
+    print(json.dumps(asyncio.run(main_async(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Benchmark de extraccion MySQL por modo de cursor (stream vs buffered, C ext vs puro).
+
+Cada combinacion corre en un proceso nuevo para que el RSS pico sea comparable.
+Lee la query completa del dominio contra la MySQL configurada (sin normalizar
+ni escribir) y reporta filas/seg y RSS pico.
+
+Uso:
+  python scripts/benchmark_sync_extract.py --domain cobranzas
+  python scripts/benchmark_sync_extract.py --domain cobranzas --modes stream --max-rows 2000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+
+def _run_one(domain: str, mode: str, use_c_ext: bool, max_rows: int) -> dict:
+    from app.core.config import settings
+    from app.db.session import SessionLocal
+    from app.services.sync_service import (
+        _iter_from_mysql,
+        _query_path_for,
+        _resolve_mysql_connection_config,
+    )
+    from app.services.sync_tuning import ExtractStats
+
+    settings.sync_extract_cursor_mode = mode
+    settings.sync_extract_cursor_mode_overrides = ""
+    settings.sync_extract_use_c_ext = use_c_ext
+    db = SessionLocal()
+    try:
+        cfg = _resolve_mysql_connection_config(db)
+    finally:
+        db.close()
+    stats = ExtractStats()
+    for _, batch in _iter_from_mysql(
+        _query_path_for(domain), domain=domain, mysql_config=cfg, extract_stats=stats
+    ):
+        if max_rows and stats.rows >= max_rows:
+            break
+    return stats.snapshot()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--domain", default="cobranzas")
+    parser.add_argument("--modes", default="stream,buffered")
+    parser.add_argument("--drivers", default="c_ext,pure")
+    parser.add_argument("--max-rows", type=int, default=0, help="Cortar tras N filas (0 = todo).")
+    parser.add_argument("--child", default="", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, driver = args.child.split(":")
+        print(json.dumps(_run_one(args.domain, mode, driver == "c_ext", args.max_rows)))
+        return 0
+
+    results = []
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        for driver in [d.strip() for d in args.drivers.split(",") if d.strip()]:
+            proc = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--domain",
+                    args.domain,
+                    "--max-rows",
+                    str(args.max_rows),
+                    "--child",
+                    f"{mode}:{driver}",
+                ],
+                capture_output=True,
+                text=True,
+            )
+            if proc.returncode != 0:
+                results.append({"cursor_mode": mode, "requested_driver": driver, "error": proc.stderr.strip()[-500:]})
+                continue
+            snapshot = json.loads(proc.stdout.strip().splitlines()[-1])
+            snapshot["requested_driver"] = driver
+            results.append(snapshot)
+    print(json.dumps({"domain": args.domain, "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Benchmark de normalizadores de sync: dict (normalize_record) vs compilado por columnas.
+
+Genera filas sinteticas con el layout de cada dominio, verifica que ambas rutas
+producen exactamente la misma salida y reporta filas/seg.
+
+Uso:
+  python scripts/benchmark_sync_normalizers.py --rows 200000
+  python scripts/benchmark_sync_normalizers.py --domains cobranzas,eerr --rounds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.services.sync_normalizers import compile_row_normalizer, normalize_record  # noqa: E402
+
+LAYOUTS: dict[str, list[str]] = {
+    "cartera": [
+        "contract_id", "fecha_contrato", "fecha_cierre", "UN", "Supervisor", "via_de_cobro",
+        "cuotas_vencidas", "monto_cuota", "monto_vencido", "total_saldo", "capital_saldo",
+        "capital_vencido", "fecha_culminacion", "updated_at",
+    ],
+    "cobranzas": [
+        "payment_way_id", "contract_id", "Dia", "Mes", "Año", "monto", "VP", "UN",
+        "Supervisor", "tramo", "gestion_month", "updated_at",
+    ],
+    "eerr": [
+        "Empresa", "Mes", "Año", "social_reason_id", "accounting_plan_id", "eerr_block",
+        "group_type", "Mayor", "Cuenta", "debit", "credit", "is_tapo",
+    ],
+    "analytics": [
+        "contract_id", "gestion_month", "supervisor", "un", "via", "tramo",
+        "contracts_total", "debt_total", "paid_total",
+    ],
+    "contratos": ["id", "fecha_contrato", "UN", "Supervisor", "Vendedor", "monto_cuota", "updated_at"],
+    "gestores": ["contract_id", "gestion_month", "Gestor", "updated_at"],
+}
+
+
+def _value(column: str, rnd: random.Random, i: int) -> Any:
+    base = datetime(2025, 1, 1) + timedelta(days=rnd.randint(0, 500))
+    if column in ("contract_id", "id", "payment_way_id"):
+        return i + 1
+    if column in ("fecha_contrato", "fecha_cierre", "fecha_culminacion"):
+        return base.strftime("%Y-%m-%d")
+    if column == "updated_at":
+        return base
+    if column == "gestion_month":
+        return base.strftime("%m/%Y")
+    if column == "Dia":
+        return base.day
+    if column == "Mes":
+        return base.month
+    if column == "Año":
+        return base.year
+    if column in ("UN", "un"):
+        return rnd.choice(["ODONTOLOGIA", "MEDICINA ESTETICA", "ODONTOLOGIA TTO"])
+    if column in ("Supervisor", "supervisor", "Vendedor", "Gestor"):
+        return f"SUPERVISOR {rnd.randint(1, 40)}"
+    if column in ("via_de_cobro", "VP", "via"):
+        return rnd.choice(["COBRADOR", "DEBITO"])
+    if column in ("cuotas_vencidas", "tramo", "group_type", "social_reason_id", "is_tapo"):
+        return rnd.randint(0, 7)
+    if column == "eerr_block":
+        return rnd.choice(["ventas", "costos", "gastos"])
+    if column in ("Empresa", "Mayor", "Cuenta"):
+        return f"{column} {rnd.randint(1, 200)}"
+    if column == "accounting_plan_id":
+        return rnd.randint(1, 3000)
+    return Decimal(rnd.randint(0, 5_000_000)) / 100
+
+
+def _synthetic_rows(domain: str, count: int, seed: int) -> tuple[list[str], list[tuple]]:
+    rnd = random.Random(seed)
+    columns = LAYOUTS[domain]
+    return columns, [tuple(_value(c, rnd, i) for c in columns) for i in range(count)]
+
+
+def _best_rate(fn, rows: list, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, rounds)):
+        started = time.perf_counter()
+        fn(rows)
+        best = min(best, time.perf_counter() - started)
+    return len(rows) / best if best > 0 else 0.0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000, help="Filas sinteticas por dominio.")
+    parser.add_argument("--rounds", type=int, default=3, help="Repeticiones (se toma la mejor).")
+    parser.add_argument("--domains", default=",".join(LAYOUTS), help="Dominios separados por coma.")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    results: list[dict[str, Any]] = []
+    for domain in [d.strip() for d in args.domains.split(",") if d.strip()]:
+        if domain not in LAYOUTS:
+            parser.error(f"dominio desconocido: {domain}")
+        columns, tuples = _synthetic_rows(domain, int(args.rows), int(args.seed))
+        dict_rows = [dict(zip(columns, row)) for row in tuples]
+        compiled = compile_row_normalizer(domain, columns)
+
+        mismatches = sum(
+            1
+            for seq, row in enumerate(tuples)
+            if repr(compiled(row, seq)) != repr(normalize_record(domain, dict_rows[seq], seq))
+        )
+
+        def run_dict(rows: list) -> None:
+            for seq, row in enumerate(rows):
+                normalize_record(domain, row, seq)
+
+        def run_compiled(rows: list) -> None:
+            for seq, row in enumerate(rows):
+                compiled(row, seq)
+
+        dict_rate = _best_rate(run_dict, dict_rows, args.rounds)
+        compiled_rate = _best_rate(run_compiled, tuples, args.rounds)
+        results.append(
+            {
+                "domain": domain,
+                "rows": len(tuples),
+                "dict_rows_per_sec": round(dict_rate, 1),
+                "compiled_rows_per_sec": round(compiled_rate, 1),
+                "speedup": round(compiled_rate / dict_rate, 2) if dict_rate else None,
+                "mismatches": mismatches,
+            }
+        )
+
+    print(json.dumps({"generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "rows": results}, indent=2))
+    return 1 if any(r["mismatches"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Crea en MySQL la tabla de cambios y los triggers usados por SYNC_CDC_MODE=change_table.
+
+Por defecto solo imprime el DDL (para revisarlo con el DBA). Con --apply lo
+ejecuta usando la conexion MySQL configurada (requiere privilegio TRIGGER).
+Con --purge-days N borra cambios mas antiguos que N dias.
+
+Uso:
+  python scripts/install_mysql_cdc_triggers.py
+  python scripts/install_mysql_cdc_triggers.py --domains cobranzas --apply
+  python scripts/install_mysql_cdc_triggers.py --purge-days 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.services.sync_cdc import (  # noqa: E402
+    CDC_DOMAIN_SPECS,
+    change_table_ddl,
+    purge_change_table,
+    trigger_ddl,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--domains", default=",".join(sorted(CDC_DOMAIN_SPECS)))
+    parser.add_argument("--apply", action="store_true", help="Ejecutar el DDL en MySQL.")
+    parser.add_argument("--purge-days", type=int, default=0)
+    args = parser.parse_args()
+
+    domains = [d.strip().lower() for d in args.domains.split(",") if d.strip()]
+    for domain in domains:
+        if domain not in CDC_DOMAIN_SPECS:
+            parser.error(f"dominio sin CDC: {domain}")
+    statements = [change_table_ddl(), *trigger_ddl(domains)]
+    if not args.apply and not args.purge_days:
+        # Trigger bodies contain ';', so the output switches the mysql client delimiter.
+        print("DELIMITER //\n")
+        for statement in statements:
+            print(f"{statement} //\n")
+        print("DELIMITER ;")
+        return 0
+
+    import mysql.connector
+
+    from app.db.session import SessionLocal
+    from app.services.sync_service import _resolve_mysql_connection_config
+
+    db = SessionLocal()
+    try:
+        cfg = _resolve_mysql_connection_config(db)
+    finally:
+        db.close()
+    conn = mysql.connector.connect(**cfg)
+    try:
+        if args.apply:
+            cursor = conn.cursor()
+            try:
+                for statement in statements:
+                    cursor.execute(statement)
+            finally:
+                cursor.close()
+            conn.commit()
+            print(f"CDC instalado: {len(statements)} sentencias ({', '.join(domains)})")
+        if args.purge_days:
+            deleted = purge_change_table(conn, keep_days=args.purge_days)
+            print(f"Cambios purgados: {deleted}")
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -13,7 +13,14 @@ BEGIN
         JOIN pg_class parent ON parent.oid = i.inhparent
         JOIN pg_class child ON child.oid = i.inhrelid
         JOIN pg_namespace ns ON ns.oid = child.relnamespace
-        WHERE parent.relname IN ('cartera_fact', 'sync_records')
+        WHERE parent.relname IN (
+            'cartera_fact',
+            'sync_records',
+            'cobranzas_fact',
+            'eerr_fact',
+            'cobranzas_cohorte_agg',
+            'analytics_rendimiento_agg'
+        )
     LOOP
         EXECUTE format(
             'ALTER TABLE %s SET (
@@ -31,3 +38,5 @@ COMMIT;
 
 ANALYZE cartera_fact;
 ANALYZE sync_records;
+ANALYZE cobranzas_fact;
+ANALYZE eerr_fact;
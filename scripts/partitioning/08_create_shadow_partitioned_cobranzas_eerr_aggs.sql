@@ -0,0 +1,100 @@
+-- Fase 1 (cobranzas/eerr/agregados): crear tablas shadow particionadas por mes serial.
+-- Misma convencion que cartera_fact: serial = (anio * 12) + mes, una particion por anio.
+-- PostgreSQL 13+ recomendado.
+--
+-- Nota: los indices UNIQUE de las tablas actuales (ux_cobranzas_fact_source_row_id,
+-- ux_eerr_fact_business_key, ux_*_agg_key) no incluyen la clave de particion y no
+-- pueden recrearse en el padre particionado. El sync detecta la ausencia del indice
+-- y usa delete+insert en lugar de ON CONFLICT (igual que cartera_fact).
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS cobranzas_fact_part (
+    LIKE cobranzas_fact INCLUDING DEFAULTS INCLUDING STORAGE INCLUDING COMMENTS
+) PARTITION BY RANGE (
+    (
+        (split_part(payment_month, '/', 2)::integer * 12) + split_part(payment_month, '/', 1)::integer
+    )
+);
+
+CREATE TABLE IF NOT EXISTS eerr_fact_part (
+    LIKE eerr_fact INCLUDING DEFAULTS INCLUDING STORAGE INCLUDING COMMENTS
+) PARTITION BY RANGE (
+    (
+        (split_part(gestion_month, '/', 2)::integer * 12) + split_part(gestion_month, '/', 1)::integer
+    )
+);
+
+CREATE TABLE IF NOT EXISTS cobranzas_cohorte_agg_part (
+    LIKE cobranzas_cohorte_agg INCLUDING DEFAULTS INCLUDING STORAGE INCLUDING COMMENTS
+) PARTITION BY RANGE (
+    (
+        (split_part(cutoff_month, '/', 2)::integer * 12) + split_part(cutoff_month, '/', 1)::integer
+    )
+);
+
+CREATE TABLE IF NOT EXISTS analytics_rendimiento_agg_part (
+    LIKE analytics_rendimiento_agg INCLUDING DEFAULTS INCLUDING STORAGE INCLUDING COMMENTS
+) PARTITION BY RANGE (
+    (
+        (split_part(gestion_month, '/', 2)::integer * 12) + split_part(gestion_month, '/', 1)::integer
+    )
+);
+
+DO $$
+DECLARE
+    y integer;
+    start_key integer;
+    end_key integer;
+    tbl text;
+BEGIN
+    FOREACH tbl IN ARRAY ARRAY['cobranzas_fact', 'eerr_fact', 'cobranzas_cohorte_agg', 'analytics_rendimiento_agg'] LOOP
+        FOR y IN 2020..2036 LOOP
+            start_key := (y * 12) + 1;
+            end_key := ((y + 1) * 12) + 1;
+            -- Nombre final {tabla}_part_YYYY: el sync crea/trunca particiones con ese nombre.
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%s) TO (%s);',
+                tbl || '_part_' || y, tbl || '_part', start_key, end_key
+            );
+        END LOOP;
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I DEFAULT;',
+            tbl || '_part_default', tbl || '_part'
+        );
+    END LOOP;
+END $$;
+
+CREATE INDEX IF NOT EXISTS ix_cobranzas_fact_part_source_row_id
+    ON cobranzas_fact_part (source_row_id);
+CREATE INDEX IF NOT EXISTS ix_cobranzas_fact_part_payment_month_un
+    ON cobranzas_fact_part (payment_month, un);
+CREATE INDEX IF NOT EXISTS ix_cobranzas_fact_part_payment_month_contract_via
+    ON cobranzas_fact_part (payment_month, contract_id, payment_via_class);
+CREATE INDEX IF NOT EXISTS ix_cobranzas_fact_part_contract_payment_month
+    ON cobranzas_fact_part (contract_id, payment_month);
+CREATE INDEX IF NOT EXISTS ix_cobranzas_fact_part_un_gestion_month
+    ON cobranzas_fact_part (un, gestion_month);
+CREATE INDEX IF NOT EXISTS ix_cobranzas_fact_part_updated_at_desc
+    ON cobranzas_fact_part (updated_at DESC);
+
+CREATE INDEX IF NOT EXISTS ix_eerr_fact_part_business_key
+    ON eerr_fact_part (gestion_month, social_reason_id, accounting_plan_id, eerr_block, is_tapo);
+CREATE INDEX IF NOT EXISTS ix_eerr_fact_part_block_gestion
+    ON eerr_fact_part (eerr_block, gestion_month);
+
+CREATE INDEX IF NOT EXISTS ix_cobranzas_cohorte_agg_part_cutoff_un
+    ON cobranzas_cohorte_agg_part (cutoff_month, un);
+CREATE INDEX IF NOT EXISTS ix_cobranzas_cohorte_agg_part_cutoff_supervisor
+    ON cobranzas_cohorte_agg_part (cutoff_month, supervisor);
+CREATE INDEX IF NOT EXISTS ix_cobranzas_cohorte_agg_part_cutoff_via
+    ON cobranzas_cohorte_agg_part (cutoff_month, via_cobro);
+CREATE INDEX IF NOT EXISTS ix_cobranzas_cohorte_agg_part_updated_at_desc
+    ON cobranzas_cohorte_agg_part (updated_at DESC);
+
+CREATE INDEX IF NOT EXISTS ix_analytics_rendimiento_agg_part_gestion_un
+    ON analytics_rendimiento_agg_part (gestion_month, un);
+CREATE INDEX IF NOT EXISTS ix_analytics_rendimiento_agg_part_gestion_supervisor
+    ON analytics_rendimiento_agg_part (gestion_month, supervisor);
+
+COMMIT;
@@ -0,0 +1,41 @@
+-- Fase 2+3 (cobranzas/eerr/agregados): backfill y cutover en una sola ventana.
+-- Ejecutar con el sync detenido (sin dual-write): los agregados se recalculan
+-- en el siguiente sync y los facts se copian completos bajo lock.
+
+BEGIN;
+
+LOCK TABLE cobranzas_fact IN ACCESS EXCLUSIVE MODE;
+LOCK TABLE eerr_fact IN ACCESS EXCLUSIVE MODE;
+LOCK TABLE cobranzas_cohorte_agg IN ACCESS EXCLUSIVE MODE;
+LOCK TABLE analytics_rendimiento_agg IN ACCESS EXCLUSIVE MODE;
+
+INSERT INTO cobranzas_fact_part SELECT * FROM cobranzas_fact;
+INSERT INTO eerr_fact_part SELECT * FROM eerr_fact;
+INSERT INTO cobranzas_cohorte_agg_part SELECT * FROM cobranzas_cohorte_agg;
+INSERT INTO analytics_rendimiento_agg_part SELECT * FROM analytics_rendimiento_agg;
+
+ALTER TABLE cobranzas_fact RENAME TO cobranzas_fact_legacy;
+ALTER TABLE cobranzas_fact_part RENAME TO cobranzas_fact;
+
+ALTER TABLE eerr_fact RENAME TO eerr_fact_legacy;
+ALTER TABLE eerr_fact_part RENAME TO eerr_fact;
+
+ALTER TABLE cobranzas_cohorte_agg RENAME TO cobranzas_cohorte_agg_legacy;
+ALTER TABLE cobranzas_cohorte_agg_part RENAME TO cobranzas_cohorte_agg;
+
+ALTER TABLE analytics_rendimiento_agg RENAME TO analytics_rendimiento_agg_legacy;
+ALTER TABLE analytics_rendimiento_agg_part RENAME TO analytics_rendimiento_agg;
+
+-- LIKE ... INCLUDING DEFAULTS reutiliza la secuencia del id legacy: pasarla a la
+-- tabla nueva para que un DROP de la legacy no se lleve el default.
+ALTER SEQUENCE IF EXISTS cobranzas_fact_id_seq OWNED BY cobranzas_fact.id;
+ALTER SEQUENCE IF EXISTS eerr_fact_id_seq OWNED BY eerr_fact.id;
+ALTER SEQUENCE IF EXISTS cobranzas_cohorte_agg_id_seq OWNED BY cobranzas_cohorte_agg.id;
+ALTER SEQUENCE IF EXISTS analytics_rendimiento_agg_id_seq OWNED BY analytics_rendimiento_agg.id;
+
+COMMIT;
+
+ANALYZE cobranzas_fact;
+ANALYZE eerr_fact;
+ANALYZE cobranzas_cohorte_agg;
+ANALYZE analytics_rendimiento_agg;
@@ -0,0 +1,33 @@
+-- Rollback del cutover de cobranzas/eerr/agregados particionados.
+-- Devuelve nombres originales legacy->activos. Las filas escritas despues del
+-- cutover quedan solo en las tablas particionadas: re-ejecutar sync de la ventana.
+
+BEGIN;
+
+LOCK TABLE cobranzas_fact IN ACCESS EXCLUSIVE MODE;
+LOCK TABLE cobranzas_fact_legacy IN ACCESS EXCLUSIVE MODE;
+LOCK TABLE eerr_fact IN ACCESS EXCLUSIVE MODE;
+LOCK TABLE eerr_fact_legacy IN ACCESS EXCLUSIVE MODE;
+LOCK TABLE cobranzas_cohorte_agg IN ACCESS EXCLUSIVE MODE;
+LOCK TABLE cobranzas_cohorte_agg_legacy IN ACCESS EXCLUSIVE MODE;
+LOCK TABLE analytics_rendimiento_agg IN ACCESS EXCLUSIVE MODE;
+LOCK TABLE analytics_rendimiento_agg_legacy IN ACCESS EXCLUSIVE MODE;
+
+ALTER TABLE cobranzas_fact RENAME TO cobranzas_fact_part;
+ALTER TABLE cobranzas_fact_legacy RENAME TO cobranzas_fact;
+
+ALTER TABLE eerr_fact RENAME TO eerr_fact_part;
+ALTER TABLE eerr_fact_legacy RENAME TO eerr_fact;
+
+ALTER TABLE cobranzas_cohorte_agg RENAME TO cobranzas_cohorte_agg_part;
+ALTER TABLE cobranzas_cohorte_agg_legacy RENAME TO cobranzas_cohorte_agg;
+
+ALTER TABLE analytics_rendimiento_agg RENAME TO analytics_rendimiento_agg_part;
+ALTER TABLE analytics_rendimiento_agg_legacy RENAME TO analytics_rendimiento_agg;
+
+ALTER SEQUENCE IF EXISTS cobranzas_fact_id_seq OWNED BY cobranzas_fact.id;
+ALTER SEQUENCE IF EXISTS eerr_fact_id_seq OWNED BY eerr_fact.id;
+ALTER SEQUENCE IF EXISTS cobranzas_cohorte_agg_id_seq OWNED BY cobranzas_cohorte_agg.id;
+ALTER SEQUENCE IF EXISTS analytics_rendimiento_agg_id_seq OWNED BY analytics_rendimiento_agg.id;
+
+COMMIT;
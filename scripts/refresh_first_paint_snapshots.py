@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import argparse
+
+from app.db.session import SessionLocal
+from app.services.first_paint_snapshots import refresh_first_paint_snapshots
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description='Recalcula first_paint_snapshots sin esperar al proximo sync.')
+    parser.add_argument('--domain', default='cartera', help='Dominio de sync a simular (cartera cubre las 4 vistas)')
+    args = parser.parse_args()
+    db = SessionLocal()
+    try:
+        out = refresh_first_paint_snapshots(db, args.domain, lambda domain, msg: print(f'[{domain}] {msg}'))
+        print(f'[snapshots] first_paint_snapshots actualizados={sum(1 for v in out.values() if v != "error")}')
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    run()
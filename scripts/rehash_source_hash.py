@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Recalcula source_hash de las tablas fact con el fingerprint activo.
+
+Usar despues de cambiar SYNC_FINGERPRINT_ALGORITHM para que la deteccion de
+cambios incremental no marque todas las filas como modificadas. Los syncs
+incrementales ya lo hacen mes a mes (SYNC_FINGERPRINT_REHASH_STORED); este
+script migra la tabla completa de una vez.
+
+Uso:
+  python scripts/rehash_source_hash.py --domains cobranzas,cartera
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.sync_fingerprint import active_fingerprint  # noqa: E402
+from app.services.sync_service import FACT_TABLE_BY_DOMAIN, _rehash_stored_source_hashes  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--domains", default=",".join(sorted(FACT_TABLE_BY_DOMAIN)))
+    parser.add_argument("--months", default="", help="Meses MM/YYYY separados por coma (vacio = todos).")
+    parser.add_argument("--batch-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    months = {m.strip() for m in args.months.split(",") if m.strip()} or None
+    result: dict[str, int] = {}
+    db = SessionLocal()
+    try:
+        for domain in [d.strip().lower() for d in args.domains.split(",") if d.strip()]:
+            if domain not in FACT_TABLE_BY_DOMAIN:
+                parser.error(f"dominio desconocido: {domain}")
+            result[domain] = _rehash_stored_source_hashes(db, domain, months, batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(json.dumps({"algorithm": active_fingerprint().name, "rehashed_rows": result}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,127 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.core import concurrency  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.main import http_exception_handler  # noqa: E402
+from starlette.exceptions import HTTPException as StarletteHTTPException  # noqa: E402
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_exception_handler(StarletteHTTPException, http_exception_handler)
+    summary_gate = concurrency.build_concurrency_dependency("summary")
+    options_gate = concurrency.build_concurrency_dependency("options")
+
+    @app.post("/heavy/summary", dependencies=[Depends(summary_gate)])
+    async def heavy():
+        await asyncio.sleep(0.3)
+        return {"ok": True}
+
+    @app.post("/cheap/options", dependencies=[Depends(options_gate)])
+    async def cheap():
+        return {"ok": True}
+
+    return app
+
+
+async def _burst(app, calls):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        async def call(path, delay):
+            await asyncio.sleep(delay)
+            return await client.post(path)
+
+        return await asyncio.gather(*(call(path, delay) for path, delay in calls))
+
+
+class AnalyticsConcurrencyTests(unittest.TestCase):
+    def setUp(self):
+        self.settings_patch = patch.multiple(
+            settings,
+            analytics_concurrency_enabled=True,
+            analytics_concurrency_budgets="summary:1:0.1,options:4:1",
+        )
+        self.settings_patch.start()
+        concurrency.reset()
+
+    def tearDown(self):
+        concurrency.reset()
+        self.settings_patch.stop()
+
+    def test_parse_budgets_keeps_defaults_and_ignores_invalid_items(self):
+        budgets = concurrency.parse_budgets("summary:3:7, export:x:1, options:5, bogus")
+        self.assertEqual(budgets["summary"], (3, 7.0))
+        self.assertEqual(budgets["options"], (5, concurrency.DEFAULT_BUDGETS["options"][1]))
+        self.assertEqual(budgets["export"], concurrency.DEFAULT_BUDGETS["export"])
+
+    def test_queue_timeout_returns_503_with_retry_after_while_other_class_is_served(self):
+        heavy, queued, cheap = asyncio.run(
+            _burst(_app(), [("/heavy/summary", 0), ("/heavy/summary", 0.02), ("/cheap/options", 0.05)])
+        )
+        self.assertEqual(heavy.status_code, 200)
+        self.assertEqual(queued.status_code, 503)
+        self.assertEqual(queued.headers["retry-after"], "1")
+        self.assertEqual(queued.json()["error_code"], "SERVER_BUSY")
+        self.assertEqual(queued.json()["details"]["endpoint_class"], "summary")
+        self.assertEqual(cheap.status_code, 200)
+        snap = concurrency.gates_snapshot()
+        self.assertEqual(snap["summary"]["rejected_timeout"], 1)
+        self.assertEqual(snap["summary"]["in_flight"], 0)
+        self.assertEqual(snap["options"]["admitted"], 1)
+
+    def test_waiters_within_timeout_are_admitted_in_turn(self):
+        with patch.object(settings, "analytics_concurrency_budgets", "summary:1:2"):
+            concurrency.reset()
+            responses = asyncio.run(_burst(_app(), [("/heavy/summary", 0), ("/heavy/summary", 0.02)]))
+        self.assertEqual([r.status_code for r in responses], [200, 200])
+        self.assertEqual(concurrency.gates_snapshot()["summary"]["admitted"], 2)
+
+    def test_zero_timeout_rejects_immediately_instead_of_queueing(self):
+        with patch.object(settings, "analytics_concurrency_budgets", "summary:1:0"):
+            concurrency.reset()
+            first, second = asyncio.run(_burst(_app(), [("/heavy/summary", 0), ("/heavy/summary", 0.02)]))
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 503)
+        self.assertEqual(second.json()["details"]["reason"], "timeout")
+        snap = concurrency.gates_snapshot()["summary"]
+        self.assertEqual((snap["admitted"], snap["rejected_timeout"], snap["waiting"]), (1, 1, 0))
+
+    def test_disabled_gates_are_pass_through(self):
+        with patch.object(settings, "analytics_concurrency_enabled", False):
+            responses = asyncio.run(_burst(_app(), [("/heavy/summary", 0), ("/heavy/summary", 0.02)]))
+        self.assertEqual([r.status_code for r in responses], [200, 200])
+        self.assertEqual(concurrency.gates_snapshot(), {})
+
+    def test_analytics_routes_declare_their_endpoint_class(self):
+        from app.api.v1.endpoints import analytics
+        from app.core import deps
+
+        expected = {
+            "/portfolio/options": deps.options_gate,
+            "/rendimiento-v2/first-paint": deps.first_paint_gate,
+            "/portfolio-rolo-v2/summary": deps.summary_gate,
+            "/cobranzas-cohorte-v2/detail": deps.summary_gate,
+            "/export/csv": deps.export_gate,
+        }
+        routes = {r.path: r for r in analytics.router.routes}
+        for path, gate in expected.items():
+            self.assertIn(path, routes)
+            self.assertIn(gate, [d.dependency for d in routes[path].dependencies], path)
+        # Un solo cliente sincrono tambien pasa por el gate sin quedar trabado entre event loops.
+        TestClient(_app()).post("/cheap/options")
+        self.assertEqual(concurrency.gates_snapshot()["options"]["in_flight"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
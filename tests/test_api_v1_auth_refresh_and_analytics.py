@@ -32,12 +32,15 @@ from app.models.brokers import (  # noqa: E402
     CarteraFact,
     CobranzasCohorteAgg,
     CobranzasFact,
+    CobranzasOrphanContract,
+    CobranzasOrphanCutoff,
     CommissionRules,
     PrizeRules,
     AuthSession,
     AuthUser,
     AuthUserState,
     FrontendPerfMetric,
+    FrontendPerfRollup,
 )
 from app.schemas.analytics import CobranzasCohorteIn  # noqa: E402
 from app.services.analytics_service import AnalyticsService, cohorte_base_cache_clear  # noqa: E402
@@ -86,6 +89,8 @@ class ApiV1AuthRefreshAnalyticsTests(unittest.TestCase):
         ensure_table(CobranzasFact)
         ensure_table(CarteraCorteAgg)
         ensure_table(CobranzasCohorteAgg)
+        ensure_table(CobranzasOrphanContract)
+        ensure_table(CobranzasOrphanCutoff)
         ensure_analytics_source_freshness_table()
         ensure_table(BrokersSupervisorScope)
         ensure_table(CommissionRules)
@@ -93,6 +98,7 @@ class ApiV1AuthRefreshAnalyticsTests(unittest.TestCase):
         ensure_table(AuditLog)
         # Some test DB bootstraps can miss this table; create it defensively.
         ensure_table(FrontendPerfMetric)
+        ensure_table(FrontendPerfRollup)
         db = SessionLocal()
         try:
             db.query(AuthUserState).delete()
@@ -547,6 +553,7 @@ class ApiV1AuthRefreshAnalyticsTests(unittest.TestCase):
         db = SessionLocal()
         try:
             db.query(FrontendPerfMetric).delete()
+            db.query(FrontendPerfRollup).delete()
             db.commit()
         finally:
             db.close()
@@ -566,7 +573,7 @@ class ApiV1AuthRefreshAnalyticsTests(unittest.TestCase):
         self.assertEqual(ing.status_code, 200)
         self.assertTrue(ing.json().get('ok'))
 
-        sm = self.client.get('/api/v1/telemetry/frontend-perf/summary?route=cohorte', headers=headers)
+        sm = self.client.get('/api/v1/telemetry/frontend-perf/summary?route=cohorte&from_utc=2026-03-05T00:00:00Z', headers=headers)
         self.assertEqual(sm.status_code, 200)
         body = sm.json()
         self.assertGreaterEqual(int(body.get('sample_count') or 0), 1)
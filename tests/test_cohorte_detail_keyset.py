@@ -0,0 +1,97 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+DEFAULT_DB_PATH = (ROOT / "data" / "test_cohorte_detail_keyset.db").resolve()
+DEFAULT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{DEFAULT_DB_PATH.as_posix()}")
+
+from app.models.brokers import CarteraCorteAgg, CobranzasCohorteAgg  # noqa: E402
+from app.schemas.analytics import CobranzasCohorteDetailIn  # noqa: E402
+from app.services.analytics_service import AnalyticsService, cohorte_base_cache_clear  # noqa: E402
+
+engine = create_engine(TEST_DATABASE_URL, future=True)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+class CohorteDetailKeysetTests(unittest.TestCase):
+    def setUp(self):
+        cohorte_base_cache_clear()
+        for table in (CobranzasCohorteAgg.__table__, CarteraCorteAgg.__table__):
+            table.drop(bind=engine, checkfirst=True)
+            table.create(bind=engine, checkfirst=True)
+        db = SessionLocal()
+        try:
+            for i in range(1, 11):
+                db.add(
+                    CobranzasCohorteAgg(
+                        cutoff_month="03/2026",
+                        sale_month=f"{i:02d}/2025",
+                        sale_year=2025,
+                        activos=10 * i,
+                        pagaron=i,
+                        deberia=100.0 * i,
+                        cobrado=float((i * 37) % 11),
+                        transacciones=i,
+                    )
+                )
+            db.commit()
+        finally:
+            db.close()
+
+    def _page(self, db, **kwargs):
+        return AnalyticsService.fetch_cobranzas_cohorte_detail_v2(
+            db, CobranzasCohorteDetailIn(cutoff_month="03/2026", page_size=4, **kwargs)
+        )
+
+    def test_keyset_pages_walk_sorted_rows_without_recomputing(self):
+        db = SessionLocal()
+        try:
+            real_rollup = AnalyticsService._cohorte_preagg_rollup
+            with patch.object(
+                AnalyticsService, "_cohorte_preagg_rollup", side_effect=real_rollup
+            ) as rollup:
+                first = self._page(db, sort_by="cobrado", sort_dir="desc")
+                second = self._page(db, sort_by="cobrado", sort_dir="desc", after=first["next_cursor"])
+                third = self._page(db, sort_by="cobrado", sort_dir="desc", after=second["next_cursor"])
+            self.assertEqual(rollup.call_count, 1)
+        finally:
+            db.close()
+        walked = [r["sale_month"] for p in (first, second, third) for r in p["items"]]
+        self.assertEqual(len(walked), 10)
+        self.assertEqual(len(set(walked)), 10)
+        cobrado = [r["cobrado"] for p in (first, second, third) for r in p["items"]]
+        self.assertEqual(cobrado, sorted(cobrado, reverse=True))
+        self.assertEqual([first["total_items"], third["total_items"]], [10, 10])
+        self.assertTrue(second["has_next"])
+        self.assertEqual(second["page"], 2)
+        self.assertFalse(third["has_next"])
+        self.assertIsNone(third["next_cursor"])
+
+    def test_offset_paging_and_cache_invalidation(self):
+        db = SessionLocal()
+        try:
+            page2 = self._page(db, page=2)
+            self.assertEqual(
+                [r["sale_month"] for r in page2["items"]],
+                ["05/2025", "06/2025", "07/2025", "08/2025"],
+            )
+            db.query(CobranzasCohorteAgg).filter(CobranzasCohorteAgg.sale_month == "10/2025").delete()
+            db.commit()
+            self.assertEqual(self._page(db, page=3)["total_items"], 10)
+            cohorte_base_cache_clear()
+            self.assertEqual(self._page(db, page=3)["total_items"], 9)
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
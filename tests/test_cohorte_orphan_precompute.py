@@ -0,0 +1,149 @@
+import os
+import sys
+import unittest
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+DEFAULT_DB_PATH = (ROOT / "data" / "test_cohorte_orphan_precompute.db").resolve()
+DEFAULT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{DEFAULT_DB_PATH.as_posix()}")
+
+from app.domain import month_serial  # noqa: E402
+from app.models.brokers import (  # noqa: E402
+    CarteraCorteAgg,
+    CarteraFact,
+    CobranzasFact,
+    CobranzasOrphanContract,
+    CobranzasOrphanCutoff,
+)
+from app.schemas.analytics import CobranzasCohorteOrphanDetailIn  # noqa: E402
+from app.services.analytics_service import AnalyticsService  # noqa: E402
+from app.services.sync_refresh import refresh_cobranzas_orphan_precompute  # noqa: E402
+
+engine = create_engine(TEST_DATABASE_URL, future=True)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+TABLES = (
+    CarteraFact.__table__,
+    CarteraCorteAgg.__table__,
+    CobranzasFact.__table__,
+    CobranzasOrphanContract.__table__,
+    CobranzasOrphanCutoff.__table__,
+)
+
+
+def _payment(row_id, contract_id, amount, un="MEDICINA", tramo=1):
+    return CobranzasFact(
+        contract_id=contract_id,
+        gestion_month="03/2026",
+        supervisor="S/D",
+        un=un,
+        via="COBRADOR",
+        payment_date=date(2026, 3, 10),
+        payment_month="03/2026",
+        payment_year=2026,
+        payment_amount=amount,
+        payment_via_class="COBRADOR",
+        source_row_id=str(row_id),
+        tramo=tramo,
+        source_hash=f"h{row_id}",
+    )
+
+
+class CohorteOrphanPrecomputeTests(unittest.TestCase):
+    def setUp(self):
+        for table in TABLES:
+            table.drop(bind=engine, checkfirst=True)
+            table.create(bind=engine, checkfirst=True)
+        db = SessionLocal()
+        try:
+            db.add(
+                CarteraFact(
+                    contract_id="c-1",
+                    close_date=date(2026, 2, 28),
+                    close_month="02/2026",
+                    close_year=2026,
+                    gestion_month="02/2026",
+                    source_hash="h",
+                )
+            )
+            db.add(CarteraCorteAgg(gestion_month="02/2026", close_month="01/2026", close_year=2026))
+            db.add_all(
+                [
+                    _payment(1, "c-1", 100.0),
+                    _payment(2, "c-2", 40.0),
+                    _payment(3, "c-2", 60.0),
+                    _payment(4, "c-3", -5.0, un="ODONTOLOGIA", tramo=5),
+                    _payment(5, "c-4", 30.0, un="ODONTOLOGIA", tramo=5),
+                ]
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def _orphans(self, db, **filters):
+        kwargs = {k: set() for k in ("un", "supervisor", "gestor", "via", "category")}
+        kwargs.update(filters)
+        return AnalyticsService._cohorte_orphan_cobranzas(
+            db,
+            "03/2026",
+            "02/2026",
+            kwargs["un"],
+            kwargs["supervisor"],
+            kwargs["gestor"],
+            kwargs["via"],
+            kwargs["category"],
+        )
+
+    def test_precomputed_orphans_match_live_anti_join(self):
+        db = SessionLocal()
+        try:
+            cases = [{}, {"un": {"ODONTOLOGIA"}}, {"category": {"MOROSO"}}, {"via": {"DEBITO"}}]
+            live = [self._orphans(db, **c) for c in cases]
+            deleted, written = refresh_cobranzas_orphan_precompute(
+                db, month_serial, effective_by_cutoff={"03/2026": "02/2026"}
+            )
+            self.assertEqual((deleted, written), (0, 3))
+            marker = db.get(CobranzasOrphanCutoff, "03/2026")
+            self.assertEqual((marker.contratos, marker.pagaron, marker.transacciones), (3, 2, 4))
+            precomputed = [self._orphans(db, **c) for c in cases]
+        finally:
+            db.close()
+        self.assertEqual(live[0], (125.0, 4, 2))
+        self.assertEqual(precomputed, live)
+
+    def test_marker_for_other_cartera_month_falls_back_to_live(self):
+        db = SessionLocal()
+        try:
+            refresh_cobranzas_orphan_precompute(
+                db, month_serial, effective_by_cutoff={"03/2026": "01/2026"}
+            )
+            self.assertEqual(self._orphans(db), (125.0, 4, 2))
+        finally:
+            db.close()
+
+    def test_orphan_detail_reads_precomputed_contracts(self):
+        db = SessionLocal()
+        try:
+            refresh_cobranzas_orphan_precompute(
+                db, month_serial, effective_by_cutoff={"03/2026": "02/2026"}
+            )
+            out = AnalyticsService.fetch_cobranzas_cohorte_orphan_detail_v2(
+                db, CobranzasCohorteOrphanDetailIn(cutoff_month="03/2026")
+            )
+        finally:
+            db.close()
+        self.assertEqual(out["meta"]["source_table"], "cobranzas_orphan_contract")
+        self.assertEqual([r["contract_id"] for r in out["items"]], ["c-2", "c-4", "c-3"])
+        self.assertEqual(out["items"][0]["transacciones"], 2)
+        self.assertEqual(out["totals"], {"contratos": 3, "transacciones": 4, "cobrado": 125.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import dataclasses
+import gzip
+import json
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+DEFAULT_DB_PATH = (ROOT / "data" / "test_first_paint_snapshots.db").resolve()
+DEFAULT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{DEFAULT_DB_PATH.as_posix()}")
+
+from app.api.v1.endpoints import analytics  # noqa: E402
+from app.core.analytics_cache import invalidate_prefix, set as cache_set  # noqa: E402
+from app.models.brokers import AnalyticsSourceFreshness, FirstPaintSnapshot  # noqa: E402
+from app.schemas.analytics import AnalyticsFilters  # noqa: E402
+from app.services import first_paint_snapshots as snapshots  # noqa: E402
+
+engine = create_engine(TEST_DATABASE_URL, future=True)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": headers})
+
+
+def _clear_cache():
+    for spec in snapshots.SNAPSHOT_SPECS:
+        invalidate_prefix(spec.endpoint)
+
+
+def _prewarm_all(version=1):
+    for spec in snapshots.SNAPSHOT_SPECS:
+        cache_set(spec.endpoint, spec.default_filters(), {"endpoint": spec.endpoint, "version": version, "meta": {}})
+
+
+class FirstPaintSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        for table in (FirstPaintSnapshot.__table__, AnalyticsSourceFreshness.__table__):
+            table.drop(bind=engine, checkfirst=True)
+            table.create(bind=engine, checkfirst=True)
+        _clear_cache()
+        snapshots.reset_decoded_cache()
+        self.db = SessionLocal()
+
+    def tearDown(self):
+        self.db.close()
+        _clear_cache()
+        snapshots.reset_decoded_cache()
+
+    def test_refresh_persists_compressed_payloads_and_upserts_by_filters(self):
+        _prewarm_all()
+        first = snapshots.refresh_first_paint_snapshots(self.db, "cartera")
+        self.assertEqual(sorted(first), sorted(s.endpoint for s in snapshots.SNAPSHOT_SPECS))
+        row = self.db.query(FirstPaintSnapshot).filter_by(endpoint="rendimiento-v2/first-paint").one()
+        body = json.loads(gzip.decompress(row.payload_gz))
+        self.assertEqual(body["version"], 1)
+        self.assertTrue(body["meta"]["cache_hit"])
+        self.assertEqual(body["meta"]["source_table"], "analytics_rendimiento_agg")
+        self.assertEqual(row.payload_bytes, len(gzip.decompress(row.payload_gz)))
+
+        _clear_cache()
+        _prewarm_all(version=2)
+        second = snapshots.refresh_first_paint_snapshots(self.db, "analytics")
+        self.assertNotIn("cobranzas-cohorte-v2/first-paint", second)
+        self.assertNotEqual(second["rendimiento-v2/first-paint"], first["rendimiento-v2/first-paint"])
+        self.assertEqual(self.db.query(FirstPaintSnapshot).count(), 4)
+
+    def test_endpoint_serves_snapshot_with_etag_and_304(self):
+        _prewarm_all()
+        etag = snapshots.refresh_first_paint_snapshots(self.db, "cartera")["anuales-v2/first-paint"]
+        _clear_cache()
+        resp = analytics.anuales_first_paint_v2(AnalyticsFilters(), _request(), self.db, user={})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.headers["etag"], f'"{etag}"')
+        self.assertEqual(json.loads(resp.body)["endpoint"], "anuales-v2/first-paint")
+
+        not_modified = analytics.anuales_first_paint_v2(AnalyticsFilters(), _request(f'W/"{etag}"'), self.db, user={})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.body, b"")
+
+        # Filtros distintos a los persistidos: no se consulta la tabla, sigue el cache en memoria.
+        other = AnalyticsFilters(supervisor=["SUP A"])
+        cache_set("anuales-v2/first-paint", other, {"endpoint": "live", "meta": {}})
+        live = analytics.anuales_first_paint_v2(other, _request(f'"{etag}"'), self.db, user={})
+        self.assertEqual(live["endpoint"], "live")
+
+    def test_failed_recompute_drops_stale_snapshot(self):
+        _prewarm_all()
+        snapshots.refresh_first_paint_snapshots(self.db, "cobranzas")
+        _clear_cache()
+
+        def boom(db, filters):
+            raise RuntimeError("agg no disponible")
+
+        specs = tuple(dataclasses.replace(s, fetch=boom) for s in snapshots.SNAPSHOT_SPECS)
+        logs = []
+        with patch.object(snapshots, "SNAPSHOT_SPECS", specs):
+            out = snapshots.refresh_first_paint_snapshots(self.db, "cobranzas", lambda d, m: logs.append(m))
+        self.assertEqual(set(out.values()), {"error"})
+        self.assertEqual(self.db.query(FirstPaintSnapshot).count(), 0)
+        self.assertIsNone(snapshots.load_first_paint_snapshot(self.db, "rendimiento-v2/first-paint", AnalyticsFilters()))
+        self.assertTrue(any("agg no disponible" in m for m in logs))
+
+
+if __name__ == "__main__":
+    unittest.main()
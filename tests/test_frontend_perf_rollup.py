@@ -0,0 +1,196 @@
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+DEFAULT_DB_PATH = (ROOT / "data" / "test_frontend_perf_rollup.db").resolve()
+DEFAULT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{DEFAULT_DB_PATH.as_posix()}")
+
+from app.core.histogram import LogLinearHistogram  # noqa: E402
+from app.models.brokers import FrontendPerfMetric, FrontendPerfRollup  # noqa: E402
+from app.schemas.telemetry import FrontendPerfIn  # noqa: E402
+from app.services.telemetry_buffer import FrontendPerfBuffer  # noqa: E402
+from app.services.telemetry_rollup import (  # noqa: E402
+    frontend_perf_event,
+    merge_frontend_perf_rollups,
+    prune_frontend_perf,
+    raw_columns,
+    rebuild_frontend_perf_rollups,
+    summarize_frontend_perf,
+)
+
+engine = create_engine(TEST_DATABASE_URL, future=True)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+T0 = datetime(2026, 3, 5, 15, 0, 0)
+
+
+def _event(route, ready_ms, seconds, warm=False):
+    return frontend_perf_event(
+        FrontendPerfIn(
+            route=route,
+            session_id="sess_rollup_1",
+            ttfb_ms=ready_ms / 10,
+            ready_ms=ready_ms,
+            api_calls=[{"endpoint": "/x", "ms": 1.0, "cache_hit": warm}],
+            timestamp_utc=T0 + timedelta(seconds=seconds),
+        )
+    )
+
+
+class LogLinearHistogramTests(unittest.TestCase):
+    def test_quantiles_within_relative_error_and_merge_roundtrip(self):
+        values = [float(v) for v in range(1, 5001)]
+        left, right = LogLinearHistogram(), LogLinearHistogram()
+        for v in values:
+            (left if v % 2 else right).record(v)
+        merged = LogLinearHistogram.from_json(left.to_json()).merge(LogLinearHistogram.from_json(right.to_json()))
+        self.assertEqual(merged.total, 5000)
+        for q, exact in ((0.5, 2500.0), (0.95, 4750.0), (0.99, 4950.0)):
+            self.assertLess(abs(merged.quantile(q) - exact) / exact, 0.04)
+        self.assertEqual(merged.cumulative_buckets([1.0, 1e9])[-1], (1e9, 5000))
+
+
+class FrontendPerfRollupTests(unittest.TestCase):
+    def setUp(self):
+        for table in (FrontendPerfMetric.__table__, FrontendPerfRollup.__table__):
+            table.drop(bind=engine, checkfirst=True)
+            table.create(bind=engine, checkfirst=True)
+
+    def test_events_merge_into_minute_buckets_and_summary_reads_sketches(self):
+        db = SessionLocal()
+        try:
+            merge_frontend_perf_rollups(db, [_event("cohorte", 100.0, 5), _event("cohorte", 200.0, 30, warm=True)])
+            merge_frontend_perf_rollups(db, [_event("cohorte", 300.0, 59), _event("cohorte", 400.0, 61)])
+            merge_frontend_perf_rollups(db, [_event("cartera", 50.0, 10)])
+            db.commit()
+            buckets = db.query(FrontendPerfRollup).order_by(FrontendPerfRollup.route, FrontendPerfRollup.bucket_start).all()
+            self.assertEqual([(b.route, b.samples) for b in buckets], [("cartera", 1), ("cohorte", 3), ("cohorte", 1)])
+            out = summarize_frontend_perf(db, route="cohorte", from_utc=T0)
+            everything = summarize_frontend_perf(db, from_utc=T0)
+            first_minute = summarize_frontend_perf(db, route="cohorte", to_utc=T0 + timedelta(seconds=30))
+        finally:
+            db.close()
+        self.assertEqual(out["sample_count"], 4)
+        self.assertEqual(out["breakdown"], {"cold": 3, "warm": 1})
+        self.assertLess(abs(out["ready_ms"]["p50"] - 200.0), 8.0)
+        self.assertLess(abs(out["ready_ms"]["p99"] - 400.0), 16.0)
+        self.assertEqual(out["fcp_ms"], {"p50": 0.0, "p95": 0.0, "p99": 0.0})
+        self.assertEqual(first_minute["sample_count"], 3)
+        self.assertEqual(out["counts_by_route"], [{"route": "cohorte", "count": 4}])
+        self.assertEqual(
+            sorted((r["route"], r["count"]) for r in everything["counts_by_route"]), [("cartera", 1), ("cohorte", 4)]
+        )
+
+    def test_summary_defaults_to_recent_window_and_counts_follow_it(self):
+        db = SessionLocal()
+        try:
+            merge_frontend_perf_rollups(db, [_event("cohorte", 100.0, 0), _event("cartera", 50.0, 0)])
+            merge_frontend_perf_rollups(db, [_event("cohorte", 300.0, 36 * 3600)])
+            db.commit()
+            recent = summarize_frontend_perf(db, to_utc=T0 + timedelta(hours=37))
+            old = summarize_frontend_perf(db, to_utc=T0 + timedelta(hours=1))
+        finally:
+            db.close()
+        self.assertEqual(recent["sample_count"], 1)
+        self.assertEqual(recent["window"]["from_utc"], (T0 + timedelta(hours=13)).isoformat())
+        self.assertEqual(recent["counts_by_route"], [{"route": "cohorte", "count": 1}])
+        self.assertEqual(old["sample_count"], 2)
+        self.assertEqual(
+            sorted((r["route"], r["count"]) for r in old["counts_by_route"]), [("cartera", 1), ("cohorte", 1)]
+        )
+
+    def test_rebuild_matches_incremental_rollups_and_prune_keeps_recent(self):
+        events = [_event("cohorte", float(10 * i), i * 7, warm=i % 3 == 0) for i in range(1, 30)]
+        db = SessionLocal()
+        try:
+            db.add_all([FrontendPerfMetric(**raw_columns(e)) for e in events])
+            merge_frontend_perf_rollups(db, events)
+            db.commit()
+            incremental = summarize_frontend_perf(db, from_utc=T0)
+            # El primer minuto (eventos desde T0+7s) puede estar cortado por el retention: se conserva.
+            complete = [e for e in events if e["event_at"] >= T0 + timedelta(minutes=1)]
+            self.assertEqual(rebuild_frontend_perf_rollups(db, batch_size=8), len(complete))
+            db.commit()
+            rebuilt = summarize_frontend_perf(db, from_utc=T0)
+            self.assertEqual(prune_frontend_perf(db, force=True), (0, 0))
+            db.query(FrontendPerfMetric).update({"created_at": datetime.utcnow() - timedelta(days=365)})
+            self.assertEqual(prune_frontend_perf(db, force=True), (len(events), 0))
+            db.commit()
+            self.assertEqual(summarize_frontend_perf(db, from_utc=T0)["sample_count"], len(events))
+        finally:
+            db.close()
+        self.assertEqual(rebuilt, incremental)
+
+    def test_rebuild_keeps_rollups_older_than_retained_raw_events(self):
+        old_events = [_event("cohorte", 100.0, 0), _event("cohorte", 200.0, 30)]
+        recent = [_event("cohorte", 300.0, 3600), _event("cartera", 50.0, 3630)]
+        db = SessionLocal()
+        try:
+            # Crudo ya podado de los eventos viejos: solo sobreviven en el rollup.
+            merge_frontend_perf_rollups(db, old_events + recent)
+            db.add_all([FrontendPerfMetric(**raw_columns(e)) for e in recent])
+            db.commit()
+            self.assertEqual(rebuild_frontend_perf_rollups(db), len(recent))
+            self.assertEqual(rebuild_frontend_perf_rollups(db, since=T0), len(recent))
+            db.commit()
+            summary = summarize_frontend_perf(db, from_utc=T0)
+            db.query(FrontendPerfMetric).delete()
+            self.assertEqual(rebuild_frontend_perf_rollups(db), 0)
+            db.commit()
+            self.assertEqual(summarize_frontend_perf(db, from_utc=T0)["sample_count"], 4)
+        finally:
+            db.close()
+        self.assertEqual(summary["sample_count"], 4)
+
+
+class FrontendPerfBufferTests(unittest.TestCase):
+    def setUp(self):
+        for table in (FrontendPerfMetric.__table__, FrontendPerfRollup.__table__):
+            table.drop(bind=engine, checkfirst=True)
+            table.create(bind=engine, checkfirst=True)
+
+    def test_put_returns_before_flush_and_flush_bulk_writes_raw_and_rollups(self):
+        buf = FrontendPerfBuffer(capacity=100, flush_interval_ms=60000, batch_size=1000, session_factory=SessionLocal)
+        try:
+            self.assertEqual(buf.put_many(_event("cohorte", float(i), i) for i in range(1, 8)), (7, 0))
+            self.assertEqual(buf.snapshot()["queue_depth"], 7)
+            db = SessionLocal()
+            try:
+                self.assertEqual(db.query(FrontendPerfMetric).count(), 0)
+            finally:
+                db.close()
+        finally:
+            self.assertEqual(buf.stop(), 7)
+        db = SessionLocal()
+        try:
+            self.assertEqual(db.query(FrontendPerfMetric).count(), 7)
+            self.assertEqual(summarize_frontend_perf(db, from_utc=T0)["sample_count"], 7)
+        finally:
+            db.close()
+        snap = buf.snapshot()
+        self.assertEqual((snap["queue_depth"], snap["flushed"], snap["flushes"]), (0, 7, 1))
+
+    def test_full_queue_drops_oldest_and_failed_flush_is_counted(self):
+        def broken_session():
+            raise RuntimeError("db down")
+
+        buf = FrontendPerfBuffer(capacity=3, flush_interval_ms=60000, batch_size=10, session_factory=broken_session)
+        self.assertEqual(buf.put_many(_event("cartera", float(i), i) for i in range(5)), (5, 2))
+        self.assertEqual([e["ready_ms"] for e in buf._queue], [2.0, 3.0, 4.0])
+        self.assertEqual(buf.stop(), 0)
+        snap = buf.snapshot()
+        self.assertEqual((snap["queue_depth"], snap["dropped"], snap["failed_events"]), (0, 2, 3))
+        self.assertIn("db down", snap["last_error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
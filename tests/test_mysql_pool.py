@@ -0,0 +1,247 @@
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.core.mysql_pool import (  # noqa: E402
+    CachedProbe,
+    MySQLPoolTimeout,
+    MySQLSourcePool,
+    parse_purpose_limits,
+)
+
+
+class _FakeCursor:
+    def __init__(self, conn, prepared):
+        self.conn = conn
+        self.prepared = prepared
+        self.closed = False
+
+    def execute(self, sql, params=()):
+        self.conn.executed.append(sql)
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeSocket:
+    def __init__(self, timeout):
+        self.timeout = timeout
+
+    def settimeout(self, value):
+        self.timeout = value
+
+
+class _FakeConn:
+    def __init__(self, **cfg):
+        self.cfg = cfg
+        self.closed = False
+        self.ping_ok = True
+        self.pings = 0
+        self.executed = []
+        self.prepared_cursors = 0
+        self._socket = _FakeSocket(cfg.get("connection_timeout"))
+        self.resets = 0
+        self.reset_ok = True
+
+    def reset_session(self):
+        self.resets += 1
+        if not self.reset_ok:
+            raise OSError("reset failed")
+
+    def cursor(self, prepared=False):
+        if prepared:
+            self.prepared_cursors += 1
+        return _FakeCursor(self, prepared)
+
+    def ping(self, reconnect=False):
+        self.pings += 1
+        if not self.ping_ok:
+            raise OSError("gone")
+
+    def consume_results(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+CFG = {"host": "src", "port": 3306, "user": "bi", "password": "x", "database": "epem"}
+
+
+class MySQLPoolTests(unittest.TestCase):
+    def _pool(self, **kwargs):
+        self.created = []
+
+        def connect(**cfg):
+            conn = _FakeConn(**cfg)
+            self.created.append(conn)
+            return conn
+
+        self.clock = _Clock()
+        params = {
+            "connect": connect,
+            "purpose_limits": {"extract": 2, "health": 1, "precheck": 1, "admin": 1},
+            "max_lifetime_sec": 600,
+            "idle_check_sec": 30,
+            "acquire_timeout_sec": 0.05,
+            "clock": self.clock,
+        }
+        params.update(kwargs)
+        return MySQLSourcePool(**params)
+
+    def test_connection_is_reused_and_prepared_statement_cached(self):
+        pool = self._pool()
+        for _ in range(3):
+            with pool.connection(CFG, purpose="precheck") as conn:
+                cursor = conn.prepared_cursor("SELECT MAX(id) FROM payments")
+                cursor.execute("SELECT MAX(id) FROM payments")
+        self.assertEqual(len(self.created), 1)
+        self.assertEqual(self.created[0].prepared_cursors, 1)
+        self.assertEqual(pool.stats["reuses"], 2)
+
+    def test_lifetime_and_failed_ping_recycle_connections(self):
+        pool = self._pool()
+        with pool.connection(CFG):
+            pass
+        self.clock.now += 60
+        self.created[0].ping_ok = False
+        with pool.connection(CFG):
+            pass
+        self.assertTrue(self.created[0].closed)
+        self.assertEqual(pool.stats["recycled_failed_ping"], 1)
+        self.clock.now += 600
+        with pool.connection(CFG):
+            pass
+        self.assertEqual(len(self.created), 3)
+        self.assertEqual(pool.stats["recycled_lifetime"], 1)
+
+    def test_error_in_block_discards_connection(self):
+        pool = self._pool()
+        with self.assertRaises(RuntimeError):
+            with pool.connection(CFG):
+                raise RuntimeError("boom")
+        self.assertTrue(self.created[0].closed)
+        self.assertEqual(pool.snapshot()["idle"], 0)
+
+    def test_purpose_limits_are_independent(self):
+        pool = self._pool()
+        release = threading.Event()
+        entered = threading.Event()
+
+        def hold_health():
+            with pool.connection(CFG, purpose="health"):
+                entered.set()
+                release.wait(2)
+
+        worker = threading.Thread(target=hold_health)
+        worker.start()
+        entered.wait(2)
+        try:
+            with self.assertRaises(MySQLPoolTimeout):
+                with pool.connection(CFG, purpose="health"):
+                    pass
+            with pool.connection(CFG, purpose="extract"):
+                pass
+        finally:
+            release.set()
+            worker.join(2)
+        self.assertEqual(pool.stats["acquire_timeouts"], 1)
+
+    def test_checkin_restores_socket_timeout_and_resets_session(self):
+        pool = self._pool()
+        cfg = {**CFG, "connection_timeout": 5}
+        with pool.connection(cfg, purpose="extract") as conn:
+            conn.prepared_cursor("SELECT 1")
+            conn.set_socket_timeout(600)
+            conn.mark_session_modified()
+            self.assertEqual(self.created[0]._socket.timeout, 600)
+        raw = self.created[0]
+        self.assertEqual(raw._socket.timeout, 5)
+        self.assertEqual(raw.resets, 1)
+        with pool.connection(cfg, purpose="health") as conn:
+            self.assertIs(conn.raw, raw)
+            self.assertFalse(conn.session_modified)
+            conn.prepared_cursor("SELECT 1")
+        # El reset de sesion descarta los prepared statements del server: se vuelven a preparar.
+        self.assertEqual(raw.prepared_cursors, 2)
+        self.assertEqual(pool.stats["discarded_dirty"], 0)
+
+    def test_connection_that_cannot_be_reset_is_discarded(self):
+        pool = self._pool()
+        with pool.connection(CFG) as conn:
+            conn.raw.reset_ok = False
+            conn.mark_session_modified()
+        with pool.connection(CFG) as conn:
+            # Sin connection_timeout en la config no hay valor al que volver.
+            conn.set_socket_timeout(600)
+        self.assertEqual(len(self.created), 2)
+        self.assertTrue(all(c.closed for c in self.created))
+        self.assertEqual(pool.stats["discarded_dirty"], 2)
+        self.assertEqual(pool.snapshot()["idle"], 0)
+
+    def test_stats_are_consistent_under_concurrent_checkouts(self):
+        pool = self._pool(purpose_limits={"extract": 8}, acquire_timeout_sec=2, max_idle=8)
+
+        def worker():
+            for _ in range(200):
+                with pool.connection(CFG):
+                    pass
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+        self.assertEqual(pool.stats["connects"], len(self.created))
+        self.assertEqual(pool.stats["connects"] + pool.stats["reuses"], 1600)
+
+    def test_parse_purpose_limits(self):
+        limits = parse_purpose_limits("extract:8, health:0,bad,precheck:x")
+        self.assertEqual(limits["extract"], 8)
+        self.assertEqual(limits["health"], 1)
+        self.assertEqual(limits["precheck"], 2)
+
+
+class CachedProbeTests(unittest.TestCase):
+    def test_get_never_runs_check_inline(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_check():
+            started.set()
+            release.wait(2)
+            return True
+
+        probe = CachedProbe(slow_check, ttl_sec=60)
+        t0 = time.perf_counter()
+        self.assertIsNone(probe.get())
+        self.assertLess(time.perf_counter() - t0, 0.5)
+        started.wait(2)
+        self.assertIsNone(probe.get())
+        release.set()
+        for _ in range(100):
+            if probe.checked_at is not None:
+                break
+            time.sleep(0.01)
+        self.assertTrue(probe.get())
+        self.assertIsNotNone(probe.age_sec())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+DEFAULT_DB_PATH = (ROOT / "data" / "test_portfolio_corte_rollup.db").resolve()
+DEFAULT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{DEFAULT_DB_PATH.as_posix()}")
+
+from app.models.brokers import CarteraCorteAgg  # noqa: E402
+from app.schemas.analytics import PortfolioSummaryIn  # noqa: E402
+from app.services.analytics_service import (  # noqa: E402
+    _CORTE_ROLLUP_DIMS,
+    AnalyticsService,
+    _corte_grouping_mask,
+    _corte_rollup_from_grouping_rows,
+    _corte_rollup_in_memory,
+)
+
+engine = create_engine(TEST_DATABASE_URL, future=True)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+def _agg(gestion, close, un, via, tramo, year, contracts, vig, mor, monto):
+    return CarteraCorteAgg(
+        gestion_month=gestion,
+        close_month=close,
+        close_year=int(close[-4:]),
+        contract_year=year,
+        un=un,
+        via_cobro=via,
+        tramo=tramo,
+        contracts_total=contracts,
+        vigentes_total=vig,
+        morosos_total=mor,
+        contracts_cobrador=contracts if via == "COBRADOR" else 0,
+        contracts_debito=contracts if via == "DEBITO" else 0,
+        monto_total=monto,
+        monto_vencido_total=monto / 2,
+        paid_total=monto / 4,
+    )
+
+
+class PortfolioCorteRollupTests(unittest.TestCase):
+    def setUp(self):
+        CarteraCorteAgg.__table__.drop(bind=engine, checkfirst=True)
+        CarteraCorteAgg.__table__.create(bind=engine, checkfirst=True)
+        db = SessionLocal()
+        try:
+            db.add_all(
+                [
+                    _agg("01/2026", "12/2025", "MEDICINA", "COBRADOR", 0, 2020, 10, 8, 2, 100.0),
+                    _agg("01/2026", "12/2025", "MEDICINA", "DEBITO", 1, 2021, 5, 5, 0, 50.0),
+                    _agg("02/2026", "01/2026", "ODONTOLOGIA", "COBRADOR", 0, 0, 7, 3, 4, 70.0),
+                    _agg("02/2026", "01/2026", "MEDICINA", "COBRADOR", 2, 2020, 3, 1, 2, 30.0),
+                ]
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def test_single_pass_summary_matches_breakdowns(self):
+        db = SessionLocal()
+        try:
+            out = AnalyticsService.fetch_portfolio_corte_summary_v2(db, PortfolioSummaryIn())
+        finally:
+            db.close()
+        kpis, charts = out["kpis"], out["charts"]
+        self.assertEqual(kpis["total_cartera"], 25)
+        self.assertEqual(kpis["vigentes_total"], 17)
+        self.assertEqual(kpis["via_debito_total"], 5)
+        self.assertEqual(kpis["monto_total_corte"], 250.0)
+        self.assertEqual(charts["by_un"], {"MEDICINA": 18, "ODONTOLOGIA": 7})
+        self.assertEqual(
+            charts["by_un_by_gestion_month"],
+            {"01/2026": {"MEDICINA": 15}, "02/2026": {"ODONTOLOGIA": 7, "MEDICINA": 3}},
+        )
+        self.assertEqual(charts["by_via_by_close_month"]["01/2026"], {"COBRADOR": 10})
+        self.assertEqual(charts["by_tramo"], {"0": 17, "1": 5, "2": 3})
+        self.assertEqual(list(charts["by_contract_year"].items()), [("2020", 13), ("2021", 5)])
+        self.assertEqual(
+            charts["series_vigente_moroso_by_month"]["02/2026"], {"vigente": 4, "moroso": 6}
+        )
+        self.assertEqual(
+            charts["series_cobrador_debito_by_month"]["01/2026"], {"cobrador": 10, "debito": 5}
+        )
+
+    def test_filters_apply_to_every_breakdown(self):
+        db = SessionLocal()
+        try:
+            out = AnalyticsService.fetch_portfolio_corte_summary_v2(
+                db, PortfolioSummaryIn(un=["odontologia"])
+            )
+            empty = AnalyticsService.fetch_portfolio_corte_summary_v2(
+                db, PortfolioSummaryIn(un=["NADA"])
+            )
+        finally:
+            db.close()
+        self.assertEqual(out["kpis"]["total_cartera"], 7)
+        self.assertEqual(out["charts"]["by_via"], {"COBRADOR": 7})
+        self.assertEqual(out["charts"]["by_contract_year"], {})
+        self.assertEqual(empty["kpis"]["total_cartera"], 0)
+        self.assertEqual(empty["charts"]["by_un"], {})
+
+    def test_grouping_sets_rows_split_like_in_memory_rollup(self):
+        dims = len(_CORTE_ROLLUP_DIMS)
+        flat = [
+            ("01/2026", "12/2025", "MEDICINA", 0, "COBRADOR", 2020, 10, 8, 2, 10, 0, 100.0, 50.0, 25.0),
+            ("02/2026", "01/2026", "MEDICINA", 1, "DEBITO", 2021, 5, 5, 0, 0, 5, 50.0, 25.0, 12.5),
+        ]
+        expected = _corte_rollup_in_memory(flat)
+        # Simular la salida de GROUP BY GROUPING SETS: dims fuera del set vienen en NULL.
+        pg_rows = []
+        for gs, groups in expected.items():
+            for key, metrics in groups.items():
+                values = dict(zip(gs, key))
+                row_dims = [values.get(d) for d in _CORTE_ROLLUP_DIMS]
+                pg_rows.append((_corte_grouping_mask(gs), *row_dims, *metrics))
+        self.assertEqual(_corte_grouping_mask(()), (1 << dims) - 1)
+        self.assertEqual(_corte_grouping_mask(tuple(_CORTE_ROLLUP_DIMS)), 0)
+        self.assertEqual(_corte_rollup_from_grouping_rows(pg_rows), expected)
+
+        db = SessionLocal()
+        try:
+            base = AnalyticsService._portfolio_corte_base(db, PortfolioSummaryIn())
+            sql = str(
+                base.with_entities(func.count())
+                .group_by(func.grouping_sets(CarteraCorteAgg.un))
+                .statement.compile(dialect=postgresql.dialect())
+            )
+        finally:
+            db.close()
+        self.assertIn("GROUPING SETS", sql)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import asyncio
+import sys
+import time
+import unittest
+from pathlib import Path
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.core import request_metrics  # noqa: E402
+from app.core.request_context import RequestContextMiddleware  # noqa: E402
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware, allowed_origins=["http://localhost:5173"])
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int, request: Request):
+        return {"id": item_id, "trace_id": request.state.trace_id}
+
+    @app.get("/boom")
+    def boom():
+        raise RuntimeError("explota")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk-{i}\n".encode()
+                await asyncio.sleep(0.05)
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+async def _call(app, path):
+    """Invoca la app ASGI directo y registra cuándo llega cada mensaje (sin buffering de cliente)."""
+    started = time.perf_counter()
+    events = []
+    sent_request = False
+
+    async def receive():
+        nonlocal sent_request
+        if not sent_request:
+            sent_request = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.sleep(3600)  # sin desconexión: la respuesta cancela la espera al terminar
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        events.append((round(time.perf_counter() - started, 3), message))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"test")],
+        "client": ("127.0.0.1", 1),
+        "server": ("test", 80),
+    }
+    await app(scope, receive, send)
+    return events
+
+
+class RequestContextMiddlewareTests(unittest.TestCase):
+    def setUp(self):
+        request_metrics.reset()
+
+    def tearDown(self):
+        request_metrics.reset()
+
+    def test_headers_trace_state_and_route_template_metrics(self):
+        client = TestClient(_app())
+        resp = client.get("/items/7", headers={"x-trace-id": "trace-abc"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json(), {"id": 7, "trace_id": "trace-abc"})
+        self.assertEqual(resp.headers["x-trace-id"], "trace-abc")
+        self.assertEqual(resp.headers["access-control-allow-private-network"], "true")
+        self.assertGreaterEqual(float(resp.headers["x-latency-ms"]), 0.0)
+        self.assertEqual(request_metrics.summary()["/items/{item_id}"]["by_status"], {"2xx": 1})
+
+    def test_unhandled_error_returns_envelope_with_cors_headers(self):
+        client = TestClient(_app(), raise_server_exceptions=False)
+        resp = client.get("/boom", headers={"origin": "http://localhost:5173"})
+        self.assertEqual(resp.status_code, 500)
+        body = resp.json()
+        self.assertEqual(body["error_code"], "INTERNAL_ERROR")
+        self.assertEqual(body["trace_id"], resp.headers["x-trace-id"])
+        self.assertEqual(resp.headers["access-control-allow-origin"], "http://localhost:5173")
+        self.assertEqual(request_metrics.summary()["/boom"]["by_status"], {"5xx": 1})
+
+    def test_streaming_chunks_are_forwarded_as_they_are_produced(self):
+        events = asyncio.run(_call(_app(), "/stream"))
+        start = [m for _, m in events if m["type"] == "http.response.start"][0]
+        self.assertIn((b"access-control-allow-private-network", b"true"), start["headers"])
+        bodies = [(t, m.get("body", b"")) for t, m in events if m["type"] == "http.response.body" and m.get("body")]
+        self.assertEqual([b for _, b in bodies], [b"chunk-0\n", b"chunk-1\n", b"chunk-2\n"])
+        # Cada chunk sale antes de que se produzca el siguiente (~50ms entre chunks).
+        self.assertLess(bodies[0][0], 0.04)
+        self.assertGreater(bodies[2][0] - bodies[0][0], 0.08)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.core import request_metrics  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.histogram import LogLinearHistogram  # noqa: E402
+
+
+def _app_with_metrics() -> FastAPI:
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def _metrics(request: Request, call_next):
+        token = request_metrics.begin_request()
+        response = await call_next(request)
+        request_metrics.observe(
+            request_metrics.route_template(request.scope),
+            12.0,
+            method=request.method,
+            status_code=response.status_code,
+            cache_hit=request_metrics.end_request(token),
+        )
+        return response
+
+    @app.get("/users/{username}")
+    def user(username: str):
+        request_metrics.note_cache_hit(username == "cached")
+        return {"username": username}
+
+    return app
+
+
+class RequestMetricsTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.settings_patch = patch.object(settings, "request_metrics_multiproc_dir", self.tmp.name)
+        self.settings_patch.start()
+        request_metrics.reset()
+
+    def tearDown(self):
+        request_metrics.reset()
+        self.settings_patch.stop()
+        self.tmp.cleanup()
+
+    def test_route_template_keys_and_cache_hit_from_threadpool_endpoint(self):
+        client = TestClient(_app_with_metrics())
+        for name in ("ana", "bob", "cached", "zoe"):
+            self.assertEqual(client.get(f"/users/{name}").status_code, 200)
+        self.assertEqual(client.get("/nope/1").status_code, 404)
+        out = request_metrics.summary()
+        self.assertEqual(sorted(out), ["/users/{username}", "unmatched"])
+        users = out["/users/{username}"]
+        self.assertEqual(users["count"], 4)
+        self.assertEqual(users["by_status"], {"2xx": 4})
+        self.assertEqual(users["by_cache"], {"hit": 1, "miss": 3})
+        self.assertEqual(users["window"]["count"], 4)
+        self.assertEqual(out["unmatched"]["by_status"], {"4xx": 1})
+
+    def test_concurrent_observe_across_stripes_keeps_exact_counts(self):
+        def work(i):
+            for n in range(500):
+                request_metrics.observe(f"/r{n % 7}", float(n), method="GET", status_code=200 + (i % 2) * 300)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        out = request_metrics.summary()
+        self.assertEqual(sum(v["count"] for v in out.values()), 4000)
+        self.assertEqual(out["/r0"]["by_status"], {"2xx": 288, "5xx": 288})
+
+    def test_prometheus_text_merges_peer_snapshots_and_keeps_dead_worker_totals(self):
+        request_metrics.observe("/api/v1/x/{id}", 40.0, method="GET", status_code=200, cache_hit=True)
+        peer = LogLinearHistogram()
+        for v in (40.0, 3000.0):
+            peer.record(v)
+        live_pid = os.getppid()
+        dead = subprocess.Popen([sys.executable, "-c", "pass"])
+        dead.wait()
+        for pid in (live_pid, dead.pid):
+            Path(self.tmp.name, f"{pid}.json").write_text(
+                json.dumps(
+                    {
+                        "pid": pid,
+                        "written_at": 0,
+                        "series": [{"k": ["GET", "/api/v1/x/{id}", "2xx", "hit"], "t": peer.to_json(), "w": peer.to_json()}],
+                    }
+                )
+            )
+        text = request_metrics.prometheus_text()
+        labels = 'method="GET",route="/api/v1/x/{id}",status="2xx",cache="hit"'
+        # Propio (1) + peer vivo (2) + worker muerto (2): los acumulados del muerto no se pierden.
+        self.assertIn(f"http_request_duration_seconds_count{{{labels}}} 5", text)
+        self.assertIn(f'http_request_duration_seconds_bucket{{{labels},le="0.05"}} 3', text)
+        self.assertIn(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 5', text)
+        # Snapshot viejo o de un worker muerto: suma al acumulado pero no a la ventana deslizante.
+        self.assertIn(f'http_request_duration_window_seconds{{{labels},quantile="0.99"}} 0.04', text)
+        self.assertFalse(Path(self.tmp.name, f"{dead.pid}.json").exists())
+        self.assertTrue(Path(self.tmp.name, "retired.json").exists())
+        # Plegado en retired.json: el scrape siguiente da el mismo total.
+        self.assertIn(f"http_request_duration_seconds_count{{{labels}}} 5", request_metrics.prometheus_text())
+
+        exported = request_metrics.export_snapshot()
+        self.assertEqual(json.loads(exported.read_text())["series"][0]["k"][1], "/api/v1/x/{id}")
+
+    def test_scrape_reads_own_exported_file_and_counters_never_decrease(self):
+        def scrape_count():
+            return sum(total.total for total, _window in request_metrics.collect().values())
+
+        request_metrics.observe("/a", 10.0, method="GET")
+        first = scrape_count()
+        own = json.loads(Path(self.tmp.name, f"{os.getpid()}.json").read_text())
+        self.assertEqual(sum(LogLinearHistogram.from_json(i["t"]).total for i in own["series"]), first)
+        request_metrics.observe("/a", 10.0, method="GET")
+        self.assertEqual(scrape_count(), first + 1)
+
+    def test_reused_pid_file_of_dead_worker_is_retired_not_overwritten(self):
+        hist = LogLinearHistogram()
+        hist.record(20.0)
+        Path(self.tmp.name, f"{os.getpid()}.json").write_text(
+            json.dumps(
+                {
+                    "pid": os.getpid(),
+                    "token": "worker-anterior",
+                    "written_at": 0,
+                    "series": [{"k": ["GET", "/a", "2xx", "none"], "t": hist.to_json(), "w": hist.to_json()}],
+                }
+            )
+        )
+        request_metrics.observe("/a", 10.0, method="GET")
+        merged = request_metrics.collect()
+        self.assertEqual(merged[("GET", "/a", "2xx", "none")][0].total, 2)
+        self.assertEqual(merged[("GET", "/a", "2xx", "none")][1].total, 1)
+
+    def test_dead_workers_of_a_previous_server_start_are_discarded(self):
+        hist = LogLinearHistogram()
+        hist.record(20.0)
+        dead = subprocess.Popen([sys.executable, "-c", "pass"])
+        dead.wait()
+        stale = Path(self.tmp.name, f"{dead.pid}.json")
+        stale.write_text(
+            json.dumps(
+                {
+                    "pid": dead.pid,
+                    "ppid": -1,
+                    "written_at": 0,
+                    "series": [{"k": ["GET", "/a", "2xx", "none"], "t": hist.to_json(), "w": hist.to_json()}],
+                }
+            )
+        )
+        request_metrics.observe("/a", 10.0, method="GET")
+        self.assertEqual(request_metrics.collect()[("GET", "/a", "2xx", "none")][0].total, 1)
+        self.assertFalse(stale.exists())
+        self.assertEqual(request_metrics.collect()[("GET", "/a", "2xx", "none")][0].total, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import io
+import json
+import logging
+import queue
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.core import logging_config  # noqa: E402
+from app.core.config import settings  # noqa: E402
+
+
+class StructuredLoggingTests(unittest.TestCase):
+    def setUp(self):
+        logging_config.shutdown_logging()
+
+    def tearDown(self):
+        logging_config.shutdown_logging()
+
+    def _capture(self, emit):
+        out = io.StringIO()
+        with patch.object(sys, "stdout", out):
+            emit()
+            logging_config.shutdown_logging()  # drena la cola del listener
+        return [json.loads(line) for line in out.getvalue().splitlines() if line.strip()]
+
+    def test_events_are_written_by_listener_thread_as_json_lines(self):
+        lines = self._capture(
+            lambda: logging_config.structured_log("warning", "algo", trace_id="t-1", duration_ms=1.234, n=3)
+        )
+        self.assertEqual(lines, [{"level": "warning", "message": "algo", "n": 3, "trace_id": "t-1", "duration_ms": 1.23}])
+        self.assertIsNotNone(logging_config._queue)
+
+    def test_request_sampling_keeps_errors_and_slow_requests(self):
+        before = logging_config.logging_stats()["sampled_out"]
+        with patch.object(settings, "log_request_sample_rate", 0.0), patch.object(settings, "log_request_slow_ms", 500.0):
+            lines = self._capture(
+                lambda: [
+                    logging_config.log_request("/a", "GET", "t", 10.0, 200),
+                    logging_config.log_request("/b", "GET", "t", 10.0, 503),
+                    logging_config.log_request("/c", "GET", "t", 900.0, 200),
+                ]
+            )
+        self.assertEqual([line["path"] for line in lines], ["/b", "/c"])
+        self.assertEqual(logging_config.logging_stats()["sampled_out"] - before, 1)
+
+    def test_full_queue_drops_and_counts_instead_of_blocking(self):
+        handler = logging_config._BoundedQueueHandler(queue.Queue(maxsize=1))
+        before = logging_config.logging_stats()["dropped"]
+        for i in range(3):
+            handler.emit(logging.LogRecord("x", logging.INFO, __file__, 1, f"m{i}", None, None))
+        self.assertEqual(logging_config.logging_stats()["dropped"] - before, 2)
+        self.assertEqual(handler.queue.get_nowait().getMessage(), "m0")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+DEFAULT_DB_PATH = (ROOT / "data" / "test_sync_adaptive_sizing.db").resolve()
+DEFAULT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{DEFAULT_DB_PATH.as_posix()}")
+
+from app.models.brokers import SyncTuningState  # noqa: E402
+import app.services.sync_service as sync_service  # noqa: E402
+from app.services.sync_tuning import AimdController, load_tuning_state, save_tuning_state  # noqa: E402
+
+engine = create_engine(TEST_DATABASE_URL, future=True)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+class AimdControllerTests(unittest.TestCase):
+    def test_grows_additively_under_target_and_halves_over_target(self):
+        ctl = AimdController(1000, min_size=100, max_size=5000, target_ms=100, increase_step=200)
+        ctl.observe(1000, 0.01)
+        self.assertEqual(ctl.size, 1200)
+        self.assertTrue(ctl.observe(1200, 0.5))
+        self.assertEqual(ctl.size, 600)
+
+    def test_lock_waits_and_rss_are_congestion_signals(self):
+        ctl = AimdController(1000, min_size=100, max_size=5000, target_ms=100, rss_limit_mb=512)
+        self.assertTrue(ctl.observe(1000, 0.01, lock_waits=2))
+        self.assertEqual(ctl.size, 500)
+        self.assertTrue(ctl.observe(500, 0.01, rss_mb=900))
+        self.assertEqual(ctl.size, 250)
+
+    def test_size_stays_within_bounds_and_partial_batches_do_not_grow(self):
+        ctl = AimdController(150, min_size=100, max_size=200, target_ms=100, increase_step=100)
+        ctl.observe(150, 0.01)
+        self.assertEqual(ctl.size, 200)
+        ctl.observe(10, 0.01)
+        self.assertEqual(ctl.size, 200)
+        for _ in range(5):
+            ctl.observe(200, 1.0)
+        self.assertEqual(ctl.size, 100)
+
+
+class TuningStatePersistenceTests(unittest.TestCase):
+    def setUp(self):
+        SyncTuningState.__table__.drop(bind=engine, checkfirst=True)
+        SyncTuningState.__table__.create(bind=engine, checkfirst=True)
+
+    def test_save_and_reload_learned_sizes_per_domain(self):
+        db = SessionLocal()
+        try:
+            fetch = AimdController(4000, min_size=100, max_size=8000, target_ms=100)
+            chunk = AimdController(6000, min_size=100, max_size=8000, target_ms=100)
+            fetch.observe(4000, 0.01)
+            chunk.observe(6000, 0.5)
+            save_tuning_state(db, "Cartera", fetch=fetch, chunk=chunk, lock_waits=1, rss_mb=300.0, job_id="job-1")
+            save_tuning_state(db, "cartera", fetch=fetch, chunk=chunk, lock_waits=0, rss_mb=310.0, job_id="job-2")
+            row = load_tuning_state(db, "cartera")
+            self.assertIsNotNone(row)
+            self.assertEqual(row.fetch_batch_size, fetch.size)
+            self.assertEqual(row.chunk_size, 3000)
+            self.assertEqual(row.last_job_id, "job-2")
+            self.assertEqual(row.samples, 4)
+            self.assertEqual(db.query(SyncTuningState).count(), 1)
+        finally:
+            db.close()
+
+
+class LockWaitersScopeTests(unittest.TestCase):
+    def test_lock_waiters_are_scoped_to_target_tables_and_partitions(self):
+        db = MagicMock()
+        db.execute.return_value.scalar.return_value = 3
+        pg = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+        with patch.object(sync_service, "engine", pg):
+            self.assertEqual(sync_service._pg_lock_waiters(db, ["cartera_fact"]), 3)
+            self.assertEqual(sync_service._pg_lock_waiters(db, []), 0)
+        self.assertEqual(db.execute.call_count, 1)
+        stmt, params = db.execute.call_args.args
+        sql = str(stmt)
+        self.assertIn("l.relation IN", sql)
+        self.assertIn("pg_inherits", sql)
+        self.assertEqual(params, {"tables": ["cartera_fact"]})
+        # Fuera de Postgres no hay pg_locks.
+        self.assertEqual(sync_service._pg_lock_waiters(MagicMock(), ["cartera_fact"]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
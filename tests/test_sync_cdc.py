@@ -0,0 +1,191 @@
+import os
+import sys
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+DEFAULT_DB_PATH = (ROOT / "data" / "test_sync_cdc.db").resolve()
+DEFAULT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{DEFAULT_DB_PATH.as_posix()}")
+
+from app.models.brokers import CobranzasFact  # noqa: E402
+from app.services import sync_cdc  # noqa: E402
+from app.services.sync_extractors import load_sql_with_includes  # noqa: E402
+import app.services.sync_service as sync_service  # noqa: E402
+
+engine = create_engine(TEST_DATABASE_URL, future=True)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+def _payment(contract_id, month, source_row_id):
+    mm, yyyy = month.split("/")
+    return CobranzasFact(
+        contract_id=contract_id,
+        gestion_month=month,
+        payment_date=date(int(yyyy), int(mm), 10),
+        payment_month=month,
+        payment_year=int(yyyy),
+        payment_amount=100.0,
+        source_row_id=source_row_id,
+        source_hash=f"h{source_row_id}",
+    )
+
+
+class _FakeCursor:
+    """Minimal DB-API cursor over an in-memory change table (id, table_name, contract_id)."""
+
+    def __init__(self, rows):
+        self._rows = rows
+        self._result = []
+
+    def execute(self, sql, params=()):
+        if sql.startswith("SELECT COALESCE(MAX(id)"):
+            self._result = [(max((r[0] for r in self._rows), default=0),)]
+            return
+        after_id, head, *rest = params
+        names, limit = set(rest[:-1]), rest[-1]
+        matching = [
+            (r[0], r[2]) for r in self._rows if after_id < r[0] <= head and r[1] in names
+        ]
+        self._result = matching[:limit]
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return list(self._result)
+
+    def close(self):
+        pass
+
+
+class _FakeConn:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def cursor(self):
+        return _FakeCursor(self.rows)
+
+
+class SyncCdcTests(unittest.TestCase):
+    def test_cdc_query_inlines_validated_ids(self):
+        sql = sync_cdc.build_cdc_query(
+            "SELECT p.contract_id FROM payments p WHERE pm.name LIKE '%PAY%';",
+            "p.contract_id",
+            ["12", 7, None, "x", 12],
+        )
+        self.assertTrue(sql.endswith(") AND (p.contract_id IN (7,12))"))
+        self.assertIn("LIKE '%PAY%'", sql)
+        self.assertNotIn(";", sql)
+        with self.assertRaises(ValueError):
+            sync_cdc.build_cdc_query("SELECT 1 FROM t WHERE 1=1", "id; DROP", [1])
+
+    def test_cdc_filter_is_pushed_into_real_domain_queries(self):
+        cases = (
+            ("cobranzas", "query_cobranzas.sql"),
+            ("cobranzas", "sql/v2/query_cobranzas.sql"),
+            ("cartera", "query.sql"),
+            ("cartera", "sql/v2/query_cartera.sql"),
+        )
+        for domain, rel in cases:
+            base, _ = load_sql_with_includes(ROOT / rel)
+            expr = sync_cdc.CDC_DOMAIN_SPECS[domain].source_key_expr
+            sql = sync_cdc.build_cdc_query(base, expr, [3, 1])
+            # Sin derived table: cobranzas selecciona p.id y pm.id (MySQL ERROR 1060 si se envuelve).
+            self.assertNotIn("_src", sql, rel)
+            self.assertEqual(sql.count("SELECT"), base.count("SELECT"), rel)
+            self.assertTrue(sql.startswith(base[: base.rindex("WHERE")].strip()), rel)
+            self.assertTrue(sql.endswith(f") AND ({expr} IN (1,3))"), rel)
+            self.assertIn(expr, base, rel)
+
+    def test_trigger_ddl_covers_each_source_table_once(self):
+        statements = sync_cdc.trigger_ddl(["cobranzas", "cartera"])
+        creates = [s for s in statements if s.startswith("CREATE TRIGGER")]
+        tables = {t.name for spec in sync_cdc.CDC_DOMAIN_SPECS.values() for t in spec.tables}
+        self.assertEqual(len(creates), len(tables) * 3)
+        apw_insert = next(s for s in creates if "`bi_cdc_account_payment_ways_insert`" in s)
+        self.assertIn("SELECT `contract_id` FROM `payments` WHERE `id` = NEW.`payment_id`", apw_insert)
+
+    def test_change_table_reads_only_domain_tables_after_position(self):
+        rows = [
+            (1, "payments", 10),
+            (2, "contract_closed_dates", 99),
+            (3, "payments", 11),
+            (4, "account_payment_ways", 10),
+            (5, "contracts", None),
+        ]
+        changes = sync_cdc.read_change_table(
+            _FakeConn(rows), "cobranzas", "1", max_contracts=100, batch_size=2
+        )
+        self.assertEqual(changes.contract_ids, {10, 11})
+        self.assertEqual(changes.events, 3)
+        self.assertEqual(changes.end_position, "5")
+        self.assertFalse(changes.truncated)
+
+        capped = sync_cdc.read_change_table(
+            _FakeConn(rows), "cobranzas", "0", max_contracts=1, batch_size=2
+        )
+        self.assertTrue(capped.truncated)
+
+    def test_cdc_replaces_target_rows_of_changed_contracts(self):
+        CobranzasFact.__table__.drop(bind=engine, checkfirst=True)
+        CobranzasFact.__table__.create(bind=engine, checkfirst=True)
+        db = SessionLocal()
+        try:
+            # Contrato 10: el pago 2 se borro en origen; el UPSERT solo reinserta lo re-extraido.
+            db.add_all(
+                [
+                    _payment("10", "01/2026", "1"),
+                    _payment("10", "12/2025", "2"),
+                    _payment("10", "01/2026", "3"),
+                    _payment("11", "12/2025", "4"),
+                ]
+            )
+            db.commit()
+            stale = sync_service._delete_target_contracts(db, "cobranzas", {10})
+            self.assertEqual(stale, {"01/2026", "12/2025"})
+            remaining = db.query(CobranzasFact.contract_id, CobranzasFact.source_row_id).all()
+            self.assertEqual(sorted(remaining), [("11", "4")])
+            self.assertEqual(sync_service._delete_target_contracts(db, "cobranzas", set()), set())
+        finally:
+            db.close()
+
+    def test_cdc_delete_without_commit_is_rolled_back_with_the_load(self):
+        CobranzasFact.__table__.drop(bind=engine, checkfirst=True)
+        CobranzasFact.__table__.create(bind=engine, checkfirst=True)
+        db = SessionLocal()
+        reader = SessionLocal()
+        try:
+            db.add_all([_payment("10", "01/2026", "1"), _payment("11", "12/2025", "2")])
+            db.commit()
+            stale = sync_service._delete_target_contracts(db, "cobranzas", {10}, commit=False)
+            self.assertEqual(stale, {"01/2026"})
+            # Otra sesion (dashboards) sigue viendo el contrato hasta el commit de la carga.
+            self.assertEqual(reader.query(CobranzasFact).filter_by(contract_id="10").count(), 1)
+            reader.rollback()
+            db.rollback()
+            self.assertEqual(db.query(CobranzasFact).count(), 2)
+        finally:
+            reader.close()
+            db.close()
+
+    def test_cdc_backend_only_for_incremental_enabled_domains(self):
+        with patch.object(sync_service.settings, "sync_cdc_mode", "change_table"), patch.object(
+            sync_service.settings, "sync_cdc_domains", "cobranzas"
+        ):
+            self.assertEqual(sync_service._cdc_backend_for("cobranzas", "incremental"), "change_table")
+            self.assertIsNone(sync_service._cdc_backend_for("cobranzas", "full_all"))
+            self.assertIsNone(sync_service._cdc_backend_for("cartera", "incremental"))
+        with patch.object(sync_service.settings, "sync_cdc_mode", "off"):
+            self.assertIsNone(sync_service._cdc_backend_for("cobranzas", "incremental"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+DEFAULT_DB_PATH = (ROOT / "data" / "test_sync_chunk_manifest_reconcile.db").resolve()
+DEFAULT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{DEFAULT_DB_PATH.as_posix()}")
+
+from app.models.brokers import SyncChunkManifest  # noqa: E402
+import app.services.sync_service as sync_service  # noqa: E402
+from app.services.sync_service import _chunk_signal_update, _reconcile_chunk_manifest  # noqa: E402
+
+engine = create_engine(TEST_DATABASE_URL, future=True)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+def _signals(hashes_by_month: dict[str, list[str]]) -> dict[str, dict]:
+    out: dict[str, dict] = {}
+    for month, hashes in hashes_by_month.items():
+        for h in hashes:
+            out[month] = _chunk_signal_update(out.get(month), h)
+    return out
+
+
+class ChunkManifestReconcileTests(unittest.TestCase):
+    def setUp(self):
+        self._engine_backup = sync_service.engine
+        sync_service.engine = engine
+        SyncChunkManifest.__table__.drop(bind=engine, checkfirst=True)
+        SyncChunkManifest.__table__.create(bind=engine, checkfirst=True)
+
+    def tearDown(self):
+        sync_service.engine = self._engine_backup
+
+    def test_batched_reconcile_marks_changed_and_unchanged_chunks(self):
+        first = _signals({"01/2026": ["a" * 64, "b" * 64], "02/2026": ["c" * 64], "03/2026": ["d" * 64]})
+        db = SessionLocal()
+        try:
+            changed, skipped = _reconcile_chunk_manifest(
+                db, domain="cobranzas", job_id="job-1", chunk_signals=first, batch_size=2
+            )
+            self.assertEqual(changed, {"01/2026", "02/2026", "03/2026"})
+            self.assertEqual(skipped, 0)
+
+            second = _signals({"01/2026": ["a" * 64, "b" * 64], "02/2026": ["e" * 64], "03/2026": ["d" * 64]})
+            changed, skipped = _reconcile_chunk_manifest(
+                db, domain="cobranzas", job_id="job-2", chunk_signals=second, batch_size=2
+            )
+            self.assertEqual(changed, {"02/2026"})
+            self.assertEqual(skipped, 2)
+
+            rows = {r.chunk_key: r for r in db.query(SyncChunkManifest).all()}
+            self.assertEqual(len(rows), 3)
+            self.assertEqual(rows["01/2026"].status, "unchanged")
+            self.assertEqual(rows["01/2026"].skipped_count, 1)
+            self.assertEqual(rows["01/2026"].row_count, 2)
+            self.assertEqual(rows["02/2026"].status, "changed")
+            self.assertEqual(rows["02/2026"].last_job_id, "job-2")
+        finally:
+            db.close()
+
+    def test_manifest_is_scoped_by_domain(self):
+        signals = _signals({"01/2026": ["a" * 64]})
+        db = SessionLocal()
+        try:
+            _reconcile_chunk_manifest(db, domain="cobranzas", job_id="j1", chunk_signals=signals)
+            changed, skipped = _reconcile_chunk_manifest(db, domain="cartera", job_id="j2", chunk_signals=signals)
+            self.assertEqual(changed, {"01/2026"})
+            self.assertEqual(skipped, 0)
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import random
+import sys
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.services.sync_normalizers import (  # noqa: E402
+    RowColumnPlan,
+    compile_row_normalizer,
+    normalize_record,
+)
+from app.services.sync_service import _compile_source_markers, _extract_source_markers  # noqa: E402
+
+LAYOUTS = {
+    "cartera": [
+        ("id_contrato", lambda r: f"C-{r.randint(1, 500)}"),
+        ("fecha_cierre", lambda r: r.choice(["2026-01-31", "31/12/2025", "", None, "2026/02/28 00:00:00"])),
+        ("gestion_month", lambda r: r.choice(["", "02/2026", "2026-01", None])),
+        ("Supervisor", lambda r: r.choice(["sup a", "  ", None, "Sup B"])),
+        ("UN", lambda r: r.choice(["odontologia", "MEDICINA", ""])),
+        ("via_de_cobro", lambda r: r.choice(["cobrador", "DEBITO", None])),
+        ("cuotas_vencidas", lambda r: r.choice([0, 1, "3", Decimal("2"), None])),
+        ("monto_cuota", lambda r: Decimal(r.randint(0, 900000)) / 100),
+        ("updated_at", lambda r: datetime(2026, 1, r.randint(1, 28), 10, 0, 0)),
+    ],
+    "cobranzas": [
+        ("payment_way_id", lambda r: r.choice([r.randint(1, 10**6), None, ""])),
+        ("contract_id", lambda r: r.choice([f"K{r.randint(1, 99)}", ""])),
+        ("Dia", lambda r: r.choice(["5", "31", "", 7])),
+        ("Mes", lambda r: r.choice(["2", "13", "", 11])),
+        ("Año", lambda r: r.choice(["2026", "", 2025])),
+        ("date", lambda r: r.choice(["2026-03-04", None])),
+        ("monto", lambda r: r.choice([Decimal("1500.50"), 0, "abc", None])),
+        ("VP", lambda r: r.choice(["cobrador", "debito", "", None])),
+        ("supervisor", lambda r: "sup"),
+        ("tramo", lambda r: r.choice(["1", "7", None])),
+        ("Actualizado_al", lambda r: r.choice(["2026-01-01 00:00:00", None, "x"])),
+    ],
+    "eerr": [
+        ("Mes", lambda r: r.choice([3, 3.0, Decimal("4"), "13", None])),
+        ("ANO", lambda r: r.choice([2026, "2025.0", None])),
+        ("eerr_block", lambda r: r.choice(["Costos", "gastos", "otro", None])),
+        ("social_reason_id", lambda r: r.randint(1, 3)),
+        ("accounting_plan_id", lambda r: r.randint(1, 50)),
+        ("is_tapo", lambda r: r.choice([1, 0, None, "1"])),
+        ("debit", lambda r: Decimal(r.randint(0, 10**6)) / 100),
+        ("credit", lambda r: r.choice([None, 12.5])),
+        ("Mayor", lambda r: "Ventas"),
+        ("cuenta", lambda r: r.choice(["Cuenta ñ", ""])),
+    ],
+    "analytics": [
+        ("contract_id", lambda r: f"A{r.randint(1, 99)}"),
+        ("gestion_month", lambda r: "01/2026"),
+        ("contracts", lambda r: r.choice([None, 2, "3"])),
+        ("deberia", lambda r: r.choice([None, "10.5"])),
+        ("cobrado", lambda r: r.choice([None, 4])),
+        ("via", lambda r: "COBRADOR"),
+    ],
+    "contratos": [
+        ("ID", lambda r: r.randint(1, 999)),
+        ("fecha_contrato", lambda r: r.choice(["2025-12-01", None])),
+        ("un", lambda r: "x"),
+        ("Gestor", lambda r: r.choice(["ana", None])),
+    ],
+}
+
+
+def _rows(domain: str, count: int, seed: int = 7):
+    rnd = random.Random(seed)
+    columns = [name for name, _ in LAYOUTS[domain]]
+    rows = [tuple(gen(rnd) for _, gen in LAYOUTS[domain]) for _ in range(count)]
+    return columns, rows
+
+
+class CompiledNormalizerParityTests(unittest.TestCase):
+    def test_compiled_output_matches_dict_normalizer_for_every_domain(self):
+        for domain in LAYOUTS:
+            columns, rows = _rows(domain, 400)
+            compiled = compile_row_normalizer(domain, columns)
+            for seq, row in enumerate(rows):
+                expected = normalize_record(domain, dict(zip(columns, row)), seq)
+                got = compiled(row, seq)
+                self.assertEqual(repr(got), repr(expected), msg=f"{domain} seq={seq}")
+
+    def test_case_insensitive_and_duplicate_columns_resolve_like_dict_rows(self):
+        columns = ["CONTRACT_ID", "Supervisor", "supervisor", "gestion_month", "gestion_month"]
+        row = ("X-1", "", "sup b", "01/2026", "03/2026")
+        compiled = compile_row_normalizer("contratos", columns)
+        self.assertEqual(compiled(row, 0), normalize_record("contratos", dict(zip(columns, row)), 0))
+
+    def test_source_markers_match_dict_extraction(self):
+        columns, rows = _rows("cobranzas", 200)
+        markers = _compile_source_markers(RowColumnPlan(columns))
+        for row in rows:
+            self.assertEqual(markers(row), _extract_source_markers(dict(zip(columns, row))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.core.mysql_pool import MySQLSourcePool  # noqa: E402
+import app.services.sync_service as sync_service  # noqa: E402
+from app.services.sync_tuning import ExtractStats  # noqa: E402
+
+
+class _FakeCursor:
+    def __init__(self, rows, buffered):
+        self.rows = list(rows)
+        self.buffered = buffered
+        self.description = None
+
+    def execute(self, sql, params=()):
+        self.description = (("contract_id",), ("monto",))
+
+    def fetchmany(self, size):
+        out, self.rows = self.rows[:size], self.rows[size:]
+        return out
+
+    def nextset(self):
+        return None
+
+    def close(self):
+        pass
+
+
+class _FakeConn:
+    def __init__(self, rows, cursors, **cfg):
+        self.rows = rows
+        self.cursors = cursors
+        self.cfg = cfg
+
+    def cursor(self, buffered=False):
+        cursor = _FakeCursor(self.rows, buffered)
+        self.cursors.append(cursor)
+        return cursor
+
+    def consume_results(self):
+        pass
+
+    def ping(self, reconnect=False):
+        pass
+
+    def close(self):
+        pass
+
+
+class ExtractCursorTests(unittest.TestCase):
+    def setUp(self):
+        self.cursors = []
+        self.connects = []
+        rows = [(i, 10.0 * i) for i in range(1, 251)]
+
+        def connect(**cfg):
+            self.connects.append(cfg)
+            return _FakeConn(rows, self.cursors, **cfg)
+
+        self.pool = MySQLSourcePool(connect=connect, acquire_timeout_sec=1)
+
+    def _extract(self, stats):
+        with patch.object(sync_service, "mysql_pool", self.pool):
+            return [
+                batch
+                for _, batch in sync_service._iter_from_mysql(
+                    sync_service._query_path_for("cobranzas"),
+                    domain="cobranzas",
+                    mysql_config={"host": "src", "user": "bi", "database": "epem"},
+                    batch_size_override=100,
+                    extract_stats=stats,
+                )
+            ]
+
+    def test_cursor_mode_defaults_and_overrides(self):
+        with patch.object(sync_service.settings, "sync_extract_cursor_mode", "stream"), patch.object(
+            sync_service.settings, "sync_extract_cursor_mode_overrides", "cartera:buffered, eerr:bogus"
+        ):
+            self.assertEqual(sync_service._extract_cursor_mode_for_domain("cobranzas"), "stream")
+            self.assertEqual(sync_service._extract_cursor_mode_for_domain("cartera"), "buffered")
+            self.assertEqual(sync_service._extract_cursor_mode_for_domain("eerr"), "stream")
+
+    def test_stream_mode_uses_unbuffered_cursor_and_reports_stats(self):
+        stats = ExtractStats()
+        with patch.object(sync_service.settings, "sync_extract_cursor_mode", "stream"), patch.object(
+            sync_service.settings, "sync_extract_cursor_mode_overrides", ""
+        ), patch.object(sync_service.settings, "sync_extract_use_c_ext", False):
+            batches = self._extract(stats)
+        self.assertEqual([len(b) for b in batches], [100, 100, 50])
+        self.assertFalse(self.cursors[0].buffered)
+        self.assertTrue(self.connects[0]["use_pure"])
+        snap = stats.snapshot()
+        self.assertEqual(snap["cursor_mode"], "stream")
+        self.assertEqual(snap["rows"], 250)
+        self.assertEqual(snap["batches"], 3)
+        self.assertEqual(snap["statements"], 1)
+        self.assertGreaterEqual(snap["peak_rss_mb"], 0.0)
+
+    def test_buffered_mode_override(self):
+        stats = ExtractStats()
+        with patch.object(
+            sync_service.settings, "sync_extract_cursor_mode_overrides", "cobranzas:buffered"
+        ):
+            self._extract(stats)
+        self.assertTrue(self.cursors[0].buffered)
+        self.assertEqual(stats.cursor_mode, "buffered")
+
+
+if __name__ == "__main__":
+    unittest.main()
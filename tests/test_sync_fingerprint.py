@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import sys
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+DEFAULT_DB_PATH = (ROOT / "data" / "test_sync_fingerprint.db").resolve()
+DEFAULT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{DEFAULT_DB_PATH.as_posix()}")
+
+from app.core.config import settings  # noqa: E402
+from app.models.brokers import ContratosFact  # noqa: E402
+from app.services.sync_fingerprint import fingerprint_words, resolve_fingerprint  # noqa: E402
+from app.services.sync_normalizers import normalize_record  # noqa: E402
+from app.services.sync_service import _rehash_stored_source_hashes  # noqa: E402
+
+engine = create_engine(TEST_DATABASE_URL, future=True)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+class FingerprintTests(unittest.TestCase):
+    def test_sha256_mode_reproduces_historical_hashes(self):
+        row = {"payment_way_id": 7, "contract_id": "C1", "gestion_month": "02/2026", "monto": "10.5"}
+        with mock.patch.object(settings, "sync_fingerprint_algorithm", "sha256"):
+            n = normalize_record("cobranzas", row, 0)
+            other = normalize_record("contratos", {"id": 1, "x": Decimal("2.50")}, 0)
+        signature = (
+            f"7|C1|02/2026||10.5|{n['payment_via_class']}|S/D|S/D|S/D|0"
+        )
+        self.assertEqual(n["source_hash"], hashlib.sha256(signature.encode("utf-8")).hexdigest())
+        self.assertEqual(other["source_hash"], hashlib.sha256(other["payload_json"].encode("utf-8")).hexdigest())
+
+    def test_blake2b_is_prefixed_and_stable_across_payload_round_trip(self):
+        fp = resolve_fingerprint("blake2b")
+        row = {"id": 1, "monto": Decimal("2.50"), "fecha": datetime(2026, 1, 2, 3, 4, 5), "nada": None}
+        payload_json = json.dumps(row, ensure_ascii=False, sort_keys=True, default=str)
+        h = fp.mapping(row, payload_json)
+        self.assertTrue(h.startswith("b2:"))
+        self.assertEqual(len(h), 35)
+        self.assertEqual(fp.mapping(json.loads(payload_json), payload_json), h)
+        self.assertNotEqual(fp.parts(("a", None)), fp.parts(("a", "None")))
+
+    def test_unknown_or_missing_xxh3_falls_back(self):
+        self.assertEqual(resolve_fingerprint("nope").name, "sha256")
+        self.assertIn(resolve_fingerprint("xxh3").name, {"xxh3", "blake2b"})
+
+    def test_words_are_64_bit(self):
+        for h in ("b2:" + "f" * 32, "a" * 64, "", "zz"):
+            words = fingerprint_words(h)
+            self.assertEqual(len(words), 3)
+            self.assertTrue(all(0 <= w < 2**64 for w in words))
+
+
+class RehashStoredTests(unittest.TestCase):
+    def setUp(self):
+        ContratosFact.__table__.drop(bind=engine, checkfirst=True)
+        ContratosFact.__table__.create(bind=engine, checkfirst=True)
+
+    def test_rehash_rewrites_only_other_algorithm_rows_in_months(self):
+        db = SessionLocal()
+        try:
+            rows = []
+            for i, month in enumerate(["01/2026", "01/2026", "02/2026"]):
+                source = {"id": i + 1, "gestion_month": month}
+                with mock.patch.object(settings, "sync_fingerprint_algorithm", "sha256"):
+                    n = normalize_record("contratos", source, i)
+                rows.append(
+                    ContratosFact(
+                        contract_id=n["contract_id"],
+                        gestion_month=month,
+                        source_hash=n["source_hash"],
+                        payload_json=n["payload_json"],
+                    )
+                )
+            db.add_all(rows)
+            db.commit()
+            with mock.patch.object(settings, "sync_fingerprint_algorithm", "blake2b"):
+                self.assertEqual(_rehash_stored_source_hashes(db, "contratos", {"01/2026"}, batch_size=1), 2)
+                self.assertEqual(_rehash_stored_source_hashes(db, "contratos", {"01/2026"}), 0)
+                expected = normalize_record("contratos", {"id": 1, "gestion_month": "01/2026"}, 0)["source_hash"]
+            stored = {r.contract_id: r.source_hash for r in db.query(ContratosFact).all()}
+            self.assertEqual(stored["1"], expected)
+            self.assertEqual(len(stored["3"]), 64)
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
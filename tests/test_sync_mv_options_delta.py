@@ -0,0 +1,103 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+DEFAULT_DB_PATH = (ROOT / "data" / "test_sync_mv_options_delta.db").resolve()
+DEFAULT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{DEFAULT_DB_PATH.as_posix()}")
+
+from app.models.brokers import (  # noqa: E402
+    AnalyticsAnualesAgg,
+    AnalyticsRendimientoAgg,
+    CarteraCorteAgg,
+    CobranzasCohorteAgg,
+    MvOptionsAnuales,
+    MvOptionsCartera,
+    MvOptionsCohorte,
+    MvOptionsRendimiento,
+)
+from app.services.sync_refresh import apply_mv_options_delta  # noqa: E402
+from app.services.sync_service import _month_serial  # noqa: E402
+
+engine = create_engine(TEST_DATABASE_URL, future=True)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+TABLES = [
+    CarteraCorteAgg,
+    CobranzasCohorteAgg,
+    AnalyticsRendimientoAgg,
+    AnalyticsAnualesAgg,
+    MvOptionsCartera,
+    MvOptionsCohorte,
+    MvOptionsRendimiento,
+    MvOptionsAnuales,
+]
+
+
+class MvOptionsDeltaTests(unittest.TestCase):
+    def setUp(self):
+        for model in TABLES:
+            model.__table__.drop(bind=engine, checkfirst=True)
+            model.__table__.create(bind=engine, checkfirst=True)
+
+    def _rend(self, month: str, supervisor: str, tramo: int = 0) -> AnalyticsRendimientoAgg:
+        return AnalyticsRendimientoAgg(
+            gestion_month=month,
+            un="ODONTOLOGIA",
+            supervisor=supervisor,
+            via_cobro="COBRADOR",
+            categoria="VIGENTE",
+            tramo=tramo,
+        )
+
+    def test_delta_inserts_only_new_tuples_and_removes_stale(self):
+        db = SessionLocal()
+        try:
+            db.add_all([self._rend("01/2026", "SUP A"), self._rend("01/2026", "SUP B", tramo=1)])
+            db.commit()
+            first = apply_mv_options_delta(db, {"01/2026"}, _month_serial)
+            self.assertEqual(first["rendimiento"], 2)
+            self.assertEqual(first["removed"], 0)
+            original_ids = {r.id for r in db.query(MvOptionsRendimiento).all()}
+
+            again = apply_mv_options_delta(db, {"01/2026"}, _month_serial)
+            self.assertEqual(again["rendimiento"], 0)
+            self.assertEqual(again["removed"], 0)
+            self.assertEqual({r.id for r in db.query(MvOptionsRendimiento).all()}, original_ids)
+
+            db.query(AnalyticsRendimientoAgg).filter(AnalyticsRendimientoAgg.supervisor == "SUP B").delete()
+            db.add(self._rend("01/2026", "SUP C"))
+            db.commit()
+            delta = apply_mv_options_delta(db, {"01/2026"}, _month_serial)
+            self.assertEqual(delta["rendimiento"], 1)
+            self.assertEqual(delta["removed"], 1)
+            supervisors = sorted(r.supervisor for r in db.query(MvOptionsRendimiento).all())
+            self.assertEqual(supervisors, ["SUP A", "SUP C"])
+        finally:
+            db.close()
+
+    def test_delta_leaves_untouched_months_alone(self):
+        db = SessionLocal()
+        try:
+            db.add_all([self._rend("01/2026", "SUP A"), self._rend("02/2026", "SUP A")])
+            db.commit()
+            apply_mv_options_delta(db, {"01/2026", "02/2026"}, _month_serial)
+            db.query(AnalyticsRendimientoAgg).filter(AnalyticsRendimientoAgg.gestion_month == "02/2026").delete()
+            db.commit()
+            delta = apply_mv_options_delta(db, {"01/2026"}, _month_serial)
+            self.assertEqual(delta["removed"], 0)
+            months = sorted(r.gestion_month for r in db.query(MvOptionsRendimiento).all())
+            self.assertEqual(months, ["01/2026", "02/2026"])
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import sys
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+import app.services.sync_normalize_pool as pool_module  # noqa: E402
+from app.services.sync_normalize_pool import NormalizationStage  # noqa: E402
+
+COLUMNS = ("payment_way_id", "contract_id", "Dia", "Mes", "Año", "monto", "VP", "updated_at")
+
+
+def _batches(total: int, size: int):
+    rows = [
+        (i + 1, f"C{i % 37}", str(1 + i % 28), str(1 + i % 12), "2026", f"{i}.5", "COBRADOR", datetime(2026, 1, 1 + i % 28))
+        for i in range(total)
+    ]
+    return [(COLUMNS, rows[i : i + size]) for i in range(0, total, size)]
+
+
+def _flatten(stage: NormalizationStage, batches) -> list[tuple]:
+    out = []
+    for batch_len, normalized in stage.run(iter(batches)):
+        assert batch_len == len(normalized)
+        out.extend(normalized)
+    return out
+
+
+class NormalizationStageTests(unittest.TestCase):
+    def test_process_pool_preserves_order_and_output(self):
+        batches = _batches(900, 100)
+        inline = _flatten(NormalizationStage("cobranzas", workers=0), batches)
+        stage = NormalizationStage("cobranzas", workers=2)
+        parallel = _flatten(stage, batches)
+        self.assertEqual(stage.snapshot()["mode"], "process")
+        self.assertEqual(stage.snapshot()["batches"], 9)
+        self.assertEqual(repr(parallel), repr(inline))
+        self.assertEqual([r[1] for r in parallel], [str(i + 1) for i in range(900)])
+
+    def test_falls_back_inline_when_pool_cannot_start(self):
+        batches = _batches(250, 100)
+        with mock.patch.object(pool_module, "ProcessPoolExecutor", side_effect=OSError("no fork")):
+            stage = NormalizationStage("cobranzas", workers=4)
+            rows = _flatten(stage, batches)
+        self.assertEqual(len(rows), 250)
+        snapshot = stage.snapshot()
+        self.assertEqual(snapshot["mode"], "inline")
+        self.assertIn("no fork", snapshot["fallback_reason"])
+        self.assertEqual(repr(rows), repr(_flatten(NormalizationStage("cobranzas"), batches)))
+
+
+if __name__ == "__main__":
+    unittest.main()
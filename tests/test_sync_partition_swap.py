@@ -0,0 +1,283 @@
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+import app.services.sync_service as sync_service  # noqa: E402
+from app.services.sync_normalizers import normalize_record  # noqa: E402
+
+PG = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+
+
+class _FakeResult:
+    def __init__(self, value):
+        self.value = value
+        self.rowcount = value if isinstance(value, int) else 0
+
+    def scalar(self):
+        return self.value
+
+    def all(self):
+        return list(self.value or [])
+
+
+class _FakeSession:
+    """Records executed SQL; `responder(sql, params)` provides each result."""
+
+    def __init__(self, responder):
+        self.responder = responder
+        self.statements = []
+        self.params = []
+
+    def execute(self, stmt, params=None):
+        sql = " ".join(str(stmt).split())
+        self.statements.append(sql)
+        self.params.append(params)
+        return _FakeResult(self.responder(sql, params or {}))
+
+    def _mark(self, sql):
+        self.statements.append(sql)
+        self.params.append(None)
+
+    def commit(self):
+        self._mark("COMMIT")
+
+    def rollback(self):
+        self._mark("ROLLBACK")
+
+
+def _catalog(partitioned=True, attached=("cobranzas_fact_part_2025", "cobranzas_fact_part_2026")):
+    def responder(sql, params):
+        if "pg_partitioned_table" in sql:
+            return 1 if partitioned else None
+        if "pg_inherits" in sql:
+            return 1 if params.get("child") in attached else None
+        return None
+
+    return responder
+
+
+class PartitionSwapPlanTests(unittest.TestCase):
+    def test_plan_groups_target_months_by_yearly_partition(self):
+        db = _FakeSession(_catalog())
+        with patch.object(sync_service, "engine", PG):
+            plan = sync_service._partition_swap_plan(db, "cobranzas", "full_year", {"03/2025", "01/2025", "02/2026"})
+        self.assertEqual(sorted(plan), [2025, 2026])
+        self.assertEqual(plan[2025]["partition"], "cobranzas_fact_part_2025")
+        self.assertEqual(plan[2025]["stage"], "cobranzas_fact_part_2025_swap")
+        self.assertEqual(plan[2025]["months"], ["01/2025", "03/2025"])
+        self.assertEqual((plan[2026]["start"], plan[2026]["end"]), (2026 * 12 + 1, 2027 * 12 + 1))
+
+    def test_plan_falls_back_to_delete_window(self):
+        months = {"01/2025", "02/2026"}
+        with patch.object(sync_service, "engine", PG):
+            cases = {
+                "incremental": (_catalog(), "cobranzas", "incremental", months),
+                "sin meses": (_catalog(), "cobranzas", "full_month", set()),
+                "dominio sin clave de dedupe": (_catalog(), "contratos", "full_year", months),
+                "tabla no particionada": (_catalog(partitioned=False), "cobranzas", "full_year", months),
+                "particion sin adjuntar": (
+                    _catalog(attached=("cobranzas_fact_part_2025",)),
+                    "cobranzas",
+                    "full_year",
+                    months,
+                ),
+            }
+            for label, (responder, domain, mode, target) in cases.items():
+                plan = sync_service._partition_swap_plan(_FakeSession(responder), domain, mode, target)
+                self.assertEqual(plan, {}, label)
+            with patch.object(sync_service.settings, "sync_partition_swap_enabled", False):
+                self.assertEqual(
+                    sync_service._partition_swap_plan(_FakeSession(_catalog()), "cobranzas", "full_year", months), {}
+                )
+        # Fuera de Postgres nunca hay swap.
+        self.assertEqual(
+            sync_service._partition_swap_plan(_FakeSession(_catalog()), "cobranzas", "full_year", months), {}
+        )
+
+    def test_stage_inherits_partition_autovacuum_reloptions(self):
+        def responder(sql, params):
+            if "reloptions" in sql:
+                self.assertEqual(params, {"t": "cobranzas_fact_part_2025"})
+                return [
+                    "autovacuum_vacuum_scale_factor=0.02",
+                    "autovacuum_analyze_threshold=2500",
+                    "fillfactor=90); DROP TABLE x; --",
+                ]
+            if sql.startswith("INSERT INTO"):
+                return 4
+            return None
+
+        db = _FakeSession(responder)
+        plan = {2025: {"partition": "cobranzas_fact_part_2025", "stage": "cobranzas_fact_part_2025_swap", "months": ["01/2025"]}}
+        kept = sync_service._prepare_partition_swap_stages(db, "cobranzas", plan)
+        self.assertEqual(kept, 4)
+        alter = (
+            "ALTER TABLE cobranzas_fact_part_2025_swap SET "
+            "(autovacuum_vacuum_scale_factor=0.02, autovacuum_analyze_threshold=2500)"
+        )
+        self.assertIn(alter, db.statements)
+        create = next(i for i, s in enumerate(db.statements) if s.startswith("CREATE TABLE"))
+        insert = next(i for i, s in enumerate(db.statements) if s.startswith("INSERT INTO"))
+        self.assertLess(create, db.statements.index(alter))
+        self.assertLess(db.statements.index(alter), insert)
+
+    def test_partition_without_reloptions_leaves_stage_untouched(self):
+        db = _FakeSession(lambda sql, params: None)
+        self.assertEqual(sync_service._copy_partition_reloptions(db, "cartera_fact_part_2025", "stage"), [])
+        self.assertFalse(any(s.startswith("ALTER TABLE") for s in db.statements))
+
+
+def _payment(source_row_id, month):
+    mm, yyyy = month.split("/")
+    return normalize_record(
+        "cobranzas",
+        {
+            "payment_way_id": source_row_id,
+            "contract_id": f"C{source_row_id}",
+            "date": f"{yyyy}-{mm}-10",
+            "monto": 100,
+        },
+        0,
+    )
+
+
+def _staged_plan(db, years=(2025, 2026)):
+    plan = {
+        year: {
+            "partition": f"cobranzas_fact_part_{year}",
+            "stage": f"cobranzas_fact_part_{year}_swap",
+            "start": year * 12 + 1,
+            "end": (year + 1) * 12 + 1,
+            "months": [f"01/{year}"],
+        }
+        for year in years
+    }
+    sync_service._prepare_partition_swap_stages(db, "cobranzas", plan)
+    return plan
+
+
+class PartitionSwapDataPathTests(unittest.TestCase):
+    def test_rows_are_routed_to_the_stage_of_their_year(self):
+        db = _FakeSession(lambda sql, params: None)
+        plan = _staged_plan(db)
+        rows = [_payment("1", "01/2025"), _payment("2", "02/2026"), _payment("3", "03/2024"), _payment("4", "01/2026")]
+        remaining = sync_service._insert_partition_swap_rows(db, "cobranzas", plan, rows)
+        # 2024 no tiene stage: vuelve al UPSERT normal.
+        self.assertEqual([r["source_row_id"] for r in remaining], ["3"])
+        inserts = {
+            sql.split()[2]: [v["source_row_id"] for v in params]
+            for sql, params in zip(db.statements, db.params)
+            if sql.startswith("INSERT INTO") and isinstance(params, list)
+        }
+        self.assertEqual(
+            inserts,
+            {"cobranzas_fact_part_2025_swap": ["1"], "cobranzas_fact_part_2026_swap": ["2", "4"]},
+        )
+        self.assertTrue(all(v["payment_month"].endswith("/2026") for v in db.params[-1]))
+
+    def test_write_fact_rows_counts_staged_rows_as_changed(self):
+        db = _FakeSession(lambda sql, params: None)
+        plan = _staged_plan(db)
+        rows = [_payment("1", "01/2025"), _payment("2", "02/2026")]
+        self.assertEqual(sync_service._write_fact_rows(db, "cobranzas", rows, plan), (2, 0))
+
+    def test_swap_dedupes_stages_then_swaps_years_in_order(self):
+        def responder(sql, params):
+            if "pg_indexes" in sql:
+                part = params["t"]
+                return [(f"ix_{part}_month", f"CREATE INDEX ix_{part}_month ON public.{part} USING btree (payment_month)")]
+            return None
+
+        db = _FakeSession(responder)
+        plan = {
+            year: {
+                "partition": f"cobranzas_fact_part_{year}",
+                "stage": f"cobranzas_fact_part_{year}_swap",
+                "start": year * 12 + 1,
+                "end": (year + 1) * 12 + 1,
+                "months": [f"01/{year}"],
+            }
+            for year in (2026, 2025)
+        }
+        sync_service._swap_in_partition_stages(db, "cobranzas", plan)
+        statements = db.statements
+        for year in (2025, 2026):
+            stage = f"cobranzas_fact_part_{year}_swap"
+            dedupe = (
+                f"DELETE FROM {stage} a USING {stage} b "
+                "WHERE a.source_row_id = b.source_row_id AND a.id < b.id"
+            )
+            # La dedupe (se queda la fila mas nueva por clave) va antes de crear los indices del stage.
+            self.assertLess(
+                statements.index(dedupe),
+                statements.index(f"CREATE INDEX {stage}_ix0 ON {stage} USING btree (payment_month)"),
+            )
+        lock = statements.index("LOCK TABLE cobranzas_fact IN ACCESS EXCLUSIVE MODE")
+        self.assertEqual(statements[lock - 1], "COMMIT")
+        swap = [s for s in statements[lock + 1 :] if not s.startswith("ALTER INDEX")]
+        expected = []
+        for year in (2025, 2026):
+            part, stage = f"cobranzas_fact_part_{year}", f"cobranzas_fact_part_{year}_swap"
+            expected += [
+                f"ALTER TABLE cobranzas_fact DETACH PARTITION {part}",
+                f"DROP TABLE {part}",
+                f"ALTER TABLE {stage} RENAME TO {part}",
+                f"ALTER TABLE cobranzas_fact ATTACH PARTITION {part} "
+                f"FOR VALUES FROM ({year * 12 + 1}) TO ({(year + 1) * 12 + 1})",
+                f"ALTER TABLE {part} DROP CONSTRAINT {stage}_bounds",
+            ]
+        self.assertEqual(swap, expected + ["COMMIT"])
+        self.assertIn(
+            "ALTER INDEX cobranzas_fact_part_2025_swap_ix0 RENAME TO ix_cobranzas_fact_part_2025_month",
+            statements[lock:],
+        )
+
+    def test_stage_dedupe_keys_match_the_upsert_conflict_keys(self):
+        self.assertEqual(sync_service.PARTITION_SWAP_DEDUPE_KEYS["cobranzas"], ("source_row_id",))
+        self.assertEqual(
+            sync_service.PARTITION_SWAP_DEDUPE_KEYS["cartera"], ("contract_id", "close_date", "gestion_month")
+        )
+
+    def test_stages_are_dropped_after_an_insert_failure(self):
+        def responder(sql, params):
+            if sql.startswith("INSERT INTO cobranzas_fact_part_2026_swap") and isinstance(params, list):
+                raise RuntimeError("disk full")
+            return None
+
+        db = _FakeSession(responder)
+        plan = _staged_plan(db)
+        with self.assertRaises(RuntimeError):
+            sync_service._write_fact_rows(db, "cobranzas", [_payment("1", "01/2025"), _payment("2", "02/2026")], plan)
+        failed_at = len(db.statements)
+        sync_service._drop_partition_swap_stages(db, plan)
+        self.assertEqual(
+            db.statements[failed_at:],
+            [
+                "ROLLBACK",
+                "DROP TABLE IF EXISTS cobranzas_fact_part_2025_swap",
+                "DROP TABLE IF EXISTS cobranzas_fact_part_2026_swap",
+                "COMMIT",
+            ],
+        )
+        # Ninguna particion real se toco: no hubo DETACH/DROP fuera de los stages.
+        self.assertFalse(any("DETACH" in s or s == "DROP TABLE cobranzas_fact_part_2025" for s in db.statements))
+
+    def test_stage_cleanup_failure_is_swallowed(self):
+        def responder(sql, params):
+            if sql.startswith("DROP TABLE IF EXISTS") and "2026" in sql:
+                raise RuntimeError("lock timeout")
+            return None
+
+        db = _FakeSession(responder)
+        plan = {2026: {"stage": "cobranzas_fact_part_2026_swap"}}
+        sync_service._drop_partition_swap_stages(db, plan)
+        self.assertEqual(db.statements[-1], "ROLLBACK")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import os
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+DEFAULT_DB_PATH = (ROOT / "data" / "test_sync_progress_reporter.db").resolve()
+DEFAULT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{DEFAULT_DB_PATH.as_posix()}")
+
+from app.models.brokers import SyncJob, SyncRun, SyncRunLog  # noqa: E402
+import app.services.sync_service as sync_service  # noqa: E402
+from app.services.sync_progress import ProgressReporter  # noqa: E402
+
+engine = create_engine(TEST_DATABASE_URL, future=True)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+class ProgressReporterTests(unittest.TestCase):
+    def test_flush_coalesces_marks_into_one_snapshot_per_domain(self):
+        persisted: list[tuple[str, dict]] = []
+        state = {"cartera": {"progress_pct": 0}}
+        reporter = ProgressReporter(
+            snapshot=lambda d: dict(state[d]),
+            persist=lambda d, snap: persisted.append((d, snap)),
+            write_logs=lambda rows: None,
+            interval_sec=3600,
+        )
+        for pct in range(1, 51):
+            state["cartera"]["progress_pct"] = pct
+            reporter.mark("cartera")
+        reporter.flush()
+        reporter.flush()
+        self.assertEqual(persisted, [("cartera", {"progress_pct": 50})])
+        self.assertEqual(reporter.snapshots_written, 1)
+
+    def test_log_lines_are_written_in_one_batch(self):
+        batches: list[list[dict]] = []
+        reporter = ProgressReporter(
+            snapshot=lambda d: None,
+            persist=lambda d, snap: None,
+            write_logs=lambda rows: batches.append(rows),
+            interval_sec=3600,
+        )
+        for i in range(5):
+            reporter.log("cobranzas", "job-1", f"linea {i}")
+        reporter.flush()
+        self.assertEqual(len(batches), 1)
+        self.assertEqual([r["line"] for r in batches[0]], [f"linea {i}" for i in range(5)])
+        self.assertEqual(reporter.log_lines_written, 5)
+
+
+class SyncServiceProgressTests(unittest.TestCase):
+    def setUp(self):
+        self._session_backup = sync_service.SessionLocal
+        sync_service.SessionLocal = SessionLocal
+        for table in (SyncRunLog.__table__, SyncRun.__table__, SyncJob.__table__):
+            table.drop(bind=engine, checkfirst=True)
+            table.create(bind=engine, checkfirst=True)
+        self.domain = "cobranzas"
+        sync_service._state_by_domain.pop(self.domain, None)
+
+    def tearDown(self):
+        sync_service._progress_reporter.flush()
+        sync_service._state_by_domain.pop(self.domain, None)
+        sync_service.SessionLocal = self._session_backup
+
+    def test_running_transition_and_logs_reach_the_database(self):
+        sync_service._set_state(
+            self.domain,
+            {
+                "job_id": "job-progress",
+                "mode": "incremental",
+                "running": True,
+                "stage": "starting",
+                "started_at": "2026-01-01T00:00:00+00:00",
+                "log": [],
+            },
+        )
+        sync_service._append_log(self.domain, "Inicio")
+        sync_service._set_state(self.domain, {"stage": "normalizing", "progress_pct": 40, "rows_read": 400})
+        sync_service._append_log(self.domain, "Normalizando")
+
+        db = SessionLocal()
+        try:
+            row = db.query(SyncRun).filter(SyncRun.job_id == "job-progress").one()
+            self.assertTrue(row.running)
+        finally:
+            db.close()
+
+        sync_service._set_state(self.domain, {"running": False, "stage": "completed", "progress_pct": 100})
+        db = SessionLocal()
+        try:
+            row = db.query(SyncRun).filter(SyncRun.job_id == "job-progress").one()
+            self.assertFalse(row.running)
+            self.assertEqual(row.stage, "completed")
+            self.assertEqual(row.progress_pct, 100)
+            self.assertEqual(row.job_step, sync_service._job_step_from_stage("completed"))
+            lines = [r.line for r in db.query(SyncRunLog).order_by(SyncRunLog.id).all()]
+            self.assertEqual(lines, ["Inicio", "Normalizando"])
+            row.running = True
+            self.assertEqual(sync_service._run_log_lines(db, row), ["Inicio", "Normalizando"])
+        finally:
+            db.close()
+
+    def test_state_updates_wait_for_state_lock(self):
+        sync_service._set_state(self.domain, {"stage": "starting", "progress_pct": 0})
+        done = threading.Event()
+
+        def writer():
+            sync_service._set_state(self.domain, {"progress_pct": 50})
+            sync_service._append_log(self.domain, "linea")
+            done.set()
+
+        with sync_service._state_lock:
+            worker = threading.Thread(target=writer)
+            worker.start()
+            # Un lector que copia el estado bajo el lock nunca ve una actualizacion a medias.
+            self.assertFalse(done.wait(0.1))
+            self.assertEqual(sync_service._state_by_domain[self.domain]["progress_pct"], 0)
+        worker.join(2)
+        self.assertTrue(done.is_set())
+        state = sync_service._progress_snapshot(self.domain)
+        self.assertEqual(state["progress_pct"], 50)
+        self.assertEqual(state["log"][-1], "linea")
+
+
+if __name__ == "__main__":
+    unittest.main()
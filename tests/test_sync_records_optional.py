@@ -0,0 +1,103 @@
+import os
+import sys
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+DEFAULT_DB_PATH = (ROOT / "data" / "test_sync_records_optional.db").resolve()
+DEFAULT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{DEFAULT_DB_PATH.as_posix()}")
+
+from app.models.brokers import CarteraFact, SyncRecord  # noqa: E402
+from app.repositories import brokers_config  # noqa: E402
+import app.services.sync_service as sync_service  # noqa: E402
+from app.services.sync_service import _should_persist_sync_records, _upsert_sync_records  # noqa: E402
+
+engine = create_engine(TEST_DATABASE_URL, future=True)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+def _record(contract_id: str, source_hash: str) -> dict:
+    return {
+        "domain": "cartera",
+        "contract_id": contract_id,
+        "gestion_month": "01/2026",
+        "supervisor": "S/D",
+        "un": "MEDICINA",
+        "via": "COBRADOR",
+        "tramo": 1,
+        "payload_json": "{}",
+        "source_hash": source_hash,
+    }
+
+
+class SyncRecordsOptionalTests(unittest.TestCase):
+    def setUp(self):
+        self._engine_backup = sync_service.engine
+        sync_service.engine = engine
+        for table in (SyncRecord.__table__, CarteraFact.__table__):
+            table.drop(bind=engine, checkfirst=True)
+            table.create(bind=engine, checkfirst=True)
+
+    def tearDown(self):
+        sync_service.engine = self._engine_backup
+
+    def test_sync_records_writes_are_opt_in_and_cartera_only(self):
+        with patch.object(sync_service.settings, "sync_persist_sync_records", False):
+            self.assertFalse(_should_persist_sync_records("cartera"))
+        with patch.object(sync_service.settings, "sync_persist_sync_records", True):
+            self.assertTrue(_should_persist_sync_records("cartera"))
+            self.assertFalse(_should_persist_sync_records("cobranzas"))
+
+    def test_bulk_merge_skips_unchanged_rows_across_batches(self):
+        rows = [_record(f"c-{i}", "h1") for i in range(250)]
+        db = SessionLocal()
+        try:
+            with patch.object(sync_service.settings, "sync_records_write_batch_size", 100):
+                self.assertEqual(_upsert_sync_records(db, rows + [_record("c-0", "h1")]), 250)
+                self.assertEqual(_upsert_sync_records(db, rows), 0)
+                changed = [_record("c-7", "h2"), _record("c-8", "h1")]
+                self.assertEqual(_upsert_sync_records(db, changed), 1)
+            self.assertEqual(db.query(SyncRecord).count(), 250)
+            row = db.query(SyncRecord).filter(SyncRecord.contract_id == "c-7").one()
+            self.assertEqual(row.source_hash, "h2")
+        finally:
+            db.close()
+
+    def test_cartera_uns_read_from_fact_when_sync_records_disabled(self):
+        db = SessionLocal()
+        try:
+            db.add(
+                CarteraFact(
+                    contract_id="c-1",
+                    close_date=date(2026, 1, 31),
+                    close_month="01/2026",
+                    close_year=2026,
+                    gestion_month="02/2026",
+                    un="odontologia ",
+                    source_hash="h1",
+                )
+            )
+            db.commit()
+            _upsert_sync_records(db, [_record("c-2", "h1")])
+            with patch.object(brokers_config.settings, "read_from_fact_tables", False), patch.object(
+                brokers_config.settings, "sync_persist_sync_records", False
+            ):
+                self.assertEqual(brokers_config.get_cartera_uns(db), ["ODONTOLOGIA"])
+            with patch.object(brokers_config.settings, "read_from_fact_tables", False), patch.object(
+                brokers_config.settings, "sync_persist_sync_records", True
+            ):
+                self.assertEqual(brokers_config.get_cartera_uns(db), ["MEDICINA"])
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import os
+import sqlite3
+import sys
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+DEFAULT_DB_PATH = (ROOT / "data" / "test_sync_source_summary.db").resolve()
+DEFAULT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{DEFAULT_DB_PATH.as_posix()}")
+
+from app.models.brokers import SyncChunkManifest  # noqa: E402
+from app.services.sync_extractors import (  # noqa: E402
+    MYSQL_MONTH_SUMMARY_QUERIES,
+    append_where_predicate,
+    load_sql_with_includes,
+)
+import app.services.sync_service as sync_service  # noqa: E402
+from app.services.sync_service import (  # noqa: E402
+    _build_month_filtered_query,
+    _chunk_signal_update,
+    _month_to_summary_period,
+    _reconcile_chunk_manifest,
+    _source_signature_fresh_since,
+    _source_summary_enabled,
+    _store_source_signatures,
+    _stored_source_signatures,
+    _summary_period_to_month,
+)
+
+engine = create_engine(TEST_DATABASE_URL, future=True)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+class SourceSummaryTests(unittest.TestCase):
+    def setUp(self):
+        self._engine_backup = sync_service.engine
+        sync_service.engine = engine
+        SyncChunkManifest.__table__.drop(bind=engine, checkfirst=True)
+        SyncChunkManifest.__table__.create(bind=engine, checkfirst=True)
+
+    def tearDown(self):
+        sync_service.engine = self._engine_backup
+
+    def test_period_month_mapping_round_trips_with_offset(self):
+        self.assertEqual(_summary_period_to_month(202601, 0), "01/2026")
+        self.assertEqual(_summary_period_to_month("202512", 1), "01/2026")
+        self.assertIsNone(_summary_period_to_month(202613, 0))
+        self.assertEqual(_month_to_summary_period("01/2026", 1), 202512)
+        self.assertEqual(_month_to_summary_period("03/2026", 0), 202603)
+
+    def test_month_filter_pushes_date_range_into_real_domain_queries(self):
+        for rel in ("query_cobranzas.sql", "sql/v2/query_cobranzas.sql"):
+            base, _ = load_sql_with_includes(ROOT / rel)
+            sql = _build_month_filtered_query("cobranzas", base, {"02/2026", "01/2026", "06/2025"})
+            # Sin derived table: la query selecciona p.id y pm.id (MySQL ERROR 1060 si se envuelve).
+            self.assertNotIn("_src", sql)
+            self.assertEqual(sql.count("SELECT"), base.count("SELECT"))
+            head = base[: base.rindex("WHERE")]
+            self.assertTrue(sql.startswith(head.strip()), rel)
+            self.assertTrue(
+                sql.endswith(
+                    ") AND ((p.date >= '2025-06-01' AND p.date < '2025-07-01') OR "
+                    "(p.date >= '2026-01-01' AND p.date < '2026-03-01'))"
+                ),
+                rel,
+            )
+        cartera, _ = load_sql_with_includes(ROOT / "query.sql")
+        sql = _build_month_filtered_query("cartera", cartera, {"01/2026"})
+        self.assertTrue(sql.endswith("AND ((ccd.closed_date >= '2025-12-01' AND ccd.closed_date < '2026-01-01'))"))
+
+    def test_pushed_predicate_keeps_or_precedence_and_duplicate_columns(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE p (id INT, date TEXT, status INT, type INT)")
+        conn.execute("CREATE TABLE pm (id INT)")
+        conn.executemany(
+            "INSERT INTO p VALUES (?, ?, ?, ?)",
+            [(1, "2026-01-15", 1, 0), (2, "2026-02-03", 0, 0), (3, "2025-12-31", 1, 0), (4, "2026-01-20", 0, 5)],
+        )
+        conn.execute("INSERT INTO pm VALUES (9)")
+        base = (
+            "SELECT p.id, pm.id FROM p JOIN pm ON 1 = 1\n"
+            "WHERE p.status = 1 -- pagos activos\n   OR p.type < 2;"
+        )
+        sql = _build_month_filtered_query("cobranzas", base, {"01/2026"})
+        self.assertEqual(conn.execute(sql).fetchall(), [(1, 9)])
+        with self.assertRaises(ValueError):
+            append_where_predicate("SELECT a FROM t WHERE a > 1 GROUP BY a", "1 = 1")
+        with self.assertRaises(ValueError):
+            append_where_predicate("SELECT a FROM (SELECT 1 a WHERE 1) x", "1 = 1")
+
+    def test_signatures_are_stored_on_reconciled_months(self):
+        signals = {}
+        for month in ("01/2026", "02/2026"):
+            signals[month] = _chunk_signal_update(None, "a" * 32)
+        db = SessionLocal()
+        try:
+            _reconcile_chunk_manifest(db, domain="cobranzas", job_id="j1", chunk_signals=signals)
+            self.assertEqual(_stored_source_signatures(db, "cobranzas", {"01/2026", "02/2026"}), {})
+            _store_source_signatures(db, "cobranzas", {"01/2026": "10:-:5", "03/2026": "1:-:1"})
+            stored = _stored_source_signatures(db, "cobranzas", {"01/2026", "02/2026", "03/2026"})
+            self.assertEqual(stored, {"01/2026": "10:-:5"})
+            self.assertEqual(_stored_source_signatures(db, "cartera", {"01/2026"}), {})
+        finally:
+            db.close()
+
+    def test_expired_signatures_force_reextract_and_summary_hashes_joined_columns(self):
+        db = SessionLocal()
+        try:
+            _reconcile_chunk_manifest(
+                db, domain="cobranzas", job_id="j1", chunk_signals={"01/2026": _chunk_signal_update(None, "b" * 32)}
+            )
+            _store_source_signatures(db, "cobranzas", {"01/2026": "10:-:5"})
+            db.query(SyncChunkManifest).update({"updated_at": datetime.utcnow() - timedelta(hours=30)})
+            db.commit()
+            self.assertEqual(_stored_source_signatures(db, "cobranzas", {"01/2026"}), {"01/2026": "10:-:5"})
+            with patch.object(sync_service.settings, "sync_source_summary_max_age_hours", 24):
+                fresh_since = _source_signature_fresh_since()
+            self.assertEqual(_stored_source_signatures(db, "cobranzas", {"01/2026"}, fresh_since=fresh_since), {})
+            with patch.object(sync_service.settings, "sync_source_summary_max_age_hours", 0):
+                self.assertIsNone(_source_signature_fresh_since())
+        finally:
+            db.close()
+        summary_sql = MYSQL_MONTH_SUMMARY_QUERIES["cobranzas"]["sql"]
+        for column in ("e.name", "b.name", "pm.name", "c.request_financing_number", "c.number"):
+            self.assertIn(column, summary_sql)
+
+    def test_summary_disabled_for_full_all_and_other_domains(self):
+        self.assertFalse(_source_summary_enabled("cobranzas", "incremental"))
+        with patch.multiple(
+            sync_service.settings, sync_source_summary_enabled=True, sync_source_summary_domains="cobranzas"
+        ):
+            self.assertTrue(_source_summary_enabled("cobranzas", "incremental"))
+            self.assertFalse(_source_summary_enabled("cobranzas", "full_all"))
+            self.assertFalse(_source_summary_enabled("contratos", "incremental"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.services.sync_normalizers import normalize_record  # noqa: E402
+from app.services.sync_spill import SPILL_SUFFIX, SpillStats, SpillWriter, iter_spill_rows  # noqa: E402
+
+
+def _rows(count: int) -> list[dict]:
+    out = []
+    for i in range(count):
+        row = {
+            "payment_way_id": i + 1,
+            "contract_id": f"C{i}",
+            "gestion_month": f"{1 + i % 3:02d}/2026",
+            "monto": "10.5",
+            "Supervisor": "sup ñ",
+        }
+        out.append(normalize_record("cobranzas", row, i))
+    return out
+
+
+class SpillRoundTripTests(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=SPILL_SUFFIX)
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_rows_round_trip_in_order_without_transient_keys(self):
+        rows = _rows(2503)
+        rows[0]["_sync_payload_parsed"] = {"cached": True}
+        stats = SpillStats()
+        writer = SpillWriter(self.path, stats=stats, frame_rows=1000)
+        for row in rows:
+            writer.append(row)
+        writer.close()
+        back = list(iter_spill_rows(self.path, stats=stats))
+        rows[0].pop("_sync_payload_parsed")
+        self.assertEqual(back, rows)
+        snap = stats.snapshot()
+        self.assertEqual(snap["frames"], 3)
+        self.assertEqual(snap["rows_written"], 2503)
+        self.assertEqual(snap["rows_read"], 2503)
+        self.assertEqual(snap["bytes"], os.path.getsize(self.path))
+
+    def test_month_filter_is_applied_on_the_column(self):
+        rows = _rows(300)
+        writer = SpillWriter(self.path, stats=SpillStats(), frame_rows=100)
+        for row in rows:
+            writer.append(row)
+        writer.close()
+        back = list(iter_spill_rows(self.path, gestion_months={"02/2026"}))
+        self.assertEqual(back, [r for r in rows if r["gestion_month"] == "02/2026"])
+
+    def test_empty_spill_yields_nothing(self):
+        SpillWriter(self.path, stats=SpillStats()).close()
+        self.assertEqual(list(iter_spill_rows(self.path)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
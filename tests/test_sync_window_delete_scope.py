@@ -3,8 +3,10 @@ import sys
 import unittest
 from datetime import date
 from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -15,6 +17,7 @@ DEFAULT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{DEFAULT_DB_PATH.as_posix()}")
 
 from app.models.brokers import CobranzasFact, SyncRecord  # noqa: E402
+import app.services.sync_service as sync_service  # noqa: E402
 from app.services.sync_service import _delete_target_window, _delete_target_window_fact  # noqa: E402
 
 engine = create_engine(TEST_DATABASE_URL, future=True)
@@ -192,5 +195,111 @@ class SyncWindowDeleteScopeTests(unittest.TestCase):
             db.close()
 
 
+class _Result:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+def _partitioned_session(truncated):
+    """
+    Sesion sqlite que simula cobranzas_fact particionada por anio: las particiones
+    figuran adjuntas y TRUNCATE de cobranzas_fact_part_YYYY borra las filas de ese anio.
+    """
+    db = SessionLocal()
+    execute = db.execute
+
+    def fake_execute(stmt, *args, **kwargs):
+        sql = " ".join(str(stmt).split())
+        if "pg_inherits" in sql:
+            return _Result(1)
+        if sql.startswith("TRUNCATE TABLE cobranzas_fact_part_"):
+            year = int(sql.rsplit("_", 1)[1])
+            truncated.append(year)
+            return execute(text("DELETE FROM cobranzas_fact WHERE payment_year = :y"), {"y": year})
+        return execute(stmt, *args, **kwargs)
+
+    db.execute = fake_execute
+    return db
+
+
+class PartitionTruncateScopeTests(unittest.TestCase):
+    def setUp(self):
+        CobranzasFact.__table__.drop(bind=engine, checkfirst=True)
+        CobranzasFact.__table__.create(bind=engine, checkfirst=True)
+        db = SessionLocal()
+        try:
+            for row_id, month in enumerate(["01/2025", "07/2025", "12/2025", "01/2026", "02/2026"], start=1):
+                mm, yyyy = month.split("/")
+                db.add(
+                    CobranzasFact(
+                        contract_id=f"c-{row_id}",
+                        gestion_month=month,
+                        payment_date=date(int(yyyy), int(mm), 10),
+                        payment_month=month,
+                        payment_year=int(yyyy),
+                        payment_amount=100.0,
+                        source_row_id=str(row_id),
+                        source_hash=f"h{row_id}",
+                    )
+                )
+            db.commit()
+        finally:
+            db.close()
+
+    def _delete(self, months):
+        truncated = []
+        db = _partitioned_session(truncated)
+        try:
+            with patch.object(sync_service, "_is_partitioned_table", return_value=True):
+                _delete_target_window_fact(db, "cobranzas", "full_all", None, None, set(months))
+            remaining = {str(r.payment_month) for r in db.query(CobranzasFact).all()}
+        finally:
+            db.close()
+        return truncated, remaining
+
+    def test_fully_covered_year_is_truncated_and_partial_year_uses_scoped_delete(self):
+        window = {f"{m:02d}/2025" for m in range(1, 13)} | {"01/2026"}
+        truncated, remaining = self._delete(window)
+        self.assertEqual(truncated, [2025])
+        self.assertEqual(remaining, {"02/2026"})
+
+    def test_partially_covered_year_is_never_truncated(self):
+        truncated, remaining = self._delete({f"{m:02d}/2025" for m in range(1, 12)})
+        self.assertEqual(truncated, [])
+        # 12/2025 queda fuera de la ventana y comparte particion: se conserva.
+        self.assertEqual(remaining, {"12/2025", "01/2026", "02/2026"})
+
+    def test_detached_partition_is_not_truncated(self):
+        db = MagicMock()
+        db.execute.return_value.scalar.return_value = None
+        with patch.object(sync_service, "_is_partitioned_table", return_value=True):
+            covered = sync_service._truncate_full_month_partitions(
+                db, "cobranzas_fact", {f"{m:02d}/2025" for m in range(1, 13)}
+            )
+        self.assertEqual(covered, set())
+        self.assertFalse(any("TRUNCATE" in str(c.args[0]) for c in db.execute.call_args_list))
+
+    def test_ensure_month_partitions_creates_one_partition_per_year(self):
+        db = MagicMock()
+        pg = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+        with patch.object(sync_service, "engine", pg), patch.object(
+            sync_service, "_is_partitioned_table", return_value=True
+        ):
+            sync_service._ensure_month_partitions(db, "cobranzas_fact", {"03/2025", "11/2025", "01/2026", "bad"})
+        ddl = [" ".join(str(c.args[0]).split()) for c in db.execute.call_args_list]
+        self.assertEqual(
+            ddl,
+            [
+                "CREATE TABLE IF NOT EXISTS cobranzas_fact_part_2025 PARTITION OF cobranzas_fact "
+                f"FOR VALUES FROM ({2025 * 12 + 1}) TO ({2026 * 12 + 1})",
+                "CREATE TABLE IF NOT EXISTS cobranzas_fact_part_2026 PARTITION OF cobranzas_fact "
+                f"FOR VALUES FROM ({2026 * 12 + 1}) TO ({2027 * 12 + 1})",
+            ],
+        )
+
+
 if __name__ == "__main__":
     unittest.main()